@@ -0,0 +1,317 @@
+# benchmarks/golden.py
+
+# 【繁】黃金輸出對照：以隨附測試字體與固定種子渲染標準的手卷、對聯、扇面，走遍每種渲染模式與墨韻後端，
+#       與參考渲染及存檔的黃金圖比較（逐像素與 PSNR/SSIM 容差），並報告各模式的加速比與偏差，
+#       使效能最佳化有憑據地合入
+# [EN] Golden-output harness: renders canonical handscroll, couplet and fan configurations with the bundled test
+#      font and fixed seeds through every render mode and ink backend, compares them with the reference render and
+#      the stored golden images (exact and PSNR/SSIM tolerances), and reports each mode's speedup and drift, so
+#      optimizations land with evidence
+#
+# Usage:
+#   python -m benchmarks.golden                  # compare and print the report (exit status 1 on any failure)
+#   python -m benchmarks.golden --repeat 3       # time each mode as the best of 3 renders
+#   python -m benchmarks.golden --update         # re-render the golden images after an intended change
+
+from __future__ import annotations
+
+import argparse
+import math
+import sys
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from PIL import Image
+
+from chinese_calligraphy import Brush, Colophon, Couplet, Fan, Handscroll, MainText, Paper, ScrollCanvas, Seal, Style
+from chinese_calligraphy.ink import available_ink_backends, get_ink_backend
+from chinese_calligraphy.layout import Margins
+
+ROOT = Path(__file__).resolve().parent.parent
+FONT = ROOT / "tests" / "data" / "CalligraphyTest.ttf"
+GOLDEN_DIR = ROOT / "tests" / "golden"
+
+# 【繁】黃金圖以半尺寸渲染，檔案小而仍走過完整墨韻管線
+# [EN] Golden images are rendered at half size: small files, yet the full ink pipeline runs
+SCALE = 0.5
+
+
+# =========================
+# 【容差 / Tolerances】
+# =========================
+
+
+@dataclass(frozen=True)
+class Tolerance:
+    # 【繁】max_diff 為單一通道最大差（None 不檢查）；psnr、ssim 為下限
+    # [EN] max_diff is the largest per-channel difference (None: not checked); psnr and ssim are lower bounds
+    max_diff: int | None = 0
+    psnr: float = math.inf
+    ssim: float = 1.0
+
+
+# 【繁】逐位元相同 / [EN] Bit-identical
+EXACT = Tolerance()
+# 【繁】只差捨入（覆蓋率畫布）/ [EN] Rounding only (coverage canvas)
+ROUNDING = Tolerance(max_diff=2, psnr=45.0, ssim=0.999)
+# 【繁】墨韻核心不同的後端：筆觸外觀相同，暈染與飛白細節有別
+# [EN] Backends with different ink kernels: same strokes, halo and flying-white details differ
+PERCEPTUAL = Tolerance(max_diff=None, psnr=25.0, ssim=0.9)
+# 【繁】本機參考渲染對存檔黃金圖：容許 FreeType/Pillow 版本造成的抗鋸齒差異
+# [EN] This machine's reference render vs the stored golden image: allows anti-aliasing drift between
+#      FreeType/Pillow versions
+GOLDEN = Tolerance(max_diff=None, psnr=35.0, ssim=0.98)
+
+
+@dataclass(frozen=True)
+class Drift:
+    max_diff: int
+    psnr: float
+    ssim: float
+
+    def within(self, tol: Tolerance) -> bool:
+        if tol.max_diff is not None and self.max_diff > tol.max_diff:
+            return False
+        return self.psnr >= tol.psnr and self.ssim >= tol.ssim
+
+
+def psnr(a: np.ndarray, b: np.ndarray) -> float:
+    mse = float(np.mean((a.astype(np.float64) - b.astype(np.float64)) ** 2))
+    return math.inf if mse == 0 else 10.0 * math.log10(255.0**2 / mse)
+
+
+def _box_mean(x: np.ndarray, k: int) -> np.ndarray:
+    # 【繁】k × k 視窗平均（積分圖）/ [EN] Mean over k × k windows (summed-area table)
+    s = np.pad(x, ((1, 0), (1, 0))).cumsum(0).cumsum(1)
+    out: np.ndarray = (s[k:, k:] - s[:-k, k:] - s[k:, :-k] + s[:-k, :-k]) / (k * k)
+    return out
+
+
+def ssim(a: np.ndarray, b: np.ndarray, k: int = 7) -> float:
+    # 【繁】亮度上的平均 SSIM（k × k 均勻視窗）/ [EN] Mean SSIM on luma over uniform k × k windows
+    luma = np.array([0.299, 0.587, 0.114])
+    x, y = a.astype(np.float64) @ luma, b.astype(np.float64) @ luma
+    if min(x.shape) < k:
+        return 1.0 if np.array_equal(x, y) else 0.0
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    mx, my = _box_mean(x, k), _box_mean(y, k)
+    vx, vy = _box_mean(x * x, k) - mx * mx, _box_mean(y * y, k) - my * my
+    cxy = _box_mean(x * y, k) - mx * my
+    s = ((2 * mx * my + c1) * (2 * cxy + c2)) / ((mx * mx + my * my + c1) * (vx + vy + c2))
+    return float(s.mean())
+
+
+def compare(a: Image.Image, b: Image.Image) -> Drift:
+    if a.size != b.size:
+        return Drift(255, 0.0, 0.0)
+    x, y = np.asarray(a.convert("RGB")), np.asarray(b.convert("RGB"))
+    return Drift(int(np.abs(x.astype(np.int16) - y).max()), psnr(x, y), ssim(x, y))
+
+
+# =========================
+# 【標準作品 / Canonical works】
+# =========================
+
+
+def _style(font_path: str, **kw: Any) -> Style:
+    return Style(font_path=font_path, **kw)
+
+
+def _seal(font_path: str, texture: float = 0.0) -> Seal:
+    return Seal(
+        font_path=font_path, size=80, font_size=30, cell=30, text_grid=[("印", 0, 0), ("章", 1, 1)], texture=texture
+    )
+
+
+def handscroll(font_path: str, engine: str) -> Handscroll:
+    style = _style(font_path, font_size=60, char_spacing=8, col_spacing=80, ink_dryness=0.25, blur_sigma=0.7)
+    return Handscroll(
+        canvas=ScrollCanvas(height=560, paper=Paper("xuan", seed=3, tile=128)),
+        margins=Margins(top=50, bottom=50, right=60, left=60),
+        main=MainText("永和九年歲在癸丑之一二三山水人天月花書法" * 2, style, brush=Brush(seed=11, ink_backend=engine)),
+        colophon=Colophon("山人書", _style(font_path, font_size=30), brush=Brush(seed=12, ink_backend=engine)),
+        name_seal=_seal(font_path, texture=0.5),
+        lead_space=40,
+        tail_space=40,
+    )
+
+
+def couplet(font_path: str, engine: str) -> Couplet:
+    style = _style(font_path, font_size=70, ink_dryness=0.35, blur_sigma=0.9)
+    return Couplet(
+        text_right="永和九年歲在",
+        text_left="癸丑之一二三",
+        text_header="山水人天",
+        colophon_right="書法",
+        colophon_left="印章",
+        style=style,
+        brush=Brush(seed=21, char_jitter=(2, 2), var_rotate_deg=1.5, ink_backend=engine),
+        seal_right=_seal(font_path),
+        seal_header=_seal(font_path),
+    )
+
+
+def fan(font_path: str, engine: str) -> Fan:
+    return Fan(
+        text="永和九年歲在癸丑之一二三山水",
+        colophon="山人",
+        style=_style(font_path, font_size=60, ink_dryness=0.2, blur_sigma=0.6),
+        brush=Brush(seed=31, char_jitter=(2, 2), var_rotate_deg=2, ink_backend=engine),
+        paper=Paper("gold_fleck", seed=5, tile=128),
+    )
+
+
+CASES: dict[str, Callable[[str, str], Handscroll | Couplet | Fan]] = {
+    "handscroll": handscroll,
+    "couplet": couplet,
+    "fan": fan,
+}
+
+
+# =========================
+# 【模式 / Modes】
+# =========================
+
+
+@dataclass(frozen=True)
+class Mode:
+    name: str
+    engine: str = "auto"
+    threads: int = 1
+    canvas: str = "rgb"
+    tolerance: Tolerance = EXACT
+
+
+def modes() -> list[Mode]:
+    # 【繁】第一個為參考模式；其餘與之比較。墨韻後端只列本機可用者
+    # [EN] The first is the reference mode; the others are compared with it. Only ink backends usable here appear
+    out = [
+        Mode("reference"),
+        Mode("threads=4", threads=4),
+        Mode("coverage", canvas="coverage", tolerance=ROUNDING),
+        Mode("coverage+threads=4", threads=4, canvas="coverage", tolerance=ROUNDING),
+    ]
+    ref = get_ink_backend("auto").name
+    out += [Mode(f"ink={name}", engine=name, tolerance=PERCEPTUAL) for name in available_ink_backends() if name != ref]
+    return out
+
+
+def _sheet(images: Sequence[Image.Image | None]) -> Image.Image:
+    # 【繁】對聯的三張圖並排為一張以便比較 / [EN] Lay the couplet's images side by side for comparison
+    parts = [im for im in images if im is not None]
+    sheet = Image.new("RGB", (sum(im.width for im in parts), max(im.height for im in parts)), (0, 0, 0))
+    x = 0
+    for im in parts:
+        sheet.paste(im, (x, 0))
+        x += im.width
+    return sheet
+
+
+def render(case: str, mode: Mode, font_path: str = str(FONT)) -> Image.Image:
+    work = CASES[case](font_path, mode.engine)
+    out = work.render(scale=SCALE, threads=mode.threads, canvas=mode.canvas)
+    return _sheet(out) if isinstance(out, tuple) else out
+
+
+def _timed(case: str, mode: Mode, font_path: str, repeat: int) -> tuple[Image.Image, float]:
+    best, img = math.inf, None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        img = render(case, mode, font_path)
+        best = min(best, time.perf_counter() - t0)
+    assert img is not None
+    return img, best
+
+
+# =========================
+# 【報告 / Report】
+# =========================
+
+
+@dataclass(frozen=True)
+class Row:
+    case: str
+    mode: str
+    seconds: float
+    speedup: float
+    drift: Drift
+    ok: bool
+
+
+def golden_path(case: str, golden_dir: Path = GOLDEN_DIR) -> Path:
+    return golden_dir / f"{case}.png"
+
+
+def run(
+    cases: Sequence[str] = tuple(CASES),
+    font_path: str = str(FONT),
+    golden_dir: Path = GOLDEN_DIR,
+    repeat: int = 1,
+) -> list[Row]:
+    """
+    【繁】每個作品先預熱（字體、字形與紙紋快取），再逐模式渲染計時；參考模式與黃金圖比較，其餘模式與參考比較。
+    [EN] Each case is warmed up first (font, glyph and paper caches), then rendered and timed in every mode; the
+    reference mode is compared with the golden image and every other mode with the reference.
+    """
+    rows: list[Row] = []
+    all_modes = modes()
+    for case in cases:
+        render(case, all_modes[0], font_path)
+        ref, ref_t = _timed(case, all_modes[0], font_path, repeat)
+        path = golden_path(case, golden_dir)
+        if path.exists():
+            with Image.open(path) as golden:
+                drift = compare(golden, ref)
+            rows.append(Row(case, "golden", ref_t, 1.0, drift, drift.within(GOLDEN)))
+        else:
+            rows.append(Row(case, "golden (missing)", ref_t, 1.0, Drift(255, 0.0, 0.0), False))
+        for mode in all_modes[1:]:
+            img, t = _timed(case, mode, font_path, repeat)
+            drift = compare(ref, img)
+            rows.append(Row(case, mode.name, t, ref_t / t, drift, drift.within(mode.tolerance)))
+    return rows
+
+
+def format_report(rows: Sequence[Row]) -> str:
+    lines = [f"{'case':<12} {'mode':<20} {'ms':>8} {'speedup':>8} {'max Δ':>6} {'PSNR':>7} {'SSIM':>7}  result"]
+    for r in rows:
+        p = "inf" if math.isinf(r.drift.psnr) else f"{r.drift.psnr:.1f}"
+        lines.append(
+            f"{r.case:<12} {r.mode:<20} {r.seconds * 1000:8.1f} {r.speedup:7.2f}x {r.drift.max_diff:6d} {p:>7} "
+            f"{r.drift.ssim:7.4f}  {'ok' if r.ok else 'FAIL'}"
+        )
+    return "\n".join(lines)
+
+
+def update(cases: Sequence[str] = tuple(CASES), font_path: str = str(FONT), golden_dir: Path = GOLDEN_DIR) -> None:
+    # 【繁】以參考模式重新渲染黃金圖 / [EN] Re-render the golden images in the reference mode
+    golden_dir.mkdir(parents=True, exist_ok=True)
+    for case in cases:
+        render(case, modes()[0], font_path).save(golden_path(case, golden_dir), optimize=True)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(
+        description="Golden-output harness: compare every render mode and ink backend against the golden images."
+    )
+    ap.add_argument("--font", default=str(FONT), help="font file (the goldens are rendered with the bundled one)")
+    ap.add_argument("--golden-dir", type=Path, default=GOLDEN_DIR)
+    ap.add_argument("--case", action="append", choices=sorted(CASES), help="limit to these cases")
+    ap.add_argument("--repeat", type=int, default=1, help="time each mode as the best of N renders")
+    ap.add_argument("--update", action="store_true", help="re-render the golden images and exit")
+    args = ap.parse_args(argv)
+    cases = args.case or list(CASES)
+    if args.update:
+        update(cases, args.font, args.golden_dir)
+        return 0
+    rows = run(cases, args.font, args.golden_dir, max(1, args.repeat))
+    print(format_report(rows))
+    return 0 if all(r.ok for r in rows) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+# benchmarks/ink_backends.py
+
+# 【繁】墨韻後端基準：比較各後端三種核心運算的速度，以及相對 SciPy 參考實作的輸出差異
+# [EN] Ink-backend benchmark: speed of the three kernels per backend, and output difference vs the SciPy reference
+#
+# Usage:
+#   python -m benchmarks.ink_backends [--font PATH] [--size 110] [--repeat 20]
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+from functools import partial
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from chinese_calligraphy.font import find_font_path, load_font
+from chinese_calligraphy.ink import InkBackend, available_ink_backends, get_ink_backend
+
+CHARS = "永之書法墨韻"
+
+
+def glyph_masks(font_path: str | None, size: int) -> list[np.ndarray]:
+    # 【繁】與 draw_char 相同尺寸的字形遮罩；無字體時以粗線條代替
+    # [EN] Glyph masks of the same patch size as draw_char; thick strokes stand in when no font is available
+    pad = max(20, size // 2)
+    w = h = size * 2 + pad * 2
+    masks = []
+    for i, ch in enumerate(CHARS):
+        img = Image.new("L", (w, h), 0)
+        d = ImageDraw.Draw(img)
+        if font_path:
+            d.text((w // 2 - size // 2, h // 2 - size // 2), ch, font=load_font(font_path, size), fill=255)
+        else:
+            for k in range(4):
+                y = h // 3 + k * size // 5
+                d.line([(pad, y + i), (w - pad, y - i * 3)], fill=255, width=max(3, size // 12))
+        masks.append(np.array(img))
+    return masks
+
+
+def timeit(fn: Callable[[], object], repeat: int) -> float:
+    fn()  # warm-up (imports, caches)
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1000.0
+
+
+def _each(fn: Callable[..., np.ndarray], arrays: list[np.ndarray], **kw: float) -> None:
+    for a in arrays:
+        fn(a, **kw)
+
+
+def run_kernels(backend: InkBackend, masks: list[np.ndarray], low: np.ndarray) -> list[np.ndarray]:
+    out: list[np.ndarray] = []
+    for m in masks:
+        out.append(backend.distance_inside(m > 25, limit=3.5))
+        out.append(backend.gaussian(m, sigma=1.0))
+    h, w = masks[0].shape
+    out.append(backend.upsample(low, h, w))
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Ink-backend benchmark: kernel speed per backend and output difference vs the SciPy reference."
+    )
+    parser.add_argument("--font", default=None, help="font file (default: look up a common CJK font)")
+    parser.add_argument("--size", type=int, default=110, help="font size in px")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    font_path = args.font or find_font_path("FZWangDXCJF") or find_font_path("Songti") or find_font_path("Noto")
+    masks = glyph_masks(font_path, args.size)
+    h, w = masks[0].shape
+    low = np.random.default_rng(0).random((max(2, int(h * 0.2)), max(2, int(w * 0.2))))
+    print(f"font: {font_path or '(synthetic strokes)'}  patch: {w}x{h}  glyphs: {len(masks)}")
+
+    names = available_ink_backends()
+    reference = run_kernels(get_ink_backend(names[0]), masks, low)
+    print(f"{'backend':<8} {'edt ms':>8} {'blur ms':>8} {'zoom ms':>8}   max|diff| vs {names[0]} (edt / blur / zoom)")
+    for name in names:
+        b = get_ink_backend(name)
+        t_edt = timeit(partial(_each, b.distance_inside, [m > 25 for m in masks], limit=3.5), args.repeat)
+        t_blur = timeit(partial(_each, b.gaussian, masks, sigma=1.0), args.repeat)
+        t_zoom = timeit(partial(b.upsample, low, h, w), args.repeat)
+
+        result = run_kernels(b, masks, low)
+        d_edt = max(float(np.abs(r - o).max()) for r, o in zip(reference[0:-1:2], result[0:-1:2], strict=True))
+        d_blur = max(float(np.abs(r - o).max()) for r, o in zip(reference[1:-1:2], result[1:-1:2], strict=True))
+        zr, zo = reference[-1], result[-1]
+        hh, ww = min(zr.shape[0], zo.shape[0]), min(zr.shape[1], zo.shape[1])
+        d_zoom = float(np.abs(zr[:hh, :ww] - zo[:hh, :ww]).max())
+        print(
+            f"{name:<8} {t_edt:8.2f} {t_blur:8.2f} {t_zoom:8.2f}   "
+            f"{d_edt:.3f} px / {d_blur:.2f} (of 255) / {d_zoom:.3f} (of 1)"
+        )
+
+
+if __name__ == "__main__":
+    main()
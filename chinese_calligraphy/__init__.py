@@ -1,16 +1,64 @@
 # chinese_calligraphy/__init__.py
 
-# 【繁】對外 API 匯出點（門面）
-# [EN] Public API exports (facade)
+# 【繁】對外 API 匯出點（門面）；各類在首次存取時才載入（模組 __getattr__），
+#       使 `import chinese_calligraphy` 不必載入 NumPy/SciPy 與全部作品模組
+# [EN] Public API exports (facade); classes are loaded on first access (module __getattr__),
+#      so `import chinese_calligraphy` does not pull in NumPy/SciPy or every work module
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
 
-from .brush import Brush
-from .elements import Colophon, MainText, Seal, Title
-from .layout import Margins, ScrollCanvas, SegmentSpec
-from .style import Style
 from .types import Color, Point, VariantTemplate
-from .works.couplet import Couplet
-from .works.fan import Fan
-from .works.handscroll import Handscroll
+
+if TYPE_CHECKING:
+    from .brush import Brush, BrushState
+    from .elements import Colophon, MainText, Seal, Title
+    from .layout import FlowSpec, Margins, ScrollCanvas, SegmentSpec
+    from .paper import Paper
+    from .style import Style
+    from .vector_brush import VectorBrush
+    from .works.album import Album
+    from .works.couplet import Couplet
+    from .works.fan import Fan
+    from .works.handscroll import Handscroll
+
+# 【繁】名稱 → 定義所在子模組
+# [EN] Name → submodule that defines it
+_LAZY = {
+    "Style": ".style",
+    "Brush": ".brush",
+    "BrushState": ".brush",
+    "VectorBrush": ".vector_brush",
+    "ScrollCanvas": ".layout",
+    "SegmentSpec": ".layout",
+    "FlowSpec": ".layout",
+    "Margins": ".layout",
+    "Paper": ".paper",
+    "Title": ".elements",
+    "MainText": ".elements",
+    "Colophon": ".elements",
+    "Seal": ".elements",
+    "Handscroll": ".works.handscroll",
+    "Couplet": ".works.couplet",
+    "Fan": ".works.fan",
+    "Album": ".works.album",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
+
 
 __all__ = [
     "Color",
@@ -18,9 +66,13 @@ __all__ = [
     "VariantTemplate",
     "Style",
     "Brush",
+    "BrushState",
+    "VectorBrush",
     "ScrollCanvas",
     "SegmentSpec",
+    "FlowSpec",
     "Margins",
+    "Paper",
     "Title",
     "MainText",
     "Colophon",
@@ -28,4 +80,5 @@ __all__ = [
     "Handscroll",
     "Couplet",
     "Fan",
+    "Album",
 ]
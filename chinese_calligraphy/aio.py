@@ -0,0 +1,97 @@
+# chinese_calligraphy/aio.py
+
+# 【繁】asyncio 整合：在執行器上渲染以免阻塞事件迴圈；以信號量限制並發；任務取消時經令牌中止渲染
+# [EN] asyncio integration: render on an executor so the event loop is never blocked; a semaphore caps
+#      concurrency; cancelling the awaiting task stops the render through its token
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import weakref
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, TypeVar
+
+from .context import CancelToken
+
+T = TypeVar("T")
+
+# 【繁】預設執行器（None = 事件迴圈的預設執行緒池）與最大並發渲染數
+# [EN] Default executor (None = the event loop's default thread pool) and max concurrent renders
+_default_executor: Executor | None = None
+_max_concurrent: int = os.cpu_count() or 1
+
+# 【繁】asyncio.Semaphore 綁定事件迴圈，故每個迴圈一個
+# [EN] asyncio.Semaphore binds to an event loop, so keep one per loop
+_semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = weakref.WeakKeyDictionary()
+
+
+# 【繁】「不變更」標記 / [EN] "leave unchanged" marker
+_KEEP: Any = object()
+
+
+def configure_async(executor: Executor | None = _KEEP, max_concurrent: int | None = None) -> None:
+    """
+    【繁】設定非同步渲染的預設執行器與最大並發數；未傳的參數保持不變。executor=None 表示事件迴圈的預設執行緒池。
+    [EN] Configure the default executor and the maximum number of concurrent async renders; omitted arguments are
+    left unchanged. executor=None means the event loop's default thread pool.
+    """
+    global _default_executor, _max_concurrent
+    if executor is not _KEEP:
+        _default_executor = executor
+    if max_concurrent is not None:
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be >= 1")
+        _max_concurrent = max_concurrent
+        _semaphores.clear()
+
+
+def _semaphore(loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+    sem = _semaphores.get(loop)
+    if sem is None:
+        sem = asyncio.Semaphore(_max_concurrent)
+        _semaphores[loop] = sem
+    return sem
+
+
+async def run_in_executor(
+    fn: Callable[..., T],
+    *args: Any,
+    executor: Executor | None = None,
+    token: CancelToken | None = None,
+) -> T:
+    """
+    【繁】在執行器上執行 fn(*args, token=token)，受並發信號量限制。
+    若等待中的任務被取消，則觸發令牌並等渲染在下一列停下後才釋放名額，使並發上限名副其實。
+    [EN] Run fn(*args, token=token) on an executor, gated by the concurrency semaphore.
+    If the awaiting task is cancelled, the token is triggered and the slot is only released once the render has
+    stopped at its next column, so the concurrency cap holds.
+
+    Process pools cannot share a token, so there fn(*args) is called and cancellation only drops jobs not yet started.
+    """
+    loop = asyncio.get_running_loop()
+    executor = executor if executor is not None else _default_executor
+    token = token if token is not None else CancelToken()
+
+    if isinstance(executor, ProcessPoolExecutor):
+        call = functools.partial(fn, *args)
+    else:
+        call = functools.partial(fn, *args, token=token)
+
+    async with _semaphore(loop):
+        token.raise_if_cancelled()
+        fut = loop.run_in_executor(executor, call)
+        try:
+            return await asyncio.shield(fut)
+        except asyncio.CancelledError:
+            token.cancel()
+            if isinstance(executor, ProcessPoolExecutor):
+                fut.cancel()
+            else:
+                try:
+                    await fut
+                except (Exception, asyncio.CancelledError):
+                    pass
+            raise
@@ -0,0 +1,417 @@
+# chinese_calligraphy/batch.py
+
+# 【繁】批量渲染：以 JSONL 清單描述作品，多行程並行渲染，依規格雜湊跳過已完成者，可斷點續跑
+# [EN] Batch rendering: works described by a JSONL manifest, rendered across a process pool;
+#      finished jobs are skipped by spec hash so an interrupted run resumes cleanly
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+import time
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, fields
+from typing import Any
+
+from PIL import Image
+
+from .brush import Brush
+from .cache import file_digest
+from .elements import Colophon, MainText, Seal, Title
+from .font import find_font_path, require_font_path
+from .layout import Margins, ScrollCanvas, SegmentSpec
+from .output import ImageWriter, OutputOptions, save_image
+from .paper import Paper
+from .style import Style
+from .works.couplet import Couplet
+from .works.fan import Fan
+from .works.handscroll import Handscroll
+
+# 【繁】清單中一行 = 一件作品的規格（JSON 物件）
+# [EN] One manifest line = one work spec (a JSON object)
+Spec = dict[str, Any]
+
+WORK_KINDS = ("handscroll", "couplet", "fan")
+
+
+# =========================
+# 【清單 / Manifest】
+# =========================
+
+
+def load_manifest(path: str) -> list[Spec]:
+    """
+    【繁】讀取 JSONL 清單；空行與 # 開頭的行忽略。未給 id 者以行號為 id。
+    [EN] Read a JSONL manifest; blank lines and lines starting with # are ignored. Jobs without an id use the line number.
+    """
+    specs: list[Spec] = []
+    with open(path, encoding="utf-8") as fp:
+        for lineno, line in enumerate(fp, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                spec = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{lineno}: invalid JSON: {e}") from e
+            if not isinstance(spec, dict):
+                raise ValueError(f"{path}:{lineno}: expected a JSON object")
+            if spec.get("work") not in WORK_KINDS:
+                raise ValueError(f"{path}:{lineno}: 'work' must be one of {WORK_KINDS}")
+            if not spec.get("output"):
+                raise ValueError(f"{path}:{lineno}: 'output' is required")
+            spec.setdefault("id", str(lineno))
+            specs.append(spec)
+    return specs
+
+
+def _font_digests(obj: Any, font_dirs: Sequence[str], out: dict[str, str]) -> dict[str, str]:
+    # 【繁】規格中每個字體（font 名或 font_path）→ 字體檔內容雜湊；找不到的字體記為空字串
+    # [EN] Every font in a spec (a "font" name or a "font_path") → content hash of the font file; fonts that cannot
+    #      be found map to an empty string
+    if isinstance(obj, list):
+        for v in obj:
+            _font_digests(v, font_dirs, out)
+    elif isinstance(obj, dict):
+        for k, v in obj.items():
+            if k in ("font", "font_path") and isinstance(v, str) and f"{k}:{v}" not in out:
+                path = v if k == "font_path" else find_font_path(v, tuple(font_dirs))
+                out[f"{k}:{v}"] = file_digest(path) if path and os.path.isfile(path) else ""
+            else:
+                _font_digests(v, font_dirs, out)
+    return out
+
+
+def spec_hash(spec: Spec, font_dirs: Sequence[str] = ()) -> str:
+    # 【繁】規格雜湊：鍵排序後的 JSON（連同所用字體檔的內容雜湊）取 SHA-256，字體檔改動即重渲染；
+    #       id 僅為標籤，不參與
+    # [EN] Spec hash: SHA-256 of key-sorted JSON, together with the content hashes of the font files it uses, so a
+    #      changed font file re-renders the job; the id is only a label and is excluded
+    payload = {k: v for k, v in spec.items() if k != "id"}
+    payload = {"spec": payload, "fonts": _font_digests(payload, font_dirs, {})}
+    text = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def job_outputs(spec: Spec) -> list[str]:
+    # 【繁】作品輸出的檔案列表；對聯（非預覽）以 output 為前綴，寫左右聯與可選橫批
+    # [EN] Files a job writes; a couplet (non-preview) treats output as a prefix for right/left/optional header
+    out = str(spec["output"])
+    if spec["work"] == "couplet" and not spec.get("preview", False):
+        parts = ["right", "left"] + (["header"] if spec.get("text_header") else [])
+        ext = (output_options(spec) or OutputOptions()).extension()
+        return [f"{out}_{part}{ext}" for part in parts]
+    return [out]
+
+
+def output_options(spec: Spec) -> OutputOptions | None:
+    # 【繁】"encode" 鍵為輸出選項（見 OutputOptions），省略則按副檔名以預設值編碼
+    # [EN] The "encode" key holds output options (see OutputOptions); when omitted, defaults by file extension
+    enc = spec.get("encode")
+    return None if enc is None else _from_spec(OutputOptions, enc, "encode")  # type: ignore[no-any-return]
+
+
+# =========================
+# 【規格 → 物件 / Spec → objects】
+# =========================
+
+
+def _from_spec(cls: type[Any], spec: Spec, what: str) -> Any:
+    # 【繁】按 dataclass 欄位建構物件；tuple 型欄位（含顏色）的 JSON 陣列轉為 tuple，未知欄位報錯
+    # [EN] Build a dataclass from its public init fields; JSON arrays for tuple fields (incl. colors) become tuples,
+    #      unknown keys raise
+    public = [f for f in fields(cls) if f.init and not f.name.startswith("_")]
+    unknown = sorted(set(spec) - {f.name for f in public})
+    if unknown:
+        raise ValueError(f"unknown {what} field(s): {', '.join(unknown)}")
+    tuple_fields = {f.name for f in public if str(f.type).startswith(("tuple", "Color", "Point"))}
+    return cls(**{k: tuple(v) if k in tuple_fields and isinstance(v, list) else v for k, v in spec.items()})
+
+
+def _font_path(spec: Spec, font_dirs: Sequence[str], what: str) -> Spec:
+    # 【繁】以字體名（font）或路徑（font_path）指定字體
+    # [EN] A font is given by name ("font") or by path ("font_path")
+    spec = dict(spec)
+    name = spec.pop("font", None)
+    if "font_path" not in spec:
+        if not name:
+            raise ValueError(f"{what} needs 'font' or 'font_path'")
+        spec["font_path"] = require_font_path(name, font_dirs)
+    return spec
+
+
+def _style(spec: Spec, font_dirs: Sequence[str]) -> Style:
+    return _from_spec(Style, _font_path(spec, font_dirs, "style"), "style")  # type: ignore[no-any-return]
+
+
+def _brush(spec: Spec | None) -> Brush:
+    if spec is None:
+        return Brush()
+    spec = dict(spec)
+    if "zhi_templates" in spec:
+        spec["zhi_templates"] = {k: [tuple(t) for t in v] for k, v in spec["zhi_templates"].items()}
+    return _from_spec(Brush, spec, "brush")  # type: ignore[no-any-return]
+
+
+def _seal(spec: Spec | None, font_dirs: Sequence[str]) -> Seal | None:
+    if spec is None:
+        return None
+    spec = _font_path(spec, font_dirs, "seal")
+    spec["text_grid"] = [tuple(cell) for cell in spec.get("text_grid", [])]
+    return _from_spec(Seal, spec, "seal")  # type: ignore[no-any-return]
+
+
+def _paper(spec: Spec | None) -> Paper | None:
+    return None if spec is None else _from_spec(Paper, spec, "paper")  # type: ignore[no-any-return]
+
+
+def _element(cls: type[Any], spec: Spec | None, font_dirs: Sequence[str], what: str) -> Any:
+    # 【繁】題/正文/款識：style、brush、segment 為巢狀規格，其餘照欄位
+    # [EN] Title/MainText/Colophon: style, brush and segment are nested specs, the rest map to fields
+    if spec is None:
+        return None
+    spec = dict(spec)
+    spec["style"] = _style(spec["style"], font_dirs)
+    if "brush" in spec:
+        spec["brush"] = _brush(spec["brush"])
+    if "segment" in spec:
+        spec["segment"] = _from_spec(SegmentSpec, spec["segment"], "segment")
+    return _from_spec(cls, spec, what)
+
+
+def build_work(spec: Spec, font_dirs: Sequence[str] = ()) -> Handscroll | Couplet | Fan:
+    """
+    【繁】由清單規格建構作品物件。
+    [EN] Build a work object from a manifest spec.
+    """
+    body = {k: v for k, v in spec.items() if k not in ("id", "work", "output", "preview", "encode")}
+    kind = spec["work"]
+
+    if kind == "handscroll":
+        canvas = body.pop("canvas", None)
+        if canvas is None:
+            raise ValueError("handscroll needs 'canvas'")
+        canvas = dict(canvas)
+        canvas["paper"] = _paper(canvas.get("paper"))
+        body["canvas"] = _from_spec(ScrollCanvas, canvas, "canvas")
+        if "margins" in body:
+            body["margins"] = _from_spec(Margins, body["margins"], "margins")
+        body["title"] = _element(Title, body.get("title"), font_dirs, "title")
+        body["main"] = _element(MainText, body.get("main"), font_dirs, "main")
+        body["colophon"] = _element(Colophon, body.get("colophon"), font_dirs, "colophon")
+        body["lead_seal"] = _seal(body.get("lead_seal"), font_dirs)
+        body["name_seal"] = _seal(body.get("name_seal"), font_dirs)
+        return _from_spec(Handscroll, body, "handscroll")  # type: ignore[no-any-return]
+
+    body["style"] = _style(body["style"], font_dirs) if "style" in body else None
+    body["paper"] = _paper(body.get("paper"))
+    if "brush" in body:
+        body["brush"] = _brush(body["brush"])
+
+    if kind == "couplet":
+        if "margins" in body:
+            body["margins"] = _from_spec(Margins, body["margins"], "margins")
+        for key in ("seal_right", "seal_left", "seal_header"):
+            body[key] = _seal(body.get(key), font_dirs)
+        return _from_spec(Couplet, body, "couplet")  # type: ignore[no-any-return]
+
+    if "colophon_style" in body:
+        body["colophon_style"] = _style(body["colophon_style"], font_dirs)
+    return _from_spec(Fan, body, "fan")  # type: ignore[no-any-return]
+
+
+# =========================
+# 【單件渲染 / Single job】
+# =========================
+
+
+def _render_images(spec: Spec, font_dirs: Sequence[str]) -> list[Image.Image]:
+    # 【繁】渲染一件作品的全部圖像，順序同 job_outputs / [EN] Render all images of a job, in job_outputs order
+    work = build_work(spec, font_dirs)
+    if isinstance(work, Couplet):
+        if spec.get("preview", False):
+            return [work.preview()]
+        right, left, header = work.render()
+        return [right, left] + ([header] if header is not None else [])
+    return [work.render()]
+
+
+def _new_record(spec: Spec, font_dirs: Sequence[str]) -> dict[str, Any]:
+    return {"id": spec["id"], "hash": spec_hash(spec, font_dirs), "outputs": job_outputs(spec)}
+
+
+def _finish_record(record: dict[str, Any], t0: float, error: BaseException | None = None) -> dict[str, Any]:
+    if error is None:
+        record["status"] = "ok"
+    else:
+        record["status"] = "error"
+        record["error"] = f"{type(error).__name__}: {error}"
+    record["seconds"] = round(time.perf_counter() - t0, 4)
+    record["pid"] = os.getpid()
+    return record
+
+
+def render_job(spec: Spec, font_dirs: Sequence[str] = ()) -> dict[str, Any]:
+    """
+    【繁】渲染並寫出一件作品，回傳狀態記錄（不拋出例外，錯誤寫入記錄）。寫檔為原子寫入。
+    [EN] Render and write one work, returning a status record (errors are recorded, not raised). Writes are atomic.
+    """
+    t0 = time.perf_counter()
+    record = _new_record(spec, font_dirs)
+    try:
+        options = output_options(spec)
+        for img, path in zip(_render_images(spec, font_dirs), record["outputs"], strict=True):
+            save_image(img, path, options)
+    except Exception as e:
+        # 【繁】單件失敗不中止整批  [EN] one bad job must not stop the batch
+        return _finish_record(record, t0, e)
+    return _finish_record(record, t0)
+
+
+def _run_pipelined(specs: Sequence[Spec], font_dirs: Sequence[str]) -> Iterator[dict[str, Any]]:
+    # 【繁】本行程內依序渲染，編碼寫檔交給背景執行緒：渲染下一件時上一件在壓縮；記錄按清單順序產出
+    # [EN] Render in order in this process and hand encoding to a background thread, so each job compresses while
+    #      the next one renders; records are yielded in manifest order
+    prev: tuple[dict[str, Any], float, list[Future[str]]] | None = None
+    with ImageWriter(max_pending=4) as writer:
+        for spec in specs:
+            t0 = time.perf_counter()
+            record = _new_record(spec, font_dirs)
+            writes: list[Future[str]] = []
+            try:
+                options = output_options(spec)
+                for img, path in zip(_render_images(spec, font_dirs), record["outputs"], strict=True):
+                    writes.append(writer.submit(img, path, options))
+            except Exception as e:
+                for f in writes:
+                    f.cancel()
+                if prev is not None:
+                    yield _collect(*prev)
+                    prev = None
+                yield _finish_record(record, t0, e)
+                continue
+            if prev is not None:
+                yield _collect(*prev)
+            prev = (record, t0, writes)
+        if prev is not None:
+            yield _collect(*prev)
+
+
+def _collect(record: dict[str, Any], t0: float, writes: list[Future[str]]) -> dict[str, Any]:
+    # 【繁】等候一件作品的寫檔完成並填寫記錄 / [EN] Wait for a job's writes and fill in its record
+    try:
+        for f in writes:
+            f.result()
+    except Exception as e:
+        return _finish_record(record, t0, e)
+    return _finish_record(record, t0)
+
+
+def _init_worker() -> None:
+    # 【繁】工作行程預熱：提前載入墨韻後端；字體與字形快取在行程內跨作業共享
+    # [EN] Worker warm-up: load the ink backend up front; font and glyph caches are shared across jobs in a process
+    from .ink import get_ink_backend
+
+    get_ink_backend("auto")
+
+
+# =========================
+# 【批量 / Batch】
+# =========================
+
+
+@dataclass
+class BatchSummary:
+    # 【繁】一次批量執行的統計
+    # [EN] Counts for one batch run
+    rendered: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+
+def default_log_path(manifest_path: str) -> str:
+    return manifest_path + ".status.jsonl"
+
+
+def completed_hashes(log_path: str) -> set[str]:
+    # 【繁】從狀態記錄讀出已成功完成的規格雜湊；末行殘缺（中斷時）則忽略
+    # [EN] Read spec hashes of successfully finished jobs from the status log; a truncated last line is ignored
+    done: set[str] = set()
+    if not os.path.exists(log_path):
+        return done
+    with open(log_path, encoding="utf-8") as fp:
+        for line in fp:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if rec.get("status") in ("ok", "skipped") and isinstance(rec.get("hash"), str):
+                done.add(rec["hash"])
+    return done
+
+
+def run_batch(
+    manifest_path: str,
+    workers: int | None = None,
+    log_path: str | None = None,
+    font_dirs: Sequence[str] = (),
+    force: bool = False,
+) -> BatchSummary:
+    """
+    【繁】執行批量渲染。已有同雜湊成功記錄且輸出檔俱在者跳過；每件完成即追加一行狀態記錄。
+    [EN] Run a batch. Jobs with a successful record of the same hash and all outputs present are skipped;
+    a status line is appended as soon as each job finishes.
+
+    workers=1 renders in-process (handy for debugging), encoding each job on a background thread while the next one
+    renders; otherwise a process pool of `workers` (default: CPU count). A spec's "encode" object sets the output
+    options (see OutputOptions).
+    """
+    specs = load_manifest(manifest_path)
+    log_path = log_path or default_log_path(manifest_path)
+    done = set() if force else completed_hashes(log_path)
+    font_dirs = tuple(font_dirs)
+    summary = BatchSummary()
+
+    with open(log_path, "a", encoding="utf-8") as log:
+
+        def emit(rec: dict[str, Any]) -> None:
+            rec["finished_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+            log.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            log.flush()
+            if rec["status"] == "ok":
+                summary.rendered += 1
+            elif rec["status"] == "skipped":
+                summary.skipped += 1
+            else:
+                summary.failed += 1
+                print(f"[error] {rec['id']}: {rec.get('error')}", file=sys.stderr)
+
+        pending: list[Spec] = []
+        for spec in specs:
+            h = spec_hash(spec, font_dirs)
+            outputs = job_outputs(spec)
+            if h in done and all(os.path.exists(p) for p in outputs):
+                emit({"id": spec["id"], "hash": h, "outputs": outputs, "status": "skipped", "seconds": 0.0})
+            else:
+                pending.append(spec)
+
+        if workers == 1:
+            for rec in _run_pipelined(pending, font_dirs):
+                emit(rec)
+            return summary
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures: list[Future[dict[str, Any]]] = [pool.submit(render_job, spec, font_dirs) for spec in pending]
+            try:
+                for fut in as_completed(futures):
+                    emit(fut.result())
+            except BaseException:
+                # 【繁】中斷：取消未開始的作業；已記錄者下次續跑時跳過
+                # [EN] Interrupted: cancel jobs not yet started; logged jobs are skipped on the next run
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+
+    return summary
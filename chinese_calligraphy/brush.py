@@ -5,19 +5,181 @@
 
 from __future__ import annotations
 
+import math
 import random
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
 
-import numpy as np
 from PIL import Image, ImageDraw, ImageFont
-from scipy import ndimage  # type: ignore
 
-from .types import Color, Point, VariantTemplate
+from .context import RenderContext
+from .display import GlyphMark
+from .font import FREETYPE_LOCK, load_font, resize_font
+from .types import Affine, Color, Point, VariantTemplate
 from .utils import NoiseGenerator, clamp_int
 
+# =========================
+# 【字形遮罩快取 / Glyph mask cache】
+# =========================
+
+
+def glyph_patch_size(font_size: int) -> int:
+    # 【繁】字形工作區邊長：字號兩倍加留白，容納切變/旋轉/暈染
+    # [EN] Side of the glyph working patch: twice the font size plus padding, room for shear/rotation/halo
+    pad = max(20, font_size // 2)
+    return font_size * 2 + pad * 2
+
+
+def _rasterize_glyph(font: ImageFont.FreeTypeFont, ch: str, w: int, h: int) -> Image.Image:
+    # 【繁】在 w×h 黑底上以白色置中繪字，作為後續墨韻處理的遮罩
+    # [EN] Draw the glyph in white, centered on a w×h black patch, as the mask for the ink pipeline
+    fs = getattr(font, "size", 100)
+    mask = Image.new("L", (w, h), 0)
+    # 【繁】字形光柵化（有快取、佔比小）持 FREETYPE_LOCK 串行，其餘墨韻階段可並行
+    # [EN] Glyph rasterization (cached, and a small share of the work) is serialized by FREETYPE_LOCK; the ink
+    #      stages run in parallel
+    with FREETYPE_LOCK:
+        ImageDraw.Draw(mask).text((w // 2 - fs // 2, h // 2 - fs // 2), ch, font=font, fill=255)
+    return mask
+
+
+@lru_cache(maxsize=4096)
+def _cached_glyph_mask(font_path: str, font_size: int, ch: str, w: int, h: int) -> Image.Image:
+    return _rasterize_glyph(load_font(font_path, font_size), ch, w, h)
+
+
+def glyph_mask(font: ImageFont.FreeTypeFont, ch: str, w: int, h: int) -> Image.Image:
+    """
+    【繁】取得字形遮罩；以檔案載入的字體按 (路徑, 字號, 字, 尺寸) 在行程內快取。
+    [EN] Get a glyph mask; fonts loaded from a file are cached per process by (path, size, char, patch size).
+
+    The returned image may be shared between callers and must not be modified in place.
+    """
+    path = getattr(font, "path", None)
+    if isinstance(path, str) and getattr(font, "index", 0) == 0:
+        return _cached_glyph_mask(path, font.size, ch, w, h)
+    return _rasterize_glyph(font, ch, w, h)
+
+
+def compose_affine(m: Affine, n: Affine) -> Affine:
+    # 【繁】合成兩個仿射（PIL AFFINE 參數次序）：(m ∘ n)(q) = m(n(q))
+    # [EN] Compose two affines (PIL AFFINE data order): (m ∘ n)(q) = m(n(q))
+    a, b, c, d, e, f = m
+    a2, b2, c2, d2, e2, f2 = n
+    return (
+        a * a2 + b * d2,
+        a * b2 + b * e2,
+        a * c2 + b * f2 + c,
+        d * a2 + e * d2,
+        d * b2 + e * e2,
+        d * c2 + e * f2 + f,
+    )
+
+
+def invert_affine(m: Affine) -> Affine:
+    # 【繁】仿射的逆
+    # [EN] Inverse of an affine
+    a, b, c, d, e, f = m
+    det = a * e - b * d
+    ia, ib, id_, ie = e / det, -b / det, -d / det, a / det
+    return (ia, ib, -(ia * c + ib * f), id_, ie, -(id_ * c + ie * f))
+
+
+def _patch_affine(w: int, h: int, rot: float, shear_x: float, sx: float, sy: float) -> Affine:
+    """
+    【繁】draw_char 的切變 → 置中縮放 → 繞中心旋轉，合成為單一仿射（輸出座標 → 遮罩座標，PIL AFFINE 參數）。
+    [EN] draw_char's shear → centered scale → rotation about the center, composed into one affine mapping output
+    coordinates to mask coordinates (PIL AFFINE data).
+    """
+    cx, cy = w / 2.0, h / 2.0
+    # rotate: output -> scaled (same convention as Image.rotate)
+    t = -math.radians(rot)
+    cos_t, sin_t = math.cos(t), math.sin(t)
+    # scaled -> sheared: undo the centered resize
+    nw, nh = max(1, int(round(w * sx))), max(1, int(round(h * sy)))
+    ox, oy = (w - nw) // 2, (h - nh) // 2
+    # sheared -> mask: x + shear_x * y
+    # Compose right to left as 2x3 matrices
+    m_rot = (cos_t, sin_t, cx - cos_t * cx - sin_t * cy, -sin_t, cos_t, cy + sin_t * cx - cos_t * cy)
+    m_scale = (w / nw, 0.0, -ox * w / nw, 0.0, h / nh, -oy * h / nh)
+    m_shear = (1.0, shear_x, 0.0, 0.0, 1.0, 0.0)
+
+    return compose_affine(m_shear, compose_affine(m_scale, m_rot))
+
+
+# 【繁】「之」模板庫：(態, (模板, ...)) 的元組，可雜湊、可序列化
+# [EN] '之' template banks: a tuple of (state, (template, ...)) pairs, hashable and picklable
+ZhiTemplates = tuple[tuple[str, tuple[VariantTemplate, ...]], ...]
+
+
+def _freeze_templates(banks: ZhiTemplates | Mapping[str, Sequence[VariantTemplate]]) -> ZhiTemplates:
+    items = banks.items() if isinstance(banks, Mapping) else banks
+    return tuple((str(k), tuple(tuple(t) for t in v)) for k, v in items)  # type: ignore[misc]
+
+
+DEFAULT_ZHI_TEMPLATES: ZhiTemplates = _freeze_templates(
+    {
+        "stable": [
+            # base_rot, base_shear, base_scale, base_anis_y, amp_rot, amp_shear, amp_scale, amp_anis_y
+            (0.0, 0.00, 1.00, 1.00, 0.9, 0.025, 0.020, 0.030),
+            (0.3, -0.02, 0.99, 0.97, 1.0, 0.030, 0.020, 0.035),
+            (-0.4, 0.03, 1.01, 0.95, 1.1, 0.030, 0.020, 0.040),
+            (0.1, 0.01, 0.98, 1.03, 1.0, 0.025, 0.025, 0.040),
+        ],
+        "flow": [
+            (-0.6, 0.06, 1.02, 1.02, 1.6, 0.060, 0.030, 0.050),
+            (0.7, -0.06, 0.99, 0.98, 1.7, 0.060, 0.030, 0.055),
+            (-0.4, 0.05, 1.04, 0.96, 1.4, 0.055, 0.035, 0.050),
+            (0.5, -0.05, 0.97, 1.05, 1.5, 0.055, 0.035, 0.055),
+            (0.3, 0.04, 1.01, 1.00, 1.4, 0.055, 0.030, 0.050),
+        ],
+        "vertical": [
+            (-0.6, 0.05, 1.00, 1.10, 1.3, 0.040, 0.025, 0.060),
+            (0.7, -0.06, 0.98, 1.14, 1.4, 0.045, 0.025, 0.070),
+            (0.1, 0.02, 1.01, 1.18, 1.1, 0.035, 0.020, 0.080),
+            (-0.3, 0.03, 0.99, 1.22, 1.2, 0.040, 0.020, 0.085),
+            (0.4, -0.02, 1.02, 1.12, 1.2, 0.035, 0.025, 0.070),
+        ],
+    }
+)
+
 
 @dataclass
+class BrushState:
+    """
+    【繁】一次渲染（或一個元素）的筆刷可變狀態：「之」的段內模板黏性與 shear 去偏統計。
+    由 Brush.new_state() 建立、不跨渲染共用，故同一 Brush 可重複使用並在多執行緒間共用。
+    [EN] Mutable brush state of one render (or one element): the per-segment template stickiness and shear de-bias
+    statistics for '之'. Created by Brush.new_state() and never shared between renders, so one Brush can be reused
+    and shared between threads.
+    """
+
+    # 段內緩存：段內家族相 / Per-segment cache: family resemblance within segment
+    zhi_cache: dict[int, tuple[str, int]] = field(default_factory=dict)  # seg_idx -> (state, template_idx)
+
+    # 段內統計：shear 去偏 / Per-segment stats for shear de-bias
+    zhi_shear_sum: dict[int, float] = field(default_factory=dict)
+    zhi_shear_cnt: dict[int, int] = field(default_factory=dict)
+
+    def end_segment(self, seg_idx: int) -> None:
+        # 【繁】段落寫完：捨棄該段的黏性與統計（之後不再查詢），狀態大小不隨段數增長
+        # [EN] A segment is finished: drop its stickiness and statistics (never queried again), so the state does
+        #      not grow with the segment count
+        self.zhi_cache.pop(seg_idx, None)
+        self.zhi_shear_sum.pop(seg_idx, None)
+        self.zhi_shear_cnt.pop(seg_idx, None)
+
+
+@dataclass(frozen=True)
 class Brush:
+    """
+    【繁】筆刷設定：不可變、可雜湊（可作快取鍵）、可廉價序列化到工作行程；每次渲染的可變狀態見 BrushState。
+    [EN] Brush configuration: immutable, hashable (usable as a cache key) and cheap to pickle to workers; the
+    mutable per-render state lives in BrushState.
+    """
+
     # =========================
     # 【隨機性 / Randomness】
     # =========================
@@ -46,6 +208,10 @@ class Brush:
     var_rotate_deg: float = 0.0  # ± degrees
     var_shear_x: float = 0.0  # ± shear coefficient (x)
     var_scale: float = 0.0  # ± relative scale, e.g. 0.03 => [0.97, 1.03]
+    # 密者放大，疏者縮小：按字體度量索引的筆畫密度縮放，0.08 => 最疏 0.92、最密 1.08
+    # Dense glyphs larger, sparse ones smaller, by stroke density from the font metrics index:
+    # 0.08 => 0.92 for the sparsest, 1.08 for the densest
+    density_scale: float = 0.0
 
     # =========================
     # 【「之」三態概率模型 / 3-state model for '之'】
@@ -55,48 +221,41 @@ class Brush:
     zhi_pos_weight: float = 0.24  # 0~0.5 recommended
     zhi_mirror_prob: float = 0.68  # flip sign of rot/shear with this prob
 
-    # 「之」模板庫 / Template banks for '之'
-    zhi_templates: dict[str, list[VariantTemplate]] = field(
-        default_factory=lambda: {
-            "stable": [
-                # base_rot, base_shear, base_scale, base_anis_y, amp_rot, amp_shear, amp_scale, amp_anis_y
-                (0.0, 0.00, 1.00, 1.00, 0.9, 0.025, 0.020, 0.030),
-                (0.3, -0.02, 0.99, 0.97, 1.0, 0.030, 0.020, 0.035),
-                (-0.4, 0.03, 1.01, 0.95, 1.1, 0.030, 0.020, 0.040),
-                (0.1, 0.01, 0.98, 1.03, 1.0, 0.025, 0.025, 0.040),
-            ],
-            "flow": [
-                (-0.6, 0.06, 1.02, 1.02, 1.6, 0.060, 0.030, 0.050),
-                (0.7, -0.06, 0.99, 0.98, 1.7, 0.060, 0.030, 0.055),
-                (-0.4, 0.05, 1.04, 0.96, 1.4, 0.055, 0.035, 0.050),
-                (0.5, -0.05, 0.97, 1.05, 1.5, 0.055, 0.035, 0.055),
-                (0.3, 0.04, 1.01, 1.00, 1.4, 0.055, 0.030, 0.050),
-            ],
-            "vertical": [
-                (-0.6, 0.05, 1.00, 1.10, 1.3, 0.040, 0.025, 0.060),
-                (0.7, -0.06, 0.98, 1.14, 1.4, 0.045, 0.025, 0.070),
-                (0.1, 0.02, 1.01, 1.18, 1.1, 0.035, 0.020, 0.080),
-                (-0.3, 0.03, 0.99, 1.22, 1.2, 0.040, 0.020, 0.085),
-                (0.4, -0.02, 1.02, 1.12, 1.2, 0.035, 0.025, 0.070),
-            ],
-        }
-    )
+    # 「之」模板庫（亦接受 {態: [模板, ...]} 字典，建構時凍結為元組）
+    # Template banks for '之' (a {state: [template, ...]} dict is accepted too and frozen into tuples)
+    zhi_templates: ZhiTemplates | Mapping[str, Sequence[VariantTemplate]] = DEFAULT_ZHI_TEMPLATES
 
-    # 段內緩存：段內家族相 / Per-segment cache: family resemblance within segment
-    _zhi_cache: dict[int, tuple[str, int]] = field(default_factory=dict)  # seg_idx -> (state, template_idx)
+    # =========================
+    # 【墨韻後端 / Ink-effect backend】
+    # =========================
+    # "auto" | "scipy" | "numpy" | "pillow"（見 chinese_calligraphy.ink）
+    ink_backend: str = "auto"
 
-    # 段內統計：shear 去偏 / Per-segment stats for shear de-bias
-    _zhi_seg_shear_sum: dict[int, float] = field(default_factory=dict)
-    _zhi_seg_shear_cnt: dict[int, int] = field(default_factory=dict)
+    # =========================
+    # 【自適應超採樣 / Adaptive supersampling】
+    # =========================
+    # 字號低於 supersample_below_px 或乾筆達 supersample_dryness 時，以 supersample 倍解析度做墨韻；
+    # "final" 品質一律超採樣，supersample=1 則關閉
+    # Glyphs below supersample_below_px or at least supersample_dryness dry run their ink stages at `supersample`×;
+    # "final" quality always does, and supersample=1 turns it off
+    supersample: int = 2
+    supersample_below_px: int = 72
+    supersample_dryness: float = 0.3
 
-    # 噪聲生成器 / Noise Generator
-    _noise_gen: NoiseGenerator = field(init=False)
+    # 噪聲生成器（由設定導出，不參與比較與雜湊）/ Noise generator (derived from the config; not compared or hashed)
+    _noise_gen: NoiseGenerator = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
+        object.__setattr__(self, "zhi_templates", _freeze_templates(self.zhi_templates))
         # Initialize noise generator with a derived seed
         # Use a fixed default if seed is None (though usually provided)
         s = self.seed if self.seed is not None else 42
-        self._noise_gen = NoiseGenerator(seed=s)
+        object.__setattr__(self, "_noise_gen", NoiseGenerator(seed=s, backend=self.ink_backend))
+
+    def new_state(self) -> BrushState:
+        # 【繁】為一次渲染（或一個元素）建立新的可變狀態
+        # [EN] Create fresh mutable state for one render (or one element)
+        return BrushState()
 
     # =========================
     # 【隨機源 / RNG】
@@ -174,9 +333,11 @@ class Brush:
         seg_idx: int,
         col_idx: int,
         row_idx: int,
+        density: float = 0.5,
     ) -> tuple[float, float, float]:
-        # 【繁】依上下文生成微變異參數：rot / shear_x / scale
-        # [EN] Contextual micro-variation params: rot / shear_x / scale
+        # 【繁】依上下文生成微變異參數：rot / shear_x / scale；density 為筆畫密度 [0, 1]（見 glyph_densities）
+        # [EN] Contextual micro-variation params: rot / shear_x / scale; density is the stroke density in [0, 1]
+        #      (see glyph_densities)
 
         # 段內/列內：幅度更小；跨列：稍大
         # Within-column smaller, across columns slightly larger
@@ -204,9 +365,21 @@ class Brush:
         scale = 1.0
         if self.var_scale:
             scale = 1.0 + r.uniform(-self.var_scale, self.var_scale) * amp * (0.5 + 0.5 * col_factor)
+        if self.density_scale:
+            scale *= 1.0 + self.density_scale * (2.0 * density - 1.0)
 
         return rot, shear, scale
 
+    def glyph_densities(self, text: str, font_path: str) -> list[float]:
+        # 【繁】整段文字的筆畫密度（一次批次查詢度量索引）；未啟用 density_scale 時不建索引，皆為 0.5
+        # [EN] Stroke densities of a run of text (one bulk query of the metrics index); without density_scale the
+        #      index is not built and all are 0.5
+        if not self.density_scale:
+            return [0.5] * len(text)
+        from .metrics import font_metrics
+
+        return [float(d) for d in font_metrics(font_path).densities(text)]
+
     # =========================
     # 【「之」三態 / 3-state model for '之'】
     # =========================
@@ -241,19 +414,26 @@ class Brush:
         z = s2 + f2 + v2
         return (s2 / z, f2 / z, v2 / z)
 
-    def pick_zhi_variant(self, r: random.Random, seg_idx: int, col_pos_ratio: float) -> tuple[str, VariantTemplate]:
-        # 【繁】先選態，再選模板；段內可黏性（stickiness）
-        # [EN] Pick state then template, optionally sticky within segment
-        if (seg_idx in self._zhi_cache) and (r.random() < self.zhi_segment_stickiness):
-            state, tidx = self._zhi_cache[seg_idx]
+    def _zhi_bank(self, state: str) -> tuple[VariantTemplate, ...]:
+        # 【繁】__post_init__ 已將模板庫凍結為元組 / [EN] __post_init__ has already frozen the banks into tuples
+        banks: ZhiTemplates = self.zhi_templates  # type: ignore[assignment]
+        return dict(banks)[state]
+
+    def pick_zhi_variant(
+        self, r: random.Random, seg_idx: int, col_pos_ratio: float, bstate: BrushState
+    ) -> tuple[str, VariantTemplate]:
+        # 【繁】先選態，再選模板；段內可黏性（stickiness），記於本次渲染的 bstate
+        # [EN] Pick state then template, optionally sticky within segment, remembered in this render's bstate
+        if (seg_idx in bstate.zhi_cache) and (r.random() < self.zhi_segment_stickiness):
+            state, tidx = bstate.zhi_cache[seg_idx]
         else:
             probs = self._state_probs_with_position(col_pos_ratio)
             state_idx = self._weighted_choice3(r, probs)
             state = ("stable", "flow", "vertical")[state_idx]
-            tidx = r.randrange(len(self.zhi_templates[state]))
-            self._zhi_cache[seg_idx] = (state, tidx)
+            tidx = r.randrange(len(self._zhi_bank(state)))
+            bstate.zhi_cache[seg_idx] = (state, tidx)
 
-        tpl = self.zhi_templates[state][tidx]
+        tpl = self._zhi_bank(state)[tidx]
         return state, tpl
 
     def sample_from_template(self, r: random.Random, tpl: VariantTemplate) -> tuple[float, float, float, float]:
@@ -270,9 +450,11 @@ class Brush:
 
         return rot, shear_x, scale, anis_y
 
-    def balance_zhi_params(self, r: random.Random, seg_idx: int, rot: float, shear_x: float) -> tuple[float, float]:
-        # 【繁】鏡像 + 段內 shear 去偏（讓均值趨近 0）
-        # [EN] Mirroring + per-segment shear de-bias (keep mean near 0)
+    def balance_zhi_params(
+        self, r: random.Random, seg_idx: int, rot: float, shear_x: float, bstate: BrushState
+    ) -> tuple[float, float]:
+        # 【繁】鏡像 + 段內 shear 去偏（讓均值趨近 0），統計記於本次渲染的 bstate
+        # [EN] Mirroring + per-segment shear de-bias (keep mean near 0), with statistics kept in this render's bstate
 
         # 1) mirror
         if r.random() < self.zhi_mirror_prob:
@@ -280,15 +462,15 @@ class Brush:
             shear_x = -shear_x
 
         # 2) de-bias shear mean in segment
-        s = self._zhi_seg_shear_sum.get(seg_idx, 0.0)
-        c = self._zhi_seg_shear_cnt.get(seg_idx, 0)
+        s = bstate.zhi_shear_sum.get(seg_idx, 0.0)
+        c = bstate.zhi_shear_cnt.get(seg_idx, 0)
         mean = (s / c) if c > 0 else 0.0
 
         k = 0.82  # stronger correction to remove one-sided bias
         shear_x = shear_x - k * mean
 
-        self._zhi_seg_shear_sum[seg_idx] = s + shear_x
-        self._zhi_seg_shear_cnt[seg_idx] = c + 1
+        bstate.zhi_shear_sum[seg_idx] = s + shear_x
+        bstate.zhi_shear_cnt[seg_idx] = c + 1
 
         return rot, shear_x
 
@@ -298,6 +480,43 @@ class Brush:
     # =========================
     # 【貼字渲染 / Patch-based glyph rendering】
     # =========================
+    def place_char(
+        self,
+        p: Point,
+        ch: str,
+        font: ImageFont.FreeTypeFont,
+        fill: Color,
+        r: random.Random,
+        rot: float,
+        shear_x: float,
+        scale: float,
+        anis_y: float = 1.0,
+        ink_dryness: float = 0.0,
+        blur_sigma: float = 0.0,
+    ) -> GlyphMark:
+        # 【繁】定案一個字：抽取字級抖動（與光柵化分離，版式可重複輸出）
+        # [EN] Settle one glyph: draw the char jitter (separate from rasterization, so the layout can be output
+        #      repeatedly)
+        # 【繁】纖維紋理已改為世界座標、不再需要逐字位移；仍照舊抽一次，使既有版式的抖動序列不變
+        # [EN] Fibers are now in world space and need no per-glyph roll; the draw is kept so existing layouts keep
+        #      the same jitter sequence
+        if ink_dryness > 0.001:
+            r.randint(0, 100000)
+        p2 = self._jitter_point(p, r, self.char_jitter)
+        return GlyphMark(
+            ch=ch,
+            p=p2,
+            font=font,
+            fill=fill,
+            rot=rot,
+            shear_x=shear_x,
+            scale=scale,
+            anis_y=anis_y,
+            ink_dryness=ink_dryness,
+            blur_sigma=blur_sigma,
+            brush=self,
+        )
+
     def draw_char(
         self,
         base_img: Image.Image,
@@ -313,57 +532,148 @@ class Brush:
         anis_y: float = 1.0,
         ink_dryness: float = 0.0,
         blur_sigma: float = 0.0,
+        ctx: RenderContext | None = None,
     ) -> None:
-        # 【繁】物理模擬渲染管線：Raster -> Transform -> Erode -> Noise -> Composite
-        # [EN] Physical simulation pipeline: Raster -> Transform -> Erode -> Noise -> Composite
+        # 【繁】定案並立即落筆
+        # [EN] Settle and paint immediately
+        mark = self.place_char(p, ch, font, fill, r, rot, shear_x, scale, anis_y, ink_dryness, blur_sigma)
+        self.paint_char(base_img, mark, ctx)
+
+    def _draft_patch(self, mark: GlyphMark, mask: Image.Image, ctx: RenderContext) -> tuple[Image.Image, Point] | None:
+        # 【繁】草稿檔：一次雙線性仿射（切變+縮放+旋轉）只算字形包圍盒；不做墨韻
+        # [EN] Draft tier: one bilinear affine (shear + scale + rotate) over the glyph's bounding box only; no ink
+        #      effects
+        w, h = mask.size
+        bbox = mask.getbbox()
+        if bbox is None:
+            return None
+
+        a, b, c, d, e, f = _patch_affine(w, h, mark.rot, mark.shear_x, mark.scale, mark.scale * mark.anis_y)
+        det = a * e - b * d
+        # 【繁】正向映射字形包圍盒四角，得輸出範圍（外擴 2px 容納插值）
+        # [EN] Map the glyph bbox corners forward to get the output region (grown by 2px for interpolation)
+        xs, ys = [], []
+        for u, v in ((bbox[0], bbox[1]), (bbox[2], bbox[1]), (bbox[0], bbox[3]), (bbox[2], bbox[3])):
+            xs.append((e * (u - c) - b * (v - f)) / det)
+            ys.append((-d * (u - c) + a * (v - f)) / det)
+        x0, y0 = max(0, int(min(xs)) - 2), max(0, int(min(ys)) - 2)
+        x1, y1 = min(w, int(max(xs)) + 3), min(h, int(max(ys)) + 3)
+        if x1 <= x0 or y1 <= y0:
+            return None
+
+        patch = mask.transform(
+            (x1 - x0, y1 - y0),
+            Image.Transform.AFFINE,
+            (a, b, a * x0 + b * y0 + c, d, e, d * x0 + e * y0 + f),
+            resample=Image.Resampling.BILINEAR,
+        )
+        px, py = ctx.pt(mark.p)
+        return patch, (px - w // 2 + x0, py - h // 2 + y0)
+
+    def _glyph_mask(self, mark: GlyphMark, font: ImageFont.FreeTypeFont, w: int, h: int) -> Image.Image:
+        # 【繁】字形遮罩來源（共用快取）；子類可改寫，例如 VectorBrush 由變形後的輪廓光柵化
+        # [EN] Source of the glyph mask (shared cache); subclasses may override it, e.g. VectorBrush rasterizes a
+        #      deformed outline
+        return glyph_mask(font, mark.ch, w, h)
+
+    def _mask_key(self, mark: GlyphMark, font: ImageFont.FreeTypeFont, w: int) -> tuple[Any, ...]:
+        # 【繁】變形後字形遮罩的備忘鍵：筆刷本身、字、字體、位置與變形；以物件而非 id 為鍵，id 在回收後可能重用
+        # [EN] Memo key of a transformed glyph mask: the brush itself, character, font, position and transform. Keyed
+        #      by the objects rather than their ids, which can be reused after garbage collection
+        path = getattr(font, "path", None)
+        return (
+            self,
+            path if isinstance(path, str) else font,
+            font.size,
+            w,
+            mark.ch,
+            mark.p,
+            mark.rot,
+            mark.shear_x,
+            mark.scale,
+            mark.anis_y,
+        )
+
+    def _shaped_mask(
+        self, mark: GlyphMark, font: ImageFont.FreeTypeFont, w: int, h: int, ctx: RenderContext
+    ) -> Image.Image:
+        # 【繁】字形遮罩經幾何變形；ctx.masks 存在時按 _mask_key 備忘
+        # [EN] Glyph mask after the geometric transform; memoized in ctx.masks, when set, under _mask_key
+        memo = ctx.masks
+        if memo is None:
+            return self._transform_patch(
+                self._glyph_mask(mark, font, w, h), mark.rot, mark.shear_x, mark.scale, mark.anis_y
+            )
+        key = self._mask_key(mark, font, w)
+        patch: Image.Image | None = memo.get(key)
+        if patch is None:
+            patch = memo[key] = self._transform_patch(
+                self._glyph_mask(mark, font, w, h), mark.rot, mark.shear_x, mark.scale, mark.anis_y
+            )
+        return patch
 
-        # 1) Patch size estimation
-        fs = getattr(font, "size", 100)
-        # Increase padding for transformations
-        pad = max(20, fs // 2)
-        w = fs * 2 + pad * 2
-        h = fs * 2 + pad * 2
-
-        # 2) High-res rasterization (2x super-sampling for better morphology)
-        # super_scale = 2 - unused
-        # sw, sh = w * super_scale, h * super_scale - unused
-
-        # Draw white text on black background for mask processing
-        # mask_img = Image.new("L", (sw, sh), 0) - unused
-        # md = ImageDraw.Draw(mask_img) - unused
-
-        # Centered drawing
-        # cx, cy = sw // 2, sh // 2 - unused
-        # Use larger font for super-sampling
-        # Note: loading font repeatedly is slow, so we scale the font object if possible
-        # Or just scale the coordinate system if font is vector.
-        # PIL font size change requires reloading.
-        # Efficient hack: draw at normal size then scale up? No, jagged edges.
-        # Better: just use font.font_variant(size=fs*super_scale) if possible?
-        # Standard FreeTypeFont allows reloading size.
-        # For performance/simplicity in this step, let's try to just load the larger font
-        # if readily available, OR just draw at normal size and scale up (blurrier but acceptable for ink).
-        # Let's try drawing at normal size * super_scale?
-        # Actually, let's stick to 1x rasterization if font reloading is expensive,
-        # but 2x is much better for erosion quality.
-        # To avoid IO, we might just scale the vectors. but PIL doesn't expose that easily.
-        # We will fallback to 1x raster for now to be safe on perf,
-        # but use a larger canvas.
-
-        # WAIT: font object is passed in. Cloning it with new size implies IO.
-        # Let's trust the user passed a sizeable font or accept 1x resolution.
-        # For "Living Ink", texture detail > sharp vector edges.
-        # So we draw at 1x, then upsample if needed for noise interaction?
-        # Or just work at 1x.
-        # Let's stick to working at provided resolution `fs` but on a padded canvas.
-
-        mask_img_1x = Image.new("L", (w, h), 0)
-        md_1x = ImageDraw.Draw(mask_img_1x)
-        md_1x.text((w // 2 - fs // 2, h // 2 - fs // 2), ch, font=font, fill=255)
+    def _shaped_distance(
+        self,
+        mark: GlyphMark,
+        font: ImageFont.FreeTypeFont,
+        patch: Image.Image,
+        box: tuple[int, int, int, int],
+        k: int,
+        ctx: RenderContext,
+    ) -> Any:
+        # 【繁】乾筆核心保護的距離場（_apply_ink 的 dist），只取決於變形後的遮罩：ctx.masks 存在時備忘。
+        #       在包圍盒外擴距離上限的範圍內計算一次，再放入各次的裁切 box；範圍外皆為背景（距離 0），
+        #       範圍內的距離也不受範圍外影響，故與直接在 box 上計算相同。ctx.masks 為 None 時回傳 None
+        # [EN] Distance field for the dry-brush core protection (_apply_ink's dist), which depends only on the
+        #      transformed mask: memoized in ctx.masks when set. It is computed once over the bounding box grown by
+        #      the distance limit and placed into each crop `box`; outside that region everything is background
+        #      (distance 0), and nothing outside it affects the distances inside, so the result equals computing it
+        #      on `box` directly. Returns None when ctx.masks is None
+        import numpy as np
+
+        from .ink import get_ink_backend
+
+        memo = ctx.masks
+        if memo is None:
+            return None
+        key = (*self._mask_key(mark, font, patch.width), self.ink_backend, "distance")
+        entry = memo.get(key)
+        if entry is None:
+            bbox = patch.getbbox()
+            if bbox is None:
+                entry = memo[key] = (None, 0, 0)
+            else:
+                m = int(math.ceil(3.5 * k)) + 1
+                x0, y0 = max(0, bbox[0] - m), max(0, bbox[1] - m)
+                x1, y1 = min(patch.width, bbox[2] + m), min(patch.height, bbox[3] + m)
+                inside = np.asarray(patch.crop((x0, y0, x1, y1))).astype(float) / 255.0 > 0.1
+                entry = memo[key] = (get_ink_backend(self.ink_backend).distance_inside(inside, 3.5 * k), x0, y0)
+        dist, dx, dy = entry
+        out = np.zeros((box[3] - box[1], box[2] - box[0]), dtype=np.float32 if dist is None else dist.dtype)
+        if dist is not None:
+            out[dy - box[1] : dy - box[1] + dist.shape[0], dx - box[0] : dx - box[0] + dist.shape[1]] = dist
+        return out
+
+    def _supersample_factor(self, fs: int, ink_dryness: float, blur_sigma: float, ctx: RenderContext) -> int:
+        # 【繁】超採樣倍數：僅在小字或乾筆（墨韻最易糊的情形）時 > 1；"final" 一律超採樣，草稿從不
+        # [EN] Supersampling factor: > 1 only for small glyphs or dry ink, where the ink stages blur edges most;
+        #      always for "final", never for drafts
+        k = max(1, int(self.supersample))
+        if k == 1 or ctx.draft:
+            return 1
+        if ctx.quality == "final":
+            return k
+        if ink_dryness <= 0.001 and blur_sigma <= 0.01:
+            return 1
+        if fs < self.supersample_below_px or ink_dryness >= self.supersample_dryness:
+            return k
+        return 1
 
+    @staticmethod
+    def _transform_patch(patch: Image.Image, rot: float, shear_x: float, scale: float, anis_y: float) -> Image.Image:
         # 3) Apply geometric transforms (Shear / Scale / Rotate) on the MASK
         #    This is generic PIL stuff.
-        patch = mask_img_1x
+        w, h = patch.size
 
         # Shear
         if shear_x != 0.0:
@@ -391,22 +701,90 @@ class Brush:
         if rot != 0.0:
             patch = patch.rotate(rot, resample=Image.Resampling.BICUBIC, expand=False)
 
+        return patch
+
+    def _supersampled_patch(
+        self,
+        mark: GlyphMark,
+        font: ImageFont.FreeTypeFont,
+        w: int,
+        h: int,
+        k: int,
+        blur_sigma: float,
+        ctx: RenderContext,
+    ) -> Image.Image:
+        # 【繁】k 倍字號光柵化（字體經快取）→ 變形 → 裁到字形包圍盒（對齊 k）→ k 倍墨韻 → 盒式濾波縮回 w×h
+        # [EN] Rasterize at k× font size (cached font) → transform → crop to the glyph bbox (aligned to k) → ink
+        #      stages at k× → box-filter down into the w×h patch
+        font_k = resize_font(font, font.size * k)
+        patch = self._shaped_mask(mark, font_k, w * k, h * k, ctx)
+
+        out = Image.new("L", (w, h), 0)
+        bbox = patch.getbbox()
+        if bbox is None:
+            return out
+        # 【繁】外擴：涵蓋暈染半徑與距離變換上限，使裁切不影響結果
+        # [EN] Margin covering the halo radius and the distance-transform limit, so cropping does not change the result
+        margin = max(int(4.0 * blur_sigma * k + 0.5), int(math.ceil(3.5 * k))) + k
+        x0 = max(0, (bbox[0] - margin) // k * k)
+        y0 = max(0, (bbox[1] - margin) // k * k)
+        x1 = min(w * k, -(-(bbox[2] + margin) // k) * k)
+        y1 = min(h * k, -(-(bbox[3] + margin) // k) * k)
+
+        box = (x0, y0, x1, y1)
+        crop = self._apply_ink(
+            patch.crop(box),
+            mark.ink_dryness,
+            blur_sigma,
+            self._fiber_origin(mark, w, h, x0, y0, k, ctx),
+            k,
+            self._shaped_distance(mark, font_k, patch, box, k, ctx) if mark.ink_dryness > 0.001 else None,
+        )
+        out.paste(crop.reduce(k), (x0 // k, y0 // k))
+        return out
+
+    @staticmethod
+    def _fiber_origin(
+        mark: GlyphMark, w: int, h: int, x0: int, y0: int, k: int, ctx: RenderContext
+    ) -> tuple[float, float, float]:
+        # 【繁】patch（k 倍空間中自 (x0, y0) 起）左上取樣點中心的原尺寸畫布座標，及取樣間距
+        # [EN] Full-size canvas position of the centre of the top-left sample of a patch starting at (x0, y0) in
+        #      k× space, and the sample spacing
+        px, py = ctx.pt(mark.p)
+        step = 1.0 / (k * ctx.scale)
+        return (px - w // 2 + x0 / k) / ctx.scale + step / 2, (py - h // 2 + y0 / k) / ctx.scale + step / 2, step
+
+    def _apply_ink(
+        self,
+        patch: Image.Image,
+        ink_dryness: float,
+        blur_sigma: float,
+        fiber_origin: tuple[float, float, float],
+        k: int = 1,
+        dist: Any = None,
+    ) -> Image.Image:
+        # 【繁】墨韻（乾筆侵蝕 + 暈染）；k 為超採樣倍數，長度參數（距離、暈染半徑）按 k 換算；
+        #       fiber_origin 為 (x, y, 間距)，纖維紋理按原尺寸畫布座標取樣；dist 為預先算好的距離場（見 _shaped_distance）
+        # [EN] Ink stages (dry-brush erosion + halo); k is the supersampling factor, and lengths (distances, halo
+        #      radius) are converted by k; fiber_origin is (x, y, spacing), and the fiber texture is sampled at
+        #      full-size canvas coordinates. dist, when given, is the precomputed distance field of the patch
+        #      (see _shaped_distance)
+        # NumPy and the ink backend are imported here, on first use of an ink effect, to keep package import cheap
+        import numpy as np
+
+        from .ink import get_ink_backend
+
+        ink = get_ink_backend(self.ink_backend)
+        w, h = patch.size
+
         # 4) Physical Simulation (Erosion / Dryness)
         # Only apply if we have dryness > 0.0, else standard compositing
         if ink_dryness > 0.001:
             arr = np.array(patch)
 
-            # Generate generic noise for this patch
-            # We use a deterministic seed per char based on position or just random?
-            # self.rng() is generic. We can use a fresh random int for noise seed.
-            param_seed = r.randint(0, 100000)
-
-            # High-frequency fiber noise
-            fiber = self._noise_gen.generate_fiber_texture(w, h)
-            # Roll it randomly to avoid repetitive patterns if generator is deterministic
-            roll_x = param_seed % w
-            roll_y = (param_seed // w) % h
-            fiber = np.roll(fiber, (roll_y, roll_x), axis=(0, 1))
+            # High-frequency fiber noise, sampled where the patch sits on the canvas: neighbouring glyphs share
+            # one continuous texture, at any output scale or supersampling factor
+            fiber = self._noise_gen.fiber_at(*fiber_origin[:2], w, h, step=fiber_origin[2])
 
             # Threshold for erosion: Higher dryness => easier to erode
             # We want to erode pixels where (fiber_val < threshold)
@@ -443,7 +821,10 @@ class Brush:
 
             # 1. Calculate distance from background
             # We treat standard alpha > 0.1 as "inside"
-            dist = ndimage.distance_transform_edt(alpha_f > 0.1)
+            # Saturated at 3.5px: core_factor below is already 1.0 from there on
+            if dist is None:
+                dist = ink.distance_inside(alpha_f > 0.1, limit=3.5 * k)
+            dist = dist / k
 
             # 2. Define protection factor
             # "Wet" ink (low dryness) flows to fill the core -> high protection
@@ -490,7 +871,7 @@ class Brush:
             # Simple gaussian blurs everything.
             # Let's do a weighted blend: Original (Dark) + Blurred (Light Halo)
 
-            blurred = ndimage.gaussian_filter(arr.astype(float), sigma=blur_sigma)
+            blurred = ink.gaussian(arr, sigma=blur_sigma * k)
 
             # Composite: Keep original structure dominant, add blur as halo
             # halo = blurred * 0.5 ?
@@ -505,19 +886,61 @@ class Brush:
             final_arr = np.clip(final_arr, 0, 255).astype(np.uint8)
             patch = Image.fromarray(final_arr, mode="L")
 
-        # 5) Composite
-        # Colored patch
-        final_w, final_h = patch.size
-        color_patch = Image.new("RGBA", (final_w, final_h), fill + (0,))
-
-        # Apply mask
-        color_patch.paste(fill + (255,), (0, 0), mask=patch)
+        return patch
 
-        # 6) Jitter position
-        p2 = self._jitter_point(p, r, self.char_jitter)
+    def glyph_patch(self, mark: GlyphMark, ctx: RenderContext | None = None) -> tuple[Image.Image, Point] | None:
+        """
+        【繁】物理模擬渲染管線 Raster -> Transform -> Erode -> Noise，產出字的覆蓋遮罩與其左上角的畫布座標
+        （空字形為 None）。不觸及畫布、不改任何共用狀態，可在多個執行緒上同時呼叫；由 composite 貼上。
+        [EN] Physical simulation pipeline Raster -> Transform -> Erode -> Noise, producing the glyph's coverage
+        mask and the canvas position of its top-left corner (None for an empty glyph). It does not touch the canvas
+        or any shared state, so it may run on several threads at once; composite pastes the result.
+        """
+        # 【繁】mark 為原尺寸；按 ctx 的縮放換算字號、位置與暈染半徑
+        # [EN] The mark is at full size; font size, position and halo radius follow ctx's scale
+        ctx = ctx if ctx is not None else RenderContext()
+        ink_dryness = mark.ink_dryness
+        blur_sigma = mark.blur_sigma * ctx.scale
+        font = ctx.scale_font(mark.font)
 
-        # 7) Paste to base
-        x = p2[0] - final_w // 2
-        y = p2[1] - final_h // 2
+        # 1) Patch size estimation
+        fs = getattr(font, "size", 100)
+        # Increase padding for transformations
+        w = h = glyph_patch_size(fs)
+
+        # 2) Rasterization
+        # 【繁】自適應超採樣：小字或乾筆時以 k 倍字號光柵化，墨韻在 k 倍解析度的緊湊包圍盒上進行，
+        #       再以盒式濾波縮回；大字正文維持 1 倍，不付 k² 的代價
+        # [EN] Adaptive supersampling: small or dry glyphs are rasterized at k× font size, the ink stages run at
+        #      k× on a tight bounding box, and the result is box-filtered back down; large main-text glyphs stay
+        #      at 1x and do not pay the k² cost
+        k = self._supersample_factor(fs, ink_dryness, blur_sigma, ctx)
+        if k > 1:
+            patch = self._supersampled_patch(mark, font, w, h, k, blur_sigma, ctx)
+        else:
+            if ctx.draft:
+                return self._draft_patch(mark, self._glyph_mask(mark, font, w, h), ctx)
+            patch = self._shaped_mask(mark, font, w, h, ctx)
+            if ink_dryness > 0.001 or blur_sigma > 0.01:
+                dist = self._shaped_distance(mark, font, patch, (0, 0, w, h), 1, ctx) if ink_dryness > 0.001 else None
+                patch = self._apply_ink(
+                    patch, ink_dryness, blur_sigma, self._fiber_origin(mark, w, h, 0, 0, 1, ctx), 1, dist
+                )
+
+        # 3) Position (jittered by place_char)
+        p2 = ctx.pt(mark.p)
+        return patch, (p2[0] - patch.width // 2, p2[1] - patch.height // 2)
 
-        base_img.paste(color_patch, (x, y), color_patch)
+    @staticmethod
+    def composite(base_img: Image.Image, mark: GlyphMark, placed: tuple[Image.Image, Point] | None) -> None:
+        # 【繁】以 glyph_patch 的遮罩將墨色貼上畫布
+        # [EN] Paste the ink color onto the canvas through the mask from glyph_patch
+        if placed is None:
+            return
+        patch, (x, y) = placed
+        base_img.paste(mark.fill, (x, y, x + patch.width, y + patch.height), mask=patch)
+
+    def paint_char(self, base_img: Image.Image, mark: GlyphMark, ctx: RenderContext | None = None) -> None:
+        # 【繁】產出遮罩並立即貼上（多執行緒落筆見 DisplayList.paint）
+        # [EN] Produce the mask and paste it right away (see DisplayList.paint for threaded painting)
+        self.composite(base_img, mark, self.glyph_patch(mark, ctx))
@@ -0,0 +1,404 @@
+# chinese_calligraphy/cache.py
+
+# 【繁】整件作品的內容定址渲染快取（磁碟）：以作品完整規格的正規化雜湊為鍵（文字、Style、字體檔內容、Brush、
+#       印章、畫布、渲染參數與函式庫版本），輸出存為 PNG，目錄總量按 LRU 淘汰；重複的請求直接讀檔，不再渲染
+# [EN] Content-addressed on-disk render cache for whole works: keyed by a canonical hash of the full work spec
+#      (texts, Style, font file contents, Brush, seals, canvas, render parameters and library version), outputs are
+#      stored as PNG files in a directory bounded by LRU eviction; repeat requests read the file and skip rendering
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields, is_dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+from .output import OutputOptions, save_image
+from .utils import cache_dir
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# 【繁】鍵格式版本：規格的正規化方式改變時遞增，舊條目即不再命中
+# [EN] Key format version: bump when the canonical form changes so old entries stop matching
+_CACHE_VERSION = 2
+
+_SUFFIX = ".png"
+
+
+def library_version() -> str:
+    # 【繁】已安裝套件的版本；從原始碼樹執行時為 "dev"
+    # [EN] Version of the installed package; "dev" when running from a source tree
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("chinese-calligraphy")
+    except PackageNotFoundError:
+        return "dev"
+
+
+# =========================
+# 【正規化規格 / Canonical spec】
+# =========================
+
+
+@lru_cache(maxsize=64)
+def _file_digest_cached(path: str, size: int, mtime_ns: int) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(1 << 20):
+            h.update(block)
+    return h.hexdigest()
+
+
+def file_digest(path: str | os.PathLike[str]) -> str:
+    """
+    【繁】檔案內容的 SHA-256；按 (路徑, 大小, 修改時間) 記在行程內，同一字體檔不重複讀取。
+    [EN] SHA-256 of a file's contents; memoized per process by (path, size, mtime), so a font file is not re-read
+    for every request.
+    """
+    p = os.path.abspath(os.fspath(path))
+    st = os.stat(p)
+    return _file_digest_cached(p, st.st_size, st.st_mtime_ns)
+
+
+def _text_digest(main: Any) -> str:
+    # 【繁】正文按去換行後的字流雜湊：字串、檔案與片段列表內容相同即同鍵
+    # [EN] Main text is hashed as its normalized stream: a string, a file and a list of pieces with the same
+    #      content share a key
+    from .utils import iter_stripped
+
+    h = hashlib.sha256()
+    for piece in iter_stripped(main._pieces()):
+        h.update(piece.encode("utf-8"))
+    return h.hexdigest()
+
+
+def canonical(obj: Any) -> Any:
+    """
+    【繁】把作品規格轉為可 JSON 序列化的正規形式：資料類按欄位展開（略過不參與比較的衍生欄位），
+    字體路徑換成檔案內容雜湊，正文換成字流雜湊，元組與列表同形，整數值的浮點數與整數同形。
+    [EN] Turn a work spec into a JSON-serializable canonical form: dataclasses expand field by field (skipping
+    derived fields excluded from comparison), font paths become file content hashes, main text becomes a stream
+    hash, tuples and lists share a form, and so do integral floats and ints.
+    """
+    if obj is None or isinstance(obj, (bool, int, str)):
+        return obj
+    if isinstance(obj, float):
+        # 【繁】整數值的浮點數記為整數，scale=1 與 scale=1.0 同鍵
+        # [EN] Integral floats count as ints, so scale=1 and scale=1.0 share a key
+        return int(obj) if obj.is_integer() else repr(obj)
+    if isinstance(obj, os.PathLike):
+        return {"file": file_digest(obj)}
+    if isinstance(obj, (tuple, list)):
+        return [canonical(v) for v in obj]
+    if isinstance(obj, dict):
+        return {str(k): canonical(v) for k, v in sorted(obj.items(), key=lambda kv: str(kv[0]))}
+    if is_dataclass(obj) and not isinstance(obj, type):
+        from .elements import MainText
+
+        out: dict[str, Any] = {"type": f"{type(obj).__module__}.{type(obj).__qualname__}"}
+        for f in fields(obj):
+            if not f.compare:
+                continue
+            value = getattr(obj, f.name)
+            if f.name == "font_path" and isinstance(value, str):
+                out[f.name] = {"font": file_digest(value)}
+            elif f.name == "text" and isinstance(obj, MainText):
+                out[f.name] = {"text": _text_digest(obj)}
+            else:
+                out[f.name] = canonical(value)
+        return out
+    raise TypeError(f"cannot build a cache key from {type(obj).__name__!r}")
+
+
+def work_key(work: Any, **params: Any) -> str:
+    """
+    【繁】作品加渲染參數（如 quality、scale、canvas）的內容位址（SHA-256 十六進位）。
+    [EN] Content address (hex SHA-256) of a work plus its render parameters (such as quality, scale, canvas).
+    """
+    spec = {
+        "version": [library_version(), _CACHE_VERSION],
+        "work": canonical(work),
+        "params": canonical(params),
+    }
+    data = json.dumps(spec, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+# =========================
+# 【磁碟 LRU / On-disk LRU】
+# =========================
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    # 【繁】目前條目數與總位元組（本行程所見）/ [EN] Current entries and total bytes (as seen by this process)
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class RenderCache:
+    """
+    【繁】渲染快取：directory 預設為 cache_dir("renders")，max_bytes 為目錄總量上限（超過即按最久未用淘汰）。
+    每個條目是一張 PNG（對聯的每一幅各為一條），先寫暫存檔再 os.replace，故讀者只會看到完整的檔案；
+    命中時更新修改時間，作為跨行程共用的 LRU 次序。多個行程可共用同一目錄：總量上限按各行程所見近似維持。
+    [EN] Render cache: directory defaults to cache_dir("renders"), and max_bytes bounds the directory's total size
+    (least recently used entries are evicted beyond it). Each entry is one PNG (each scroll of a couplet is its own
+    entry), written to a temporary file and moved in with os.replace, so readers only ever see complete files; a
+    hit refreshes the modification time, which is the LRU order shared across processes. Several processes may
+    share a directory: the size bound is then kept approximately, per what each process has seen.
+    """
+
+    directory: str | None = None
+    max_bytes: int = 1 << 30
+    # 【繁】條目的編碼參數（PNG；壓縮等級影響寫入速度與容量）
+    # [EN] Encoding of the entries (PNG; the compression level trades write speed for capacity)
+    options: OutputOptions = field(default_factory=lambda: OutputOptions(format="png", compress_level=3))
+
+    _index: OrderedDict[str, int] | None = field(default=None, init=False, repr=False)
+    _stats: CacheStats = field(default_factory=CacheStats, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.directory is None:
+            self.directory = cache_dir("renders")
+        if self.options.resolve_format() != "PNG":
+            raise ValueError("RenderCache stores PNG entries")
+
+    def _path(self, key: str) -> str:
+        assert self.directory is not None
+        return os.path.join(self.directory, key[:2], key + _SUFFIX)
+
+    def _load_index(self) -> OrderedDict[str, int]:
+        # 【繁】首次使用時掃描目錄，按修改時間排成 LRU 次序（呼叫者持鎖）
+        # [EN] Scan the directory on first use and order it by modification time, oldest first (caller holds the lock)
+        if self._index is None:
+            found: list[tuple[int, str, int]] = []
+            assert self.directory is not None
+            if os.path.isdir(self.directory):
+                for sub in os.scandir(self.directory):
+                    if not sub.is_dir():
+                        continue
+                    for entry in os.scandir(sub.path):
+                        # 【繁】略過寫到一半的暫存檔 / [EN] Skip temporary files still being written
+                        if entry.name.endswith(_SUFFIX) and ".partial-" not in entry.name and entry.is_file():
+                            st = entry.stat()
+                            found.append((st.st_mtime_ns, entry.name[: -len(_SUFFIX)], st.st_size))
+            found.sort()
+            self._index = OrderedDict((key, size) for _, key, size in found)
+            self._stats.entries = len(self._index)
+            self._stats.bytes = sum(self._index.values())
+        return self._index
+
+    def stats(self) -> CacheStats:
+        # 【繁】命中、未命中、淘汰次數與目前容量的快照 / [EN] Snapshot of hits, misses, evictions and current size
+        with self._lock:
+            self._load_index()
+            return CacheStats(**vars(self._stats))
+
+    def _forget(self, key: str) -> None:
+        # 【繁】條目已被其他行程刪除（呼叫者持鎖）/ [EN] The entry was removed by another process (caller holds the lock)
+        size = self._load_index().pop(key, None)
+        if size is not None:
+            self._stats.entries -= 1
+            self._stats.bytes -= size
+
+    def path(self, key: str) -> str | None:
+        """
+        【繁】查詢條目：命中則更新其 LRU 次序並回傳檔案路徑，否則為 None；計入命中/未命中統計。
+        [EN] Look an entry up: on a hit, refresh its LRU position and return the file path, otherwise None; counted
+        in the hit/miss statistics.
+        """
+        path = self._path(key)
+        with self._lock:
+            index = self._load_index()
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                self._forget(key)
+                self._stats.misses += 1
+                return None
+            if key not in index:
+                # 【繁】其他行程寫入的條目 / [EN] An entry written by another process
+                index[key] = os.path.getsize(path)
+                self._stats.entries += 1
+                self._stats.bytes += index[key]
+            index.move_to_end(key)
+            self._stats.hits += 1
+            return path
+
+    def get(self, key: str) -> Image.Image | None:
+        # 【繁】讀出條目的圖像（完整載入後關檔）/ [EN] Read an entry's image (fully loaded, file closed)
+        path = self.path(key)
+        if path is None:
+            return None
+        from PIL import Image
+
+        try:
+            with Image.open(path) as img:
+                img.load()
+                return img
+        except FileNotFoundError:
+            self._evicted(key)
+            return None
+
+    def _evicted(self, key: str) -> None:
+        # 【繁】查詢後才被淘汰：改計為未命中 / [EN] Evicted right after the lookup: count it as a miss instead
+        with self._lock:
+            self._forget(key)
+            self._stats.hits -= 1
+            self._stats.misses += 1
+
+    def put(self, key: str, img: Image.Image) -> str:
+        """
+        【繁】寫入條目（原子寫入），必要時淘汰最久未用的條目；回傳檔案路徑。
+        [EN] Store an entry (atomic write), evicting the least recently used entries if needed; returns the file
+        path.
+        """
+        path = save_image(img, self._path(key), self.options)
+        size = os.path.getsize(path)
+        with self._lock:
+            index = self._load_index()
+            old = index.pop(key, None)
+            if old is not None:
+                self._stats.entries -= 1
+                self._stats.bytes -= old
+            index[key] = size
+            self._stats.entries += 1
+            self._stats.bytes += size
+            self._evict(keep=key)
+        return path
+
+    def _evict(self, keep: str) -> None:
+        # 【繁】從最久未用處刪除，直到總量不超過上限（剛寫入的條目保留）（呼叫者持鎖）
+        # [EN] Delete from the least recently used end until the total fits (the entry just written stays)
+        #      (caller holds the lock)
+        index = self._load_index()
+        while self._stats.bytes > self.max_bytes and len(index) > 1:
+            key = next(iter(index))
+            if key == keep:
+                index.move_to_end(key)
+                continue
+            size = index.pop(key)
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            self._stats.entries -= 1
+            self._stats.bytes -= size
+            self._stats.evictions += 1
+
+    def clear(self) -> None:
+        # 【繁】刪除全部條目（統計歸零）/ [EN] Delete every entry (statistics reset)
+        with self._lock:
+            assert self.directory is not None
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self._index = None
+            self._stats = CacheStats()
+
+    # =========================
+    # 【作品 / Works】
+    # =========================
+
+    def render(self, work: Any, quality: str = "standard", scale: float = 1.0, canvas: str = "rgb", **kw: Any) -> Any:
+        """
+        【繁】以快取渲染作品，回傳值與 work.render() 相同（對聯為三元組，無橫批時第三項為 None）。
+        全部命中即不排版、不渲染；其餘參數（如 threads、token）只在未命中時傳給 work.render()。
+        [EN] Render a work through the cache; returns what work.render() returns (a triple for a couplet, whose
+        third item is None without a header). When everything hits, nothing is laid out or rendered; other
+        arguments (such as threads, token) are only passed on to work.render() on a miss.
+        """
+        key = work_key(work, quality=quality, scale=scale, canvas=canvas)
+        parts = _parts(work)
+        if parts is None:
+            img = self.get(key)
+            if img is None:
+                img = work.render(quality=quality, scale=scale, canvas=canvas, **kw)
+                self.put(key, img)
+            return img
+
+        keys = [f"{key}-{name}" if present else None for name, present in parts]
+        cached = [self.get(k) if k is not None else None for k in keys]
+        if all(img is not None for k, img in zip(keys, cached, strict=True) if k is not None):
+            return tuple(cached)
+        out = work.render(quality=quality, scale=scale, canvas=canvas, **kw)
+        for k, img in zip(keys, out, strict=True):
+            if k is not None and img is not None:
+                self.put(k, img)
+        return out
+
+    def save(
+        self,
+        work: Any,
+        path: str,
+        quality: str = "standard",
+        scale: float = 1.0,
+        options: OutputOptions | None = None,
+        canvas: str = "rgb",
+        **kw: Any,
+    ) -> str:
+        """
+        【繁】以快取渲染單圖作品並存檔；輸出為 PNG 且未指定特殊編碼時，命中直接複製快取檔，不解碼也不重新編碼。
+        [EN] Render a single-image work through the cache and save it; when the output is a PNG with no special
+        encoding options, a hit copies the cached file as is, without decoding or re-encoding.
+        """
+        if _parts(work) is not None:
+            raise TypeError(f"{type(work).__name__} renders several images; use RenderCache.render")
+        fmt = (options or OutputOptions()).resolve_format(path)
+        if fmt != "PNG" or options is not None:
+            return save_image(self.render(work, quality=quality, scale=scale, canvas=canvas, **kw), path, options)
+
+        key = work_key(work, quality=quality, scale=scale, canvas=canvas)
+        cached = self.path(key)
+        if cached is not None:
+            try:
+                return _copy_atomic(cached, path)
+            except FileNotFoundError:
+                self._evicted(key)
+        img = work.render(quality=quality, scale=scale, canvas=canvas, **kw)
+        try:
+            return _copy_atomic(self.put(key, img), path)
+        except FileNotFoundError:
+            # 【繁】寫入後即被其他執行緒淘汰：直接存圖 / [EN] Evicted by another thread right after the put: save directly
+            return save_image(img, path)
+
+
+def _parts(work: Any) -> list[tuple[str, bool]] | None:
+    # 【繁】多圖作品的各幅（名稱, 是否存在）；單圖作品為 None
+    # [EN] Parts of a multi-image work as (name, present); None for single-image works
+    from .works.couplet import Couplet
+
+    if isinstance(work, Couplet):
+        return [("right", True), ("left", True), ("header", bool(work.text_header))]
+    return None
+
+
+def _copy_atomic(src: str, dst: str) -> str:
+    # 【繁】複製到暫存檔再 os.replace（同 output.save_image）/ [EN] Copy to a temp file, then os.replace (as save_image)
+    d = os.path.dirname(dst)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    root, ext = os.path.splitext(dst)
+    tmp = f"{root}.partial-{os.getpid()}-{threading.get_ident()}{ext}"
+    try:
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dst)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return dst
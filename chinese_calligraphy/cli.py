@@ -0,0 +1,45 @@
+# chinese_calligraphy/cli.py
+
+# 【繁】命令列入口：python -m chinese_calligraphy <子命令>
+# [EN] Command-line entry point: python -m chinese_calligraphy <command>
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Sequence
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m chinese_calligraphy")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    batch = sub.add_parser("batch", help="render every work described in a JSONL manifest")
+    batch.add_argument("manifest", help="JSONL file, one work spec per line")
+    batch.add_argument(
+        "--workers", type=int, default=None, help="process pool size (default: CPU count; 1 = in-process)"
+    )
+    batch.add_argument("--log", default=None, help="status log path (default: <manifest>.status.jsonl)")
+    batch.add_argument(
+        "--font-dir", action="append", default=[], dest="font_dirs", help="extra directory to search for fonts"
+    )
+    batch.add_argument("--force", action="store_true", help="re-render even if outputs match the status log")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.command == "batch":
+        from .batch import run_batch
+
+        summary = run_batch(
+            args.manifest,
+            workers=args.workers,
+            log_path=args.log,
+            font_dirs=args.font_dirs,
+            force=args.force,
+        )
+        print(f"rendered={summary.rendered} skipped={summary.skipped} failed={summary.failed}")
+        return 1 if summary.failed else 0
+
+    return 2
@@ -0,0 +1,115 @@
+# chinese_calligraphy/context.py
+
+# 【繁】渲染上下文：一次渲染中跨元素傳遞的控制狀態（取消令牌、品質檔位、輸出縮放）
+# [EN] Render context: control state threaded through all elements of one render (cancellation token, quality tier,
+#      output scale)
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+
+    from PIL import ImageFont
+
+    from .types import Point
+
+# 【繁】品質檔位：draft = 同版式同隨機序列，但略過纖維噪聲/距離變換/暈染並用雙線性重採樣，供調參速覽；
+#       standard = 預設（僅小字或乾筆超採樣）；final = 每個字皆按 Brush.supersample 超採樣，最精細也最慢
+# [EN] Quality tiers: draft = same layout and random draws, but skips fiber noise / distance transform / halo and
+#      resamples bilinearly, for quick previews while tuning; standard = default (supersamples only small or dry
+#      glyphs); final = supersamples every glyph by Brush.supersample, the finest and slowest
+QUALITIES = ("draft", "standard", "final")
+
+
+class RenderCancelled(Exception):
+    # 【繁】渲染被取消（由 CancelToken 觸發）
+    # [EN] Raised when a render is cancelled through its CancelToken
+    pass
+
+
+class CancelToken:
+    """
+    【繁】取消令牌：任一執行緒呼叫 cancel() 後，渲染在下一個檢查點（排版時列與列之間、落筆時每字之前）停止。
+    [EN] Cancellation token: after cancel() is called from any thread, the render stops at its next checkpoint
+    (between columns while laying out, before each glyph while painting).
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise RenderCancelled("render cancelled")
+
+
+@dataclass
+class RenderContext:
+    # 【繁】渲染上下文：由作品建立並傳給各元素的 draw()。
+    #       版式一律以原尺寸座標計算，僅在落筆時乘以 scale，故縮小輸出與原尺寸的版式與隨機序列一致
+    # [EN] Render context: created by a work and passed to each element's draw().
+    #      Layout is always computed in full-size coordinates and multiplied by `scale` only when drawing, so a
+    #      reduced-scale output has the same layout and random draws as the full-size one
+    token: CancelToken | None = None
+    quality: str = "standard"
+    scale: float = 1.0
+    # 【繁】落筆執行緒數：> 1 時筆刷字的遮罩在執行緒池上並行產出，由單一合成者按記錄順序貼上（結果與 1 相同）
+    # [EN] Painting threads: when > 1, brush glyph masks are produced on a thread pool and a single compositor
+    #      pastes them in recorded order (the result is identical to 1)
+    threads: int = 1
+    # 【繁】變形後字形遮罩（及其乾筆距離場）的共用備忘（參數掃描用）：同一版式在多組墨韻參數下重複光柵化時，
+    #       字形光柵化、幾何變形與距離變換只做一次；None 為不備忘
+    # [EN] Shared memo of transformed glyph masks (and their dry-brush distance fields), for parameter sweeps: when
+    #      one layout is rasterized again under several ink settings, glyph rasterization, the geometric transform
+    #      and the distance transform run once; None for no memo
+    masks: dict[Hashable, Any] | None = None
+
+    def __post_init__(self) -> None:
+        if self.quality not in QUALITIES:
+            raise ValueError(f"quality must be one of {QUALITIES}, got {self.quality!r}")
+        if not self.scale > 0:
+            raise ValueError(f"scale must be positive, got {self.scale!r}")
+        if self.threads < 1:
+            raise ValueError(f"threads must be >= 1, got {self.threads!r}")
+
+    @property
+    def draft(self) -> bool:
+        return self.quality == "draft"
+
+    def checkpoint(self) -> None:
+        # 【繁】檢查點：已取消則拋出 RenderCancelled
+        # [EN] Checkpoint: raise RenderCancelled if the render was cancelled
+        if self.token is not None:
+            self.token.raise_if_cancelled()
+
+    # =========================
+    # 【縮放 / Output scale】
+    # =========================
+    def px(self, v: float) -> int:
+        # 【繁】原尺寸長度/座標 → 輸出像素
+        # [EN] Full-size length or coordinate -> output pixels
+        if self.scale == 1.0:
+            return int(v)
+        return int(round(v * self.scale))
+
+    def pt(self, p: Point) -> Point:
+        return (self.px(p[0]), self.px(p[1]))
+
+    def scale_font(self, font: ImageFont.FreeTypeFont) -> ImageFont.FreeTypeFont:
+        # 【繁】原尺寸字體 → 輸出尺寸字體（經 resize_font 快取）
+        # [EN] Full-size font -> font at the output scale (cached through resize_font)
+        if self.scale == 1.0:
+            return font
+        from .font import resize_font
+
+        return resize_font(font, max(1, self.px(font.size)))
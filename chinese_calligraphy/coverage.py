@@ -0,0 +1,118 @@
+# chinese_calligraphy/coverage.py
+
+# 【繁】覆蓋率畫布：每種墨色一張單通道（uint8）覆蓋平面，落筆只累積覆蓋率；底色、紙紋與墨色在輸出或取塊時
+#       以一次向量化運算套上。單色作品的工作記憶體約為 RGB 畫布的三分之一，且同色覆蓋的累積與次序無關，
+#       並行合成可按完成先後貼上
+# [EN] Coverage canvas: one single-channel (uint8) coverage plane per ink color; painting only accumulates coverage,
+#      and the background, paper and ink colors are applied in one vectorized pass at export or tile time. A
+#      monochrome work needs about a third of the working memory of an RGB canvas, and since same-color coverage
+#      accumulates independently of order, parallel compositing can paste glyphs as they finish
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from .types import Color, Point
+
+if TYPE_CHECKING:
+    from PIL import Image, ImageDraw
+
+    from .paper import Paper
+
+# 【繁】平面的鍵：(墨色, 紙紋)；紙紋為 None 時為純色墨，否則為以紙紋填充的區域（扇面）
+# [EN] Plane key: (ink color, paper); a None paper is flat ink, otherwise a paper-filled region (fan leaves)
+PlaneKey = tuple[Color, "Paper | None"]
+
+
+@dataclass
+class CoverageCanvas:
+    """
+    【繁】覆蓋率畫布（已縮放的像素尺寸）。平面在第一次用到某墨色時建立，著色時按建立先後疊加，
+    故後出現的顏色（如印章）蓋在先出現的顏色之上。
+    [EN] Coverage canvas, in scaled pixel size. A plane is created the first time an ink color is used, and planes
+    are layered in creation order when colorizing, so colors that appear later (e.g. seals) sit on top.
+    """
+
+    size: tuple[int, int]
+    bg: Color = (255, 255, 255)
+    paper: Paper | None = None
+    scale: float = 1.0
+    planes: dict[PlaneKey, Image.Image] = field(default_factory=dict)
+
+    def plane(self, fill: Color, paper: Paper | None = None) -> Image.Image:
+        # 【繁】取得（必要時建立）某墨色的覆蓋平面 / [EN] Get (creating if needed) the coverage plane of an ink color
+        key = (fill, paper)
+        img = self.planes.get(key)
+        if img is None:
+            from PIL import Image
+
+            img = self.planes[key] = Image.new("L", self.size, 0)
+        return img
+
+    def draw(self, fill: Color, paper: Paper | None = None) -> ImageDraw.ImageDraw:
+        # 【繁】在覆蓋平面上繪圖：以 255 為墨即得抗鋸齒覆蓋率
+        # [EN] Draw on a coverage plane: drawing with 255 yields anti-aliased coverage
+        from PIL import ImageDraw
+
+        return ImageDraw.Draw(self.plane(fill, paper))
+
+    def stamp(self, fill: Color, placed: tuple[Image.Image, Point] | None) -> None:
+        """
+        【繁】累積一個字的覆蓋遮罩（Brush.glyph_patch 的結果）：c ← c + a·(1 − c)，與次序無關。
+        [EN] Accumulate a glyph's coverage mask (the result of Brush.glyph_patch): c ← c + a·(1 − c), which does
+        not depend on order.
+        """
+        if placed is None:
+            return
+        patch, (x, y) = placed
+        self.plane(fill).paste(255, (x, y, x + patch.width, y + patch.height), mask=patch)
+
+    def tile(self, box: tuple[int, int, int, int] | None = None) -> Image.Image:
+        """
+        【繁】著色 box 範圍（預設整張）為 RGB：先鋪底色或紙紋，再按平面次序以覆蓋率混入各墨色。
+        [EN] Colorize the `box` region (default: everything) to RGB: lay down the background or paper, then blend
+        each ink color in by its coverage, in plane order.
+        """
+        import numpy as np
+        from PIL import Image
+
+        x0, y0, x1, y1 = box if box is not None else (0, 0, *self.size)
+        size = (x1 - x0, y1 - y0)
+        if self.paper is not None:
+            base = self.paper.fill(size, self.bg, self.scale, origin=(x0, y0))
+        else:
+            base = Image.new("RGB", size, self.bg)
+
+        out: np.ndarray | None = None
+        for (fill, paper), plane in self.planes.items():
+            crop = plane.crop((x0, y0, x1, y1))
+            bbox = crop.getbbox()
+            if bbox is None:
+                continue
+            if out is None:
+                out = np.asarray(base, dtype=np.float32)
+            # 【繁】只混入平面有墨的範圍 / [EN] Blend only where the plane has ink
+            bx0, by0, bx1, by1 = bbox
+            a = np.asarray(crop.crop(bbox), dtype=np.float32)[..., None] * np.float32(1 / 255)
+            if paper is None:
+                src = np.asarray(fill, dtype=np.float32)
+            else:
+                region = paper.fill((bx1 - bx0, by1 - by0), fill, self.scale, origin=(x0 + bx0, y0 + by0))
+                src = np.asarray(region, dtype=np.float32)
+            view = out[by0:by1, bx0:bx1]
+            view += (src - view) * a
+        if out is None:
+            return base
+        return Image.fromarray((out + 0.5).astype(np.uint8), mode="RGB")
+
+    def colorize(self, band: int = 256) -> Image.Image:
+        # 【繁】整張著色；按 band 列分帶進行，浮點暫存只有一帶大小
+        # [EN] Colorize the whole canvas in bands of `band` rows, so the float temporaries stay one band in size
+        from PIL import Image
+
+        w, h = self.size
+        img = Image.new("RGB", self.size)
+        for y in range(0, h, band):
+            img.paste(self.tile((0, y, w, min(h, y + band))), (0, y))
+        return img
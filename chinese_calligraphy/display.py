@@ -0,0 +1,489 @@
+# chinese_calligraphy/display.py
+
+# 【繁】顯示列表：作品先排版成一串已定案的筆跡（位置、變形、隨機數皆已抽定，座標為原尺寸），
+#       再按任意縮放與品質光柵化；同一份版式可輸出多種解析度而隨機序列不分岔
+# [EN] Display list: a work is first laid out into a sequence of settled marks (positions, transforms and random
+#      draws all fixed, in full-size coordinates), then rasterized at any scale and quality; one layout can be
+#      output at several resolutions without the random draws diverging
+
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterable, Iterator
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any
+
+from .context import CancelToken, RenderContext
+from .font import FREETYPE_LOCK
+from .types import Color, Point
+
+if TYPE_CHECKING:
+    from PIL import Image, ImageDraw, ImageFont
+
+    from .brush import Brush
+    from .coverage import CoverageCanvas
+    from .paper import Paper
+    from .stamp import StampSpec
+
+# 【繁】畫布模式："rgb" 直接在 RGB 畫布上落筆；"coverage" 每種墨色累積一張覆蓋平面，輸出時著色（見 coverage）
+# [EN] Canvas modes: "rgb" paints straight onto an RGB canvas; "coverage" accumulates one coverage plane per ink
+#      color and colorizes at export (see coverage)
+CANVASES = ("rgb", "coverage")
+
+
+@dataclass(frozen=True)
+class GlyphMark:
+    # 【繁】一個筆刷字：Brush.place_char 的產物，由 Brush.paint_char 光柵化
+    # [EN] One brush glyph: produced by Brush.place_char, rasterized by Brush.paint_char
+    ch: str
+    p: Point  # 【繁】抖動後的字心 / [EN] glyph center after jitter
+    font: ImageFont.FreeTypeFont = field(compare=False)
+    fill: Color
+    rot: float
+    shear_x: float
+    scale: float
+    anis_y: float
+    ink_dryness: float
+    blur_sigma: float
+    brush: Brush = field(compare=False, repr=False)
+
+    def paint(self, img: Image.Image, ctx: RenderContext) -> None:
+        self.brush.paint_char(img, self, ctx)
+
+    def cover(self, canvas: CoverageCanvas, ctx: RenderContext) -> None:
+        canvas.stamp(self.fill, self.brush.glyph_patch(self, ctx))
+
+
+@dataclass(frozen=True)
+class TextMark:
+    # 【繁】一般文字（題、款、印文）：左上角定位
+    # [EN] Plain text (title, colophon, seal characters), positioned by its top-left corner
+    p: Point
+    text: str
+    font: ImageFont.FreeTypeFont = field(compare=False)
+    fill: Color
+
+    def paint(self, draw: ImageDraw.ImageDraw, ctx: RenderContext) -> None:
+        font = ctx.scale_font(self.font)
+        with FREETYPE_LOCK:
+            draw.text(ctx.pt(self.p), self.text, font=font, fill=self.fill)
+
+    def cover(self, canvas: CoverageCanvas, ctx: RenderContext) -> None:
+        font = ctx.scale_font(self.font)
+        with FREETYPE_LOCK:
+            canvas.draw(self.fill).text(ctx.pt(self.p), self.text, font=font, fill=255)
+
+
+@dataclass(frozen=True)
+class ShapeMark:
+    # 【繁】幾何圖形：印框（rectangle）與扇面（pieslice）
+    # [EN] Shapes: seal borders ("rectangle") and fan leaves ("pieslice")
+    kind: str
+    box: tuple[int, int, int, int]
+    fill: Color | None = None
+    outline: Color | None = None
+    width: int = 1
+    start: float = 0.0
+    end: float = 0.0
+    # 【繁】以紙紋代替純色 fill 填充（扇面）
+    # [EN] Fill with a paper texture on `fill` instead of the flat color (fan leaves)
+    paper: Paper | None = None
+
+    def paint(self, draw: ImageDraw.ImageDraw, ctx: RenderContext) -> None:
+        self._shape(draw, ctx, self.fill, self.outline)
+
+    def _shape(
+        self, draw: ImageDraw.ImageDraw, ctx: RenderContext, fill: Color | int | None, outline: Color | int | None
+    ) -> None:
+        box = [ctx.px(v) for v in self.box]
+        if self.kind == "rectangle":
+            draw.rectangle(box, fill=fill, outline=outline, width=max(1, ctx.px(self.width)))
+        elif self.kind == "pieslice":
+            draw.pieslice(box, start=self.start, end=self.end, fill=fill)
+        else:
+            raise ValueError(f"unknown shape kind {self.kind!r}")
+
+    def cover(self, canvas: CoverageCanvas, ctx: RenderContext) -> None:
+        # 【繁】填充與外框各入其色的平面（紙紋填充另成一個平面）；外框平面後建，故蓋在填充之上
+        # [EN] Fill and outline go to the planes of their colors (a paper fill gets a plane of its own); the outline
+        #      plane is created after the fill plane, so it sits on top
+        if self.fill is not None:
+            self._shape(canvas.draw(self.fill, self.paper), ctx, 255, None)
+        if self.outline is not None:
+            self._shape(canvas.draw(self.outline), ctx, None, 255)
+
+    def paint_paper(self, img: Image.Image, ctx: RenderContext) -> None:
+        # 【繁】紙紋填充：只在圖形與畫布相交的範圍內鋪磚，再以圖形為遮罩貼上
+        # [EN] Paper fill: tile only where the shape meets the canvas, then paste with the shape as the mask
+        from PIL import Image, ImageDraw
+
+        assert self.paper is not None and self.fill is not None
+        box = [ctx.px(v) for v in self.box]
+        x0, y0 = max(0, box[0]), max(0, box[1])
+        x1, y1 = min(img.width, box[2] + 1), min(img.height, box[3] + 1)
+        if x1 > x0 and y1 > y0:
+            mask = Image.new("L", (x1 - x0, y1 - y0), 0)
+            local = [box[0] - x0, box[1] - y0, box[2] - x0, box[3] - y0]
+            if self.kind == "rectangle":
+                ImageDraw.Draw(mask).rectangle(local, fill=255)
+            else:
+                ImageDraw.Draw(mask).pieslice(local, start=self.start, end=self.end, fill=255)
+            img.paste(self.paper.fill(mask.size, self.fill, ctx.scale, origin=(x0, y0)), (x0, y0), mask)
+        if self.outline is not None:
+            replace(self, fill=None, paper=None).paint(ImageDraw.Draw(img), ctx)
+
+
+@dataclass(frozen=True)
+class StampMark:
+    # 【繁】印章：貼上按 spec 快取的 RGBA 印蛻（見 stamp）；向量輸出時展開為印框與印文筆跡
+    # [EN] Seal: pastes the RGBA stamp cached for `spec` (see stamp); vector export expands it into border and
+    #      character marks
+    p: Point  # 【繁】印框左上角 / [EN] top-left corner of the border
+    spec: StampSpec
+
+    def _placed(self, ctx: RenderContext) -> tuple[Image.Image, Point]:
+        stamp, (ox, oy) = self.spec.stamp(ctx.scale)
+        x, y = ctx.pt(self.p)
+        return stamp, (x + ox, y + oy)
+
+    def paint(self, img: Image.Image, ctx: RenderContext) -> None:
+        stamp, pos = self._placed(ctx)
+        img.paste(stamp, pos, mask=stamp)
+
+    def cover(self, canvas: CoverageCanvas, ctx: RenderContext) -> None:
+        stamp, pos = self._placed(ctx)
+        canvas.stamp(self.spec.color, (stamp.getchannel("A"), pos))
+
+    def marks(self) -> list[ShapeMark | TextMark]:
+        return self.spec.marks(self.p)
+
+
+Mark = GlyphMark | TextMark | ShapeMark | StampMark
+
+# 【繁】像素矩形 (x0, y0, x1, y1)，右下為開區間 / [EN] Pixel rectangle (x0, y0, x1, y1), exclusive at the bottom right
+Box = tuple[int, int, int, int]
+
+
+@dataclass(frozen=True)
+class Frame:
+    """
+    【繁】書寫動畫的一幀：image 為持續累積的畫布本身（不複製，下一幀會改寫；要保留請 copy()），
+    box 為與上一幀相比有變動的矩形（第 0 幀為整張；無變動時面積為 0）。
+    [EN] One frame of a writing animation: image is the persistent canvas itself (not a copy, and the next frame
+    paints over it; copy() it to keep it), and box is the rectangle that changed since the previous frame (the
+    whole canvas for frame 0; zero area when nothing changed).
+    """
+
+    index: int
+    image: Image.Image
+    box: Box
+
+    def delta(self) -> Image.Image:
+        # 【繁】變動區域的像素 / [EN] Pixels of the changed region
+        return self.image.crop(self.box)
+
+
+def _union(a: Box | None, b: Box | None) -> Box | None:
+    if a is None or b is None:
+        return a if b is None else b
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
+
+
+@dataclass
+class DisplayList:
+    """
+    【繁】一張畫布的顯示列表（原尺寸）。rasterize() 可對同一列表重複呼叫，每次以不同縮放/品質輸出。
+    [EN] Display list of one canvas, at full size. rasterize() can be called repeatedly on the same list, each time
+    at a different scale or quality.
+    """
+
+    width: int = 0
+    height: int = 0
+    bg: Color = (255, 255, 255)
+    marks: list[Mark] = field(default_factory=list)
+    # 【繁】紙張材質（None 為純色 bg）/ [EN] Paper material (None for a flat bg)
+    paper: Paper | None = None
+
+    def add(self, mark: Mark) -> None:
+        self.marks.append(mark)
+
+    def extend(self, marks: Iterable[Mark]) -> None:
+        self.marks.extend(marks)
+
+    def flat_marks(self) -> Iterator[GlyphMark | TextMark | ShapeMark]:
+        # 【繁】印蛻展開為其印框與印文筆跡（向量輸出用）
+        # [EN] Marks with each stamp expanded into its border and character marks (for vector export)
+        for mark in self.marks:
+            if isinstance(mark, StampMark):
+                yield from mark.marks()
+            else:
+                yield mark
+
+    def paint(self, img: Image.Image, ctx: RenderContext, marks: Iterable[Mark] | None = None) -> None:
+        # 【繁】按記錄順序落筆；每個筆刷字前設檢查點。ctx.threads > 1 時改走執行緒池（見 _paint_threaded）。
+        #       marks 給定時改畫這串筆跡（只迭代一次，可為邊排版邊產出的串流），不用 self.marks
+        # [EN] Paint in recorded order, with a checkpoint before each brush glyph. With ctx.threads > 1 the thread
+        #      pool path is taken instead (see _paint_threaded). When given, marks is painted instead of self.marks
+        #      (iterated once, so it may be a stream produced while laying out)
+        from PIL import ImageDraw
+
+        marks = self.marks if marks is None else marks
+        if ctx.threads > 1:
+            self._paint_threaded(img, ctx, marks)
+            return
+        draw = ImageDraw.Draw(img)
+        for mark in marks:
+            if isinstance(mark, GlyphMark):
+                ctx.checkpoint()
+                mark.paint(img, ctx)
+            else:
+                self._paint_flat(img, draw, mark, ctx)
+
+    @staticmethod
+    def _paint_flat(
+        img: Image.Image, draw: ImageDraw.ImageDraw, mark: TextMark | ShapeMark | StampMark, ctx: RenderContext
+    ) -> None:
+        if isinstance(mark, StampMark):
+            mark.paint(img, ctx)
+        elif isinstance(mark, ShapeMark) and mark.paper is not None:
+            mark.paint_paper(img, ctx)
+        else:
+            mark.paint(draw, ctx)
+
+    def _paint_threaded(self, img: Image.Image, ctx: RenderContext, marks: Iterable[Mark]) -> None:
+        # 【繁】筆刷字的光柵化、變形與墨韻（Pillow 與 NumPy/SciPy 在其中大多釋放 GIL）在執行緒池上進行；
+        #       本執行緒為唯一合成者，按記錄順序貼上每個遮罩並繪製其餘筆跡，故輸出與單執行緒逐位元相同。
+        #       在途的字數以視窗限制，記憶體不隨字數增長
+        # [EN] Rasterizing, transforming and inking brush glyphs (where Pillow and NumPy/SciPy mostly release the
+        #      GIL) runs on a thread pool; this thread is the only compositor, pasting each mask and drawing the other
+        #      marks in recorded order, so the output is bit-identical to single-threaded painting. A window bounds
+        #      the glyphs in flight, so memory does not grow with the glyph count
+        from collections import deque
+        from concurrent.futures import Future, ThreadPoolExecutor
+
+        from PIL import ImageDraw
+
+        draw = ImageDraw.Draw(img)
+        window = ctx.threads * 4
+        pending: deque[tuple[Mark, Future[tuple[Image.Image, Point] | None] | None]] = deque()
+
+        def drain(limit: int) -> None:
+            while len(pending) > limit:
+                mark, fut = pending.popleft()
+                if isinstance(mark, GlyphMark):
+                    assert fut is not None
+                    mark.brush.composite(img, mark, fut.result())
+                else:
+                    self._paint_flat(img, draw, mark, ctx)
+
+        with ThreadPoolExecutor(max_workers=ctx.threads, thread_name_prefix="calligraphy-paint") as pool:
+            try:
+                for mark in marks:
+                    if isinstance(mark, GlyphMark):
+                        ctx.checkpoint()
+                        pending.append((mark, pool.submit(mark.brush.glyph_patch, mark, ctx)))
+                    else:
+                        pending.append((mark, None))
+                    drain(window)
+                drain(0)
+            except BaseException:
+                for _, fut in pending:
+                    if fut is not None:
+                        fut.cancel()
+                raise
+
+    def cover(self, canvas: CoverageCanvas, ctx: RenderContext, marks: Iterable[Mark] | None = None) -> None:
+        """
+        【繁】在覆蓋率畫布上落筆。同色覆蓋的累積與次序無關，故 ctx.threads > 1 時按完成先後貼上，不必排隊。
+        marks 同 paint。
+        [EN] Paint onto a coverage canvas. Same-color coverage accumulates regardless of order, so with
+        ctx.threads > 1 glyphs are pasted as they finish rather than in recorded order. marks is as for paint.
+        """
+        marks = self.marks if marks is None else marks
+        if ctx.threads == 1:
+            for mark in marks:
+                if isinstance(mark, GlyphMark):
+                    ctx.checkpoint()
+                mark.cover(canvas, ctx)
+            return
+
+        from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+        window = ctx.threads * 4
+        pending: dict[Future[tuple[Image.Image, Point] | None], Color] = {}
+
+        def drain(limit: int) -> None:
+            while len(pending) > limit:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    canvas.stamp(pending.pop(fut), fut.result())
+
+        with ThreadPoolExecutor(max_workers=ctx.threads, thread_name_prefix="calligraphy-paint") as pool:
+            try:
+                for mark in marks:
+                    if isinstance(mark, GlyphMark):
+                        ctx.checkpoint()
+                        pending[pool.submit(mark.brush.glyph_patch, mark, ctx)] = mark.fill
+                        drain(window)
+                    else:
+                        mark.cover(canvas, ctx)
+                drain(0)
+            except BaseException:
+                for fut in pending:
+                    fut.cancel()
+                raise
+
+    def rasterize(
+        self,
+        quality: str = "standard",
+        scale: float = 1.0,
+        token: CancelToken | None = None,
+        threads: int = 1,
+        canvas: str = "rgb",
+        masks: dict[Hashable, Any] | None = None,
+        marks: Iterable[Mark] | None = None,
+    ) -> Image.Image:
+        # 【繁】建立 scale 倍畫布並落筆；threads > 1 時以執行緒池落筆（輸出相同）。
+        #       canvas="coverage" 改在覆蓋平面上落筆、最後著色（與 "rgb" 只差捨入，見 coverage）。
+        #       masks 為變形後字形遮罩的共用備忘（見 RenderContext.masks）。marks 給定時畫這串筆跡而非
+        #       self.marks（見 paint），供邊排版邊落筆
+        # [EN] Create a canvas at `scale` and paint onto it; threads > 1 paints on a thread pool (same output).
+        #      canvas="coverage" paints onto coverage planes and colorizes at the end (it differs from "rgb" only
+        #      by rounding; see coverage). masks is a shared memo of transformed glyph masks (see
+        #      RenderContext.masks). When given, marks is painted instead of self.marks (see paint), for painting
+        #      while laying out
+        from PIL import Image
+
+        if canvas not in CANVASES:
+            raise ValueError(f"canvas must be one of {CANVASES}, got {canvas!r}")
+        ctx = RenderContext(token=token, quality=quality, scale=scale, threads=threads, masks=masks)
+        size = (max(1, ctx.px(self.width)), max(1, ctx.px(self.height)))
+        if canvas == "coverage":
+            from .coverage import CoverageCanvas
+
+            cov = CoverageCanvas(size, self.bg, self.paper, scale)
+            self.cover(cov, ctx, marks)
+            return cov.colorize()
+        img = self.paper.fill(size, self.bg, scale) if self.paper is not None else Image.new("RGB", size, self.bg)
+        self.paint(img, ctx, marks)
+        return img
+
+    def _patched(
+        self, marks: Iterable[Mark], ctx: RenderContext
+    ) -> Iterator[tuple[Mark, tuple[Image.Image, Point] | None]]:
+        # 【繁】按記錄順序產出 (筆跡, 字遮罩)；筆刷字的遮罩在 ctx.threads > 1 時於執行緒池上預先計算（視窗同
+        #       _paint_threaded），其餘筆跡的遮罩為 None
+        # [EN] Yield (mark, glyph mask) in recorded order; with ctx.threads > 1 brush glyph masks are computed ahead
+        #      on a thread pool (windowed as in _paint_threaded), and other marks come with None
+        if ctx.threads == 1:
+            for mark in marks:
+                if isinstance(mark, GlyphMark):
+                    ctx.checkpoint()
+                    yield mark, mark.brush.glyph_patch(mark, ctx)
+                else:
+                    yield mark, None
+            return
+
+        from collections import deque
+        from concurrent.futures import Future, ThreadPoolExecutor
+
+        window = ctx.threads * 4
+        pending: deque[tuple[Mark, Future[tuple[Image.Image, Point] | None] | None]] = deque()
+        with ThreadPoolExecutor(max_workers=ctx.threads, thread_name_prefix="calligraphy-paint") as pool:
+            try:
+                for mark in marks:
+                    if isinstance(mark, GlyphMark):
+                        ctx.checkpoint()
+                        pending.append((mark, pool.submit(mark.brush.glyph_patch, mark, ctx)))
+                    else:
+                        pending.append((mark, None))
+                    while len(pending) > window:
+                        done, fut = pending.popleft()
+                        yield done, fut.result() if fut is not None else None
+                while pending:
+                    done, fut = pending.popleft()
+                    yield done, fut.result() if fut is not None else None
+            finally:
+                for _, fut in pending:
+                    if fut is not None:
+                        fut.cancel()
+
+    def _paint_tracked(
+        self,
+        img: Image.Image,
+        draw: ImageDraw.ImageDraw,
+        mark: Mark,
+        placed: tuple[Image.Image, Point] | None,
+        ctx: RenderContext,
+    ) -> Box | None:
+        # 【繁】落一筆並回傳它觸及的像素矩形（裁到畫布內；沒畫到任何像素為 None）
+        # [EN] Paint one mark and return the pixel rectangle it touched (clipped to the canvas; None if nothing)
+        box: Box | None
+        if isinstance(mark, GlyphMark):
+            mark.brush.composite(img, mark, placed)
+            box = (
+                None
+                if placed is None
+                else (*placed[1], placed[1][0] + placed[0].width, placed[1][1] + placed[0].height)
+            )
+        elif isinstance(mark, StampMark):
+            stamp, (x, y) = mark._placed(ctx)
+            img.paste(stamp, (x, y), mask=stamp)
+            box = (x, y, x + stamp.width, y + stamp.height)
+        elif isinstance(mark, TextMark):
+            font = ctx.scale_font(mark.font)
+            with FREETYPE_LOCK:
+                x0, y0, x1, y1 = draw.textbbox(ctx.pt(mark.p), mark.text, font=font)
+            mark.paint(draw, ctx)
+            box = (int(x0), int(y0), int(x1) + 1, int(y1) + 1)
+        else:
+            self._paint_flat(img, draw, mark, ctx)
+            x0, y0, x1, y1 = (ctx.px(v) for v in mark.box)
+            box = (x0, y0, x1 + 1, y1 + 1)
+        if box is None:
+            return None
+        x0, y0 = max(0, box[0]), max(0, box[1])
+        x1, y1 = min(img.width, box[2]), min(img.height, box[3])
+        return (x0, y0, x1, y1) if x1 > x0 and y1 > y0 else None
+
+    def iter_frames(
+        self,
+        quality: str = "standard",
+        scale: float = 1.0,
+        token: CancelToken | None = None,
+        threads: int = 1,
+        group: int = 1,
+    ) -> Iterator[Frame]:
+        """
+        【繁】書寫動畫：在同一張畫布上按書寫次序逐筆累積，每落 group 筆（筆刷字、文字或印章）產出一幀。
+        第 0 幀為空白畫布（底色、紙紋與開頭的底圖形，如扇面）。每幀只畫新的筆跡，總成本與字數成線性，
+        最後一幀與 rasterize() 的輸出相同。幀的 image 為畫布本身，見 Frame。
+        [EN] Writing animation: marks accumulate on one canvas in writing order, and a frame is yielded after every
+        `group` marks (brush glyphs, text or seals). Frame 0 is the blank canvas (background, paper, and leading
+        ground shapes such as the fan leaf). Each frame only paints the new marks, so the total cost is linear in
+        the glyph count, and the last frame equals the output of rasterize(). A frame's image is the canvas
+        itself; see Frame.
+        """
+        from PIL import Image, ImageDraw
+
+        if group < 1:
+            raise ValueError("group must be >= 1")
+        ctx = RenderContext(token=token, quality=quality, scale=scale, threads=threads)
+        size = (max(1, ctx.px(self.width)), max(1, ctx.px(self.height)))
+        img = self.paper.fill(size, self.bg, scale) if self.paper is not None else Image.new("RGB", size, self.bg)
+        draw = ImageDraw.Draw(img)
+
+        start = 0
+        while start < len(self.marks) and isinstance(self.marks[start], ShapeMark):
+            self._paint_tracked(img, draw, self.marks[start], None, ctx)
+            start += 1
+        yield Frame(0, img, (0, 0, *size))
+
+        index, count, dirty = 1, 0, None
+        for mark, placed in self._patched(self.marks[start:], ctx):
+            dirty = _union(dirty, self._paint_tracked(img, draw, mark, placed, ctx))
+            count += 1
+            if count == group:
+                yield Frame(index, img, dirty or (0, 0, 0, 0))
+                index, count, dirty = index + 1, 0, None
+        if count:
+            yield Frame(index, img, dirty or (0, 0, 0, 0))
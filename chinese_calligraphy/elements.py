@@ -5,15 +5,24 @@
 
 from __future__ import annotations
 
+import os
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
+from itertools import islice
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 
 from .brush import Brush
-from .layout import SegmentSpec
+from .context import RenderContext
+from .display import DisplayList, GlyphMark, ShapeMark, StampMark, TextMark
+from .layout import FlowSpec, SegmentSpec, Skyline
+from .stamp import StampSpec
 from .style import Style
 from .types import Color, Point
-from .utils import chunk, floor_int, strip_newlines
+from .utils import floor_int, iter_chunks, iter_stripped
+
+# 【繁】串流讀取正文的區塊大小（字元）/ [EN] Block size (characters) for streaming the main text
+_TEXT_BLOCK = 1 << 16
 
 # =========================
 # 【引首題 / Title】
@@ -37,19 +46,34 @@ class Title:
         # [EN] Estimated width: reserve about two column widths
         return floor_int(self.style.col_spacing * 2.0)
 
-    def draw(self, draw: ImageDraw.ImageDraw, x_right: int, y_top: int) -> None:
-        # 【繁】在 (x_right, y_top) 畫一列竪排題字
-        # [EN] Draw title as a vertical column at (x_right, y_top)
+    def _marks(self, x_right: int, y_top: int) -> list[TextMark]:
         font = self.style.font()
         r = self.brush.rng()
 
+        marks = []
         x = x_right
         y = y_top
         for ch in self.text:
             p = (x, y)
             p = self.brush.jitter_point_basic(p, r)
-            draw.text(p, ch, font=font, fill=self.style.color)
+            marks.append(TextMark(p, ch, font, self.style.color))
             y += self.style.step_y
+        return marks
+
+    def place(self, dl: DisplayList, x_right: int, y_top: int, ctx: RenderContext | None = None) -> None:
+        # 【繁】將題字排入顯示列表
+        # [EN] Lay the title out into a display list
+        if ctx is not None:
+            ctx.checkpoint()
+        dl.extend(self._marks(x_right, y_top))
+
+    def draw(self, draw: ImageDraw.ImageDraw, x_right: int, y_top: int, ctx: RenderContext | None = None) -> None:
+        # 【繁】在 (x_right, y_top) 畫一列竪排題字
+        # [EN] Draw title as a vertical column at (x_right, y_top)
+        ctx = ctx if ctx is not None else RenderContext()
+        ctx.checkpoint()
+        for mark in self._marks(x_right, y_top):
+            mark.paint(draw, ctx)
 
 
 # =========================
@@ -61,7 +85,15 @@ class Title:
 class MainText:
     # 【繁】正文：按列高切列，再按段落打包（手卷右起左行）
     # [EN] Main text: slice into columns by height, then pack into segments (handscroll: right-to-left)
-    text: str
+    #
+    # 【繁】text 可為字串、文字檔路徑（os.PathLike，UTF-8）或可重複迭代的字串片段（如行的列表）；
+    #       皆以串流方式去換行、切列，逐段排版（_segments）。逐段取用者（Handscroll.render、Album、draw）的排版記憶體
+    #       與全文長度無關；place() 則把整篇的筆跡排入一個顯示列表
+    # [EN] text may be a string, a text file path (os.PathLike, UTF-8) or a re-iterable of string pieces (such as a
+    #      list of lines); all are normalized and cut into columns as a stream and laid out segment by segment
+    #      (_segments). Consumers that take one segment at a time (Handscroll.render, Album, draw) use layout memory
+    #      independent of the text length; place() puts every mark of the text into one display list
+    text: str | os.PathLike[str] | Iterable[str]
     style: Style
     segment: SegmentSpec = field(default_factory=SegmentSpec)
 
@@ -85,6 +117,15 @@ class MainText:
     # [EN] Optional: override characters per column
     chars_per_col: int | None = None
 
+    # 【繁】可選：游走軸線排法（避讓、咬合右鄰列的墨跡輪廓）；None 為網格排法
+    # [EN] Optional: flowing-axis layout (columns avoid or interlock with the right-hand column's ink contour);
+    #      None for the grid layout
+    flow: FlowSpec | None = None
+
+    # 【繁】字數快取：(text 物件, 檔案狀態, 字數)；僅用於字串與檔案路徑
+    # [EN] Character count cache: (text object, file status, count); only used for strings and file paths
+    _count_cache: tuple[object, object, int] | None = field(default=None, init=False, repr=False, compare=False)
+
     def _chars_per_col(self, content_height: int) -> int:
         # 【繁】每列可容納字數（或使用手動指定）
         # [EN] Characters per column (or use manual override)
@@ -92,21 +133,104 @@ class MainText:
             return max(1, int(self.chars_per_col))
         return max(1, floor_int(content_height / self.style.step_y))
 
-    def _columns(self, content_height: int) -> list[str]:
-        # 【繁】將全文轉字流，再按列字數切成多列
-        # [EN] Convert to stream, then chunk into columns
-        stream = strip_newlines(self.text)
-        cpc = self._chars_per_col(content_height)
-        return chunk(stream, cpc)
+    def _pieces(self) -> Iterator[str]:
+        # 【繁】按區塊讀出原文片段（未經處理）
+        # [EN] Read the raw text in blocks
+        text = self.text
+        if isinstance(text, str):
+            for i in range(0, len(text), _TEXT_BLOCK):
+                yield text[i : i + _TEXT_BLOCK]
+        elif isinstance(text, os.PathLike):
+            with open(text, encoding="utf-8") as f:
+                while block := f.read(_TEXT_BLOCK):
+                    yield block
+        else:
+            it = iter(text)
+            if it is text:
+                raise TypeError(
+                    "MainText.text must be re-iterable (it is read once to measure and once to lay out); "
+                    "pass a list or a file path instead of a one-shot iterator"
+                )
+            yield from it
+
+    def char_count(self) -> int:
+        # 【繁】去換行後的字數（串流計數；字串與檔案的結果按內容快取）
+        # [EN] Character count after removing line breaks (counted as a stream; cached for strings and files)
+        text = self.text
+        if isinstance(text, os.PathLike):
+            st = os.stat(text)
+            key: object = (st.st_size, st.st_mtime_ns)
+        elif isinstance(text, str):
+            key = None
+        else:
+            return sum(map(len, iter_stripped(self._pieces())))
+        cached = self._count_cache
+        if cached is not None and cached[0] is text and cached[1] == key:
+            return cached[2]
+        n = sum(map(len, iter_stripped(self._pieces())))
+        self._count_cache = (text, key, n)
+        return n
+
+    def num_columns(self, content_height: int) -> int:
+        # 【繁】列數只由字數與每列字數決定，無須切列
+        # [EN] The column count follows from the character count and column length alone, without cutting columns
+        return -(-self.char_count() // self._chars_per_col(content_height))
+
+    def _columns(self, content_height: int) -> Iterator[str]:
+        # 【繁】將全文轉字流，再按列字數切成多列（逐列產出）
+        # [EN] Convert to stream, then chunk into columns (yielded one at a time)
+        return iter_chunks(iter_stripped(self._pieces()), self._chars_per_col(content_height))
 
     def width(self, content_height: int) -> int:
         # 【繁】計算正文總寬度（列距 * 列數 + 段間氣口）
         # [EN] Measure total main text width (columns + inter-segment gaps)
-        cols = self._columns(content_height)
+        n_cols = self.num_columns(content_height)
         cols_per_seg = self.segment.columns_per_segment
         seg_gap = self.segment.segment_gap
-        segs = (len(cols) + cols_per_seg - 1) // cols_per_seg
-        return len(cols) * self.style.col_spacing + max(0, segs - 1) * seg_gap
+        segs = (n_cols + cols_per_seg - 1) // cols_per_seg
+        return n_cols * self.style.col_spacing + max(0, segs - 1) * seg_gap
+
+    def _flow_axes(self, col_text: str, cx: int, cy: int, skyline: Skyline | None) -> list[float] | None:
+        # 【繁】游走軸線：以度量索引取各字墨跡盒，對右鄰輪廓做一次向量化查詢，再由彈簧求各字軸線
+        # [EN] Flowing axis: ink boxes from the metrics index, one vectorized lookup against the right-hand
+        #      contour, then the spring gives each glyph's axis
+        import numpy as np
+
+        from .metrics import font_metrics
+
+        assert self.flow is not None
+        if skyline is None:
+            return None
+        fs = self.style.font_size
+        boxes = font_metrics(self.style.font_path).ink_bboxes(col_text, fs)
+        ys = cy + np.arange(len(col_text)) * self.style.step_y
+        gap = self.flow.gap if self.flow.gap is not None else max(0, self.style.col_spacing - fs)
+        # 【繁】本列的字尚未抽抖動與縮放：按其上限預留，另加 1px 取整
+        # [EN] This column's jitter and scale are not drawn yet: reserve their maximum, plus 1 px for rounding
+        grow = 1.0 + self.brush.var_scale + self.brush.density_scale
+        slack = abs(self.brush.char_jitter[0]) + 1
+        ceiling = skyline.limits(ys + boxes[:, 1] * grow, ys + boxes[:, 3] * grow) - gap - slack - boxes[:, 2] * grow
+        return self.flow.axes(cx, ceiling, self.style.col_spacing)
+
+    def _skyline(self, marks: list[GlyphMark], y_top: int, content_height: int) -> Skyline:
+        # 【繁】由一列已定案的字（含抖動與縮放）建立其朝左的輪廓
+        # [EN] Build the left-facing contour of a column from its settled glyphs (jitter and scale included)
+        import numpy as np
+
+        from .metrics import font_metrics
+
+        assert self.flow is not None
+        fs = self.style.font_size
+        sky = Skyline(y_top - 2 * fs, content_height + 4 * fs, self.flow.bin)
+        if not marks:
+            return sky
+        boxes = font_metrics(self.style.font_path).ink_bboxes("".join(m.ch for m in marks), fs)
+        px = np.array([m.p[0] for m in marks], dtype=float)
+        py = np.array([m.p[1] for m in marks], dtype=float)
+        sx = np.array([m.scale for m in marks])
+        sy = sx * np.array([m.anis_y for m in marks])
+        sky.add(py + boxes[:, 1] * sy, py + boxes[:, 3] * sy, px + boxes[:, 0] * sx)
+        return sky
 
     def draw(
         self,
@@ -115,11 +239,47 @@ class MainText:
         x_right_start: int,
         y_top: int,
         content_height: int,
+        ctx: RenderContext | None = None,
     ) -> int:
         # 【繁】從右向左繪製正文；回傳繪製結束後的 x_right（更靠左）
         # [EN] Draw main text right-to-left; return final x_right after drawing
+        # 【繁】逐段排版並立即落筆，不保留整篇的顯示列表
+        # [EN] Lay out and paint one segment at a time, without keeping a display list of the whole text
+        ctx = ctx if ctx is not None else RenderContext()
+        x_right = x_right_start
+        for marks, x_end in self._segments(x_right_start, y_top, content_height, ctx):
+            DisplayList(marks=list(marks)).paint(img, ctx)
+            x_right = x_end
+        return x_right
+
+    def place(
+        self,
+        dl: DisplayList,
+        x_right_start: int,
+        y_top: int,
+        content_height: int,
+        ctx: RenderContext | None = None,
+    ) -> int:
+        # 【繁】從右向左將正文排入顯示列表；回傳結束後的 x_right（更靠左）
+        # [EN] Lay main text out right-to-left into a display list; return final x_right
+        ctx = ctx if ctx is not None else RenderContext()
+        x_right = x_right_start
+        for marks, x_end in self._segments(x_right_start, y_top, content_height, ctx):
+            dl.extend(marks)
+            x_right = x_end
+        return x_right
+
+    def _segments(
+        self, x_right_start: int, y_top: int, content_height: int, ctx: RenderContext
+    ) -> Iterator[tuple[list[GlyphMark], int]]:
+        # 【繁】逐段產出 (該段的筆刷字, 段後的 x_right)；列從字流逐段讀入，只暫存一段
+        # [EN] Yield (the segment's brush glyphs, x_right after it) one segment at a time; columns are read from
+        #      the stream a segment at a time, so only one segment is held
         font = self.style.font()
         r = self.brush.rng()
+        # 【繁】本次排版的筆刷狀態（筆刷設定本身不可變，可在元素間共用）
+        # [EN] Brush state of this layout pass (the brush config itself is immutable and may be shared)
+        bstate = self.brush.new_state()
 
         cols = self._columns(content_height)
         cols_per_seg = self.segment.columns_per_segment
@@ -127,9 +287,9 @@ class MainText:
 
         x_right = x_right_start
 
-        for seg_i in range(0, len(cols), cols_per_seg):
-            seg_cols = cols[seg_i : seg_i + cols_per_seg]
-            seg_idx = seg_i // cols_per_seg
+        seg_idx = 0
+        while seg_cols := list(islice(cols, cols_per_seg)):
+            seg_marks: list[GlyphMark] = []
 
             # 【繁】段級偏移（一次）
             # [EN] Segment-level drift (once per segment)
@@ -142,7 +302,16 @@ class MainText:
             seg_x_right = x_right + sx
             seg_y_top = y_top + sy
 
+            # 【繁】右鄰列的墨跡輪廓（游走軸線排法；每段重置，段間氣口不相咬合）
+            # [EN] Ink contour of the right-hand column (flowing-axis layout; reset per segment, so columns do not
+            #      interlock across a segment gap)
+            skyline: Skyline | None = None
+
             for local_col_idx, col_text in enumerate(seg_cols):
+                # 【繁】列間檢查點（落筆時另有逐字檢查點）
+                # [EN] Checkpoint between columns (painting also checks before every glyph)
+                ctx.checkpoint()
+
                 col_pos_ratio = 0.0 if len(seg_cols) <= 1 else (local_col_idx / (len(seg_cols) - 1))
 
                 # 更新列級慣性漂移
@@ -153,15 +322,20 @@ class MainText:
                 cy = seg_y_top + int(dy)
 
                 y = cy
+                densities = self.brush.glyph_densities(col_text, self.style.font_path)
+                axes = self._flow_axes(col_text, cx, cy, skyline) if self.flow is not None else None
+                col_marks = []
                 for row_idx, ch in enumerate(col_text):
                     prev_ch = col_text[row_idx - 1] if row_idx > 0 else None
                     next_ch = col_text[row_idx + 1] if row_idx + 1 < len(col_text) else None
 
                     if ch == "之":
                         # 三態 → 模板 → 連續抽樣 → 去偏
-                        _, tpl = self.brush.pick_zhi_variant(r=r, seg_idx=seg_idx, col_pos_ratio=col_pos_ratio)
+                        _, tpl = self.brush.pick_zhi_variant(
+                            r=r, seg_idx=seg_idx, col_pos_ratio=col_pos_ratio, bstate=bstate
+                        )
                         rot, shear_x, scale, anis_y = self.brush.sample_from_template(r, tpl)
-                        rot, shear_x = self.brush.balance_zhi_params(r, seg_idx, rot, shear_x)
+                        rot, shear_x = self.brush.balance_zhi_params(r, seg_idx, rot, shear_x, bstate)
 
                         # 【繁】小幅噪聲，避免模板味
                         # [EN] Tiny noise to avoid template feel
@@ -178,13 +352,12 @@ class MainText:
                             seg_idx=seg_idx,
                             col_idx=local_col_idx,
                             row_idx=row_idx,
+                            density=densities[row_idx],
                         )
                         anis_y = 1.0
 
-                    self.brush.draw_char(
-                        base_img=img,
-                        draw=draw,
-                        p=(cx, y),
+                    mark = self.brush.place_char(
+                        p=(cx if axes is None else int(round(axes[row_idx])), y),
                         ch=ch,
                         font=font,
                         fill=self.style.color,
@@ -196,14 +369,19 @@ class MainText:
                         ink_dryness=self.style.ink_dryness,
                         blur_sigma=self.style.blur_sigma,
                     )
+                    seg_marks.append(mark)
+                    col_marks.append(mark)
 
                     y += self.style.step_y
 
+                if self.flow is not None:
+                    skyline = self._skyline(col_marks, seg_y_top, content_height)
                 seg_x_right -= self.style.col_spacing
 
             x_right = seg_x_right - seg_gap
-
-        return x_right
+            bstate.end_segment(seg_idx)
+            yield seg_marks, x_right
+            seg_idx += 1
 
 
 # =========================
@@ -224,20 +402,40 @@ class Colophon:
         # [EN] Estimated width: reserve about two column widths
         return floor_int(self.style.col_spacing * 2.0)
 
-    def draw(self, draw: ImageDraw.ImageDraw, x_right: int, y_top: int) -> tuple[int, int]:
-        # 【繁】繪製款識並回傳末尾位置（便於放名章）
-        # [EN] Draw colophon and return end position for placing the name seal
+    def _marks(self, x_right: int, y_top: int) -> tuple[list[TextMark], Point]:
         font = self.style.font()
         r = self.brush.rng()
 
+        marks = []
         x = x_right
         y = y_top
         for ch in self.signature:
             p = (x, y)
             p = self.brush.jitter_point_basic(p, r)
-            draw.text(p, ch, font=font, fill=self.style.color)
+            marks.append(TextMark(p, ch, font, self.style.color))
             y += self.style.step_y
-        return (x, y)
+        return marks, (x, y)
+
+    def place(self, dl: DisplayList, x_right: int, y_top: int, ctx: RenderContext | None = None) -> Point:
+        # 【繁】將款識排入顯示列表並回傳末尾位置（便於放名章）
+        # [EN] Lay the colophon out into a display list and return its end position (for the name seal)
+        if ctx is not None:
+            ctx.checkpoint()
+        marks, end = self._marks(x_right, y_top)
+        dl.extend(marks)
+        return end
+
+    def draw(
+        self, draw: ImageDraw.ImageDraw, x_right: int, y_top: int, ctx: RenderContext | None = None
+    ) -> tuple[int, int]:
+        # 【繁】繪製款識並回傳末尾位置（便於放名章）；位置為原尺寸座標
+        # [EN] Draw colophon and return end position for placing the name seal, in full-size coordinates
+        ctx = ctx if ctx is not None else RenderContext()
+        ctx.checkpoint()
+        marks, end = self._marks(x_right, y_top)
+        for mark in marks:
+            mark.paint(draw, ctx)
+        return end
 
 
 # =========================
@@ -257,14 +455,42 @@ class Seal:
     padding: int = 10
     cell: int = 45
     text_grid: list[tuple[str, int, int]] = field(default_factory=list)  # (char, row, col)
+    # 【繁】印泥質感強度 [0, 1]（按壓不均、顆粒、邊緣磨損），0 為平塗；texture_seed 決定噪聲場
+    # [EN] Seal-paste texture strength in [0, 1] (uneven impression, grain, edge wear), 0 for a flat impression;
+    #      texture_seed picks the noise field
+    texture: float = 0.0
+    texture_seed: int = 0
+
+    def spec(self) -> StampSpec:
+        # 【繁】可雜湊的印章快照，亦為印蛻快取的鍵 / [EN] Hashable snapshot of the seal, also the stamp cache key
+        return StampSpec(
+            font_path=self.font_path,
+            font_size=self.font_size,
+            size=self.size,
+            color=self.color,
+            border_width=self.border_width,
+            padding=self.padding,
+            cell=self.cell,
+            text_grid=tuple((ch, row, col) for ch, row, col in self.text_grid),
+            texture=self.texture,
+            texture_seed=self.texture_seed,
+        )
+
+    def _marks(self, origin: Point) -> list[ShapeMark | TextMark]:
+        return self.spec().marks(origin)
+
+    def place(self, dl: DisplayList, origin: Point) -> None:
+        # 【繁】將印章排入顯示列表：一個印蛻筆跡，落筆時貼上快取的印蛻
+        # [EN] Lay the seal out into a display list as one stamp mark, which pastes the cached stamp when painted
+        dl.add(StampMark(origin, self.spec()))
+
+    def stamp(self, img: Image.Image, origin: Point, ctx: RenderContext | None = None) -> None:
+        # 【繁】在 origin（原尺寸座標）蓋印：一次貼上 / [EN] Stamp at origin (full-size coordinates) with one paste
+        StampMark(origin, self.spec()).paint(img, ctx if ctx is not None else RenderContext())
 
-    def draw(self, draw: ImageDraw.ImageDraw, origin: Point) -> None:
-        # 【繁】在 origin 畫印：先框，再印文
-        # [EN] Draw seal at origin: border then characters
-        x, y = origin
-        draw.rectangle([x, y, x + self.size, y + self.size], outline=self.color, width=self.border_width)
-        font = ImageFont.truetype(self.font_path, self.font_size)
-        for ch, row, col in self.text_grid:
-            cx = x + self.padding + col * self.cell
-            cy = y + self.padding + row * self.cell
-            draw.text((cx, cy), ch, font=font, fill=self.color)
+    def draw(self, draw: ImageDraw.ImageDraw, origin: Point, ctx: RenderContext | None = None) -> None:
+        # 【繁】在 origin（原尺寸座標）畫印：先框，再印文
+        # [EN] Draw seal at origin (full-size coordinates): border then characters
+        ctx = ctx if ctx is not None else RenderContext()
+        for mark in self._marks(origin):
+            mark.paint(draw, ctx)
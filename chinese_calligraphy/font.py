@@ -7,12 +7,24 @@ from __future__ import annotations
 
 import os
 import sys
+import threading
 from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from PIL import ImageFont
 
 FONT_EXTS = (".ttf", ".otf", ".ttc", ".otc")
 
+# 【繁】FreeType 字體物件不可跨執行緒並用，而 load_font/resize_font 的快取使同一物件在各執行緒間共用：
+#       凡對共用字體物件的 FreeType 呼叫（繪字、量字、取字寬、另建字號）皆持此鎖
+# [EN] FreeType font objects must not be used from several threads at once, and the load_font/resize_font caches
+#      share one object across threads: every FreeType call on a shared font object (drawing, measuring, advances,
+#      size variants) holds this lock
+FREETYPE_LOCK = threading.Lock()
+
 
 @dataclass(frozen=True)
 class FontSpec:
@@ -168,3 +180,30 @@ def require_font_path(font_name: str, extra_dirs: Sequence[str] = ()) -> str:
             f"Font not found: '{font_name}'. Searched in: {dirs} (plus extra_dirs={list(extra_dirs)})"
         )
     return p
+
+
+@lru_cache(maxsize=64)
+def load_font(font_path: str, font_size: int) -> ImageFont.FreeTypeFont:
+    """
+    【繁】載入字體並在行程內快取；同一 (路徑, 字號) 只解析一次字體檔。
+    [EN] Load a font and cache it per process; each (path, size) pair is parsed only once.
+    """
+    from PIL import ImageFont
+
+    return ImageFont.truetype(font_path, font_size)
+
+
+@lru_cache(maxsize=64)
+def resize_font(font: ImageFont.FreeTypeFont, font_size: int) -> ImageFont.FreeTypeFont:
+    """
+    【繁】同一字體的另一字號並在行程內快取；檔案字體經 load_font，其餘用 font_variant。
+    [EN] The same font at another size, cached per process; file fonts go through load_font, others use
+    font_variant.
+    """
+    if font.size == font_size:
+        return font
+    path = getattr(font, "path", None)
+    if isinstance(path, str) and getattr(font, "index", 0) == 0:
+        return load_font(path, font_size)
+    with FREETYPE_LOCK:
+        return font.font_variant(size=font_size)
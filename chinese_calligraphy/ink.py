@@ -0,0 +1,233 @@
+# chinese_calligraphy/ink.py
+
+# 【繁】墨韻運算後端：距離變換、高斯暈染、噪聲上採樣三種核心運算，可在 SciPy / 純 NumPy / Pillow 之間切換
+# [EN] Ink-effect backends: the three kernels of the living-ink pipeline (distance transform, Gaussian halo,
+#      noise upsampling), interchangeable between SciPy, pure NumPy and Pillow
+
+from __future__ import annotations
+
+import importlib.util
+import math
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+
+import numpy as np
+
+
+class InkBackend(ABC):
+    """
+    【繁】墨韻後端介面。輸入輸出皆為 NumPy 陣列，以便在 Brush.draw_char 與 NoiseGenerator 中互換；子類須實作三種核心運算。
+    [EN] Ink backend interface. Inputs and outputs are NumPy arrays, so backends are interchangeable in
+    Brush.draw_char and NoiseGenerator. Subclasses implement all three kernels.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def distance_inside(self, inside: np.ndarray, limit: float) -> np.ndarray:
+        # 【繁】每個前景像素到最近背景像素的歐氏距離，於 limit 處飽和（背景為 0）
+        # [EN] Euclidean distance from each foreground pixel to the nearest background pixel, saturated at limit
+        ...
+
+    @abstractmethod
+    def gaussian(self, arr: np.ndarray, sigma: float) -> np.ndarray:
+        # 【繁】高斯模糊（邊界鏡像），回傳浮點陣列
+        # [EN] Gaussian blur (mirrored borders), returning a float array
+        ...
+
+    @abstractmethod
+    def upsample(self, low: np.ndarray, height: int, width: int) -> np.ndarray:
+        # 【繁】將低解析度網格平滑（三次）放大到約 (height, width)
+        # [EN] Smoothly (cubic) upsample a low-resolution grid to about (height, width)
+        ...
+
+
+# =========================
+# 【SciPy】
+# =========================
+
+
+class ScipyInkBackend(InkBackend):
+    # 【繁】參考實作：scipy.ndimage（精確 EDT、精確高斯、三次樣條縮放）
+    # [EN] Reference implementation: scipy.ndimage (exact EDT, exact Gaussian, cubic-spline zoom)
+    name = "scipy"
+
+    def __init__(self) -> None:
+        from scipy import ndimage  # type: ignore
+
+        self._ndimage = ndimage
+
+    def distance_inside(self, inside: np.ndarray, limit: float) -> np.ndarray:
+        dist = self._ndimage.distance_transform_edt(inside)
+        return np.minimum(dist, limit)  # type: ignore[no-any-return]
+
+    def gaussian(self, arr: np.ndarray, sigma: float) -> np.ndarray:
+        return self._ndimage.gaussian_filter(arr.astype(float), sigma=sigma)  # type: ignore[no-any-return]
+
+    def upsample(self, low: np.ndarray, height: int, width: int) -> np.ndarray:
+        gh, gw = low.shape
+        # spline order 3 = cubic
+        return self._ndimage.zoom(low, (height / gh, width / gw), order=3)  # type: ignore[no-any-return]
+
+
+# =========================
+# 【純 NumPy / Pure NumPy】
+# =========================
+
+
+def _offsets_by_distance(limit: float) -> list[tuple[float, int, int]]:
+    # 【繁】半徑 limit 內的整數位移，按距離由近到遠
+    # [EN] Integer offsets within radius `limit`, nearest first
+    r = int(math.ceil(limit))
+    offs = [(math.hypot(dy, dx), dy, dx) for dy in range(-r, r + 1) for dx in range(-r, r + 1)]
+    return sorted(o for o in offs if 0.0 < o[0] <= limit)
+
+
+def _cubic_weights(t: np.ndarray) -> np.ndarray:
+    # 【繁】Keys 三次卷積核（a=-0.5），對位移 -1, 0, 1, 2 的權重
+    # [EN] Keys cubic convolution kernel (a=-0.5): weights for taps at offsets -1, 0, 1, 2
+    t2, t3 = t * t, t * t * t
+    return np.stack(
+        [
+            -0.5 * t3 + t2 - 0.5 * t,
+            1.5 * t3 - 2.5 * t2 + 1.0,
+            -1.5 * t3 + 2.0 * t2 + 0.5 * t,
+            0.5 * t3 - 0.5 * t2,
+        ]
+    )
+
+
+class NumpyInkBackend(InkBackend):
+    # 【繁】純 NumPy：截斷 EDT（limit 內精確）、可分離高斯、Keys 三次插值；無需 SciPy
+    # [EN] Pure NumPy: truncated EDT (exact up to limit), separable Gaussian, Keys cubic interpolation; no SciPy
+    name = "numpy"
+
+    def distance_inside(self, inside: np.ndarray, limit: float) -> np.ndarray:
+        inside = inside.astype(bool)
+        h, w = inside.shape
+        dist: np.ndarray = np.where(inside, np.float32(limit), np.float32(0.0))
+        r = int(math.ceil(limit))
+        # 【繁】陣列外不算背景（與 SciPy 的 EDT 一致）
+        # [EN] Outside the array is not background (matches SciPy's EDT)
+        bg = np.pad(~inside, r, constant_values=False)
+        for d, dy, dx in _offsets_by_distance(limit):
+            hit = bg[r + dy : r + dy + h, r + dx : r + dx + w] & (dist > d)
+            dist[hit] = d
+        return dist
+
+    def gaussian(self, arr: np.ndarray, sigma: float) -> np.ndarray:
+        out = arr.astype(float)
+        radius = int(4.0 * sigma + 0.5)  # same truncation as scipy.ndimage.gaussian_filter
+        if radius < 1:
+            return out
+        x = np.arange(-radius, radius + 1, dtype=float)
+        k = np.exp(-0.5 * (x / sigma) ** 2)
+        k /= k.sum()
+        for axis in (0, 1):
+            n = out.shape[axis]
+            pad = [(0, 0), (0, 0)]
+            pad[axis] = (radius, radius)
+            padded = np.pad(out, pad, mode="symmetric")
+            acc = np.zeros_like(out)
+            for i, wgt in enumerate(k):
+                acc += wgt * (padded[i : i + n, :] if axis == 0 else padded[:, i : i + n])
+            out = acc
+        return out
+
+    def upsample(self, low: np.ndarray, height: int, width: int) -> np.ndarray:
+        out = low.astype(float)
+        for axis, n_out in ((0, height), (1, width)):
+            n_in = out.shape[axis]
+            # 【繁】與 scipy.ndimage.zoom 相同的座標對應：兩端對齊
+            # [EN] Same coordinate mapping as scipy.ndimage.zoom: endpoints aligned
+            x = np.arange(n_out) * ((n_in - 1) / (n_out - 1) if n_out > 1 else 0.0)
+            i0 = np.floor(x).astype(int)
+            wts = _cubic_weights(x - i0)
+            acc = np.zeros((n_out, out.shape[1]) if axis == 0 else (out.shape[0], n_out))
+            for tap in range(4):
+                idx = np.clip(i0 + tap - 1, 0, n_in - 1)
+                if axis == 0:
+                    acc += wts[tap][:, None] * out[idx, :]
+                else:
+                    acc += wts[tap][None, :] * out[:, idx]
+            out = acc
+        return out
+
+
+# =========================
+# 【Pillow】
+# =========================
+
+
+class PillowInkBackend(InkBackend):
+    # 【繁】Pillow C 濾鏡：MinFilter 逐層腐蝕（棋盤距離近似）、GaussianBlur（8 位元）、BICUBIC 縮放
+    # [EN] Pillow C filters: layered MinFilter erosion (chessboard-distance approximation), 8-bit GaussianBlur,
+    #      BICUBIC resize
+    name = "pillow"
+
+    def distance_inside(self, inside: np.ndarray, limit: float) -> np.ndarray:
+        from PIL import Image, ImageFilter
+
+        layer = Image.fromarray(inside.astype(np.uint8) * 255, mode="L")
+        dist = np.zeros(inside.shape, dtype=np.float32)
+        for _ in range(int(math.ceil(limit))):
+            dist += np.asarray(layer) > 0
+            layer = layer.filter(ImageFilter.MinFilter(3))
+        out: np.ndarray = np.minimum(dist, np.float32(limit))
+        return out
+
+    def gaussian(self, arr: np.ndarray, sigma: float) -> np.ndarray:
+        from PIL import Image, ImageFilter
+
+        img = Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8), mode="L")
+        return np.asarray(img.filter(ImageFilter.GaussianBlur(radius=sigma)), dtype=float)
+
+    def upsample(self, low: np.ndarray, height: int, width: int) -> np.ndarray:
+        from PIL import Image
+
+        img = Image.fromarray(low.astype(np.float32), mode="F")
+        return np.asarray(img.resize((width, height), resample=Image.Resampling.BICUBIC), dtype=float)
+
+
+# =========================
+# 【註冊表 / Registry】
+# =========================
+
+_FACTORIES: dict[str, Callable[[], InkBackend]] = {
+    "scipy": ScipyInkBackend,
+    "numpy": NumpyInkBackend,
+    "pillow": PillowInkBackend,
+}
+_INSTANCES: dict[str, InkBackend] = {}
+
+
+def register_ink_backend(name: str, factory: Callable[[], InkBackend]) -> None:
+    # 【繁】註冊自訂後端（例如 GPU 實作）
+    # [EN] Register a custom backend (e.g. a GPU implementation)
+    _FACTORIES[name] = factory
+    _INSTANCES.pop(name, None)
+
+
+def available_ink_backends() -> list[str]:
+    # 【繁】可用後端名稱（未安裝 SciPy 時不含 "scipy"）
+    # [EN] Names of usable backends ("scipy" is omitted when SciPy is not installed)
+    names = list(_FACTORIES)
+    if importlib.util.find_spec("scipy") is None:
+        names.remove("scipy")
+    return names
+
+
+def get_ink_backend(name: str = "auto") -> InkBackend:
+    """
+    【繁】按名取得後端（行程內單例）。"auto" = 已安裝 SciPy 則用 SciPy，否則純 NumPy。
+    [EN] Get a backend by name (one instance per process). "auto" = SciPy when installed, else pure NumPy.
+    """
+    if name == "auto":
+        name = "scipy" if importlib.util.find_spec("scipy") is not None else "numpy"
+    backend = _INSTANCES.get(name)
+    if backend is None:
+        factory = _FACTORIES.get(name)
+        if factory is None:
+            raise ValueError(f"unknown ink backend {name!r}; choose from {sorted(_FACTORIES)} or 'auto'")
+        backend = _INSTANCES[name] = factory()
+    return backend
@@ -5,12 +5,18 @@
 
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
-
-from PIL import Image
+from typing import TYPE_CHECKING
 
 from .types import Color
 
+if TYPE_CHECKING:
+    import numpy as np
+    from PIL import Image
+
+    from .paper import Paper
+
 
 @dataclass
 class ScrollCanvas:
@@ -19,9 +25,17 @@ class ScrollCanvas:
     height: int
     bg: Color = (245, 240, 225)
 
+    # 【繁】紙張材質（None 為純色底）
+    # [EN] Paper material (None for a flat color)
+    paper: Paper | None = None
+
     def new_image(self, width: int) -> Image.Image:
-        # 【繁】建立 RGB 畫布
-        # [EN] Create an RGB canvas
+        # 【繁】建立 RGB 畫布；有紙張材質時以紙紋磚平鋪
+        # [EN] Create an RGB canvas, tiled with the paper texture when one is set
+        from PIL import Image
+
+        if self.paper is not None:
+            return self.paper.fill((width, self.height), self.bg)
         return Image.new("RGB", (width, self.height), self.bg)
 
 
@@ -41,3 +55,85 @@ class Margins:
     bottom: int = 200
     right: int = 250
     left: int = 250
+
+
+@dataclass
+class FlowSpec:
+    # 【繁】游走軸線排法：每列的軸線是一根阻尼彈簧，想保持在網格位置，又被上一列（右鄰）的墨跡輪廓推開或吸近
+    # [EN] Flowing-axis layout: each column axis is a damped spring that wants to stay on its grid position but is
+    #      pushed away from, or drawn towards, the ink contour of the previous (right-hand) column
+    # 【繁】與右鄰墨跡的最小間隙；None 為 col_spacing - font_size（網格排法中字身之間的空隙）
+    # [EN] Minimum clearance to the neighbour's ink; None for col_spacing - font_size (the gap between em boxes in
+    #      the grid layout)
+    gap: int | None = None
+    # 【繁】軸線離網格位置的最大偏移（col_spacing 的比例）；防碰撞優先於此上限
+    # [EN] Largest offset of the axis from its grid position (fraction of col_spacing); avoiding collisions wins
+    #      over this limit
+    max_shift: float = 0.25
+    stiffness: float = 0.35
+    damping: float = 0.5
+    # 【繁】輪廓沿 y 的取樣間距（像素）/ [EN] Sampling step of the contour along y (pixels)
+    bin: int = 4
+
+    def axes(self, target: float, ceiling: np.ndarray, col_spacing: int) -> list[float]:
+        """
+        【繁】一列各字的軸線 x。ceiling[i] 為第 i 字與右鄰保持間隙時軸線可到的最右處（+inf 為無鄰）；
+        軸線以彈簧趨向 ceiling（咬合），限於網格位置 target 的 ±max_shift 內，並且永不越過 ceiling。
+        [EN] Axis x of each glyph in a column. ceiling[i] is the rightmost axis position at which glyph i keeps its
+        clearance from the right-hand neighbour (+inf when there is none); the axis springs towards the ceiling
+        (interlocking), within ±max_shift of the grid position `target`, and never passes the ceiling.
+        """
+        import numpy as np
+
+        shift = self.max_shift * col_spacing
+        goals = np.clip(np.where(np.isfinite(ceiling), ceiling, target), target - shift, target + shift)
+        out: list[float] = []
+        x, v = float(min(goals[0], ceiling[0])) if len(goals) else target, 0.0
+        for goal, cap in zip(goals.tolist(), ceiling.tolist(), strict=True):
+            nx = min(x + self.damping * v + self.stiffness * (goal - x), cap)
+            x, v = nx, nx - x
+            out.append(x)
+        return out
+
+
+class Skyline:
+    """
+    【繁】一列墨跡朝左的輪廓：沿 y 每 bin 像素記錄墨跡最左的 x（無墨為 +inf）。逐字增量更新，
+    並以向量化方式對一整列的 y 區間批次查詢；兩者皆與字數成線性。
+    [EN] The left-facing ink contour of a column: for every `bin` pixels along y, the leftmost inked x (+inf where
+    there is no ink). Updated incrementally glyph by glyph and queried for a whole column of y ranges at once with
+    vectorized lookups; both are linear in the number of glyphs.
+    """
+
+    def __init__(self, y0: float, height: float, bin: int = 4) -> None:
+        import numpy as np
+
+        self.y0 = y0
+        self.bin = max(1, int(bin))
+        # 【繁】末尾多一格 +inf，供 reduceat 的區間終點使用 / [EN] One extra +inf cell as the end point for reduceat
+        self.edge = np.full(int(math.ceil(height / self.bin)) + 2, np.inf)
+
+    def _bins(self, top: np.ndarray, bottom: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        import numpy as np
+
+        n = self.edge.size - 1
+        b0 = np.clip(np.floor((np.asarray(top) - self.y0) / self.bin).astype(np.intp), 0, n - 1)
+        b1 = np.clip(np.ceil((np.asarray(bottom) - self.y0) / self.bin).astype(np.intp), 0, n)
+        return b0, np.maximum(b1, b0 + 1)
+
+    def add(self, top: np.ndarray, bottom: np.ndarray, left: np.ndarray) -> None:
+        # 【繁】記入若干字的墨跡（y 區間 [top, bottom)、左緣 left）/ [EN] Record glyph ink spans [top, bottom) at `left`
+        import numpy as np
+
+        b0, b1 = self._bins(top, bottom)
+        counts = b1 - b0
+        starts = np.repeat(b0 - np.cumsum(counts) + counts, counts)
+        np.minimum.at(self.edge, starts + np.arange(counts.sum()), np.repeat(np.asarray(left, dtype=float), counts))
+
+    def limits(self, top: np.ndarray, bottom: np.ndarray) -> np.ndarray:
+        # 【繁】各 y 區間內墨跡最左的 x / [EN] Leftmost inked x within each y range
+        import numpy as np
+
+        b0, b1 = self._bins(top, bottom)
+        out: np.ndarray = np.minimum.reduceat(self.edge, np.column_stack([b0, b1]).ravel())[::2]
+        return out
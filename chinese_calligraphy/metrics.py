@@ -0,0 +1,270 @@
+# chinese_calligraphy/metrics.py
+
+# 【繁】字形度量索引：每個字體對其字符表中的每個字預先量好墨跡包圍盒、墨量比、重心與輪廓點數，
+#       只建一次（多執行緒），以 NumPy 檔存於磁碟快取；排版與筆刷按整段文字批次查詢，不必逐字光柵化
+# [EN] Glyph metrics index: for every character in a font's cmap, the ink bounding box, ink area ratio, centroid and
+#      outline point count are measured ahead of time, built once (multi-threaded) and stored as a NumPy file in
+#      the on-disk cache; layouts and the brush query whole runs of text in bulk instead of rasterizing glyphs
+
+from __future__ import annotations
+
+import hashlib
+import os
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from .utils import cache_dir
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# 【繁】磁碟快取格式版本：量測方式改變時遞增，使舊索引失效
+# [EN] On-disk format version: bump when the measurements change so stale indexes are ignored
+_METRICS_VERSION = 1
+
+# 【繁】沒有 fontTools 時無法讀字符表，改量這些常用區段（略過缺字）
+# [EN] Without fontTools the cmap cannot be read; these common blocks are measured instead (missing glyphs skipped)
+_FALLBACK_RANGES = ((0x20, 0x7F), (0x3000, 0x3040), (0x4E00, 0xA000), (0xFF00, 0xFFF0))
+
+_FIELDS = ("codepoints", "bbox", "ink_ratio", "centroid", "points", "density")
+
+
+@dataclass(frozen=True, eq=False)
+class FontMetrics:
+    """
+    【繁】一個字體的字形度量（按碼位排序的平行陣列）。長度量以字號為單位、相對於字心
+    （Brush 定位字的點）；y 向下。
+    [EN] Glyph metrics of one font, as parallel arrays sorted by code point. Lengths are in units of the font size
+    and relative to the glyph center (the point the brush positions a glyph by); y points down.
+    """
+
+    codepoints: np.ndarray  # (N,) int32
+    bbox: np.ndarray  # (N, 4) float32：x0, y0, x1, y1
+    ink_ratio: np.ndarray  # (N,) float32：墨跡面積 / 字號² / inked area / font size²
+    centroid: np.ndarray  # (N, 2) float32
+    points: np.ndarray  # (N,) int32：輪廓點數，無 fontTools 時為 0 / outline points, 0 without fontTools
+    density: np.ndarray  # (N,) float32：筆畫密度排名 [0, 1] / stroke-density rank in [0, 1]
+
+    def __len__(self) -> int:
+        return int(self.codepoints.size)
+
+    def __contains__(self, ch: object) -> bool:
+        return isinstance(ch, str) and len(ch) == 1 and bool(self.lookup(ch)[0] >= 0)
+
+    def lookup(self, text: str) -> np.ndarray:
+        # 【繁】各字在陣列中的位置；缺字為 -1 / [EN] Row of each character in the arrays; -1 when missing
+        import numpy as np
+
+        cps = np.fromiter((ord(c) for c in text), dtype=np.int64, count=len(text))
+        if not len(self):
+            return np.full(cps.size, -1, dtype=np.intp)
+        i = np.minimum(np.searchsorted(self.codepoints, cps), len(self) - 1)
+        out: np.ndarray = np.where(self.codepoints[i] == cps, i, -1)
+        return out
+
+    def ink_bboxes(self, text: str, font_size: float) -> np.ndarray:
+        """
+        【繁】各字墨跡包圍盒（像素，相對字心）；缺字以整個字身 ±font_size/2 代替。
+        [EN] Ink bounding box of each character (pixels, relative to the glyph center); missing characters fall
+        back to the full em box ±font_size/2.
+        """
+        import numpy as np
+
+        i = self.lookup(text)
+        em = np.array([-0.5, -0.5, 0.5, 0.5], dtype=np.float32)
+        out: np.ndarray = np.where((i >= 0)[:, None], self.bbox[np.maximum(i, 0)], em) * font_size
+        return out
+
+    def densities(self, text: str) -> np.ndarray:
+        # 【繁】各字筆畫密度 [0, 1]；缺字為 0.5 / [EN] Stroke density of each character in [0, 1]; 0.5 when missing
+        import numpy as np
+
+        i = self.lookup(text)
+        out: np.ndarray = np.where(i >= 0, self.density[np.maximum(i, 0)], np.float32(0.5))
+        return out
+
+
+# =========================
+# 【量測 / Measuring】
+# =========================
+
+
+def _cmap_and_points(font_path: str) -> tuple[list[int], dict[int, int]] | None:
+    # 【繁】以 fontTools 讀字符表與輪廓點數；未安裝則回傳 None
+    # [EN] Read the cmap and outline point counts with fontTools; None when it is not installed
+    try:
+        from fontTools.pens.recordingPen import RecordingPen  # type: ignore
+        from fontTools.ttLib import TTFont  # type: ignore
+    except ImportError:
+        return None
+
+    tt = TTFont(font_path, lazy=True)
+    cmap = tt.getBestCmap() or {}
+    glyph_set = tt.getGlyphSet()
+    per_glyph: dict[str, int] = {}
+    points: dict[int, int] = {}
+    for cp, name in cmap.items():
+        if name not in per_glyph:
+            pen = RecordingPen()
+            glyph_set[name].draw(pen)
+            per_glyph[name] = sum(len(args) for _, args in pen.value)
+        points[cp] = per_glyph[name]
+    return sorted(cmap), points
+
+
+def _measure(font_path: str, codepoints: Sequence[int], size: int, skip_notdef: bool) -> np.ndarray:
+    # 【繁】以 size 像素光柵化（與 Brush 相同的置中方式）量每個字；每列 [bbox(4), 墨量, 重心(2)]，缺字整列為 NaN
+    # [EN] Rasterize each glyph at `size` px (centered as the brush does) and measure it; each row is
+    #      [bbox(4), ink, centroid(2)], all NaN for a missing glyph
+    import numpy as np
+    from PIL import Image, ImageDraw, ImageFont
+
+    # 【繁】每個執行緒各自載入字體：FreeType 物件不可跨執行緒共用
+    # [EN] Each thread loads its own font: FreeType objects must not be shared across threads
+    font = ImageFont.truetype(font_path, size)
+    n = size * 2
+    img = Image.new("L", (n, n), 0)
+    draw = ImageDraw.Draw(img)
+    origin = (n // 2 - size // 2, n // 2 - size // 2)
+    ys, xs = np.mgrid[0:n, 0:n].astype(np.float32)
+
+    notdef = None
+    if skip_notdef:
+        draw.text(origin, "\U0010fffd", font=font, fill=255)
+        notdef = img.tobytes()
+
+    out = np.full((len(codepoints), 7), np.nan, dtype=np.float32)
+    for row, cp in enumerate(codepoints):
+        draw.rectangle((0, 0, n, n), fill=0)
+        draw.text(origin, chr(cp), font=font, fill=255)
+        bbox = img.getbbox()
+        if bbox is None or (notdef is not None and img.tobytes() == notdef):
+            continue
+        a = np.asarray(img, dtype=np.float32) / 255.0
+        ink = float(a.sum())
+        cx, cy = float((a * xs).sum()) / ink, float((a * ys).sum()) / ink
+        out[row] = (*bbox, ink, cx, cy)
+    half = n / 2
+    out[:, [0, 2, 5]] = (out[:, [0, 2, 5]] - half) / size
+    out[:, [1, 3, 6]] = (out[:, [1, 3, 6]] - half) / size
+    out[:, 4] /= size * size
+    return out
+
+
+def _rank(v: np.ndarray) -> np.ndarray:
+    # 【繁】百分位排名 [0, 1] / [EN] Percentile rank in [0, 1]
+    import numpy as np
+
+    r = np.empty(v.size, dtype=np.float32)
+    r[np.argsort(v, kind="stable")] = np.arange(v.size, dtype=np.float32)
+    out: np.ndarray = r / max(1, v.size - 1)
+    return out
+
+
+def build_font_metrics(font_path: str, size: int = 64, workers: int | None = None) -> FontMetrics:
+    """
+    【繁】量測字體字符表中的每個字（有 fontTools 時讀字符表與輪廓點數，否則量常用區段），分塊多執行緒進行。
+    筆畫密度為墨量比與輪廓點數兩個排名的平均。
+    [EN] Measure every character in the font's cmap (read with fontTools, along with outline point counts; common
+    blocks are measured instead without it), in chunks across threads. Stroke density is the mean of the ink-ratio
+    rank and the outline-point rank.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    import numpy as np
+
+    found = _cmap_and_points(font_path)
+    if found is None:
+        cps = [cp for lo, hi in _FALLBACK_RANGES for cp in range(lo, hi)]
+        point_of: dict[int, int] = {}
+    else:
+        cps, point_of = found
+
+    step = 512
+    chunks = [cps[i : i + step] for i in range(0, len(cps), step)]
+    workers = workers or min(8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+        parts = list(ex.map(lambda c: _measure(font_path, c, size, found is None), chunks))
+    rows = np.concatenate(parts) if parts else np.zeros((0, 7), dtype=np.float32)
+
+    keep = ~np.isnan(rows[:, 4])
+    codepoints = np.asarray(cps, dtype=np.int32)[keep]
+    rows = rows[keep]
+    points = np.asarray([point_of.get(int(cp), 0) for cp in codepoints], dtype=np.int32)
+    density = _rank(rows[:, 4])
+    if points.any():
+        density = (density + _rank(points.astype(np.float32))) / 2
+    return FontMetrics(
+        codepoints=codepoints,
+        bbox=np.ascontiguousarray(rows[:, 0:4]),
+        ink_ratio=np.ascontiguousarray(rows[:, 4]),
+        centroid=np.ascontiguousarray(rows[:, 5:7]),
+        points=points,
+        density=density.astype(np.float32),
+    )
+
+
+@lru_cache(maxsize=256)
+def _text_bboxes(font_path: str, text: str) -> np.ndarray:
+    # 【繁】只量 text 中的字（按索引的量測方式，缺字為 NaN）/ [EN] Measure only the characters of text (as the
+    #      index does; NaN for missing glyphs)
+    return _measure(font_path, [ord(c) for c in text], 64, skip_notdef=True)[:, 0:4]
+
+
+def glyph_ink_bboxes(font_path: str, text: str, font_size: float) -> np.ndarray:
+    """
+    【繁】同 FontMetrics.ink_bboxes，但只量 text 中的字，不建立（也不讀取）整個字體的索引；供只需幾個字的排版用。
+    [EN] Same as FontMetrics.ink_bboxes, but measures only the characters of text without building (or loading)
+    the whole font's index; for layouts that need a handful of glyphs.
+    """
+    import numpy as np
+
+    bbox = _text_bboxes(font_path, text)
+    em = np.array([-0.5, -0.5, 0.5, 0.5], dtype=np.float32)
+    out: np.ndarray = np.where(np.isnan(bbox[:, :1]), em, bbox) * font_size
+    return out
+
+
+# =========================
+# 【索引快取 / Index cache】
+# =========================
+
+
+def _index_path(font_path: str) -> str:
+    # 【繁】快取檔名含字體檔的路徑、大小與修改時間，字體更新後自動重建
+    # [EN] The cache file name covers the font file's path, size and mtime, so an updated font is re-indexed
+    st = os.stat(font_path)
+    key = f"{os.path.abspath(font_path)}:{st.st_size}:{st.st_mtime_ns}".encode()
+    stem = os.path.splitext(os.path.basename(font_path))[0]
+    return cache_dir("metrics", f"{stem}-{hashlib.sha1(key).hexdigest()[:12]}-v{_METRICS_VERSION}.npz")
+
+
+@lru_cache(maxsize=8)
+def font_metrics(font_path: str) -> FontMetrics:
+    """
+    【繁】取得字體的度量索引；先查記憶體，再查磁碟快取（見 utils.cache_dir），皆無則建立並寫回磁碟。
+    [EN] Get a font's metrics index; looked up in memory, then in the on-disk cache (see utils.cache_dir), and built
+    and written back to disk when missing.
+    """
+    import numpy as np
+
+    path = _index_path(font_path)
+    try:
+        with np.load(path) as data:
+            return FontMetrics(**{k: data[k] for k in _FIELDS})
+    except Exception:
+        # 【繁】不存在或損壞：重新建立 / [EN] Missing or corrupt: build again
+        pass
+
+    metrics = build_font_metrics(font_path)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.partial-{os.getpid()}.npz"
+        np.savez_compressed(tmp, **{k: getattr(metrics, k) for k in _FIELDS})  # type: ignore[arg-type]
+        os.replace(tmp, path)
+    except OSError:
+        # 【繁】唯讀或無權限：僅保留記憶體快取 / [EN] Read-only or no permission: keep the in-memory cache only
+        pass
+    return metrics
@@ -0,0 +1,459 @@
+# chinese_calligraphy/output.py
+
+# 【繁】輸出管線：格式與速度選項（PNG 壓縮級別、WebP、JPEG 品質、LZW/Deflate TIFF）、原子寫檔、
+#       大圖分條並行壓縮（PNG 與 Deflate TIFF），以及在背景執行緒編碼寫檔的 ImageWriter，使下一件作品在
+#       上一件壓縮時即可開始渲染
+# [EN] Output pipeline: format and speed options (PNG compression level, WebP, JPEG quality, LZW/Deflate TIFF),
+#      atomic writes, parallel strip compression for large images (PNG and Deflate TIFF), and ImageWriter, which
+#      encodes and writes on a background thread so the next work can render while the previous one compresses
+
+from __future__ import annotations
+
+import io
+import os
+import struct
+import threading
+import zlib
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    from PIL import Image
+
+# 【繁】副檔名 → Pillow 格式名 / [EN] File extension → Pillow format name
+FORMATS = {"png": "PNG", "jpg": "JPEG", "jpeg": "JPEG", "webp": "WEBP", "tif": "TIFF", "tiff": "TIFF"}
+
+TIFF_COMPRESSIONS = ("tiff_deflate", "tiff_lzw", "raw")
+
+# 【繁】小於此像素數的圖不值得分條並行 / [EN] Images below this many pixels are not worth splitting into strips
+_STRIP_MIN_PIXELS = 2_000_000
+
+# 【繁】可分條編碼的模式：模式 → (通道數, PNG 色彩類型, TIFF 光度解讀)
+# [EN] Modes the strip encoders handle: mode → (channels, PNG color type, TIFF photometric interpretation)
+_STRIP_MODES = {"L": (1, 0, 1), "RGB": (3, 2, 2), "RGBA": (4, 6, 2)}
+
+
+@dataclass(frozen=True)
+class OutputOptions:
+    """
+    【繁】輸出格式與速度選項。format 省略時按副檔名推斷（未知則 PNG）。
+    PNG 的 compress_level 1 比預設 6 快數倍、檔案略大；strip_threads 為分條並行壓縮的執行緒數
+    （None = CPU 數，1 = 關閉），用於大幅 PNG 與 Deflate TIFF。
+    [EN] Output format and speed options. format defaults to the one implied by the file extension (PNG when
+    unknown). PNG compress_level 1 is several times faster than the default 6 for slightly larger files;
+    strip_threads is the number of threads for parallel strip compression (None = CPU count, 1 = off), used for
+    large PNG and Deflate TIFF images.
+    """
+
+    format: str | None = None
+    compress_level: int = 6  # PNG zlib level 0-9 (also the Deflate level of strip-encoded TIFF)
+    quality: int = 90  # JPEG and lossy WebP, 1-100
+    lossless: bool = False  # WebP
+    method: int = 4  # WebP effort 0 (fast) - 6 (small)
+    tiff_compression: str = "tiff_deflate"
+    strip_threads: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.format is not None and self.format.lower() not in FORMATS:
+            raise ValueError(f"unknown output format {self.format!r}; choose from {sorted(FORMATS)}")
+        if not 0 <= self.compress_level <= 9:
+            raise ValueError("compress_level must be in 0..9")
+        if not 1 <= self.quality <= 100:
+            raise ValueError("quality must be in 1..100")
+        if self.tiff_compression not in TIFF_COMPRESSIONS:
+            raise ValueError(f"tiff_compression must be one of {TIFF_COMPRESSIONS}")
+        if self.strip_threads is not None and self.strip_threads < 1:
+            raise ValueError("strip_threads must be >= 1")
+
+    def resolve_format(self, path: str | None = None) -> str:
+        # 【繁】Pillow 格式名：先看 format，再看副檔名，否則 PNG
+        # [EN] Pillow format name: from format, else from the path extension, else PNG
+        if self.format is not None:
+            return FORMATS[self.format.lower()]
+        ext = os.path.splitext(path or "")[1].lstrip(".").lower()
+        return FORMATS.get(ext, "PNG")
+
+    def extension(self) -> str:
+        # 【繁】format 對應的副檔名（未指定為 .png）/ [EN] Extension for format (.png when unset)
+        return {"PNG": ".png", "JPEG": ".jpg", "WEBP": ".webp", "TIFF": ".tif"}[self.resolve_format()]
+
+
+# =========================
+# 【編碼 / Encoding】
+# =========================
+
+
+def write_image(img: Image.Image, fp: BinaryIO, fmt: str, options: OutputOptions | None = None) -> None:
+    """
+    【繁】按格式與選項將圖像編碼寫入檔案物件；大幅 PNG 與 Deflate TIFF 分條並行壓縮。
+    [EN] Encode an image into a binary file object with the given format and options; large PNG and Deflate TIFF
+    images are compressed in parallel strips.
+    """
+    opts = options or OutputOptions()
+    threads = opts.strip_threads or os.cpu_count() or 1
+    strips = threads > 1 and img.width * img.height >= _STRIP_MIN_PIXELS and img.mode in _STRIP_MODES
+    if fmt == "PNG":
+        if strips:
+            _write_png_strips(img, fp, opts.compress_level, threads)
+        else:
+            img.save(fp, format="PNG", compress_level=opts.compress_level)
+    elif fmt == "TIFF":
+        if strips and opts.tiff_compression == "tiff_deflate":
+            _write_tiff_strips(img, fp, opts.compress_level, threads)
+        else:
+            img.save(fp, format="TIFF", compression=None if opts.tiff_compression == "raw" else opts.tiff_compression)
+    elif fmt == "JPEG":
+        img.convert("RGB").save(fp, format="JPEG", quality=opts.quality)
+    elif fmt == "WEBP":
+        img.save(fp, format="WEBP", quality=opts.quality, lossless=opts.lossless, method=opts.method)
+    else:
+        raise ValueError(f"unsupported output format {fmt!r}")
+
+
+def encode_image(img: Image.Image, options: OutputOptions | None = None, fmt: str | None = None) -> bytes:
+    # 【繁】編碼為位元組（格式：fmt，否則 options.format，否則 PNG）
+    # [EN] Encode to bytes (format: fmt, else options.format, else PNG)
+    buf = io.BytesIO()
+    write_image(img, buf, fmt or (options or OutputOptions()).resolve_format(), options)
+    return buf.getvalue()
+
+
+def save_image(img: Image.Image, path: str, options: OutputOptions | None = None, fmt: str | None = None) -> str:
+    """
+    【繁】原子寫檔：先寫暫存檔再改名，中斷時不會留下半張圖；格式見 OutputOptions.resolve_format。回傳 path。
+    [EN] Atomic save: write to a temp file, then rename, so an interruption never leaves a half-written image; the
+    format follows OutputOptions.resolve_format. Returns path.
+    """
+    opts = options or OutputOptions()
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    root, ext = os.path.splitext(path)
+    tmp = f"{root}.partial-{os.getpid()}-{threading.get_ident()}{ext}"
+    try:
+        with open(tmp, "wb") as fp:
+            write_image(img, fp, fmt or opts.resolve_format(path), opts)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return path
+
+
+# =========================
+# 【分條並行壓縮 / Parallel strip compression】
+# =========================
+
+
+def _rows(img: Image.Image) -> tuple[Any, int]:
+    # 【繁】像素陣列，每列攤平為 (寬 × 通道) 位元組 / [EN] Pixel array with each row flattened to width × channels bytes
+    import numpy as np
+
+    channels = _STRIP_MODES[img.mode][0]
+    return np.asarray(img, dtype=np.uint8).reshape(img.height, img.width * channels), channels
+
+
+def _strip_map(fn: Callable[[Any, bool], bytes], rows: Any, threads: int) -> list[bytes]:
+    # 【繁】按列切成約 2 × threads 條，在執行緒池上壓縮（zlib 壓縮時釋放 GIL），按序回傳
+    # [EN] Cut rows into about 2 × threads strips and compress them on a thread pool (zlib releases the GIL while
+    #      compressing), returning them in order
+    from concurrent.futures import ThreadPoolExecutor
+
+    step = max(1, -(-rows.shape[0] // (threads * 2)))
+    parts = [rows[i : i + step] for i in range(0, rows.shape[0], step)]
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="calligraphy-encode") as pool:
+        return list(pool.map(fn, parts, [i == len(parts) - 1 for i in range(len(parts))]))
+
+
+def _write_png_strips(img: Image.Image, fp: BinaryIO, level: int, threads: int) -> None:
+    # 【繁】以 Up 濾波後分條壓縮：各條為無結尾的原始 Deflate 區塊（以 full flush 對齊位元組），串接即成一個
+    #       zlib 串流（pigz 的做法）；Adler-32 對整段未壓縮資料計算
+    # [EN] Up-filter, then compress in strips: each strip is raw Deflate without a final block (byte-aligned by a
+    #      full flush), so the strips concatenate into one zlib stream (as pigz does); Adler-32 covers all of the
+    #      uncompressed data
+    raw = _up_filtered(img)
+
+    def deflate(part: Any, last: bool) -> bytes:
+        co = zlib.compressobj(level, zlib.DEFLATED, -15)
+        return co.compress(part) + co.flush(zlib.Z_FINISH if last else zlib.Z_FULL_FLUSH)
+
+    body = _strip_map(deflate, raw, threads)
+    body[0] = b"\x78\x9c" + body[0]
+    body[-1] += struct.pack(">I", zlib.adler32(raw.data))
+    fp.write(_PNG_SIGNATURE)
+    fp.write(_png_chunk(b"IHDR", _png_header(img)))
+    for data in body:
+        fp.write(_png_chunk(b"IDAT", data))
+    fp.write(_png_chunk(b"IEND", b""))
+
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def _png_header(img: Image.Image) -> bytes:
+    return struct.pack(">IIBBBBB", img.width, img.height, 8, _STRIP_MODES[img.mode][1], 0, 0, 0)
+
+
+def _up_filtered(img: Image.Image) -> Any:
+    # 【繁】PNG 掃描列：每列前置濾波類型 Up，減去上一列 / [EN] PNG scanlines: filter type Up, minus the row above
+    import numpy as np
+
+    a, _ = _rows(img)
+    raw = np.empty((a.shape[0], a.shape[1] + 1), dtype=np.uint8)
+    raw[:, 0] = 2
+    raw[:, 1:] = a
+    raw[1:, 1:] -= a[:-1]
+    return raw
+
+
+def _png_data(img: Image.Image, level: int) -> bytes:
+    # 【繁】一張圖的 zlib 像素資料，整段壓縮 / [EN] zlib image data of one image, compressed in one piece
+    return zlib.compress(_up_filtered(img).data, level)
+
+
+def _write_tiff_strips(img: Image.Image, fp: BinaryIO, level: int, threads: int) -> None:
+    # 【繁】Deflate TIFF（水平差分預測）：TIFF 的每條本就獨立壓縮，各條並行壓縮後依序寫出，IFD 置於檔尾
+    # [EN] Deflate TIFF (horizontal differencing predictor): TIFF strips are compressed independently by design, so
+    #      they are compressed in parallel and written in order, with the IFD at the end of the file
+    a, channels = _rows(img)
+    pred = a.copy()
+    pred[:, channels:] -= a[:, :-channels]
+    strips = _strip_map(lambda part, _: zlib.compress(part, level), pred, threads)
+    rows_per_strip = -(-img.height // len(strips))
+
+    offsets, pos = [], 8
+    for s in strips:
+        offsets.append(pos)
+        pos += len(s)
+    bits = struct.pack(f"<{channels}H", *([8] * channels))
+    bits_at = pos
+    offsets_at = bits_at + len(bits)
+    counts_at = offsets_at + 4 * len(strips)
+    ifd_at = counts_at + 4 * len(strips)
+
+    def entry(tag: int, kind: int, count: int, value: int | bytes) -> bytes:
+        # 【繁】kind 3 = SHORT、4 = LONG；bytes 為內嵌值，int 為單一值或陣列的偏移
+        # [EN] kind 3 = SHORT, 4 = LONG; bytes are inline values, an int is a single value or an array offset
+        if isinstance(value, bytes):
+            data = value
+        else:
+            data = struct.pack("<H" if kind == 3 and count == 1 else "<I", value)
+        return struct.pack("<HHI", tag, kind, count) + data.ljust(4, b"\0")
+
+    entries = [
+        entry(256, 4, 1, img.width),
+        entry(257, 4, 1, img.height),
+        entry(258, 3, channels, bits if channels <= 2 else bits_at),
+        entry(259, 3, 1, 8),
+        entry(262, 3, 1, _STRIP_MODES[img.mode][2]),
+        entry(273, 4, len(strips), offsets_at if len(strips) > 1 else offsets[0]),
+        entry(277, 3, 1, channels),
+        entry(278, 4, 1, rows_per_strip),
+        entry(279, 4, len(strips), counts_at if len(strips) > 1 else len(strips[0])),
+        entry(284, 3, 1, 1),
+        entry(317, 3, 1, 2),
+    ]
+    if channels == 4:
+        entries.append(entry(338, 3, 1, 2))  # 【繁】非預乘 alpha / [EN] unassociated alpha
+
+    fp.write(b"II*\0" + struct.pack("<I", ifd_at))
+    for s in strips:
+        fp.write(s)
+    fp.write(bits)
+    fp.write(struct.pack(f"<{len(strips)}I", *offsets))
+    fp.write(struct.pack(f"<{len(strips)}I", *(len(s) for s in strips)))
+    fp.write(struct.pack("<H", len(entries)) + b"".join(entries) + struct.pack("<I", 0))
+
+
+# =========================
+# 【背景寫檔 / Background writer】
+# =========================
+
+
+class ImageWriter:
+    """
+    【繁】背景編碼寫檔：submit() 把圖交給背景執行緒編碼並原子寫檔後立即返回，呼叫端可接著渲染下一件；
+    排隊的圖最多 max_pending 張，滿則 submit() 等待（限制記憶體）。workers > 1 時可同時編碼多張。
+    離開 with 區塊時等候全部寫完。
+    [EN] Background encoder: submit() hands the image to a background thread, which encodes it and writes it
+    atomically, and returns right away so the caller can render the next work; at most max_pending images wait in
+    the queue, and submit() blocks while it is full (bounding memory). With workers > 1 several images are encoded
+    at once. Leaving the with block waits for every write.
+    """
+
+    def __init__(self, options: OutputOptions | None = None, max_pending: int = 2, workers: int = 1) -> None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        if max_pending < 1 or workers < 1:
+            raise ValueError("max_pending and workers must be >= 1")
+        self.options = options
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="calligraphy-writer")
+
+    def submit(self, img: Image.Image, path: str, options: OutputOptions | None = None) -> Future[str]:
+        self._slots.acquire()
+        try:
+            fut = self._pool.submit(save_image, img, path, options or self.options)
+        except BaseException:
+            self._slots.release()
+            raise
+        fut.add_done_callback(lambda _: self._slots.release())
+        return fut
+
+    def save_all(self, items: Sequence[tuple[Image.Image, str]], options: OutputOptions | None = None) -> list[str]:
+        # 【繁】寫出多張並等候完成 / [EN] Write several images and wait for them
+        return [f.result() for f in [self.submit(img, path, options) for img, path in items]]
+
+    def close(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+    def __enter__(self) -> ImageWriter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+# =========================
+# 【書寫動畫 / Writing animations】
+# =========================
+
+
+class APNGWriter:
+    """
+    【繁】串流寫出 APNG 動畫：第 0 幀為整張，其後每幀只編碼變動矩形（dispose NONE、blend SOURCE，蓋在上一幀上），
+    故寫檔成本與各幀變動面積之和成正比，而非幀數 × 畫布。每幀寫出前只暫存上一幀的壓縮資料
+    （末幀要加上 hold 秒）；幀數在關閉時回填。先寫暫存檔，關閉時原子改名；with 區塊出錯則丟棄暫存檔。
+    [EN] Streaming APNG writer: frame 0 is the whole canvas and every later frame encodes only its changed rectangle
+    (dispose NONE, blend SOURCE, over the previous frame), so writing costs the sum of the changed areas rather than
+    frames × canvas. Only the previous frame's compressed data is held before it is written (the last frame gets
+    `hold` extra seconds); the frame count is filled in on close. The file is written to a temp file and renamed
+    into place on close; if the with-block raises, the temp file is discarded instead.
+    """
+
+    def __init__(self, path: str, fps: float = 12.0, loop: int = 0, hold: float = 1.0, compress_level: int = 6) -> None:
+        if fps <= 0 or hold < 0:
+            raise ValueError("fps must be > 0 and hold >= 0")
+        self.path = path
+        self.fps = fps
+        self.loop = loop
+        self.hold = hold
+        self.compress_level = compress_level
+        self.frames = 0
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        root, ext = os.path.splitext(path)
+        self._tmp = f"{root}.partial-{os.getpid()}-{threading.get_ident()}{ext}"
+        self._fp: BinaryIO = open(self._tmp, "wb")
+        self._seq = 0
+        self._actl_at = 0
+        self._held: tuple[tuple[int, int, int, int], bytes] | None = None
+
+    def add(self, img: Image.Image, box: tuple[int, int, int, int] | None = None) -> None:
+        """
+        【繁】加入一幀：img 為目前的畫布，box 為自上一幀以來變動的矩形（None 為整張）。
+        [EN] Add a frame: img is the current canvas and box the rectangle changed since the previous frame (None for
+        all of it).
+        """
+        if self.frames == 0:
+            if img.mode not in ("RGB", "RGBA"):
+                raise ValueError("APNG frames must be RGB or RGBA")
+            self._fp.write(_PNG_SIGNATURE + _png_chunk(b"IHDR", _png_header(img)))
+            self._actl_at = self._fp.tell()
+            self._fp.write(_png_chunk(b"acTL", struct.pack(">II", 0, self.loop)))
+            box = (0, 0, img.width, img.height)
+        elif box is None:
+            box = (0, 0, img.width, img.height)
+        elif box[2] <= box[0] or box[3] <= box[1]:
+            # 【繁】沒有變動：重寫一個像素 / [EN] Nothing changed: rewrite a single pixel
+            box = (0, 0, 1, 1)
+        self._flush(1.0 / self.fps)
+        self._held = (box, _png_data(img.crop(box), self.compress_level))
+        self.frames += 1
+
+    def _flush(self, delay: float) -> None:
+        # 【繁】寫出暫存的上一幀（fcTL + IDAT/fdAT）/ [EN] Write the held previous frame (fcTL + IDAT/fdAT)
+        if self._held is None:
+            return
+        (x0, y0, x1, y1), data = self._held
+        ms = max(1, round(delay * 1000))
+        fctl = struct.pack(">IIIIIHHBB", self._seq, x1 - x0, y1 - y0, x0, y0, min(ms, 65535), 1000, 0, 0)
+        self._fp.write(_png_chunk(b"fcTL", fctl))
+        self._seq += 1
+        if self.frames == 1:
+            self._fp.write(_png_chunk(b"IDAT", data))
+        else:
+            self._fp.write(_png_chunk(b"fdAT", struct.pack(">I", self._seq) + data))
+            self._seq += 1
+        self._held = None
+
+    def close(self) -> str:
+        # 【繁】寫出末幀、回填幀數並改名；回傳路徑 / [EN] Write the last frame, fill in the count, rename; returns the path
+        if self._fp.closed:
+            return self.path
+        try:
+            if self.frames == 0:
+                raise ValueError("no frames were added")
+            self._flush(1.0 / self.fps + self.hold)
+            self._fp.write(_png_chunk(b"IEND", b""))
+            self._fp.seek(self._actl_at)
+            self._fp.write(_png_chunk(b"acTL", struct.pack(">II", self.frames, self.loop)))
+            self._fp.close()
+            os.replace(self._tmp, self.path)
+        finally:
+            self._fp.close()
+            if os.path.exists(self._tmp):
+                os.remove(self._tmp)
+        return self.path
+
+    def discard(self) -> None:
+        # 【繁】放棄未完成的動畫：關檔並刪除暫存檔，不改名 / [EN] Abandon an unfinished animation: close, remove the temp
+        self._fp.close()
+        if os.path.exists(self._tmp):
+            os.remove(self._tmp)
+
+    def __enter__(self) -> APNGWriter:
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *exc: object) -> None:
+        # 【繁】區塊出錯時只丟棄，不蓋過原本的例外 / [EN] If the block raised, only discard; never mask the original error
+        if exc_type is not None:
+            self.discard()
+        else:
+            self.close()
+
+
+def save_apng(
+    frames: Iterable[Any], path: str, fps: float = 12.0, loop: int = 0, hold: float = 1.0, compress_level: int = 6
+) -> int:
+    """
+    【繁】把 iter_frames() 的幀串流寫成 APNG（見 APNGWriter）；回傳幀數。
+    [EN] Stream the frames from iter_frames() into an APNG (see APNGWriter); returns the frame count.
+    """
+    with APNGWriter(path, fps, loop, hold, compress_level) as writer:
+        for frame in frames:
+            writer.add(frame.image, frame.box)
+    return writer.frames
+
+
+def save_frames(
+    frames: Iterable[Any], pattern: str, options: OutputOptions | None = None, max_pending: int = 4
+) -> list[str]:
+    """
+    【繁】把各幀存為編號圖檔，pattern 以 {frame} 代入幀號（從 0 起），例如 "out/f-{frame:04d}.png"；
+    每幀複製一份交給背景寫檔（ImageWriter），畫布即可繼續落筆。回傳寫出的路徑。
+    [EN] Save each frame as a numbered image file; pattern takes the frame number (from 0) as {frame}, e.g.
+    "out/f-{frame:04d}.png". Each frame is copied and handed to a background writer (ImageWriter), so painting
+    continues meanwhile. Returns the paths written.
+    """
+    with ImageWriter(options, max_pending=max_pending) as writer:
+        futures = [writer.submit(f.image.copy(), pattern.format(frame=f.index)) for f in frames]
+    return [f.result() for f in futures]
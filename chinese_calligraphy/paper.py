@@ -0,0 +1,199 @@
+# chinese_calligraphy/paper.py
+
+# 【繁】紙張材質：程序生成的無縫紙紋磚（生宣纖維、灑金），按 (類型, 種子, 磚尺寸) 只生成一次，
+#       存於記憶體與磁碟快取；畫布以平鋪貼磚鋪滿，代價與純色填底相當
+# [EN] Paper materials: procedurally generated seamless paper tiles (Xuan fibers, gold flecks), generated once per
+#      (kind, seed, tile size) and cached in memory and on disk; canvases are covered by pasting the tile
+#      repeatedly, which costs about the same as a flat fill
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from .types import Color
+from .utils import cache_dir
+
+if TYPE_CHECKING:
+    import numpy as np
+    from PIL import Image
+
+# 【繁】"xuan"：生宣（雲狀明暗 + 纖維）；"gold_fleck"：灑金（生宣底 + 金箔碎片）
+# [EN] "xuan": raw Xuan paper (cloudy shading + fibers); "gold_fleck": Xuan base with scattered gold leaf
+PAPER_KINDS = ("xuan", "gold_fleck")
+
+# 【繁】磁碟快取格式版本：生成演算法改變時遞增，使舊磚失效
+# [EN] On-disk format version: bump when the generator changes so stale tiles are ignored
+_TILE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Paper:
+    """
+    【繁】紙張材質規格；tile 為無縫磚邊長（像素），同一 (kind, seed, tile) 的磚只生成一次。
+    [EN] Paper material spec; tile is the side of the seamless tile in pixels, and each (kind, seed, tile) tile is
+    generated only once.
+    """
+
+    kind: str = "xuan"
+    seed: int = 0
+    tile: int = 512
+    fleck_color: Color = (214, 172, 80)
+
+    def __post_init__(self) -> None:
+        if self.kind not in PAPER_KINDS:
+            raise ValueError(f"unknown paper kind {self.kind!r}; choose from {PAPER_KINDS}")
+        if self.tile < 16:
+            raise ValueError("paper tile must be at least 16 px")
+
+    def fill(
+        self, size: tuple[int, int], bg: Color, scale: float = 1.0, origin: tuple[int, int] = (0, 0)
+    ) -> Image.Image:
+        """
+        【繁】以 bg 為底色的紙紋鋪滿 size；origin 為此區域左上角的畫布座標，使分塊鋪設的紋理彼此銜接。
+        [EN] Cover `size` with the paper texture on `bg`; origin is the canvas position of the region's top-left
+        corner, so regions filled separately line up.
+        """
+        from PIL import Image
+
+        t = _colored_tile(self, bg, max(8, int(round(self.tile * scale))))
+        n = t.width
+        img = Image.new("RGB", size)
+        x0, y0 = -(origin[0] % n), -(origin[1] % n)
+        for y in range(y0, size[1], n):
+            for x in range(x0, size[0], n):
+                img.paste(t, (x, y))
+        return img
+
+
+# =========================
+# 【無縫噪聲 / Seamless noise】
+# =========================
+
+
+def _periodic_noise(rng: np.random.Generator, size: int, cells_x: int, cells_y: int) -> np.ndarray:
+    # 【繁】週期值噪聲：格點索引取模，磚的左右、上下邊緣自然銜接；回傳 [0, 1] float32
+    # [EN] Periodic value noise: lattice indices wrap, so opposite tile edges meet seamlessly; returns float32 in
+    #      [0, 1]
+    import numpy as np
+
+    lattice = rng.random((cells_y, cells_x), dtype=np.float32)
+
+    def axis(cells: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        u = np.arange(size, dtype=np.float32) * (cells / size)
+        i = np.floor(u).astype(np.intp)
+        f = u - i
+        return i % cells, (i + 1) % cells, f * f * (3.0 - 2.0 * f)
+
+    y0, y1, fy = axis(cells_y)
+    x0, x1, fx = axis(cells_x)
+    top = lattice[y0][:, x0] * (1.0 - fx) + lattice[y0][:, x1] * fx
+    bottom = lattice[y1][:, x0] * (1.0 - fx) + lattice[y1][:, x1] * fx
+    out: np.ndarray = top * (1.0 - fy)[:, None] + bottom * fy[:, None]
+    return out
+
+
+def _fibers(rng: np.random.Generator, size: int, along: int, across: int) -> np.ndarray:
+    # 【繁】纖維：拉長的噪聲取脊線（|2n-1| 近 0 處），得細長的線狀紋
+    # [EN] Fibers: ridges (where |2n-1| is near 0) of stretched noise give long, thin threads
+    n = _periodic_noise(rng, size, along, across)
+    ridge: np.ndarray = (1.0 - abs(2.0 * n - 1.0)) ** 12
+    return ridge
+
+
+# =========================
+# 【紙紋磚 / Paper tiles】
+# =========================
+
+
+def _generate_tile(kind: str, seed: int, tile: int) -> dict[str, np.ndarray]:
+    # 【繁】明暗調製 mod（約 ±5%）；灑金另有金箔覆蓋 fleck 與金箔明暗 shade
+    # [EN] Shading modulation `mod` (about ±5%); gold fleck adds gold-leaf coverage `fleck` and its shading `shade`
+    import numpy as np
+    from PIL import Image, ImageDraw, ImageFilter
+
+    rng = np.random.default_rng([seed, PAPER_KINDS.index(kind), tile])
+
+    cloud = sum(_periodic_noise(rng, tile, c, c) * a for c, a in ((3, 0.5), (7, 0.3), (17, 0.2)))
+    fiber = _fibers(rng, tile, 5, tile // 3) - _fibers(rng, tile, tile // 3, 5) * 0.6
+    fiber = fiber + _fibers(rng, tile, 9, tile // 5).T * 0.7
+    grain = rng.random((tile, tile), dtype=np.float32)
+    mod = (cloud - 0.5) * 0.07 + fiber * 0.035 + (grain - 0.5) * 0.02
+    out = {"mod": (mod - mod.mean()).astype(np.float32)}
+
+    if kind == "gold_fleck":
+        # 【繁】金箔碎片：多數細小、少數大片；按磚尺寸平移重畫，使跨邊緣的碎片無縫
+        # [EN] Gold-leaf flakes: mostly small, a few large; each is redrawn shifted by the tile size so flakes that
+        #      cross an edge stay seamless
+        mask = Image.new("L", (tile * 2, tile * 2), 0)
+        draw = ImageDraw.Draw(mask)
+        count = max(4, tile * tile // 3500)
+        for _ in range(count):
+            cx, cy = rng.random(2) * tile
+            r = 1.0 + rng.pareto(2.5) * 2.2
+            r = min(r, tile / 20)
+            sides = int(rng.integers(4, 8))
+            angles = np.sort(rng.random(sides)) * 2 * np.pi
+            radii = r * (0.5 + rng.random(sides))
+            level = int(rng.integers(170, 256))
+            for dx in (-tile, 0, tile):
+                for dy in (-tile, 0, tile):
+                    pts = [
+                        (2 * (cx + dx + rr * np.cos(a)), 2 * (cy + dy + rr * np.sin(a)))
+                        for a, rr in zip(angles, radii, strict=True)
+                    ]
+                    draw.polygon(pts, fill=level)
+        small = mask.filter(ImageFilter.GaussianBlur(0.6)).reduce(2)
+        out["fleck"] = np.asarray(small, dtype=np.float32) / 255.0
+        out["shade"] = (0.8 + 0.4 * _periodic_noise(rng, tile, 24, 24)).astype(np.float32)
+    return out
+
+
+@lru_cache(maxsize=16)
+def paper_tile(kind: str, seed: int, tile: int) -> dict[str, np.ndarray]:
+    """
+    【繁】取得紙紋磚資料（與底色無關）；先查記憶體，再查磁碟快取（見 utils.cache_dir），皆無則生成並寫回磁碟。
+    [EN] Get the paper tile data (independent of the base color); looked up in memory, then in the on-disk cache
+    (see utils.cache_dir), and generated and written back to disk when missing.
+    """
+    import numpy as np
+
+    path = cache_dir("paper", f"{kind}-s{seed}-t{tile}-v{_TILE_VERSION}.npz")
+    try:
+        with np.load(path) as data:
+            return {k: data[k] for k in data.files}
+    except Exception:
+        # 【繁】不存在或損壞：重新生成 / [EN] Missing or corrupt: generate again
+        pass
+
+    arrays = _generate_tile(kind, seed, tile)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.partial-{os.getpid()}.npz"
+        np.savez_compressed(tmp, **arrays)  # type: ignore[arg-type]
+        os.replace(tmp, path)
+    except OSError:
+        # 【繁】唯讀或無權限：僅保留記憶體快取 / [EN] Read-only or no permission: keep the in-memory cache only
+        pass
+    return arrays
+
+
+@lru_cache(maxsize=32)
+def _colored_tile(paper: Paper, bg: Color, size: int) -> Image.Image:
+    # 【繁】按底色上色並縮放到 size 的磚（共用，不可原地修改）
+    # [EN] Tile colored for `bg` and resized to `size` (shared; must not be modified in place)
+    import numpy as np
+    from PIL import Image
+
+    data = paper_tile(paper.kind, paper.seed, paper.tile)
+    rgb = np.asarray(bg, dtype=np.float32) * (1.0 + data["mod"])[..., None]
+    if "fleck" in data:
+        a = data["fleck"][..., None]
+        gold = np.asarray(paper.fleck_color, dtype=np.float32) * data["shade"][..., None]
+        rgb = rgb * (1.0 - a) + gold * a
+    img = Image.fromarray(np.clip(rgb + 0.5, 0, 255).astype(np.uint8), mode="RGB")
+    if size != paper.tile:
+        img = img.resize((size, size), Image.Resampling.LANCZOS)
+    return img
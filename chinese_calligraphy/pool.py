@@ -0,0 +1,323 @@
+# chinese_calligraphy/pool.py
+
+# 【繁】常駐渲染行程池：工作行程預熱字體、字形快取與墨韻模組後長駐，按作業數回收以控記憶體
+# [EN] Long-lived render pool: worker processes stay alive with fonts, glyph caches and ink modules warm,
+#      and are recycled after a number of jobs to cap memory growth
+
+from __future__ import annotations
+
+import multiprocessing
+import queue
+import threading
+import time
+from collections.abc import Sequence
+from concurrent.futures import Future
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from multiprocessing.context import BaseContext
+from typing import Any
+
+from .output import FORMATS, OutputOptions, encode_image, save_image
+from .style import Style
+
+# 【繁】預熱字體：Style（連同 warm_text 字形一併預熱）或 (路徑, 字號)
+# [EN] Fonts to warm: a Style (its warm_text glyphs are pre-rasterized too) or a (path, size) pair
+FontSpec = Style | tuple[str, int]
+
+
+# =========================
+# 【工作行程 / Worker process】
+# =========================
+
+
+def _warm(fonts: Sequence[FontSpec], warm_text: str) -> None:
+    # 【繁】預熱：載入字體、預光柵化常用字形，並跑一次墨韻管線以載入 NumPy/SciPy
+    # [EN] Warm-up: load fonts, pre-rasterize common glyphs and run the ink pipeline once to load NumPy/SciPy
+    import random
+
+    from PIL import Image, ImageDraw
+
+    from .brush import Brush, glyph_mask
+    from .font import load_font
+
+    for spec in fonts:
+        path, size = (spec.font_path, spec.font_size) if isinstance(spec, Style) else spec
+        font = load_font(path, size)
+        if isinstance(spec, Style):
+            pad = max(20, size // 2)
+            for ch in warm_text:
+                glyph_mask(font, ch, size * 2 + pad * 2, size * 2 + pad * 2)
+
+    if fonts:
+        path, size = (fonts[0].font_path, fonts[0].font_size) if isinstance(fonts[0], Style) else fonts[0]
+        img = Image.new("RGB", (size * 3, size * 3))
+        Brush(seed=0).draw_char(
+            img,
+            ImageDraw.Draw(img),
+            (size, size),
+            warm_text[:1] or "永",
+            load_font(path, size),
+            (0, 0, 0),
+            random.Random(0),
+            rot=0.5,
+            shear_x=0.01,
+            scale=1.01,
+            ink_dryness=0.05,
+            blur_sigma=0.5,
+        )
+
+
+def _render_image(work: Any) -> Any:
+    # 【繁】對聯以預覽拼版為單張圖輸出；其餘作品直接 render()
+    # [EN] A couplet is output as its single preview sheet; other works use render() directly
+    from .works.couplet import Couplet
+
+    if isinstance(work, Couplet):
+        return work.preview()
+    return work.render()
+
+
+def _worker_main(conn: Connection, fonts: Sequence[FontSpec], warm_text: str) -> None:
+    _warm(fonts, warm_text)
+    while True:
+        msg = conn.recv()
+        if msg is None:
+            break
+        work, path, fmt, options = msg
+        try:
+            img = _render_image(work)
+            if fmt is not None:
+                fmt = FORMATS[fmt.lower()]
+            if path is not None:
+                result: bytes | str = save_image(img, path, options, fmt)
+            else:
+                result = encode_image(img, options, fmt)
+            conn.send((True, result))
+        except Exception as e:
+            try:
+                conn.send((False, e))
+            except Exception:
+                conn.send((False, RuntimeError(f"{type(e).__name__}: {e}")))
+    conn.close()
+
+
+# =========================
+# 【統計 / Statistics】
+# =========================
+
+
+@dataclass(frozen=True)
+class WorkerStats:
+    # 【繁】單個工作槽位的統計（跨回收累計）
+    # [EN] Statistics of one worker slot (accumulated across recycles)
+    index: int
+    pid: int | None
+    busy: bool
+    jobs_done: int
+    jobs_since_spawn: int
+    recycles: int
+    busy_seconds: float
+    utilization: float  # busy_seconds / pool uptime
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    # 【繁】池統計：待處理佇列深度 + 各工作槽位
+    # [EN] Pool statistics: pending queue depth + per-worker slots
+    queue_depth: int
+    workers: tuple[WorkerStats, ...]
+
+
+# =========================
+# 【工作槽位 / Worker slot】
+# =========================
+
+
+class _WorkerSlot:
+    # 【繁】一個槽位 = 一條調度執行緒 + 一個工作行程；執行緒逐件送作業並等結果
+    # [EN] One slot = one dispatch thread + one worker process; the thread sends jobs one at a time and awaits results
+
+    def __init__(self, pool: RenderPool, index: int) -> None:
+        self.pool = pool
+        self.index = index
+        self.process: Any = None
+        self.conn: Connection | None = None
+        self.busy_since: float | None = None
+        self.busy_seconds = 0.0
+        self.jobs_done = 0
+        self.jobs_since_spawn = 0
+        self.recycles = 0
+        self.thread = threading.Thread(target=self._loop, name=f"RenderPool-{index}", daemon=True)
+
+    def _spawn(self) -> None:
+        ctx = self.pool._mp_context
+        parent, child = ctx.Pipe()
+        proc = ctx.Process(  # type: ignore[attr-defined]
+            target=_worker_main, args=(child, self.pool._fonts, self.pool._warm_text), daemon=True
+        )
+        proc.start()
+        child.close()
+        self.process, self.conn = proc, parent
+        self.jobs_since_spawn = 0
+
+    def _retire(self) -> None:
+        if self.conn is not None:
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+            self.conn.close()
+        if self.process is not None:
+            self.process.join(timeout=5)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+        self.process, self.conn = None, None
+
+    def _respawn(self) -> None:
+        self._retire()
+        self._spawn()
+
+    def _loop(self) -> None:
+        self._spawn()
+        while True:
+            item = self.pool._jobs.get()
+            if item is None:
+                break
+            fut, payload = item
+            if not fut.set_running_or_notify_cancel():
+                continue
+            assert self.conn is not None
+            try:
+                self.conn.send(payload)
+            except Exception as e:
+                # 【繁】多為作品無法 pickle；管道未寫入，行程仍可用
+                # [EN] Usually an unpicklable work; nothing was written, so the worker is still usable
+                fut.set_exception(e)
+                continue
+
+            self.busy_since = time.monotonic()
+            try:
+                ok, value = self.conn.recv()
+            except (EOFError, OSError):
+                ok, value = False, RuntimeError("render worker exited unexpectedly")
+                self._respawn()
+            finally:
+                self.busy_seconds += time.monotonic() - self.busy_since
+                self.busy_since = None
+
+            self.jobs_done += 1
+            self.jobs_since_spawn += 1
+            if ok:
+                fut.set_result(value)
+            else:
+                fut.set_exception(value)
+
+            limit = self.pool.max_jobs_per_worker
+            if limit and self.jobs_since_spawn >= limit:
+                # 【繁】回收後立即重生，讓新行程在等待下一件時完成預熱
+                # [EN] Respawn right away so the new process warms up while waiting for the next job
+                self._respawn()
+                self.recycles += 1
+        self._retire()
+
+    def stats(self, uptime: float) -> WorkerStats:
+        busy_since = self.busy_since
+        busy = self.busy_seconds + (time.monotonic() - busy_since if busy_since is not None else 0.0)
+        return WorkerStats(
+            index=self.index,
+            pid=self.process.pid if self.process is not None else None,
+            busy=busy_since is not None,
+            jobs_done=self.jobs_done,
+            jobs_since_spawn=self.jobs_since_spawn,
+            recycles=self.recycles,
+            busy_seconds=busy,
+            utilization=busy / uptime if uptime > 0 else 0.0,
+        )
+
+
+# =========================
+# 【渲染池 / Render pool】
+# =========================
+
+
+class RenderPool:
+    """
+    【繁】常駐渲染池。工作行程啟動時預熱 fonts 所列字體（及 warm_text 字形），之後跨作業保留字體與字形快取。
+    [EN] Long-lived render pool. Workers warm the given fonts (and warm_text glyphs) at start-up and keep font and
+    glyph caches across jobs.
+
+    submit(work) returns a Future resolving to the encoded image bytes, or to `path` when a path is given.
+    A Couplet is rendered as its preview sheet. Each worker is recycled after max_jobs_per_worker jobs
+    (None = never) to cap memory growth.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        fonts: Sequence[FontSpec] = (),
+        max_jobs_per_worker: int | None = 500,
+        warm_text: str = "",
+        mp_context: BaseContext | None = None,
+    ) -> None:
+        n = workers if workers is not None else (multiprocessing.cpu_count() or 1)
+        if n < 1:
+            raise ValueError("workers must be >= 1")
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self._fonts = tuple(fonts)
+        self._warm_text = warm_text
+        # 【繁】預設 spawn：調度執行緒存在時 fork 不安全
+        # [EN] Default to spawn: forking while dispatch threads are running is unsafe
+        self._mp_context: BaseContext = mp_context or multiprocessing.get_context("spawn")
+        self._jobs: queue.Queue[tuple[Future[Any], tuple[Any, str | None, str | None, OutputOptions | None]] | None] = (
+            queue.Queue()
+        )
+        self._started = time.monotonic()
+        self._closed = False
+        self._slots = [_WorkerSlot(self, i) for i in range(n)]
+        for slot in self._slots:
+            slot.thread.start()
+
+    def submit(
+        self, work: Any, path: str | None = None, format: str | None = None, options: OutputOptions | None = None
+    ) -> Future[bytes | str]:
+        # 【繁】提交作品；format 省略時按 options、再按 path 副檔名推斷，皆無則為 PNG；檔案為原子寫入
+        # [EN] Submit a work; format defaults to options, then to the path extension, else PNG; files are written
+        #      atomically
+        if self._closed:
+            raise RuntimeError("RenderPool is closed")
+        fut: Future[bytes | str] = Future()
+        self._jobs.put((fut, (work, path, format, options)))
+        return fut
+
+    def stats(self) -> PoolStats:
+        uptime = time.monotonic() - self._started
+        return PoolStats(
+            queue_depth=self._jobs.qsize(),
+            workers=tuple(slot.stats(uptime) for slot in self._slots),
+        )
+
+    def close(self, cancel_pending: bool = False) -> None:
+        # 【繁】關閉：預設等待佇列中的作業完成；cancel_pending=True 則取消未開始者
+        # [EN] Close: by default queued jobs finish first; cancel_pending=True cancels jobs not yet started
+        if self._closed:
+            return
+        self._closed = True
+        if cancel_pending:
+            while True:
+                try:
+                    item = self._jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    item[0].cancel()
+        for _ in self._slots:
+            self._jobs.put(None)
+        for slot in self._slots:
+            slot.thread.join()
+
+    def __enter__(self) -> RenderPool:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -0,0 +1,143 @@
+# chinese_calligraphy/stamp.py
+
+# 【繁】印蛻快取：一方印按其全部參數只光柵化一次（每種縮放一次），得 RGBA 印蛻，可選印泥質感
+#       （按壓不均、顆粒、邊緣磨損，皆由種子噪聲場向量化生成）；蓋印只需一次貼上
+# [EN] Seal stamp cache: a seal is rasterized once per set of parameters (and per scale) into an RGBA stamp, with an
+#      optional seal-paste texture (uneven impression, grain and edge wear, all generated as vectorized seeded noise
+#      fields); stamping then costs a single paste
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from .display import ShapeMark, TextMark
+from .font import FREETYPE_LOCK, load_font
+from .types import Color, Point
+
+if TYPE_CHECKING:
+    import numpy as np
+    from PIL import Image
+
+
+@dataclass(frozen=True)
+class StampSpec:
+    """
+    【繁】一方印的完整規格（Seal 的可雜湊快照），亦為印蛻快取的鍵。texture 為印泥質感強度 [0, 1]，0 為平塗。
+    [EN] Full spec of one seal (a hashable snapshot of a Seal), which is also the stamp cache key. texture is the
+    seal-paste texture strength in [0, 1]; 0 is a flat impression.
+    """
+
+    font_path: str
+    font_size: int
+    size: int
+    color: Color
+    border_width: int
+    padding: int
+    cell: int
+    text_grid: tuple[tuple[str, int, int], ...]
+    texture: float = 0.0
+    texture_seed: int = 0
+
+    def marks(self, origin: Point) -> list[ShapeMark | TextMark]:
+        # 【繁】印框與印文的筆跡（向量輸出與逐筆繪製用）
+        # [EN] Marks for the border and the characters (for vector export and mark-by-mark drawing)
+        x, y = origin
+        marks: list[ShapeMark | TextMark] = [
+            ShapeMark("rectangle", (x, y, x + self.size, y + self.size), outline=self.color, width=self.border_width)
+        ]
+        font = load_font(self.font_path, self.font_size)
+        for ch, row, col in self.text_grid:
+            marks.append(
+                TextMark((x + self.padding + col * self.cell, y + self.padding + row * self.cell), ch, font, self.color)
+            )
+        return marks
+
+    def stamp(self, scale: float = 1.0) -> tuple[Image.Image, Point]:
+        """
+        【繁】取得（快取的）RGBA 印蛻與其左上角相對印章原點的偏移（縮放後像素；印文溢出印框時為負）。
+        [EN] Get the (cached) RGBA stamp and the offset of its top-left corner from the seal origin (scaled pixels;
+        negative when characters overflow the border).
+        """
+        return _stamp(self, scale)
+
+
+def _texture(spec: StampSpec, w: int, h: int, ox: int, oy: int, box: int) -> np.ndarray:
+    # 【繁】印泥質感的乘數場 [0, 1]：噪聲格點按原尺寸印框取定，再放大到縮放後的印框（邊長 box），
+    #       故各種縮放的印蛻質感一致
+    # [EN] Multiplier field in [0, 1] for the paste texture: noise lattices are sized by the full-size border box
+    #      and resized to the scaled box (side `box`), so stamps at every scale share the same texture
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng([spec.texture_seed, spec.size])
+    s = spec.texture
+    n = spec.size + 1
+
+    def field(cells: int) -> np.ndarray:
+        # 【繁】cells × cells 隨機格點，雙三次放大到縮放後的印框 / [EN] Random cells × cells lattice, bicubic-resized
+        grid = Image.fromarray((rng.random((cells, cells)) * 255).astype(np.uint8), mode="L")
+        return np.asarray(grid.resize((box, box), Image.Resampling.BICUBIC), dtype=np.float32) / 255.0
+
+    impression = 1.0 - s * 0.55 * field(5)  # 【繁】按壓不均 / [EN] uneven pressure
+    grain = field(max(8, n // 2))  # 【繁】印泥顆粒 / [EN] paste grain
+    wear = field(max(6, n // 8))  # 【繁】邊緣磨損 / [EN] edge wear
+
+    # 【繁】到印框外緣的距離（以印寬為單位）：越近邊緣越易磨損
+    # [EN] Distance to the outer edge of the border, in seal widths: the closer to the edge, the more wear
+    t = (np.arange(box, dtype=np.float32) + 0.5) / box
+    edge = np.minimum(t, 1.0 - t)
+    d = np.minimum(edge[:, None], edge[None, :])
+    worn = np.clip((s * 0.55 * (1.0 - d / 0.12) - wear) * 8.0, 0.0, 1.0)
+    dropped = np.clip((s * 0.3 - grain) * 10.0, 0.0, 1.0)
+    mult = impression * (1.0 - worn) * (1.0 - dropped)
+
+    # 【繁】貼入印蛻畫布（印文可能溢出印框，框外為 1）/ [EN] Place into the stamp canvas (outside the box it is 1)
+    out = np.ones((h, w), dtype=np.float32)
+    out[-oy : -oy + box, -ox : -ox + box] = mult
+    return out
+
+
+@lru_cache(maxsize=64)
+def _stamp(spec: StampSpec, scale: float) -> tuple[Image.Image, Point]:
+    # 【繁】以覆蓋率遮罩畫框與印文（與直接畫在畫布上相同的幾何與抗鋸齒），再套質感、上色
+    # [EN] Draw the border and characters as a coverage mask (same geometry and anti-aliasing as drawing on the
+    #      canvas directly), then apply the texture and the color
+    import numpy as np
+    from PIL import Image, ImageDraw
+
+    from .context import RenderContext
+
+    ctx = RenderContext(scale=scale)
+    marks = spec.marks((0, 0))
+    box = ctx.px(spec.size) + 1
+    bounds = [(0, 0, box, box)]
+    probe = ImageDraw.Draw(Image.new("L", (1, 1)))
+    for m in marks:
+        if isinstance(m, TextMark):
+            font = ctx.scale_font(m.font)
+            with FREETYPE_LOCK:
+                x0, y0, x1, y1 = probe.textbbox(ctx.pt(m.p), m.text, font=font)
+            bounds.append((int(x0), int(y0), int(x1) + 1, int(y1) + 1))
+    ox, oy = min(0, *(b[0] for b in bounds)), min(0, *(b[1] for b in bounds))
+    w, h = max(b[2] for b in bounds) - ox, max(b[3] for b in bounds) - oy
+
+    mask = Image.new("L", (w, h), 0)
+    draw = ImageDraw.Draw(mask)
+    for m in marks:
+        if isinstance(m, TextMark):
+            x, y = ctx.pt(m.p)
+            font = ctx.scale_font(m.font)
+            with FREETYPE_LOCK:
+                draw.text((x - ox, y - oy), m.text, font=font, fill=255)
+        else:
+            x0, y0, x1, y1 = (ctx.px(v) for v in m.box)
+            draw.rectangle((x0 - ox, y0 - oy, x1 - ox, y1 - oy), outline=255, width=max(1, ctx.px(m.width)))
+    if spec.texture > 0:
+        a = np.asarray(mask, dtype=np.float32) * _texture(spec, w, h, ox, oy, box)
+        mask = Image.fromarray((a + 0.5).astype(np.uint8), mode="L")
+
+    stamp = Image.new("RGBA", (w, h), (*spec.color, 0))
+    stamp.putalpha(mask)
+    return stamp, (ox, oy)
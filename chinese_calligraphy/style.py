@@ -6,11 +6,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-from PIL import ImageFont
-
+from .font import load_font
 from .types import Color
 
+if TYPE_CHECKING:
+    from PIL import ImageFont
+
 
 @dataclass(frozen=True)
 class Style:
@@ -39,9 +42,9 @@ class Style:
     blur_sigma: float = 0.15
 
     def font(self) -> ImageFont.FreeTypeFont:
-        # 【繁】載入字體（TrueType/OpenType）
-        # [EN] Load font (TrueType/OpenType)
-        return ImageFont.truetype(self.font_path, self.font_size)
+        # 【繁】載入字體（TrueType/OpenType；行程內快取）
+        # [EN] Load font (TrueType/OpenType; cached per process)
+        return load_font(self.font_path, self.font_size)
 
     @property
     def step_y(self) -> int:
@@ -0,0 +1,300 @@
+# chinese_calligraphy/sweep.py
+
+# 【繁】參數掃描：對一件作品（或一組字）按參數網格（如 ink_dryness × blur_sigma × seed）批量渲染，產出帶標註的
+#       對照表與各點的圖。不改版式的參數（墨韻）共用同一份版式，字形光柵化與幾何變形在各點間只做一次；
+#       各點在執行緒池上並行光柵化
+# [EN] Parameter sweeps: render a work (or a set of glyphs) over a parameter grid (such as ink_dryness × blur_sigma
+#      × seed) into a labelled contact sheet plus one image per point. Parameters that leave the layout alone (the
+#      ink ones) share one layout, and glyph rasterization and geometric transforms run once across those points;
+#      points are rasterized in parallel on a thread pool
+
+from __future__ import annotations
+
+import itertools
+import os
+from collections.abc import Hashable, Mapping, Sequence
+from dataclasses import dataclass, field, fields, is_dataclass, replace
+from typing import Any
+
+from PIL import Image, ImageDraw
+
+from .brush import Brush
+from .context import CancelToken
+from .display import DisplayList, GlyphMark
+from .output import OutputOptions, save_image
+from .style import Style
+from .types import Color
+
+# 【繁】只作用於筆跡墨韻、不改版式的參數 / [EN] Parameters that only change the ink of the marks, not the layout
+INK_PARAMS = ("ink_dryness", "blur_sigma")
+
+# 【繁】Brush.place_char 在乾筆高於此值時多抽一次隨機數，故乾/濕兩側的版式不同
+# [EN] Brush.place_char takes one extra random draw for dryness above this, so layouts differ on either side
+_DRY = 0.001
+
+# 【繁】版式分組鍵：(改版式的參數, 強制的乾濕側) / [EN] Layout group key: (layout parameters, forced dry/wet side)
+_LayoutKey = tuple[tuple[tuple[str, Any], ...], "bool | None"]
+
+
+# =========================
+# 【字組 / Glyph set】
+# =========================
+
+
+@dataclass
+class GlyphSet:
+    """
+    【繁】一行不加變形的字（如墨韻試樣）：字心間距一個字號加 gap，供掃描字形本身而非整件作品。
+    [EN] One row of untransformed glyphs (like an ink swatch): glyph centers one font size plus `gap` apart, for
+    sweeping glyphs on their own rather than a whole work.
+    """
+
+    text: str
+    style: Style
+    brush: Brush = field(default_factory=lambda: Brush(seed=42))
+    gap: int = 40
+    margin: int = 40
+    bg: Color = (245, 240, 230)
+
+    def layout(self, token: CancelToken | None = None) -> DisplayList:
+        fs = self.style.font_size
+        pitch = fs + self.gap
+        dl = DisplayList(2 * self.margin + len(self.text) * pitch - self.gap, 2 * self.margin + fs, self.bg)
+        font = self.style.font()
+        r = self.brush.rng()
+        for i, ch in enumerate(self.text):
+            p = (self.margin + i * pitch + fs // 2, self.margin + fs // 2)
+            dl.add(
+                self.brush.place_char(
+                    p,
+                    ch,
+                    font,
+                    self.style.color,
+                    r,
+                    rot=0.0,
+                    shear_x=0.0,
+                    scale=1.0,
+                    ink_dryness=self.style.ink_dryness,
+                    blur_sigma=self.style.blur_sigma,
+                )
+            )
+        return dl
+
+    def render(self, token: CancelToken | None = None, quality: str = "standard", scale: float = 1.0) -> Image.Image:
+        return self.layout(token).rasterize(quality=quality, scale=scale, token=token)
+
+
+# =========================
+# 【網格 / Grid】
+# =========================
+
+
+def _rebuild(obj: Any, brush_kw: Mapping[str, Any], style_kw: Mapping[str, Any]) -> Any:
+    # 【繁】複製作品規格，把其中每個 Brush 與 Style 換上掃描值；未受影響的部分保持原物件
+    # [EN] Copy a work spec with the swept values set on every Brush and Style in it; untouched parts stay the
+    #      same objects
+    if isinstance(obj, Brush):
+        return replace(obj, **brush_kw) if brush_kw else obj
+    if isinstance(obj, Style):
+        return replace(obj, **style_kw) if style_kw else obj
+    if not is_dataclass(obj) or isinstance(obj, type):
+        return obj
+    changes = {}
+    for f in fields(obj):
+        if f.init:
+            value = getattr(obj, f.name)
+            new = _rebuild(value, brush_kw, style_kw)
+            if new is not value:
+                changes[f.name] = new
+    return replace(obj, **changes) if changes else obj
+
+
+def _split(params: Mapping[str, Any]) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any]]:
+    # 【繁】參數分為 Brush 欄位、（改版式的）Style 欄位與墨韻 / [EN] Split into Brush fields, (layout) Style fields, ink
+    brush_names = {f.name for f in fields(Brush) if f.init}
+    style_names = {f.name for f in fields(Style)}
+    brush_kw, style_kw, ink = {}, {}, {}
+    for name, value in params.items():
+        if name in INK_PARAMS:
+            ink[name] = value
+        elif name in brush_names:
+            brush_kw[name] = value
+        elif name in style_names:
+            style_kw[name] = value
+        else:
+            raise ValueError(f"unknown sweep parameter {name!r}; use Brush or Style field names")
+    return brush_kw, style_kw, ink
+
+
+def _with_ink(layout: Any, ink: Mapping[str, Any]) -> Any:
+    # 【繁】版式中每個筆刷字換上墨韻參數（其他筆跡不變）/ [EN] Set the ink parameters on every brush glyph of a layout
+    if isinstance(layout, tuple):
+        return tuple(None if dl is None else _with_ink(dl, ink) for dl in layout)
+    if not ink:
+        return layout
+    marks = [replace(m, **ink) if isinstance(m, GlyphMark) else m for m in layout.marks]
+    return replace(layout, marks=marks)
+
+
+def _dry_sides(layout: Any) -> set[bool]:
+    # 【繁】版式中各筆刷字落在乾濕門檻的哪一側（決定 place_char 的隨機序列）
+    # [EN] Which side of the dry/wet threshold the brush glyphs of a layout are on (it fixes place_char's draws)
+    dls = layout if isinstance(layout, tuple) else (layout,)
+    return {m.ink_dryness > _DRY for dl in dls if dl is not None for m in dl.marks if isinstance(m, GlyphMark)}
+
+
+# =========================
+# 【結果 / Result】
+# =========================
+
+
+@dataclass
+class SweepResult:
+    """
+    【繁】掃描結果：axes 為參數名，points 為各點的參數值（按網格次序，末軸變化最快），images 為各點的圖。
+    [EN] Sweep result: axes are the parameter names, points the values at each point (in grid order, the last axis
+    varying fastest), and images one image per point.
+    """
+
+    axes: tuple[str, ...]
+    points: list[tuple[Any, ...]]
+    images: list[Image.Image]
+    # 【繁】共用的版式數（供檢查共用程度）/ [EN] Number of layouts computed (to check how much was shared)
+    layouts: int = 0
+
+    def params(self, index: int) -> dict[str, Any]:
+        return dict(zip(self.axes, self.points[index], strict=True))
+
+    def label(self, index: int) -> str:
+        return "  ".join(f"{k}={v}" for k, v in self.params(index).items())
+
+    def contact_sheet(
+        self, columns: int | None = None, gap: int = 16, bg: Color = (255, 255, 255), label_color: Color = (90, 90, 90)
+    ) -> Image.Image:
+        """
+        【繁】對照表：每格一張圖，下方標註其參數。columns 預設為末軸的點數（二維網格即一行一個首軸值）。
+        [EN] Contact sheet: one cell per image, its parameters written below it. columns defaults to the length of
+        the last axis (so a 2-D grid gets one row per value of the first axis).
+        """
+        n = len(self.images)
+        if n == 0:
+            raise ValueError("empty sweep")
+        if columns is None:
+            columns = len({p[-1] for p in self.points}) if self.axes else 1
+        columns = max(1, min(columns, n))
+        rows = -(-n // columns)
+        cell_w = max(img.width for img in self.images)
+        cell_h = max(img.height for img in self.images)
+        draw = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+        text_h = max(int(draw.textbbox((0, 0), self.label(i))[3]) for i in range(n)) + 6
+        sheet = Image.new("RGB", (gap + columns * (cell_w + gap), gap + rows * (cell_h + text_h + gap)), bg)
+        draw = ImageDraw.Draw(sheet)
+        for i, img in enumerate(self.images):
+            x = gap + (i % columns) * (cell_w + gap)
+            y = gap + (i // columns) * (cell_h + text_h + gap)
+            sheet.paste(img.convert("RGB"), (x, y))
+            draw.text((x, y + cell_h + 4), self.label(i), fill=label_color)
+        return sheet
+
+    def save(self, directory: str, options: OutputOptions | None = None, sheet: str | None = "sheet.png") -> list[str]:
+        """
+        【繁】各點存為以參數命名的圖檔（如 "ink_dryness=0.2,blur_sigma=1.0.png"），並寫出對照表；回傳路徑。
+        [EN] Save each point as a file named after its parameters (e.g. "ink_dryness=0.2,blur_sigma=1.0.png") and
+        write the contact sheet; returns the paths.
+        """
+        ext = (options or OutputOptions()).extension()
+        paths = []
+        for i, img in enumerate(self.images):
+            name = ",".join(f"{k}={v}" for k, v in self.params(i).items()) or "render"
+            paths.append(save_image(img, os.path.join(directory, name + ext), options))
+        if sheet:
+            paths.append(save_image(self.contact_sheet(), os.path.join(directory, sheet), options))
+        return paths
+
+
+# =========================
+# 【掃描 / Sweep】
+# =========================
+
+
+def _compose(work: Any, images: tuple[Image.Image | None, ...]) -> Image.Image:
+    # 【繁】對聯各幅按預覽拼版合成一張 / [EN] Compose a couplet's scrolls as its preview sheet
+    right, left, header = images
+    assert right is not None and left is not None
+    size, right_at, left_at, header_at = work._sheet(right.size, left.size, header.size if header else None, 50)
+    sheet = Image.new("RGB", size, (255, 255, 255))
+    if header is not None and header_at is not None:
+        sheet.paste(header, header_at)
+    sheet.paste(left, left_at)
+    sheet.paste(right, right_at)
+    return sheet
+
+
+def sweep(
+    work: Any,
+    grid: Mapping[str, Sequence[Any]],
+    quality: str = "standard",
+    scale: float = 1.0,
+    workers: int | None = None,
+    token: CancelToken | None = None,
+) -> SweepResult:
+    """
+    【繁】按 grid（參數名 → 取值列表）的笛卡兒積渲染 work。參數可為 Brush 欄位（如 seed）或 Style 欄位；
+    作用於作品中每個 Brush 與 Style，與用改過的規格重新渲染逐位元相同。ink_dryness 與 blur_sigma 不重新排版：
+    同一版式（及同一乾濕側）的各點共用排版、字形光柵化與幾何變形，只重做墨韻。各點在 workers 個執行緒上光柵化
+    （預設 CPU 數）。work 為 Handscroll、Fan、Couplet（輸出其預覽拼版）或 GlyphSet。
+    [EN] Render `work` over the Cartesian product of `grid` (parameter name → values). Parameters may be Brush
+    fields (such as seed) or Style fields; they apply to every Brush and Style in the work, bit-identically to
+    re-rendering a modified spec. ink_dryness and blur_sigma do not re-layout: points sharing a layout (and a side
+    of the dry/wet threshold) share layout, glyph rasterization and geometric transforms, and only redo the ink
+    stages. Points are rasterized on `workers` threads (default: CPU count). work is a Handscroll, Fan, Couplet
+    (its preview sheet is output) or GlyphSet.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    axes = tuple(grid)
+    points = list(itertools.product(*(grid[a] for a in axes)))
+
+    # 【繁】按改版式的參數分組：每組排版一次；墨韻跨過乾濕門檻時另排
+    # [EN] Group by the layout-changing parameters: one layout per group, plus another when the ink crosses the
+    #      dry/wet threshold
+    layouts: dict[_LayoutKey, tuple[Any, dict[Hashable, Any]]] = {}
+    plan: list[tuple[_LayoutKey, dict[str, Any]]] = []
+    for point in points:
+        brush_kw, style_kw, ink = _split(dict(zip(axes, point, strict=True)))
+        layout_kw = {**brush_kw, **style_kw}
+        spec = _rebuild(work, brush_kw, style_kw)
+        key: _LayoutKey = (tuple(sorted(layout_kw.items())), None)
+        if key not in layouts:
+            layouts[key] = (spec.layout(token), {})
+        dry = ink.get("ink_dryness")
+        if dry is not None and _dry_sides(layouts[key][0]) - {dry > _DRY}:
+            # 【繁】有字須換到門檻另一側：以該乾濕重新排版一次（同側的各點共用）
+            # [EN] Some glyphs must cross the threshold: lay out once more at that dryness (shared by the points on
+            #      that side)
+            key = (key[0], dry > _DRY)
+            if key not in layouts:
+                layouts[key] = (_rebuild(spec, {}, {"ink_dryness": ink["ink_dryness"]}).layout(token), {})
+        plan.append((key, ink))
+
+    def render(key: _LayoutKey, ink: dict[str, Any]) -> Image.Image:
+        layout, masks = layouts[key]
+        raster = _with_ink(layout, ink)
+        if isinstance(raster, tuple):
+            return _compose(
+                work,
+                tuple(
+                    None if dl is None else dl.rasterize(quality=quality, scale=scale, token=token, masks=masks)
+                    for dl in raster
+                ),
+            )
+        img: Image.Image = raster.rasterize(quality=quality, scale=scale, token=token, masks=masks)
+        return img
+
+    n = workers or os.cpu_count() or 1
+    if n == 1:
+        images = [render(key, ink) for key, ink in plan]
+    else:
+        with ThreadPoolExecutor(max_workers=n, thread_name_prefix="calligraphy-sweep") as pool:
+            images = list(pool.map(lambda item: render(*item), plan))
+    return SweepResult(axes, points, images, layouts=len(layouts))
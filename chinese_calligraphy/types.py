@@ -17,6 +17,10 @@ Color = tuple[int, int, int]
 # [EN] Integer pixel coordinate point (x, y)
 Point = tuple[int, int]
 
+# 【繁】二維仿射 (a, b, c, d, e, f)：x' = a·x + b·y + c，y' = d·x + e·y + f（PIL AFFINE 次序）
+# [EN] 2D affine (a, b, c, d, e, f): x' = a·x + b·y + c, y' = d·x + e·y + f (PIL AFFINE order)
+Affine = tuple[float, float, float, float, float, float]
+
 
 # =========================
 # 【字形變體模板 / Glyph variant templates】
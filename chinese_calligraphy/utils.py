@@ -6,9 +6,12 @@
 from __future__ import annotations
 
 import math
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-import numpy as np
+if TYPE_CHECKING:
+    import numpy as np
 
 # =========================
 # 【文字預處理 / Text preprocessing】
@@ -22,6 +25,53 @@ def strip_newlines(text: str) -> str:
     return "".join([ln for ln in lines if ln])
 
 
+def iter_stripped(pieces: Iterable[str]) -> Iterator[str]:
+    """
+    【繁】strip_newlines 的串流版：逐片（可任意切在行中）輸出去除行首尾空白與換行後的字流片段，
+    串接結果與 strip_newlines(''.join(pieces)) 相同；只暫存行內可能為行尾的空白。
+    [EN] Streaming strip_newlines: yields pieces of the stream with line-edge whitespace and line breaks removed,
+    from input pieces that may split lines anywhere; the concatenation equals strip_newlines(''.join(pieces)). Only
+    whitespace that may turn out to end a line is held back.
+    """
+    at_start = True
+    held = ""
+    for piece in pieces:
+        for part in piece.splitlines(keepends=True):
+            lines = part.splitlines()
+            body = lines[0] if lines else ""
+            ended = len(body) < len(part)
+            if at_start:
+                body = body.lstrip()
+            if body:
+                at_start = False
+                core = body.rstrip()
+                if core:
+                    yield held + core
+                    held = body[len(core) :]
+                else:
+                    held += body
+            if ended:
+                at_start, held = True, ""
+
+
+def iter_chunks(pieces: Iterable[str], n: int) -> Iterator[str]:
+    # 【繁】chunk 的串流版：將字流片段切成每列 n 字（最後一列可不足 n），只暫存不足一列的尾巴
+    # [EN] Streaming chunk: cut stream pieces into columns of n characters (the last may be shorter), holding back
+    #      only the tail that does not fill a column yet
+    if n <= 0:
+        raise ValueError("chunk size n must be positive")
+    buf = ""
+    for piece in pieces:
+        buf += piece
+        full = len(buf) - len(buf) % n
+        if full:
+            for i in range(0, full, n):
+                yield buf[i : i + n]
+            buf = buf[full:]
+    if buf:
+        yield buf
+
+
 def split_lines(text: str) -> list[str]:
     # 【繁】按行切分，去除空白行（適合“每行=一列”的排法）
     # [EN] Split by lines and drop empty ones (useful when “one line = one column”)
@@ -61,14 +111,98 @@ def clamp_int(v: int, lo: int, hi: int) -> int:
 # =========================
 
 
+def _lattice_hash(ix: np.ndarray, iy: np.ndarray, seed: int) -> np.ndarray:
+    # 【繁】格點整數雜湊 → [0, 1) float32；無狀態，同一 (格點, 種子) 永遠同值
+    # [EN] Integer hash of lattice points → float32 in [0, 1); stateless, so a (point, seed) pair always gives the
+    #      same value
+    import numpy as np
+
+    with np.errstate(over="ignore"):
+        h = ix.astype(np.uint32) * np.uint32(0x8DA6B343) ^ iy.astype(np.uint32) * np.uint32(0xD8163841)
+        h ^= np.uint32((seed * 0x9E3779B9) & 0xFFFFFFFF)
+        # 【繁】murmur3 末段混合 / [EN] murmur3 finalizer
+        h ^= h >> np.uint32(16)
+        h *= np.uint32(0x85EBCA6B)
+        h ^= h >> np.uint32(13)
+        h *= np.uint32(0xC2B2AE35)
+        h ^= h >> np.uint32(16)
+    out: np.ndarray = (h >> np.uint32(8)).astype(np.float32) * np.float32(1.0 / (1 << 24))
+    return out
+
+
+def _lattice_axis(v: np.ndarray, cell: float) -> tuple[np.ndarray, np.ndarray]:
+    # 【繁】座標 → 所在格點索引與 smoothstep 權重 / [EN] Coordinates → lattice cell index and smoothstep weight
+    import numpy as np
+
+    u = v / cell
+    i = np.floor(u)
+    f = (u - i).astype(np.float32)
+    return i.astype(np.int64), f * f * (3.0 - 2.0 * f)
+
+
+def value_noise(
+    xs: np.ndarray, ys: np.ndarray, seed: int, cell: float = 8.0, octaves: int = 1, persistence: float = 0.5
+) -> np.ndarray:
+    """
+    【繁】世界座標值噪聲：在畫布座標 xs（各列）× ys（各行）構成的網格上取值，回傳 (len(ys), len(xs)) 的 [0, 1]
+    float32。無狀態：同一座標與種子永遠同值，故任意分塊、字塊或長條可各自（並行）計算且彼此銜接。
+    cell 為第一八度的格距；每高一八度格距減半、振幅乘 persistence。
+    [EN] World-space value noise: evaluated on the grid spanned by canvas coordinates xs (columns) × ys (rows),
+    returning float32 in [0, 1] with shape (len(ys), len(xs)). Stateless: the same coordinates and seed always give
+    the same values, so any tile, glyph patch or strip can be computed on its own (or in parallel) and still line
+    up. cell is the lattice spacing of the first octave; each further octave halves it and scales the amplitude by
+    persistence.
+    """
+    import numpy as np
+
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    total = np.zeros((ys.size, xs.size), dtype=np.float32)
+    if total.size == 0:
+        return total
+    norm = 0.0
+    amp = 1.0
+    for o in range(max(1, octaves)):
+        c = cell / (1 << o)
+        ix, fx = _lattice_axis(xs, c)
+        iy, fy = _lattice_axis(ys, c)
+        # 【繁】只對涵蓋範圍內的格點雜湊一次，再按索引取用
+        # [EN] Hash only the lattice points the rectangle covers, once, then gather by index
+        lx, ly = ix - ix.min(), iy - iy.min()
+        gx = np.arange(ix.min(), ix.max() + 2)
+        gy = np.arange(iy.min(), iy.max() + 2)
+        lattice = _lattice_hash(gx[None, :], gy[:, None], seed + o * 1013)
+        top = lattice[ly][:, lx] * (1.0 - fx) + lattice[ly][:, lx + 1] * fx
+        bottom = lattice[ly + 1][:, lx] * (1.0 - fx) + lattice[ly + 1][:, lx + 1] * fx
+        total += (top * (1.0 - fy)[:, None] + bottom * fy[:, None]) * np.float32(amp)
+        norm += amp
+        amp *= persistence
+    out: np.ndarray = total / np.float32(norm)
+    return out
+
+
 @dataclass
 class NoiseGenerator:
     """Generate reproducible noise for ink textures."""
 
     seed: int
 
+    # 【繁】上採樣所用的墨韻後端（見 chinese_calligraphy.ink）
+    # [EN] Ink backend used for upsampling (see chinese_calligraphy.ink)
+    backend: str = "auto"
+
     def __post_init__(self) -> None:
-        self._rng = np.random.default_rng(self.seed)
+        # 【繁】隨機源在首次生成噪聲時才建立（延後載入 NumPy）
+        # [EN] The RNG is created on first noise generation (defers importing NumPy)
+        self._gen: np.random.Generator | None = None
+
+    @property
+    def _rng(self) -> np.random.Generator:
+        if self._gen is None:
+            import numpy as np
+
+            self._gen = np.random.default_rng(self.seed)
+        return self._gen
 
     def generate_simplex(self, width: int, height: int, scale: float = 0.1) -> np.ndarray:
         """
@@ -78,6 +212,8 @@ class NoiseGenerator:
         Using a simplified Value Noise approach here to avoid heavy dependencies like opensimplex.
         For ink texture, value noise with bicubic interpolation is often sufficient.
         """
+        import numpy as np
+
         # Generate a lower-resolution grid
         grid_w = max(2, int(width * scale))
         grid_h = max(2, int(height * scale))
@@ -85,17 +221,11 @@ class NoiseGenerator:
         # Random independent low-res values
         low_res = self._rng.random((grid_h, grid_w))
 
-        # Bicubic interpolation up to (height, width) would be ideal,
-        # but linear/cubic resizing via scipy or numpy is faster.
-        # Here we manually implement a simple upscale for dependency minimalism if needed,
-        # but since we have scipy, let's use scipy.ndimage.zoom for quality.
-        from scipy.ndimage import zoom  # type: ignore
-
-        zoom_y = height / grid_h
-        zoom_x = width / grid_w
+        # Bicubic interpolation up to (height, width) would be ideal.
+        # The ink backend decides how: scipy.ndimage.zoom (cubic spline), NumPy cubic convolution or Pillow BICUBIC.
+        from .ink import get_ink_backend
 
-        # spline order 3 = cubic
-        high_res = zoom(low_res, (zoom_y, zoom_x), order=3)
+        high_res = get_ink_backend(self.backend).upsample(low_res, height, width)
 
         # Clip to [0,1] as bicubic can overshoot
         high_res = np.clip(high_res, 0.0, 1.0)
@@ -130,6 +260,8 @@ class NoiseGenerator:
         # We want long thin structures.
         # A simple approximation is heavily blurred noise thresholded, or just motion blur.
 
+        import numpy as np
+
         # For simplicity in this version: simple perlin-ish layers
         base = self.generate_simplex(width, height, scale=0.2)
         fine = self.generate_simplex(width, height, scale=0.8)
@@ -140,3 +272,44 @@ class NoiseGenerator:
         # Contrast stretch
         texture = (texture - 0.3) * 2.0
         return np.clip(texture, 0.0, 1.0)
+
+    def fiber_at(self, x0: float, y0: float, width: int, height: int, step: float = 1.0) -> np.ndarray:
+        """
+        【繁】世界座標纖維紋理：width×height 個取樣點，左上取樣點中心在畫布座標 (x0, y0)、間距 step；
+        紋理只取決於座標與 seed，故相鄰字塊的纖維無縫相接，且與呼叫次序無關。
+        [EN] World-space fiber texture: width×height samples, the top-left one centred on canvas point (x0, y0)
+        and spaced `step` apart; the texture depends only on the coordinates and the seed, so fibers run on
+        seamlessly across neighbouring glyph patches and do not depend on call order.
+        """
+        import numpy as np
+
+        xs = x0 + np.arange(width) * step
+        ys = y0 + np.arange(height) * step
+        # 【繁】與 generate_fiber_texture 同一配方：粗層格距 5px、細層 1.25px
+        # [EN] Same recipe as generate_fiber_texture: coarse layer on a 5 px lattice, fine layer on 1.25 px
+        base = value_noise(xs, ys, self.seed, cell=5.0)
+        fine = value_noise(xs, ys, self.seed + 1, cell=1.25)
+        texture = 0.6 * base + 0.4 * fine
+        out: np.ndarray = np.clip((texture - 0.3) * 2.0, 0.0, 1.0)
+        return out
+
+
+# =========================
+# 【磁碟快取目錄 / On-disk cache directory】
+# =========================
+
+
+def cache_dir(*parts: str) -> str:
+    """
+    【繁】磁碟快取目錄：環境變數 CHINESE_CALLIGRAPHY_CACHE 優先，否則為 $XDG_CACHE_HOME（或 ~/.cache）下的
+    chinese_calligraphy；不會自動建立。
+    [EN] On-disk cache directory: CHINESE_CALLIGRAPHY_CACHE if set, else chinese_calligraphy under $XDG_CACHE_HOME
+    (or ~/.cache); not created here.
+    """
+    import os
+
+    root = os.environ.get("CHINESE_CALLIGRAPHY_CACHE")
+    if not root:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        root = os.path.join(base, "chinese_calligraphy")
+    return os.path.join(root, *parts)
@@ -0,0 +1,463 @@
+# chinese_calligraphy/vector.py
+
+# 【繁】向量輸出：把顯示列表寫成 SVG / PDF。每個字取字體輪廓（fontTools），按字只定義一次
+#       （SVG <use>、PDF Form XObject），落筆處只記一個仿射矩陣，故檔案大小隨「不同字數」增長，
+#       與畫布面積無關；印框、扇面為向量圖形；乾筆紋理可選以點陣遮罩疊加
+# [EN] Vector output: write display lists as SVG / PDF. Each glyph comes from the font outline (fontTools) and is
+#      defined once per character (SVG <use>, PDF Form XObject); every placement only records an affine,
+#      so file size grows with the number of distinct characters, not with canvas area. Seal borders and fan
+#      leaves are vector shapes; the dry-brush texture can optionally be added as a raster mask
+
+from __future__ import annotations
+
+import base64
+import io
+import math
+import zlib
+from collections.abc import Sequence
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+from .brush import _patch_affine, compose_affine, glyph_patch_size, invert_affine
+from .display import DisplayList, GlyphMark, ShapeMark, TextMark
+from .font import FREETYPE_LOCK
+from .types import Affine, Color
+
+if TYPE_CHECKING:
+    from PIL import Image, ImageFont
+
+# 【繁】路徑指令：("M", (x, y)) / ("L", (x, y)) / ("C", (x1, y1, x2, y2, x, y)) / ("Z", ())
+# [EN] Path commands: ("M", (x, y)) / ("L", (x, y)) / ("C", (x1, y1, x2, y2, x, y)) / ("Z", ())
+PathOp = tuple[str, tuple[float, ...]]
+
+
+@dataclass(frozen=True)
+class GlyphOutline:
+    # 【繁】字形輪廓（字體單位，y 向上）
+    # [EN] Glyph outline, in font units with y pointing up
+    ops: tuple[PathOp, ...]
+    units_per_em: int
+    bbox: tuple[float, float, float, float]
+
+
+# =========================
+# 【字形輪廓 / Glyph outlines】
+# =========================
+
+
+@lru_cache(maxsize=16)
+def _ttfont(font_path: str, index: int) -> Any:
+    from fontTools.ttLib import TTFont  # type: ignore
+
+    return TTFont(font_path, fontNumber=index, lazy=True)
+
+
+@lru_cache(maxsize=4096)
+def glyph_outline(font_path: str, index: int, ch: str) -> GlyphOutline:
+    """
+    【繁】取字的輪廓並在行程內快取；字體缺字時用 .notdef。需要 fontTools（`pip install chinese-calligraphy[fonttools]`）。
+    [EN] Get a character's outline, cached per process; falls back to .notdef when the font lacks the character.
+    Requires fontTools (`pip install chinese-calligraphy[fonttools]`).
+    """
+    from fontTools.pens.basePen import BasePen  # type: ignore
+
+    tt = _ttfont(font_path, index)
+    glyph_set = tt.getGlyphSet()
+    name = tt.getBestCmap().get(ord(ch), ".notdef")
+    ops: list[PathOp] = []
+
+    class _Pen(BasePen):  # type: ignore[misc]
+        def _moveTo(self, p: tuple[float, float]) -> None:
+            ops.append(("M", p))
+
+        def _lineTo(self, p: tuple[float, float]) -> None:
+            ops.append(("L", p))
+
+        def _curveToOne(self, p1: tuple[float, float], p2: tuple[float, float], p3: tuple[float, float]) -> None:
+            ops.append(("C", (*p1, *p2, *p3)))
+
+        def _qCurveToOne(self, p1: tuple[float, float], p2: tuple[float, float]) -> None:
+            # Quadratic (TrueType) → cubic, exact
+            x0, y0 = self._getCurrentPoint()
+            c1 = (x0 + (p1[0] - x0) * 2 / 3, y0 + (p1[1] - y0) * 2 / 3)
+            c2 = (p2[0] + (p1[0] - p2[0]) * 2 / 3, p2[1] + (p1[1] - p2[1]) * 2 / 3)
+            ops.append(("C", (*c1, *c2, *p2)))
+
+        def _closePath(self) -> None:
+            ops.append(("Z", ()))
+
+    glyph_set[name].draw(_Pen(glyph_set))
+    xs = [v for _, args in ops for v in args[0::2]] or [0.0]
+    ys = [v for _, args in ops for v in args[1::2]] or [0.0]
+    return GlyphOutline(tuple(ops), int(tt["head"].unitsPerEm), (min(xs), min(ys), max(xs), max(ys)))
+
+
+def _font_key(font: ImageFont.FreeTypeFont) -> tuple[str, int]:
+    path = getattr(font, "path", None)
+    if not isinstance(path, str):
+        raise ValueError("vector output needs fonts loaded from a file (Style.font_path / load_font)")
+    return path, int(getattr(font, "index", 0))
+
+
+# =========================
+# 【落筆矩陣 / Placement matrices】
+# =========================
+
+
+def _text_matrix(font: ImageFont.FreeTypeFont, upem: int, left: float, top: float) -> Affine:
+    # 【繁】字體單位 → 畫布：與 ImageDraw.text((left, top)) 相同，以上緣（ascender）對齊
+    # [EN] Font units → canvas, matching ImageDraw.text((left, top)), which aligns the ascender with top
+    s = font.size / upem
+    with FREETYPE_LOCK:
+        ascent = font.getmetrics()[0]
+    return (s, 0.0, left, 0.0, -s, top + ascent)
+
+
+def _glyph_matrix(mark: GlyphMark, upem: int) -> Affine:
+    # 【繁】與 Brush.paint_char 相同的幾何：工作區內置中繪字 → 切變/縮放/旋轉 → 以抖動後字心貼回
+    # [EN] Same geometry as Brush.paint_char: glyph centered in the working patch → shear/scale/rotate → pasted
+    #      back around the jittered center
+    fs = int(mark.font.size)
+    w = glyph_patch_size(fs)
+    to_patch = _text_matrix(mark.font, upem, w // 2 - fs // 2, w // 2 - fs // 2)
+    warp = invert_affine(_patch_affine(w, w, mark.rot, mark.shear_x, mark.scale, mark.scale * mark.anis_y))
+    place = (1.0, 0.0, float(mark.p[0] - w // 2), 0.0, 1.0, float(mark.p[1] - w // 2))
+    return compose_affine(place, compose_affine(warp, to_patch))
+
+
+def _arc(cx: float, cy: float, rx: float, ry: float, start: float, end: float) -> list[PathOp]:
+    # 【繁】橢圓弧（PIL 角度：度，自三點鐘方向順時針）→ 三次貝茲，每段不超過 90°
+    # [EN] Elliptical arc (PIL angles: degrees, clockwise from three o'clock) → cubic Béziers of at most 90° each
+    n = max(1, math.ceil(abs(end - start) / 90.0))
+    step = math.radians(end - start) / n
+    k = 4.0 / 3.0 * math.tan(step / 4.0)
+    ops: list[PathOp] = []
+    t = math.radians(start)
+    for _ in range(n):
+        t2 = t + step
+        c, s, c2, s2 = math.cos(t), math.sin(t), math.cos(t2), math.sin(t2)
+        ops.append(
+            (
+                "C",
+                (
+                    cx + rx * (c - k * s),
+                    cy + ry * (s + k * c),
+                    cx + rx * (c2 + k * s2),
+                    cy + ry * (s2 - k * c2),
+                    cx + rx * c2,
+                    cy + ry * s2,
+                ),
+            )
+        )
+        t = t2
+    return ops
+
+
+def _pieslice(mark: ShapeMark) -> list[PathOp]:
+    x0, y0, x1, y1 = mark.box
+    cx, cy, rx, ry = (x0 + x1) / 2, (y0 + y1) / 2, (x1 - x0) / 2, (y1 - y0) / 2
+    t = math.radians(mark.start)
+    return [
+        ("M", (cx, cy)),
+        ("L", (cx + rx * math.cos(t), cy + ry * math.sin(t))),
+        *_arc(cx, cy, rx, ry, mark.start, mark.end),
+        ("Z", ()),
+    ]
+
+
+def _rect_inset(mark: ShapeMark) -> tuple[float, float, float, float, float]:
+    # 【繁】PIL 的框線畫在 box 內側；換算成以線寬中線描邊的矩形 (x, y, w, h, 線寬)
+    # [EN] PIL draws the outline inside the box; convert to a rectangle stroked on its centerline (x, y, w, h, width)
+    x0, y0, x1, y1 = mark.box
+    lw = max(1, mark.width)
+    return x0 + lw / 2, y0 + lw / 2, x1 - x0 + 1 - lw, y1 - y0 + 1 - lw, float(lw)
+
+
+# =========================
+# 【乾筆紋理 / Ink texture】
+# =========================
+
+
+def _ink_texture(dl: DisplayList, scale: float) -> Image.Image:
+    # 【繁】筆刷字的墨量（白 = 墨），略為外擴，使外緣仍由向量輪廓決定、紋理只挖出乾筆飛白
+    # [EN] Ink coverage of the brush glyphs (white = ink), slightly grown so the outer edges still come from the
+    #      vector outline and the texture only cuts out the dry-brush streaks
+    from PIL import ImageFilter, ImageOps
+
+    glyphs = [replace(m, fill=(0, 0, 0)) for m in dl.marks if isinstance(m, GlyphMark)]
+    coverage = DisplayList(dl.width, dl.height, (255, 255, 255), list(glyphs)).rasterize(scale=scale)
+    return ImageOps.invert(coverage.convert("L")).filter(ImageFilter.MaxFilter(3))
+
+
+# =========================
+# 【SVG】
+# =========================
+
+
+def _num(v: float) -> str:
+    return f"{v:.2f}".rstrip("0").rstrip(".") if v != int(v) else str(int(v))
+
+
+def _svg_path(ops: Sequence[PathOp]) -> str:
+    return " ".join(op + " ".join(_num(v) for v in args) for op, args in ops)
+
+
+def _svg_color(c: Color | None) -> str:
+    return "none" if c is None else "#{:02x}{:02x}{:02x}".format(*c[:3])
+
+
+def _svg_matrix(m: Affine) -> str:
+    a, b, c, d, e, f = m
+    return "matrix(" + " ".join(f"{v:.6g}" for v in (a, d, b, e, c, f)) + ")"
+
+
+def to_svg(dl: DisplayList, ink_texture: bool = False, texture_scale: float = 0.5) -> str:
+    """
+    【繁】把顯示列表寫成 SVG 字串（像素座標）；ink_texture=True 時以 texture_scale 倍的點陣遮罩疊上乾筆紋理。
+    [EN] Write a display list as an SVG string (pixel coordinates); with ink_texture=True the dry-brush texture is
+    applied as a raster mask at texture_scale.
+    """
+    # 【繁】(字體, 字) → (id, 路徑)；每個不同的字只定義一次
+    # [EN] (font, char) → (id, path data); each distinct glyph is defined once
+    defs: dict[tuple[str, int, str], tuple[str, str]] = {}
+    body: list[str] = []
+    glyphs: list[str] = []
+
+    def use(font: ImageFont.FreeTypeFont, ch: str) -> tuple[str, GlyphOutline]:
+        path, index = _font_key(font)
+        outline = glyph_outline(path, index, ch)
+        key = (path, index, ch)
+        if key not in defs:
+            defs[key] = (f"g{len(defs)}", _svg_path(outline.ops))
+        return defs[key][0], outline
+
+    for mark in dl.flat_marks():
+        if isinstance(mark, GlyphMark):
+            gid, outline = use(mark.font, mark.ch)
+            m = _glyph_matrix(mark, outline.units_per_em)
+            glyphs.append(f'<use xlink:href="#{gid}" transform="{_svg_matrix(m)}" fill="{_svg_color(mark.fill)}"/>')
+        elif isinstance(mark, TextMark):
+            x = float(mark.p[0])
+            for ch in mark.text:
+                gid, outline = use(mark.font, ch)
+                m = _text_matrix(mark.font, outline.units_per_em, x, mark.p[1])
+                body.append(f'<use xlink:href="#{gid}" transform="{_svg_matrix(m)}" fill="{_svg_color(mark.fill)}"/>')
+                with FREETYPE_LOCK:
+                    x += mark.font.getlength(ch)
+        elif mark.kind == "rectangle":
+            x, y, w, h, lw = _rect_inset(mark)
+            if mark.fill is not None:
+                x0, y0, x1, y1 = mark.box
+                body.append(
+                    f'<rect x="{x0}" y="{y0}" width="{x1 - x0 + 1}" height="{y1 - y0 + 1}" '
+                    f'fill="{_svg_color(mark.fill)}"/>'
+                )
+            if mark.outline is not None:
+                body.append(
+                    f'<rect x="{_num(x)}" y="{_num(y)}" width="{_num(w)}" height="{_num(h)}" fill="none" '
+                    f'stroke="{_svg_color(mark.outline)}" stroke-width="{_num(lw)}"/>'
+                )
+        elif mark.kind == "pieslice":
+            body.append(f'<path d="{_svg_path(_pieslice(mark))}" fill="{_svg_color(mark.fill)}"/>')
+        else:
+            raise ValueError(f"unknown shape kind {mark.kind!r}")
+
+    out = [
+        '<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+        f'width="{dl.width}" height="{dl.height}" viewBox="0 0 {dl.width} {dl.height}">',
+        "<defs>",
+        *(f'<path id="{gid}" d="{d}"/>' for gid, d in defs.values()),
+    ]
+    glyph_group = "<g>"
+    if ink_texture and glyphs:
+        buf = io.BytesIO()
+        _ink_texture(dl, texture_scale).save(buf, format="PNG")
+        data = base64.b64encode(buf.getvalue()).decode("ascii")
+        out += [
+            f'<mask id="ink" maskUnits="userSpaceOnUse" x="0" y="0" width="{dl.width}" height="{dl.height}">',
+            f'<image width="{dl.width}" height="{dl.height}" preserveAspectRatio="none" '
+            f'xlink:href="data:image/png;base64,{data}"/>',
+            "</mask>",
+        ]
+        glyph_group = '<g mask="url(#ink)">'
+    out += [
+        "</defs>",
+        f'<rect width="{dl.width}" height="{dl.height}" fill="{_svg_color(dl.bg)}"/>',
+        *body,
+        glyph_group,
+        *glyphs,
+        "</g>",
+        "</svg>",
+    ]
+    return "\n".join(out) + "\n"
+
+
+def save_svg(dl: DisplayList, path: str, ink_texture: bool = False, texture_scale: float = 0.5) -> None:
+    # 【繁】輸出 SVG 檔（見 to_svg）
+    # [EN] Save an SVG file (see to_svg)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(to_svg(dl, ink_texture=ink_texture, texture_scale=texture_scale))
+
+
+# =========================
+# 【PDF】
+# =========================
+
+
+def _pdf_path(ops: Sequence[PathOp]) -> str:
+    names = {"M": "m", "L": "l", "C": "c", "Z": "h"}
+    return "\n".join(" ".join(f"{v:.2f}" for v in args) + (" " if args else "") + names[op] for op, args in ops)
+
+
+def _pdf_color(c: Color, op: str) -> str:
+    return " ".join(f"{v / 255:.4g}" for v in c[:3]) + " " + op
+
+
+def _pdf_matrix(m: Affine) -> str:
+    a, b, c, d, e, f = m
+    return " ".join(f"{v:.6g}" for v in (a, d, b, e, c, f)) + " cm"
+
+
+class _PdfWriter:
+    # 【繁】最小 PDF 寫入器：按編號收集物件，最後寫出交叉參照表
+    # [EN] Minimal PDF writer: collects numbered objects, then writes the cross-reference table
+    def __init__(self) -> None:
+        self.objects: list[bytes | None] = []
+
+    def reserve(self) -> int:
+        self.objects.append(None)
+        return len(self.objects)
+
+    def set(self, num: int, body: str | bytes) -> int:
+        self.objects[num - 1] = body.encode("latin-1") if isinstance(body, str) else body
+        return num
+
+    def add(self, body: str | bytes) -> int:
+        return self.set(self.reserve(), body)
+
+    def stream(self, header: str, data: bytes, num: int | None = None) -> int:
+        data = zlib.compress(data)
+        body = f"<< {header} /Filter /FlateDecode /Length {len(data)} >>\nstream\n".encode("latin-1")
+        return self.set(num if num is not None else self.reserve(), body + data + b"\nendstream")
+
+    def tobytes(self, root: int) -> bytes:
+        out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for i, body in enumerate(self.objects, start=1):
+            assert body is not None, f"PDF object {i} was reserved but never written"
+            offsets.append(len(out))
+            out += f"{i} 0 obj\n".encode("latin-1") + body + b"\nendobj\n"
+        xref = len(out)
+        out += f"xref\n0 {len(self.objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+        out += b"".join(f"{o:010d} 00000 n \n".encode("latin-1") for o in offsets)
+        out += f"trailer\n<< /Size {len(self.objects) + 1} /Root {root} 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode(
+            "latin-1"
+        )
+        return bytes(out)
+
+
+def to_pdf(
+    dls: Sequence[DisplayList], dpi: float = 72.0, ink_texture: bool = False, texture_scale: float = 0.5
+) -> bytes:
+    """
+    【繁】把一至多個顯示列表寫成 PDF（每個一頁）；頁面尺寸按 dpi 由像素換算（預設 1 像素 = 1 pt）。
+    每個不同的字只存一次（Form XObject），各頁共用。
+    [EN] Write one or more display lists as a PDF, one page each; page size is converted from pixels at `dpi`
+    (by default 1 px = 1 pt). Each distinct glyph is stored once, as a Form XObject shared by all pages.
+    """
+    pdf = _PdfWriter()
+    catalog, pages = pdf.reserve(), pdf.reserve()
+    forms: dict[tuple[str, int, str], tuple[str, int]] = {}
+
+    def form(font: ImageFont.FreeTypeFont, ch: str) -> tuple[str, GlyphOutline]:
+        path, index = _font_key(font)
+        outline = glyph_outline(path, index, ch)
+        key = (path, index, ch)
+        if key not in forms:
+            x0, y0, x1, y1 = outline.bbox
+            num = pdf.stream(
+                f"/Type /XObject /Subtype /Form /BBox [{x0:.0f} {y0:.0f} {x1:.0f} {y1:.0f}] /Resources << >>",
+                (_pdf_path(outline.ops) + "\nf").encode("latin-1"),
+            )
+            forms[key] = (f"G{len(forms)}", num)
+        return forms[key][0], outline
+
+    kids = []
+    for dl in dls:
+        # 【繁】頁內以像素、y 向下作畫：先翻轉座標
+        # [EN] Draw in pixels with y pointing down within the page: flip the coordinates first
+        k = 72.0 / dpi
+        ops = [
+            f"{k:.6g} 0 0 {-k:.6g} 0 {dl.height * k:.6g} cm",
+            _pdf_color(dl.bg, "rg"),
+            f"0 0 {dl.width} {dl.height} re f",
+        ]
+        glyph_ops: list[str] = []
+        used: set[str] = set()
+        for mark in dl.flat_marks():
+            if isinstance(mark, GlyphMark):
+                name, outline = form(mark.font, mark.ch)
+                used.add(name)
+                m = _pdf_matrix(_glyph_matrix(mark, outline.units_per_em))
+                glyph_ops.append(f"{_pdf_color(mark.fill, 'rg')} q {m} /{name} Do Q")
+            elif isinstance(mark, TextMark):
+                x = float(mark.p[0])
+                for ch in mark.text:
+                    name, outline = form(mark.font, ch)
+                    used.add(name)
+                    m = _pdf_matrix(_text_matrix(mark.font, outline.units_per_em, x, mark.p[1]))
+                    ops.append(f"{_pdf_color(mark.fill, 'rg')} q {m} /{name} Do Q")
+                    with FREETYPE_LOCK:
+                        x += mark.font.getlength(ch)
+            elif mark.kind == "rectangle":
+                x, y, w, h, lw = _rect_inset(mark)
+                if mark.fill is not None:
+                    x0, y0, x1, y1 = mark.box
+                    ops.append(f"{_pdf_color(mark.fill, 'rg')} {x0} {y0} {x1 - x0 + 1} {y1 - y0 + 1} re f")
+                if mark.outline is not None:
+                    ops.append(f"{_pdf_color(mark.outline, 'RG')} {lw:g} w {x:g} {y:g} {w:g} {h:g} re S")
+            elif mark.kind == "pieslice":
+                if mark.fill is not None:
+                    ops.append(f"{_pdf_color(mark.fill, 'rg')}\n{_pdf_path(_pieslice(mark))}\nf")
+            else:
+                raise ValueError(f"unknown shape kind {mark.kind!r}")
+
+        resources = " ".join(f"/{name} {num} 0 R" for name, num in forms.values() if name in used)
+        extgstate = ""
+        if ink_texture and glyph_ops:
+            tex = _ink_texture(dl, texture_scale)
+            image = pdf.stream(
+                f"/Type /XObject /Subtype /Image /Width {tex.width} /Height {tex.height} "
+                "/ColorSpace /DeviceGray /BitsPerComponent 8",
+                tex.tobytes(),
+            )
+            group = pdf.stream(
+                f"/Type /XObject /Subtype /Form /BBox [0 0 {dl.width} {dl.height}] "
+                "/Group << /S /Transparency /CS /DeviceGray >> "
+                f"/Resources << /XObject << /Im {image} 0 R >> >>",
+                f"q {dl.width} 0 0 {-dl.height} 0 {dl.height} cm /Im Do Q".encode("latin-1"),
+            )
+            gs = pdf.add(f"<< /Type /ExtGState /SMask << /S /Luminosity /G {group} 0 R >> >>")
+            extgstate = f"/ExtGState << /Ink {gs} 0 R >>"
+            glyph_ops = ["q /Ink gs", *glyph_ops, "Q"]
+        content = pdf.stream("", "\n".join(ops + glyph_ops).encode("latin-1"))
+        kids.append(
+            pdf.add(
+                f"<< /Type /Page /Parent {pages} 0 R /MediaBox [0 0 {dl.width * k:.6g} {dl.height * k:.6g}] "
+                f"/Resources << /XObject << {resources} >> {extgstate} >> /Contents {content} 0 R >>"
+            )
+        )
+
+    pdf.set(pages, f"<< /Type /Pages /Kids [{' '.join(f'{n} 0 R' for n in kids)}] /Count {len(kids)} >>")
+    pdf.set(catalog, f"<< /Type /Catalog /Pages {pages} 0 R >>")
+    return pdf.tobytes(catalog)
+
+
+def save_pdf(
+    dls: Sequence[DisplayList], path: str, dpi: float = 72.0, ink_texture: bool = False, texture_scale: float = 0.5
+) -> None:
+    # 【繁】輸出 PDF 檔（見 to_pdf）
+    # [EN] Save a PDF file (see to_pdf)
+    with open(path, "wb") as f:
+        f.write(to_pdf(dls, dpi=dpi, ink_texture=ink_texture, texture_scale=texture_scale))
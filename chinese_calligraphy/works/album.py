@@ -0,0 +1,265 @@
+# chinese_calligraphy/works/album.py
+
+# 【繁】冊頁作品容器：把正文字流分成固定尺寸的頁，筆刷狀態跨頁延續；各頁作為獨立作業在行程/執行緒池上渲染，
+#       輸出為編號圖檔或多頁 PDF，同時在記憶體中的只有少數幾頁
+# [EN] Album-leaf work container: paginates the main text stream into fixed-size leaves, with the brush state
+#      continuing across pages; each page is rendered as an independent job on a process or thread pool and written
+#      as numbered image files or a multi-page PDF, with only a few pages in memory at a time
+
+from __future__ import annotations
+
+import os
+import threading
+import zlib
+from collections import deque
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field, replace
+from functools import partial
+from typing import TYPE_CHECKING, BinaryIO, TypeVar
+
+from ..context import CancelToken, RenderContext
+from ..display import DisplayList
+from ..elements import MainText
+from ..layout import Margins, SegmentSpec
+from ..output import OutputOptions, save_image
+from ..paper import Paper
+from ..types import Color
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, Future
+
+    from PIL import Image
+
+T = TypeVar("T")
+
+
+@dataclass
+class Album:
+    """
+    【繁】冊頁：右起左行，正文按頁面內容區排滿一頁再換頁，各頁邊距一致。排版一次走完整個字流
+    （隨機序列、慣性與「之」狀態跨頁延續），頁面則可並行光柵化。
+    [EN] Album leaves: text flows right-to-left and fills each page's content box before moving to the next, with
+    the same margins on every page. Layout walks the whole text stream once (random draws, inertia and '之' state
+    continue across pages), while pages can be rasterized in parallel.
+    """
+
+    main: MainText
+    page_size: tuple[int, int] = (1000, 1400)
+    margins: Margins = field(default_factory=lambda: Margins(top=120, bottom=120, right=120, left=120))
+    bg: Color = (250, 246, 236)
+    # 【繁】紙張材質（None 為純色 bg）/ [EN] Paper material (None for a flat bg)
+    paper: Paper | None = None
+
+    def _content_size(self) -> tuple[int, int]:
+        w, h = self.page_size
+        return w - self.margins.left - self.margins.right, h - self.margins.top - self.margins.bottom
+
+    def columns_per_page(self) -> int:
+        # 【繁】一頁可容納的列數：首末列的字身都落在內容區內
+        # [EN] Columns per page: the em boxes of the first and last columns stay inside the content box
+        content_w, _ = self._content_size()
+        fs = self.main.style.font_size
+        return max(1, (content_w - fs) // self.main.style.col_spacing + 1)
+
+    def page_count(self) -> int:
+        # 【繁】頁數只由字數決定，無須排版
+        # [EN] The page count follows from the character count alone, without laying anything out
+        _, content_h = self._content_size()
+        return -(-self.main.num_columns(content_h) // self.columns_per_page())
+
+    def pages(self, token: CancelToken | None = None) -> Iterator[DisplayList]:
+        """
+        【繁】逐頁產出顯示列表（原尺寸）。一頁即正文的一段，段後換頁，故排版時只暫存一頁。
+        [EN] Yield the display list of each page (full size). A page is one segment of the main text, so only one
+        page is held while laying out.
+        """
+        w, h = self.page_size
+        _, content_h = self._content_size()
+        fs = self.main.style.font_size
+        main = replace(self.main, segment=SegmentSpec(columns_per_segment=self.columns_per_page(), segment_gap=0))
+
+        # 【繁】首列字心距右邊距半個字身、首字字心距上邊距半個字身
+        # [EN] The first column's axis and the first glyph's center sit half an em inside the right and top margins
+        x_right = w - self.margins.right - fs // 2
+        y_top = self.margins.top + fs // 2
+        ctx = RenderContext(token=token)
+        start = x_right
+        for marks, end in main._segments(x_right, y_top, content_h, ctx):
+            # 【繁】各段接續上一段的末端向左排開（段漂移隨之累積）；按本段的起點移回本頁座標，各頁邊距才一致
+            # [EN] Each segment starts where the previous one ended, further left along the stream (segment drift
+            #      accumulates with it); shift it back by its own starting point so every page has the same margins
+            shift = x_right - start
+            dl = DisplayList(w, h, self.bg, paper=self.paper)
+            dl.extend(replace(m, p=(m.p[0] + shift, m.p[1])) for m in marks)
+            yield dl
+            start = end
+
+    def _map_pages(
+        self,
+        job: Callable[[int, DisplayList], T],
+        workers: int | None,
+        executor: Executor | None,
+        token: CancelToken | None,
+    ) -> Iterator[T]:
+        # 【繁】以 (頁碼, 顯示列表) 呼叫 job，按頁序產出結果；在途的頁數以視窗限制（約兩倍工作者數），
+        #       故記憶體不隨頁數增長
+        # [EN] Call job with (page number, display list) and yield the results in page order; a window (about
+        #      twice the worker count) bounds the pages in flight, so memory does not grow with the page count
+        if executor is None and workers == 1:
+            for page, dl in enumerate(self.pages(token), start=1):
+                yield job(page, dl)
+            return
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        n = workers or os.cpu_count() or 1
+        pool = executor if executor is not None else ProcessPoolExecutor(max_workers=n)
+        pending: deque[Future[T]] = deque()
+        try:
+            for page, dl in enumerate(self.pages(token), start=1):
+                pending.append(pool.submit(job, page, dl))
+                if len(pending) >= 2 * n:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for fut in pending:
+                fut.cancel()
+            if executor is None:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+    def render_pages(
+        self,
+        quality: str = "standard",
+        scale: float = 1.0,
+        workers: int | None = None,
+        executor: Executor | None = None,
+        token: CancelToken | None = None,
+    ) -> Iterator[Image.Image]:
+        """
+        【繁】按頁序產出各頁圖像。預設以 CPU 數個行程並行渲染；workers=1 在本行程內逐頁渲染；
+        亦可傳入自己的 executor（例如 ThreadPoolExecutor）。token 在排版與本行程渲染時檢查。
+        [EN] Yield the page images in order. Pages are rendered on a process pool of CPU-count workers by default;
+        workers=1 renders them one by one in this process, and any executor (e.g. a ThreadPoolExecutor) may be
+        passed instead. token is checked while laying out and when rendering in this process.
+        """
+        in_process = executor is None and workers == 1
+        job = partial(_rasterize_page, quality=quality, scale=scale, token=token if in_process else None)
+        return self._map_pages(job, workers, executor, token)
+
+    def save(
+        self,
+        pattern: str,
+        quality: str = "standard",
+        scale: float = 1.0,
+        workers: int | None = None,
+        executor: Executor | None = None,
+        token: CancelToken | None = None,
+        options: OutputOptions | None = None,
+    ) -> list[str]:
+        """
+        【繁】各頁存為編號圖檔，pattern 以 {page}（從 1 起）代入頁碼，例如 "out/leaf-{page:03d}.png"；
+        圖檔由工作者按 options 編碼並直接寫出。回傳寫出的路徑。
+        [EN] Save each page as a numbered image file; pattern takes the page number (from 1) as {page}, e.g.
+        "out/leaf-{page:03d}.png". Workers encode (per `options`) and write the files themselves. Returns the paths
+        written.
+        """
+        job = partial(_save_page, pattern=pattern, quality=quality, scale=scale, options=options)
+        return list(self._map_pages(job, workers, executor, token))
+
+    def save_pdf(
+        self,
+        path: str,
+        dpi: float = 150.0,
+        quality: str = "standard",
+        scale: float = 1.0,
+        workers: int | None = None,
+        executor: Executor | None = None,
+        token: CancelToken | None = None,
+    ) -> None:
+        """
+        【繁】輸出多頁點陣 PDF：工作者渲染並壓縮各頁，本行程按頁序串流寫入檔案；頁面尺寸按 dpi 由像素換算。檔案為原子寫入。
+        [EN] Save a multi-page raster PDF: workers render and compress each page, and this process streams them to
+        the file in page order; page size is converted from pixels at `dpi`. The file is written atomically.
+        """
+        job = partial(_compress_page, quality=quality, scale=scale)
+        # 【繁】原子寫檔（同 save_image）：頁面作業失敗或取消時不留下半個 PDF
+        # [EN] Atomic write (as save_image): a failed or cancelled page job leaves no half-written PDF behind
+        root, ext = os.path.splitext(path)
+        tmp = f"{root}.partial-{os.getpid()}-{threading.get_ident()}{ext}"
+        try:
+            with open(tmp, "wb") as fp:
+                _write_pdf(fp, self._map_pages(job, workers, executor, token), 72.0 / (dpi * scale))
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+
+# =========================
+# 【頁面作業 / Page jobs】
+# =========================
+# 【繁】模組層級函式，可序列化到工作行程 / [EN] Module-level functions, so they can be pickled to worker processes
+
+
+def _rasterize_page(
+    page: int, dl: DisplayList, quality: str, scale: float, token: CancelToken | None = None
+) -> Image.Image:
+    return dl.rasterize(quality=quality, scale=scale, token=token)
+
+
+def _save_page(
+    page: int, dl: DisplayList, pattern: str, quality: str, scale: float, options: OutputOptions | None = None
+) -> str:
+    return save_image(dl.rasterize(quality=quality, scale=scale), pattern.format(page=page), options)
+
+
+def _compress_page(page: int, dl: DisplayList, quality: str, scale: float) -> tuple[int, int, bytes]:
+    # 【繁】渲染並以 Flate 壓縮 RGB 像素（壓縮也在工作者上進行）
+    # [EN] Render and Flate-compress the RGB pixels (compression runs on the worker too)
+    img = dl.rasterize(quality=quality, scale=scale)
+    return img.width, img.height, zlib.compress(img.tobytes())
+
+
+def _write_pdf(fp: BinaryIO, pages: Iterator[tuple[int, int, bytes]], k: float) -> None:
+    # 【繁】串流寫出多頁點陣 PDF：每頁寫完即釋放；頁樹與目錄最後寫出（1、2 號物件預留給它們）
+    # [EN] Stream a multi-page raster PDF: each page is released once written; the page tree and catalog are written
+    #      last (objects 1 and 2 are reserved for them)
+    offsets: dict[int, int] = {}
+
+    def obj(num: int, body: bytes) -> None:
+        offsets[num] = fp.tell()
+        fp.write(f"{num} 0 obj\n".encode("latin-1") + body + b"\nendobj\n")
+
+    def stream(header: str, data: bytes) -> bytes:
+        return f"<< {header} /Length {len(data)} >>\nstream\n".encode("latin-1") + data + b"\nendstream"
+
+    fp.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    kids: list[int] = []
+    num = 2
+    for w, h, data in pages:
+        image, content, page = num + 1, num + 2, num + 3
+        num += 3
+        pw, ph = w * k, h * k
+        obj(
+            image,
+            stream(
+                f"/Type /XObject /Subtype /Image /Width {w} /Height {h} /ColorSpace /DeviceRGB /BitsPerComponent 8 "
+                "/Filter /FlateDecode",
+                data,
+            ),
+        )
+        obj(content, stream("", f"q {pw:.6g} 0 0 {ph:.6g} 0 0 cm /Im Do Q".encode("latin-1")))
+        obj(
+            page,
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {pw:.6g} {ph:.6g}] "
+            f"/Resources << /XObject << /Im {image} 0 R >> >> /Contents {content} 0 R >>".encode("latin-1"),
+        )
+        kids.append(page)
+    obj(2, f"<< /Type /Pages /Kids [{' '.join(f'{n} 0 R' for n in kids)}] /Count {len(kids)} >>".encode("latin-1"))
+    obj(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+
+    xref = fp.tell()
+    fp.write(f"xref\n0 {num + 1}\n0000000000 65535 f \n".encode("latin-1"))
+    fp.write(b"".join(f"{offsets[i]:010d} 00000 n \n".encode("latin-1") for i in range(1, num + 1)))
+    fp.write(f"trailer\n<< /Size {num + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1"))
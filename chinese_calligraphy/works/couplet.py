@@ -5,15 +5,26 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING
 
-from PIL import Image, ImageDraw
+from PIL import Image
 
 from ..brush import Brush
+from ..context import CancelToken, RenderContext
+from ..display import DisplayList, Frame
 from ..elements import Colophon, MainText, Seal
-from ..layout import Margins, ScrollCanvas, SegmentSpec
+from ..layout import Margins, SegmentSpec
+from ..metrics import glyph_ink_bboxes
+from ..output import ImageWriter, OutputOptions, save_image
+from ..paper import Paper
 from ..style import Style
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
 
 @dataclass
 class Couplet:
@@ -41,6 +52,9 @@ class Couplet:
 
     margins: Margins = field(default_factory=lambda: Margins(top=200, bottom=200, right=50, left=50))
     bg_color: tuple[int, int, int] = (160, 40, 40)
+    # 【繁】紙張材質（如灑金紅箋 Paper("gold_fleck")）；None 為純色
+    # [EN] Paper material (e.g. gold-flecked red paper, Paper("gold_fleck")); None for a flat color
+    paper: Paper | None = None
 
     seal_right: Seal | None = None
     seal_left: Seal | None = None
@@ -65,15 +79,15 @@ class Couplet:
         )  # 【繁】向上提 15% 的空白距離 [EN] Raise by 15% blank distance
         return geometric_center_start - visual_correction
 
-    def _render_vertical(self, text: str, colophon_text: str | None, seal: Seal | None) -> Image.Image:
+    def _layout_vertical(
+        self, text: str, colophon_text: str | None, seal: Seal | None, ctx: RenderContext
+    ) -> DisplayList:
         """
-        【繁】渲染單幅直聯（垂直自動居中 + 視覺修正）
-        [EN] Render a single vertical scroll (vertical auto-centering + visual correction)
+        【繁】排版單幅直聯（垂直自動居中 + 視覺修正）
+        [EN] Lay out a single vertical scroll (vertical auto-centering + visual correction)
         """
         assert self.style is not None, "Style must be provided"
-        canvas = ScrollCanvas(height=self.height, bg=self.bg_color)
-        img = canvas.new_image(self.width)
-        draw = ImageDraw.Draw(img)
+        dl = DisplayList(self.width, self.height, self.bg_color, paper=self.paper)
 
         # 1. 【繁】計算正文的實際垂直高度
         #    [EN] Calculate the actual vertical height of the main text
@@ -109,9 +123,10 @@ class Couplet:
         # [EN] MainText.width() is used to calculate width, approximated here as font_size
         # 【繁】content_height 傳入 self.height 即可，因為我們已經手動控製了 y_start
         # [EN] Pass self.height for content_height, as we have manually controlled y_start
-        cols = main._columns(self.height)
+        cols = list(main._columns(self.height))
         num_cols = len(cols)
         block_axis_span = (num_cols - 1) * self.style.col_spacing
+        half_em = self.style.font_size // 2
         paper_center_x = self.width // 2
         x_start_main = paper_center_x + (block_axis_span // 2)
 
@@ -119,11 +134,16 @@ class Couplet:
         #    [EN] Draw main text
         # 【繁】注意：content_height 參數在 draw 裡主要用於切分列。因為我們已經強制單列且手動計算了 Y，這裡傳入剩餘高度即可
         # [EN] Note: content_height in draw is mainly used for column splitting. Since we forced a single column and manually calculated Y, passing remaining height is fine
-        main.draw(img, draw, x_start_main, y_start_main, self.height)
+        main.place(dl, x_start_main, y_start_main, self.height, ctx)
 
         # 6. 【繁】處理落款
         #    [EN] Handle colophon
-        visual_left_edge = (x_start_main - block_axis_span) - (self.style.font_size // 2)
+        # 【繁】量末列各字的真實墨跡邊界（左緣、末字下緣），取代以字號估算的字身；只量這幾個字，不建整個字體的索引
+        # [EN] Measure the real ink extent of the last column (left edge, bottom of the last glyph) instead of
+        #      estimating the em box from the font size; only these glyphs are measured, not the whole font's index
+        ink = glyph_ink_bboxes(self.style.font_path, cols[-1] if cols else "", self.style.font_size)
+        ink_left, ink_bottom = (int(ink[:, 0].min()), int(ink[-1, 3])) if len(ink) else (-half_em, half_em)
+        visual_left_edge = (x_start_main - block_axis_span) + ink_left
 
         # 【繁】默認印章位置
         # [EN] Default seal position
@@ -131,7 +151,7 @@ class Couplet:
 
         # 【繁】印章跟隨正文結束位置
         # [EN] Seal follows the end position of the main text
-        seal_y = y_start_main + text_span_y + self.style.font_size + 50
+        seal_y = y_start_main + text_span_y + ink_bottom + half_em + 50
 
         if colophon_text:
             sig_style = Style(
@@ -152,21 +172,21 @@ class Couplet:
             # [EN] Align the first char of colophon roughly with the second char of main text, appearing humble
             y_col = y_start_main + self.style.font_size * 1.5
 
-            end_x_col, end_y_col = colophon_obj.draw(draw, int(x_col), int(y_col))
+            end_x_col, end_y_col = colophon_obj.place(dl, int(x_col), int(y_col), ctx)
 
             if seal:
                 seal_x = end_x_col - (seal.size - sig_style.font_size) // 2
                 seal_y = end_y_col + 30
 
         if seal:
-            seal.draw(draw, (int(seal_x), int(seal_y)))
+            seal.place(dl, (int(seal_x), int(seal_y)))
 
-        return img
+        return dl
 
-    def _render_header(self) -> Image.Image | None:
+    def _layout_header(self, ctx: RenderContext) -> DisplayList | None:
         """
-        【繁】渲染橫批（視覺垂直居中）
-        [EN] Render header (visual vertical centering)
+        【繁】排版橫批（視覺垂直居中）
+        [EN] Lay out the header (visual vertical centering)
         """
         if not self.text_header:
             return None
@@ -174,9 +194,7 @@ class Couplet:
         w = self.header_width if self.header_width else int(self.width * 2.5)
         h = self.header_height
         assert self.style is not None, "Style must be provided"
-        canvas = ScrollCanvas(height=h, bg=self.bg_color)
-        img = canvas.new_image(w)
-        draw = ImageDraw.Draw(img)
+        dl = DisplayList(w, h, self.bg_color, paper=self.paper)
 
         one_char_h = self.style.step_y + 10
 
@@ -192,56 +210,240 @@ class Couplet:
             segment=SegmentSpec(columns_per_segment=1, segment_gap=0),
         )
 
-        cols = main._columns(one_char_h)
-        num_chars = len(cols)
+        num_chars = main.num_columns(one_char_h)
         block_span = (num_chars - 1) * self.style.col_spacing
 
         x_center = w // 2
         x_right_start = x_center + (block_span // 2)
 
-        main.draw(img, draw, x_right_start, y_center_axis, one_char_h)
+        main.place(dl, x_right_start, y_center_axis, one_char_h, ctx)
 
         if self.seal_header:
             sx = self.margins.left
             sy = (h - self.seal_header.size) // 2
-            self.seal_header.draw(draw, (sx, sy))
+            self.seal_header.place(dl, (sx, sy))
 
-        return img
+        return dl
 
-    def render(self) -> tuple[Image.Image, Image.Image, Image.Image | None]:
-        img_right = self._render_vertical(self.text_right, self.colophon_right, self.seal_right)
-        img_left = self._render_vertical(self.text_left, self.colophon_left, self.seal_left)
-        img_header = self._render_header()
-        return img_right, img_left, img_header
+    def layout(self, token: CancelToken | None = None) -> tuple[DisplayList, DisplayList, DisplayList | None]:
+        """
+        【繁】排版右聯、左聯與橫批為顯示列表（原尺寸）
+        [EN] Lay the right and left scrolls and the header out into display lists (full size)
+        """
+        ctx = RenderContext(token=token)
+        right = self._layout_vertical(self.text_right, self.colophon_right, self.seal_right, ctx)
+        left = self._layout_vertical(self.text_left, self.colophon_left, self.seal_left, ctx)
+        return right, left, self._layout_header(ctx)
+
+    def render(
+        self,
+        token: CancelToken | None = None,
+        quality: str = "standard",
+        scale: float = 1.0,
+        threads: int = 1,
+        canvas: str = "rgb",
+    ) -> tuple[Image.Image, Image.Image, Image.Image | None]:
+        """
+        【繁】渲染右聯、左聯與橫批；quality="draft" 與 scale<1 供調參速覽（版式與隨機序列不變）
+        [EN] Render the right and left scrolls and the header; quality="draft" and scale<1 are for quick previews
+        (same layout and random draws); threads > 1 paints glyphs on a thread pool and canvas="coverage" uses
+        coverage planes (see Handscroll.render)
+        """
+        return self._rasterize(self.layout(token), quality, scale, token, threads, canvas)
 
-    def save(self, prefix: str) -> None:
-        img_right, img_left, img_header = self.render()
-        img_right.save(f"{prefix}_right.png")
-        img_left.save(f"{prefix}_left.png")
-        if img_header:
-            img_header.save(f"{prefix}_header.png")
+    def render_multi(
+        self, scales: Sequence[float] = (1.0, 0.25, 0.05), quality: str = "standard", token: CancelToken | None = None
+    ) -> list[tuple[Image.Image, Image.Image, Image.Image | None]]:
+        """
+        【繁】一次排版、多種解析度（見 Handscroll.render_multi）
+        [EN] One layout pass, several resolutions (see Handscroll.render_multi)
+        """
+        layout = self.layout(token)
+        return [self._rasterize(layout, quality, s, token) for s in scales]
+
+    @staticmethod
+    def _rasterize(
+        layout: tuple[DisplayList, DisplayList, DisplayList | None],
+        quality: str,
+        scale: float,
+        token: CancelToken | None,
+        threads: int = 1,
+        canvas: str = "rgb",
+    ) -> tuple[Image.Image, Image.Image, Image.Image | None]:
+        right, left, header = layout
+        raster = partial(
+            DisplayList.rasterize, quality=quality, scale=scale, token=token, threads=threads, canvas=canvas
+        )
+        return raster(right), raster(left), raster(header) if header is not None else None
+
+    async def render_async(
+        self,
+        executor: Executor | None = None,
+        token: CancelToken | None = None,
+        quality: str = "standard",
+        scale: float = 1.0,
+    ) -> tuple[Image.Image, Image.Image, Image.Image | None]:
+        """
+        【繁】非同步渲染：在執行器上運行，不阻塞事件迴圈；任務取消即中止渲染
+        [EN] Async render: runs on an executor without blocking the event loop; cancelling the task stops the render
+        """
+        from ..aio import run_in_executor
+
+        render = partial(self.render, quality=quality, scale=scale)
+        return await run_in_executor(render, executor=executor, token=token)
+
+    async def save_async(
+        self,
+        prefix: str,
+        executor: Executor | None = None,
+        token: CancelToken | None = None,
+        quality: str = "standard",
+        scale: float = 1.0,
+        options: OutputOptions | None = None,
+    ) -> None:
+        """
+        【繁】非同步渲染並保存（同 save 的檔名規則）
+        [EN] Async render and save (same file naming as save)
+        """
+        from ..aio import run_in_executor
+
+        await run_in_executor(
+            partial(self.save, quality=quality, scale=scale, options=options), prefix, executor=executor, token=token
+        )
 
-    def save_preview(self, path: str, gap: int = 50) -> None:
-        img_right, img_left, img_header = self.render()
-        w_total = img_right.width + img_left.width + gap * 4
+    def save(
+        self,
+        prefix: str,
+        token: CancelToken | None = None,
+        quality: str = "standard",
+        scale: float = 1.0,
+        options: OutputOptions | None = None,
+    ) -> None:
+        """
+        【繁】寫出 {prefix}_right、_left 與（若有）_header；副檔名按 options.format（預設 .png），各檔同時編碼。
+        [EN] Write {prefix}_right, _left and (if any) _header; the extension follows options.format (.png by
+        default), and the files are encoded concurrently.
+        """
+        ext = (options or OutputOptions()).extension()
+        img_right, img_left, img_header = self.render(token=token, quality=quality, scale=scale)
+        items = [(img_right, f"{prefix}_right{ext}"), (img_left, f"{prefix}_left{ext}")]
         if img_header:
-            w_total = max(w_total, img_header.width + gap * 2)
-        h_header_val = img_header.height if img_header else 0
-        h_total = h_header_val + gap + max(img_right.height, img_left.height) + gap
+            items.append((img_header, f"{prefix}_header{ext}"))
+        with ImageWriter(options, max_pending=len(items), workers=len(items)) as writer:
+            writer.save_all(items)
+
+    def save_svg(self, prefix: str, token: CancelToken | None = None, ink_texture: bool = False) -> None:
+        """
+        【繁】輸出向量 SVG（同 save 的檔名規則；見 Handscroll.save_svg）
+        [EN] Save vector SVGs (same file naming as save; see Handscroll.save_svg)
+        """
+        from ..vector import save_svg
+
+        right, left, header = self.layout(token)
+        save_svg(right, f"{prefix}_right.svg", ink_texture=ink_texture)
+        save_svg(left, f"{prefix}_left.svg", ink_texture=ink_texture)
+        if header is not None:
+            save_svg(header, f"{prefix}_header.svg", ink_texture=ink_texture)
+
+    def save_pdf(
+        self, path: str, token: CancelToken | None = None, dpi: float = 72.0, ink_texture: bool = False
+    ) -> None:
+        """
+        【繁】輸出向量 PDF：右聯、左聯、橫批各一頁，共用字形
+        [EN] Save a vector PDF: one page each for the right scroll, left scroll and header, sharing glyphs
+        """
+        from ..vector import save_pdf
+
+        pages = [dl for dl in self.layout(token) if dl is not None]
+        save_pdf(pages, path, dpi=dpi, ink_texture=ink_texture)
+
+    def save_preview(
+        self,
+        path: str,
+        gap: int = 50,
+        quality: str = "standard",
+        scale: float = 1.0,
+        options: OutputOptions | None = None,
+    ) -> None:
+        save_image(self.preview(gap=gap, quality=quality, scale=scale), path, options)
+
+    @staticmethod
+    def _sheet(
+        right: tuple[int, int], left: tuple[int, int], header: tuple[int, int] | None, gap: int
+    ) -> tuple[tuple[int, int], tuple[int, int], tuple[int, int], tuple[int, int] | None]:
+        # 【繁】預覽拼版：橫批在上，左聯在左、右聯在右；回傳整張尺寸與右聯、左聯、橫批的左上角
+        # [EN] Preview sheet: header on top, left scroll on the left and right scroll on the right; returns the sheet
+        #      size and the top-left corners of the right scroll, left scroll and header
+        w_total = right[0] + left[0] + gap * 4
+        if header:
+            w_total = max(w_total, header[0] + gap * 2)
+        h_header_val = header[1] if header else 0
+        h_total = h_header_val + gap + max(right[1], left[1]) + gap
 
-        preview = Image.new("RGB", (w_total, h_total), (255, 255, 255))
         current_y = gap
-        if img_header:
-            x_h = (w_total - img_header.width) // 2
-            preview.paste(img_header, (x_h, current_y))
-            current_y += img_header.height + gap
+        header_at = None
+        if header:
+            header_at = ((w_total - header[0]) // 2, current_y)
+            current_y += header[1] + gap
 
-        pair_w = img_left.width + gap + img_right.width
+        pair_w = left[0] + gap + right[0]
         x_start = (w_total - pair_w) // 2
 
         # 【繁】左側放左聯（下聯），右側放右聯（上聯），符合展示習慣
         # [EN] Place left scroll (bottom couplet) on the left, right scroll (top couplet) on the right, matching display convention
-        preview.paste(img_left, (x_start, current_y))
-        preview.paste(img_right, (x_start + img_left.width + gap, current_y))
-
-        preview.save(path)
+        return (w_total, h_total), (x_start + left[0] + gap, current_y), (x_start, current_y), header_at
+
+    def preview(self, gap: int = 50, quality: str = "standard", scale: float = 1.0) -> Image.Image:
+        # 【繁】白底預覽：橫批在上，左右兩聯並排
+        # [EN] White-background preview: header on top, the two scrolls side by side
+        img_right, img_left, img_header = self.render(quality=quality, scale=scale)
+        size, right_at, left_at, header_at = self._sheet(
+            img_right.size, img_left.size, img_header.size if img_header else None, gap
+        )
+        preview = Image.new("RGB", size, (255, 255, 255))
+        if img_header and header_at:
+            preview.paste(img_header, header_at)
+        preview.paste(img_left, left_at)
+        preview.paste(img_right, right_at)
+        return preview
+
+    def iter_frames(
+        self,
+        token: CancelToken | None = None,
+        quality: str = "standard",
+        scale: float = 1.0,
+        threads: int = 1,
+        group: int = 1,
+        gap: int = 50,
+    ) -> Iterator[Frame]:
+        """
+        【繁】書寫動畫，畫在預覽拼版上：第 0 幀為三幅空白，其後依右聯、左聯、橫批的次序逐筆增量合成；
+        各幅在自己的畫布上落筆，每幀只把變動矩形貼到拼版上（見 Handscroll.iter_frames）
+        [EN] Writing animation on the preview sheet: frame 0 shows the three blank scrolls, then marks are
+        composited incrementally in the order right scroll, left scroll, header; each scroll paints on its own canvas
+        and every frame pastes only the changed rectangle onto the sheet (see Handscroll.iter_frames)
+        """
+        layout = [dl for dl in self.layout(token) if dl is not None]
+        parts = [
+            dl.iter_frames(quality=quality, scale=scale, token=token, threads=threads, group=group) for dl in layout
+        ]
+        blanks = [next(part) for part in parts]
+        size, *corners = self._sheet(
+            blanks[0].image.size, blanks[1].image.size, blanks[2].image.size if len(blanks) > 2 else None, gap
+        )
+        sheet = Image.new("RGB", size, (255, 255, 255))
+        for blank, at in zip(blanks, corners, strict=False):
+            assert at is not None
+            sheet.paste(blank.image, at)
+        yield Frame(0, sheet, (0, 0, *size))
+
+        index = 1
+        for part, at in zip(parts, corners, strict=False):
+            assert at is not None
+            x, y = at
+            for frame in part:
+                x0, y0, x1, y1 = frame.box
+                if x1 > x0 and y1 > y0:
+                    sheet.paste(frame.delta(), (x + x0, y + y0))
+                yield Frame(index, sheet, (x + x0, y + y0, x + x1, y + y1))
+                index += 1
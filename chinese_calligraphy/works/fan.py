@@ -4,15 +4,25 @@ from __future__ import annotations
 
 import math
 import random
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageFont
 
 from ..brush import Brush
+from ..context import CancelToken, RenderContext
+from ..display import DisplayList, Frame, ShapeMark
+from ..output import OutputOptions, save_image
+from ..paper import Paper
 from ..style import Style
 from ..types import Color
 from ..utils import chunk, strip_newlines
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
 
 @dataclass
 class Fan:
@@ -46,6 +56,7 @@ class Fan:
     angle_span: int = 140
 
     bg_color: Color = (235, 215, 170)  # 泥金/灑金紙色
+    paper: Paper | None = None  # 扇面紙紋，如 Paper("gold_fleck") / leaf paper texture, e.g. Paper("gold_fleck")
 
     def __post_init__(self) -> None:
         if self.style is None:
@@ -74,10 +85,55 @@ class Fan:
         clean_text = strip_newlines(text)
         return chunk(clean_text, cpc)
 
-    def render(self) -> Image.Image:
+    def render(
+        self,
+        token: CancelToken | None = None,
+        quality: str = "standard",
+        scale: float = 1.0,
+        threads: int = 1,
+        canvas: str = "rgb",
+    ) -> Image.Image:
+        """
+        【繁】渲染扇面；quality="draft" 與 scale<1 供調參速覽（版式與隨機序列不變）
+        [EN] Render the fan; quality="draft" and scale<1 are for quick previews (same layout and random draws);
+        threads > 1 paints glyphs on a thread pool and canvas="coverage" uses coverage planes (see Handscroll.render)
+        """
+        dl = self.layout(token)
+        return dl.rasterize(quality=quality, scale=scale, token=token, threads=threads, canvas=canvas)
+
+    def iter_frames(
+        self,
+        token: CancelToken | None = None,
+        quality: str = "standard",
+        scale: float = 1.0,
+        threads: int = 1,
+        group: int = 1,
+    ) -> Iterator[Frame]:
+        """
+        【繁】書寫動畫：第 0 幀為空白扇面，其後按書寫次序逐筆增量合成（見 Handscroll.iter_frames）
+        [EN] Writing animation: frame 0 is the blank fan leaf, then marks are composited incrementally in writing
+        order (see Handscroll.iter_frames)
+        """
+        return self.layout(token).iter_frames(quality=quality, scale=scale, token=token, threads=threads, group=group)
+
+    def render_multi(
+        self, scales: Sequence[float] = (1.0, 0.25, 0.05), quality: str = "standard", token: CancelToken | None = None
+    ) -> list[Image.Image]:
+        """
+        【繁】一次排版、多種解析度（見 Handscroll.render_multi）
+        [EN] One layout pass, several resolutions (see Handscroll.render_multi)
+        """
+        dl = self.layout(token)
+        return [dl.rasterize(quality=quality, scale=s, token=token) for s in scales]
+
+    def layout(self, token: CancelToken | None = None) -> DisplayList:
+        """
+        【繁】排版扇面為顯示列表（原尺寸）
+        [EN] Lay the fan out into a display list (full size)
+        """
         assert self.style is not None, "Fan.style must be provided"
-        img = Image.new("RGB", (self.width, self.height), (255, 255, 255))
-        draw = ImageDraw.Draw(img)
+        ctx = RenderContext(token=token)
+        dl = DisplayList(self.width, self.height, (255, 255, 255))
 
         # --- 1. 繪製扇形背景 (Draw Background) ---
         half_span = self.angle_span / 2
@@ -85,22 +141,22 @@ class Fan:
         pil_end = 270 + half_span
 
         # 外弧 (Gold)
-        bbox_outer = [
+        bbox_outer = (
             self.center_x - self.radius_outer,
             self.center_y - self.radius_outer,
             self.center_x + self.radius_outer,
             self.center_y + self.radius_outer,
-        ]
-        draw.pieslice(bbox_outer, start=pil_start, end=pil_end, fill=self.bg_color)
+        )
+        dl.add(ShapeMark("pieslice", bbox_outer, fill=self.bg_color, start=pil_start, end=pil_end, paper=self.paper))
 
         # 內弧 (White mask) - 模擬扇骨鏤空區
-        bbox_inner = [
+        bbox_inner = (
             self.center_x - self.radius_inner,
             self.center_y - self.radius_inner,
             self.center_x + self.radius_inner,
             self.center_y + self.radius_inner,
-        ]
-        draw.pieslice(bbox_inner, start=pil_start - 1, end=pil_end + 1, fill=(255, 255, 255))
+        )
+        dl.add(ShapeMark("pieslice", bbox_inner, fill=(255, 255, 255), start=pil_start - 1, end=pil_end + 1))
 
         # --- 2. 準備排版數據 ---
         # 正文
@@ -141,7 +197,7 @@ class Fan:
 
         # 3.1 繪製正文
         for _col_idx, col_text in enumerate(main_cols):
-            self._draw_column(img, draw, col_text, current_angle, self.style, font_main, rng, is_colophon=False)
+            self._place_column(dl, col_text, current_angle, self.style, font_main, rng, ctx, is_colophon=False)
             current_angle += step_main
 
         # 3.2 繪製落款
@@ -151,25 +207,27 @@ class Fan:
 
             for _col_idx, col_text in enumerate(col_cols):
                 # 落款通常稍微低一點開始 (天頭留白更多)
-                self._draw_column(
-                    img, draw, col_text, current_angle, self.colophon_style, font_col, rng, is_colophon=True
+                self._place_column(
+                    dl, col_text, current_angle, self.colophon_style, font_col, rng, ctx, is_colophon=True
                 )
                 current_angle += step_col
 
-        return img
+        return dl
 
-    def _draw_column(
+    def _place_column(
         self,
-        img: Image.Image,
-        draw: ImageDraw.ImageDraw,
+        dl: DisplayList,
         text: str,
         angle_deg: float,
         style: Style,
         font: ImageFont.FreeTypeFont | None,
         rng: random.Random,
+        ctx: RenderContext,
         is_colophon: bool,
     ) -> None:
         assert font is not None, "Font must be provided"
+        # 【繁】列間檢查點 / [EN] checkpoint between columns
+        ctx.checkpoint()
         # 計算列的起始半徑
         # 正文：緊貼上邊緣；落款：稍微下沈
         top_margin = style.font_size * 0.8
@@ -180,6 +238,7 @@ class Fan:
 
         # 列級漂移初始化
         dx, dy = self.brush.init_col_state()
+        densities = self.brush.glyph_densities(text, style.font_path)
 
         for row_idx, ch in enumerate(text):
             rad = math.radians(angle_deg)
@@ -191,11 +250,11 @@ class Fan:
             base_rot = -angle_deg
 
             # 筆觸變形
-            rot_jit, shear, scale = self.brush.glyph_transform_params(rng, ch, None, None, 0, 0, row_idx)
+            rot_jit, shear, scale = self.brush.glyph_transform_params(
+                rng, ch, None, None, 0, 0, row_idx, densities[row_idx]
+            )
 
-            self.brush.draw_char(
-                base_img=img,
-                draw=draw,
+            mark = self.brush.place_char(
                 p=(int(cx + dx), int(cy + dy)),
                 ch=ch,
                 font=font,
@@ -207,12 +266,75 @@ class Fan:
                 ink_dryness=style.ink_dryness,
                 blur_sigma=style.blur_sigma,
             )
+            dl.add(mark)
 
             current_r -= style.step_y
 
-    def save(self, path: str) -> None:
+    def save(
+        self,
+        path: str,
+        token: CancelToken | None = None,
+        quality: str = "standard",
+        scale: float = 1.0,
+        options: OutputOptions | None = None,
+    ) -> None:
         """
-        【繁】保存到文件
-        [EN] Save to file
+        【繁】保存到文件（格式與壓縮見 OutputOptions）
+        [EN] Save to file (format and compression per OutputOptions)
+        """
+        save_image(self.render(token=token, quality=quality, scale=scale), path, options)
+
+    def save_svg(self, path: str, token: CancelToken | None = None, ink_texture: bool = False) -> None:
         """
-        self.render().save(path)
+        【繁】輸出向量 SVG（見 Handscroll.save_svg）
+        [EN] Save a vector SVG (see Handscroll.save_svg)
+        """
+        from ..vector import save_svg
+
+        save_svg(self.layout(token), path, ink_texture=ink_texture)
+
+    def save_pdf(
+        self, path: str, token: CancelToken | None = None, dpi: float = 72.0, ink_texture: bool = False
+    ) -> None:
+        """
+        【繁】輸出向量 PDF（見 Handscroll.save_pdf）
+        [EN] Save a vector PDF (see Handscroll.save_pdf)
+        """
+        from ..vector import save_pdf
+
+        save_pdf([self.layout(token)], path, dpi=dpi, ink_texture=ink_texture)
+
+    async def render_async(
+        self,
+        executor: Executor | None = None,
+        token: CancelToken | None = None,
+        quality: str = "standard",
+        scale: float = 1.0,
+    ) -> Image.Image:
+        """
+        【繁】非同步渲染：在執行器上運行，不阻塞事件迴圈；任務取消即中止渲染
+        [EN] Async render: runs on an executor without blocking the event loop; cancelling the task stops the render
+        """
+        from ..aio import run_in_executor
+
+        render = partial(self.render, quality=quality, scale=scale)
+        return await run_in_executor(render, executor=executor, token=token)
+
+    async def save_async(
+        self,
+        path: str,
+        executor: Executor | None = None,
+        token: CancelToken | None = None,
+        quality: str = "standard",
+        scale: float = 1.0,
+        options: OutputOptions | None = None,
+    ) -> None:
+        """
+        【繁】非同步渲染並保存
+        [EN] Async render and save
+        """
+        from ..aio import run_in_executor
+
+        await run_in_executor(
+            partial(self.save, quality=quality, scale=scale, options=options), path, executor=executor, token=token
+        )
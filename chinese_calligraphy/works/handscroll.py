@@ -5,12 +5,22 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass, field
+from functools import partial
+from itertools import chain
+from typing import TYPE_CHECKING
 
-from PIL import Image, ImageDraw
+from PIL import Image
 
+from ..context import CancelToken, RenderContext
+from ..display import DisplayList, Frame, Mark
 from ..elements import Colophon, MainText, Seal, Title
 from ..layout import Margins, ScrollCanvas
+from ..output import OutputOptions, save_image
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
 
 
 @dataclass
@@ -57,16 +67,18 @@ class Handscroll:
 
         return w
 
-    def render(self) -> Image.Image:
-        # 【繁】生成整卷圖像
-        # [EN] Render full scroll image
-        assert self.main is not None, "Handscroll.main must be set"
+    def _sheet(self) -> DisplayList:
+        # 【繁】整卷的空白顯示列表（尺寸、底色、紙張）/ [EN] Empty display list of the whole scroll (size, bg, paper)
+        return DisplayList(self.measure_width(), self.canvas.height, self.canvas.bg, paper=self.canvas.paper)
 
+    def _batches(self, width: int, ctx: RenderContext) -> Iterator[list[Mark]]:
+        # 【繁】按書寫次序逐批產出筆跡：引首（題與引首章）、正文逐段、款識與名章；正文每段在取用時才排版，
+        #       只暫存一段
+        # [EN] Yield the marks in writing order, batch by batch: the lead (title and lead seal), the main text
+        #      segment by segment, then the colophon and name seal; each segment is laid out only when it is taken,
+        #      so only one segment is held
+        assert self.main is not None, "Handscroll.main must be set"
         content_h = self._content_height()
-        width = self.measure_width()
-
-        img = self.canvas.new_image(width)
-        draw = ImageDraw.Draw(img)
 
         # 【繁】右起：從最右端向左逐段展開
         # [EN] Start from the right edge and flow leftwards
@@ -75,40 +87,153 @@ class Handscroll:
 
         # 1) 引首題字 / Lead title
         if self.title is not None:
-            self.title.draw(draw, x_right, y_top + 50)
+            head = DisplayList()
+            self.title.place(head, x_right, y_top + 50, ctx)
 
             # 引首章（可選）：放在題後稍偏下
             # Lead seal (optional): place slightly below after title
             if self.lead_seal is not None:
                 seal_x = x_right + 20
                 seal_y = y_top + 50 + len(self.title.text) * self.title.style.step_y + 90
-                self.lead_seal.draw(draw, (seal_x, seal_y))
+                self.lead_seal.place(head, (seal_x, seal_y))
 
+            yield head.marks
             x_right -= self.title.width() + self.title.extra_gap_after
 
         # 2) 正文（分段）/ Main text (segmented)
-        x_right = self.main.draw(img, draw, x_right, y_top, content_h)
+        for marks, x_end in self.main._segments(x_right, y_top, content_h, ctx):
+            yield list(marks)
+            x_right = x_end
 
         # 3) 款識 / Colophon
         if self.colophon is not None:
+            tail = DisplayList()
             # 【繁】款識略低：避免與正文末列同高頂住
             # [EN] Put colophon a bit lower to avoid cramped ending
             sig_x = x_right - 50
             sig_y = y_top + 600
-            _, end_y = self.colophon.draw(draw, sig_x, sig_y)
+            _, end_y = self.colophon.place(tail, sig_x, sig_y, ctx)
 
             # 4) 名章（可選）/ Name seal (optional)
             if self.name_seal is not None:
                 seal_x = sig_x - 20
                 seal_y = end_y + 30
-                self.name_seal.draw(draw, (seal_x, seal_y))
-
-        return img
-
-    def save(self, path: str) -> None:
-        # 【繁】輸出 PNG
-        # [EN] Save PNG
-        self.render().save(path)
+                self.name_seal.place(tail, (seal_x, seal_y))
+            yield tail.marks
+
+    def layout(self, token: CancelToken | None = None) -> DisplayList:
+        # 【繁】排版整卷為顯示列表（原尺寸，隨機數全部抽定）；整篇筆跡皆存於列表中，render 則逐段落筆不保留
+        # [EN] Lay the whole scroll out into a display list (full size, all random draws taken); it holds every
+        #      mark of the text, whereas render paints segment by segment without keeping them
+        dl = self._sheet()
+        for batch in self._batches(dl.width, RenderContext(token=token)):
+            dl.extend(batch)
+        return dl
+
+    def render(
+        self,
+        token: CancelToken | None = None,
+        quality: str = "standard",
+        scale: float = 1.0,
+        threads: int = 1,
+        canvas: str = "rgb",
+    ) -> Image.Image:
+        # 【繁】生成整卷圖像；token 取消時拋出 RenderCancelled。
+        #       quality="draft" 與 scale<1 供調參速覽：版式與隨機序列不變，只略過墨韻、縮小輸出
+        # [EN] Render full scroll image; if token is cancelled, RenderCancelled is raised.
+        #      quality="draft" and scale<1 are for quick previews while tuning: same layout and random draws, ink
+        #      effects skipped and output reduced.
+        #      threads > 1 paints glyphs on a thread pool for a single latency-sensitive render (same output);
+        #      canvas="coverage" paints onto per-ink coverage planes and colorizes at the end (see DisplayList.rasterize)
+        # 【繁】邊排版邊落筆：正文每段排好即畫，不建整篇的顯示列表，排版記憶體與全文長度無關（輸出同 layout()）
+        # [EN] Lay out while painting: each main-text segment is painted as soon as it is laid out, without a display
+        #      list of the whole text, so layout memory does not depend on the text length (same output as layout())
+        sheet = self._sheet()
+        marks = chain.from_iterable(self._batches(sheet.width, RenderContext(token=token)))
+        return sheet.rasterize(quality=quality, scale=scale, token=token, threads=threads, canvas=canvas, marks=marks)
+
+    def iter_frames(
+        self,
+        token: CancelToken | None = None,
+        quality: str = "standard",
+        scale: float = 1.0,
+        threads: int = 1,
+        group: int = 1,
+    ) -> Iterator[Frame]:
+        # 【繁】書寫動畫：按書寫次序每落 group 筆產出一幀，增量合成於同一張畫布（見 DisplayList.iter_frames）；
+        #       可直接交給 output.save_apng 或 output.save_frames
+        # [EN] Writing animation: a frame after every `group` marks in writing order, composited incrementally on
+        #      one canvas (see DisplayList.iter_frames); can go straight to output.save_apng or output.save_frames
+        return self.layout(token).iter_frames(quality=quality, scale=scale, token=token, threads=threads, group=group)
+
+    def render_multi(
+        self, scales: Sequence[float] = (1.0, 0.25, 0.05), quality: str = "standard", token: CancelToken | None = None
+    ) -> list[Image.Image]:
+        # 【繁】一次排版、多種解析度：各 scale 直接以縮放後的字體/畫布/墨韻參數光柵化，彼此一致
+        # [EN] One layout pass, several resolutions: each scale is rasterized directly with scaled fonts, canvas and
+        #      ink parameters, so the outputs match each other
+        dl = self.layout(token)
+        return [dl.rasterize(quality=quality, scale=s, token=token) for s in scales]
+
+    def save(
+        self,
+        path: str,
+        token: CancelToken | None = None,
+        quality: str = "standard",
+        scale: float = 1.0,
+        options: OutputOptions | None = None,
+    ) -> None:
+        # 【繁】輸出圖檔（格式與壓縮見 OutputOptions；預設按副檔名，PNG 為主）
+        # [EN] Save an image file (format and compression per OutputOptions; by default from the extension, PNG)
+        save_image(self.render(token=token, quality=quality, scale=scale), path, options)
+
+    def save_svg(self, path: str, token: CancelToken | None = None, ink_texture: bool = False) -> None:
+        # 【繁】輸出向量 SVG：字形取自字體輪廓（需要 fontTools），每個不同的字只存一次；ink_texture=True 疊加乾筆紋理
+        # [EN] Save a vector SVG: glyphs are font outlines (needs fontTools), each distinct character stored once;
+        #      ink_texture=True adds the dry-brush texture
+        from ..vector import save_svg
+
+        save_svg(self.layout(token), path, ink_texture=ink_texture)
+
+    def save_pdf(
+        self, path: str, token: CancelToken | None = None, dpi: float = 72.0, ink_texture: bool = False
+    ) -> None:
+        # 【繁】輸出向量 PDF（同 save_svg）；頁面尺寸按 dpi 由像素換算
+        # [EN] Save a vector PDF (as save_svg); the page size is converted from pixels at `dpi`
+        from ..vector import save_pdf
+
+        save_pdf([self.layout(token)], path, dpi=dpi, ink_texture=ink_texture)
+
+    async def render_async(
+        self,
+        executor: Executor | None = None,
+        token: CancelToken | None = None,
+        quality: str = "standard",
+        scale: float = 1.0,
+    ) -> Image.Image:
+        # 【繁】非同步渲染：在執行器上運行，不阻塞事件迴圈；任務取消即中止渲染
+        # [EN] Async render: runs on an executor without blocking the event loop; cancelling the task stops the render
+        from ..aio import run_in_executor
+
+        render = partial(self.render, quality=quality, scale=scale)
+        return await run_in_executor(render, executor=executor, token=token)
+
+    async def save_async(
+        self,
+        path: str,
+        executor: Executor | None = None,
+        token: CancelToken | None = None,
+        quality: str = "standard",
+        scale: float = 1.0,
+        options: OutputOptions | None = None,
+    ) -> None:
+        # 【繁】非同步渲染並輸出
+        # [EN] Async render and save
+        from ..aio import run_in_executor
+
+        await run_in_executor(
+            partial(self.save, quality=quality, scale=scale, options=options), path, executor=executor, token=token
+        )
 
     def save_preview(self, path: str, segment_index: int, preview_width: int = 3200) -> None:
         # 【繁】輸出某一段附近的裁切預覽，便於調參
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+# 【繁】測試用字集：每字由數筆矩形組成，足以驗證排版與墨韻管線
+# [EN] Test charset: each glyph is a few rectangles, enough to exercise layout and the ink pipeline
+TEST_CHARS = "永和九年歲在癸丑之一二三山水人天月花書法印章"
+
+# 【繁】隨測試附帶的字體（由 _build_test_font 生成，約 2 KB），不需 fontTools 即可執行測試；黃金圖以它渲染
+# [EN] Font bundled with the tests (generated by _build_test_font, about 2 KB), so the tests run without fontTools;
+#      the golden images are rendered with it
+BUNDLED_FONT = Path(__file__).parent / "data" / "CalligraphyTest.ttf"
+
+
+def _build_test_font(path: Path) -> None:
+    fb = pytest.importorskip("fontTools.fontBuilder")
+    pens = pytest.importorskip("fontTools.pens.ttGlyphPen")
+
+    def box_glyph(rects: list[tuple[int, int, int, int]]) -> object:
+        pen = pens.TTGlyphPen(None)
+        for x0, y0, x1, y1 in rects:
+            pen.moveTo((x0, y0))
+            pen.lineTo((x0, y1))
+            pen.lineTo((x1, y1))
+            pen.lineTo((x1, y0))
+            pen.closePath()
+        return pen.glyph()
+
+    glyph_order = [".notdef"]
+    cmap: dict[int, str] = {}
+    glyphs = {".notdef": box_glyph([(100, -80, 900, 720)])}
+    for i, ch in enumerate(TEST_CHARS):
+        name = f"uni{ord(ch):04X}"
+        glyph_order.append(name)
+        cmap[ord(ch)] = name
+        # 【繁】一橫 + 一竪 + 一筆按序號偏移，使各字形彼此可區分
+        # [EN] One horizontal + one vertical + one index-dependent stroke, so glyphs differ
+        k = (i * 97) % 600
+        glyphs[name] = box_glyph(
+            [
+                (80, 280, 920, 400),
+                (440, -100, 560, 820),
+                (100 + k // 2, 500, 260 + k // 2, 760 - (k % 200)),
+            ]
+        )
+
+    builder = fb.FontBuilder(1000, isTTF=True)
+    builder.setupGlyphOrder(glyph_order)
+    builder.setupCharacterMap(cmap)
+    builder.setupGlyf(glyphs)
+    builder.setupHorizontalMetrics(dict.fromkeys(glyph_order, (1000, 0)))
+    builder.setupHorizontalHeader(ascent=880, descent=-120)
+    builder.setupNameTable({"familyName": "CalligraphyTest", "styleName": "Regular"})
+    builder.setupOS2(sTypoAscender=880, sTypoDescender=-120, usWinAscent=880, usWinDescent=120)
+    builder.setupPost()
+    builder.save(str(path))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _session_cache(tmp_path_factory: pytest.TempPathFactory) -> Iterator[None]:
+    # 【繁】磁碟快取（紙紋磚、字形度量索引）寫入臨時目錄，不污染使用者快取
+    # [EN] On-disk caches (paper tiles, glyph metrics indexes) go to a temporary directory, not the user's cache
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("CHINESE_CALLIGRAPHY_CACHE", str(tmp_path_factory.mktemp("cache")))
+        yield
+
+
+@pytest.fixture(scope="session")
+def font_path() -> str:
+    return str(BUNDLED_FONT)
+
+
+if __name__ == "__main__":
+    # 【繁】重新生成隨附字體（改動後須以 python -m benchmarks.golden --update 更新黃金圖）
+    # [EN] Regenerate the bundled font (then refresh the golden images with python -m benchmarks.golden --update)
+    _build_test_font(BUNDLED_FONT)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from chinese_calligraphy import Handscroll, MainText, ScrollCanvas, Style
+from chinese_calligraphy.aio import configure_async, run_in_executor
+from chinese_calligraphy.context import CancelToken, RenderCancelled
+from chinese_calligraphy.layout import Margins
+
+
+def _scroll(font_path: str, text: str = "永和九年歲在癸丑之") -> Handscroll:
+    style = Style(font_path=font_path, font_size=32, char_spacing=4, col_spacing=40)
+    return Handscroll(
+        canvas=ScrollCanvas(height=200),
+        margins=Margins(top=20, bottom=20, left=20, right=20),
+        main=MainText(text=text, style=style),
+        lead_space=20,
+        tail_space=20,
+    )
+
+
+def test_render_async_matches_render(font_path: str) -> None:
+    img = asyncio.run(_scroll(font_path).render_async())
+    assert img.tobytes() == _scroll(font_path).render().tobytes()
+
+
+def test_cancelled_token_stops_render(font_path: str) -> None:
+    token = CancelToken()
+    token.cancel()
+    with pytest.raises(RenderCancelled):
+        _scroll(font_path).render(token=token)
+
+
+def test_task_cancellation_triggers_token(font_path: str) -> None:
+    scroll = _scroll(font_path, text="永和九年歲在癸丑之" * 40)
+    token = CancelToken()
+
+    async def go() -> None:
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            task = asyncio.create_task(scroll.render_async(executor=pool, token=token))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+    asyncio.run(go())
+    assert token.cancelled
+
+
+def test_semaphore_caps_concurrency() -> None:
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def job(token: CancelToken | None = None) -> None:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+
+    async def go() -> None:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            await asyncio.gather(*(run_in_executor(job, executor=pool) for _ in range(6)))
+
+    configure_async(max_concurrent=2)
+    try:
+        asyncio.run(go())
+    finally:
+        configure_async(max_concurrent=os.cpu_count() or 1)
+    assert peak == 2
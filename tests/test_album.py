@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from chinese_calligraphy import Album, Brush, MainText, Style
+from chinese_calligraphy.context import CancelToken, RenderCancelled
+from chinese_calligraphy.display import GlyphMark
+from chinese_calligraphy.utils import strip_newlines
+
+TEXT = "永和九年歲在癸丑之一二三山水人天\n" * 12
+
+
+def _album(font_path: str, brush: Brush | None = None) -> Album:
+    style = Style(font_path=font_path, font_size=40, char_spacing=6, col_spacing=56, ink_dryness=0.2)
+    main = MainText(text=TEXT, style=style, brush=brush or Brush(seed=4, char_jitter=(0, 0)))
+    return Album(main=main, page_size=(400, 520))
+
+
+def test_pages_continue_the_text_inside_the_margins(font_path: str) -> None:
+    album = _album(font_path)
+    pages = list(album.pages())
+    assert len(pages) == album.page_count() > 2
+    chars = "".join(m.ch for dl in pages for m in dl.marks if isinstance(m, GlyphMark))
+    assert chars == strip_newlines(TEXT)
+    half = 20
+    for dl in pages:
+        assert (dl.width, dl.height) == (400, 520)
+        xs = [m.p[0] for m in dl.marks if isinstance(m, GlyphMark)]
+        ys = [m.p[1] for m in dl.marks if isinstance(m, GlyphMark)]
+        assert min(xs) - half >= 120 and max(xs) + half <= 400 - 120
+        assert min(ys) - half >= 120 and max(ys) + half <= 520 - 120
+
+
+def test_long_albums_keep_the_margins_on_every_page(font_path: str) -> None:
+    # 【繁】段漂移不隨頁累積：五十多頁後字框仍在邊距內（只差本頁自身的漂移）
+    # [EN] Segment drift does not accumulate from page to page: after fifty-odd pages the glyph boxes are still
+    #      inside the margins (up to the page's own drift)
+    drift = 8
+    album = _album(font_path, Brush(seed=4, char_jitter=(0, 0), segment_drift=(drift, 0)))
+    album = replace(album, main=replace(album.main, text=TEXT * 16))
+    pages = list(album.pages())
+    assert len(pages) >= 50
+    half = 20
+    for dl in pages:
+        xs = [m.p[0] for m in dl.marks if isinstance(m, GlyphMark)]
+        assert min(xs) - half >= 120 - drift and max(xs) + half <= 400 - 120 + drift
+
+
+def test_brush_state_continues_across_pages(font_path: str) -> None:
+    # Page two of the album is not a re-run of page one: the random stream carries on
+    pages = list(_album(font_path, Brush(seed=4)).pages())
+    first = [(m.p[1], m.rot) for m in pages[0].marks if isinstance(m, GlyphMark)]
+    second = [(m.p[1], m.rot) for m in pages[1].marks if isinstance(m, GlyphMark)]
+    assert first != second[: len(first)]
+
+
+def test_parallel_pages_match_in_process(font_path: str, tmp_path: Path) -> None:
+    album = _album(font_path)
+    serial = album.save(str(tmp_path / "a-{page:02d}.png"), quality="draft", workers=1)
+    with ThreadPoolExecutor(2) as pool:
+        threaded = album.save(str(tmp_path / "b-{page:02d}.png"), quality="draft", executor=pool)
+    processes = album.save(str(tmp_path / "c-{page:02d}.png"), quality="draft", workers=2)
+    assert [Path(p).name for p in serial][:2] == ["a-01.png", "a-02.png"] and len(serial) == album.page_count()
+    for a, b, c in zip(serial, threaded, processes, strict=True):
+        assert Image.open(a).tobytes() == Image.open(b).tobytes() == Image.open(c).tobytes()
+
+
+def test_pdf_streams_every_page(font_path: str, tmp_path: Path) -> None:
+    album = _album(font_path)
+    path = tmp_path / "album.pdf"
+    album.save_pdf(str(path), dpi=72, quality="draft", workers=1)
+    data = path.read_bytes()
+    assert data.startswith(b"%PDF-") and f"/Count {album.page_count()}".encode() in data
+    assert data.count(b"/Subtype /Image") == album.page_count()
+    xref = int(data[data.rindex(b"startxref") + 10 :].split()[0])
+    offsets = [int(line[:10]) for line in data[xref:].splitlines()[3:] if line.endswith(b" n ")]
+    assert all(data[o:].startswith(f"{i} 0 obj".encode()) for i, o in enumerate(offsets, start=1))
+
+    # 【繁】中途取消：不留下半個 PDF，也不覆蓋既有檔案 / [EN] Cancelled midway: no half-written PDF, the old file stays
+    token = CancelToken()
+    token.cancel()
+    with pytest.raises(RenderCancelled):
+        album.save_pdf(str(path), dpi=72, quality="draft", workers=1, token=token)
+    assert path.read_bytes() == data
+    assert list(tmp_path.iterdir()) == [path]
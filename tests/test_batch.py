@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+from chinese_calligraphy.batch import build_work, completed_hashes, run_batch, spec_hash
+from chinese_calligraphy.cli import main
+from chinese_calligraphy.works.fan import Fan
+
+
+def _manifest(tmp_path: Path, font_path: str) -> tuple[Path, list[dict[str, Any]]]:
+    style = {"font_path": font_path, "font_size": 32, "char_spacing": 4, "col_spacing": 40}
+    specs: list[dict[str, Any]] = [
+        {
+            "id": "scroll",
+            "work": "handscroll",
+            "output": str(tmp_path / "out" / "scroll.png"),
+            "canvas": {"height": 300, "bg": [245, 240, 225]},
+            "margins": {"top": 30, "bottom": 30, "right": 40, "left": 40},
+            "main": {"text": "永和九年歲在癸丑之", "style": style, "segment": {"columns_per_segment": 2}},
+            "colophon": {"signature": "一二三", "style": style, "brush": {"seed": 3}},
+            "name_seal": {"font_path": font_path, "size": 40, "font_size": 16, "text_grid": [["印", 0, 0]]},
+            "lead_space": 40,
+            "tail_space": 40,
+        },
+        {
+            "id": "pair",
+            "work": "couplet",
+            "output": str(tmp_path / "out" / "pair"),
+            "text_right": "山水",
+            "text_left": "人天",
+            "style": style,
+            "brush": {"seed": 7, "char_jitter": [1, 1]},
+            "width": 120,
+            "height": 300,
+        },
+        {
+            "id": "fan",
+            "work": "fan",
+            "output": str(tmp_path / "out" / "fan.png"),
+            "text": "山水人天",
+            "style": style,
+            "width": 400,
+            "height": 260,
+            "center_x": 200,
+            "center_y": 500,
+            "radius_outer": 460,
+            "radius_inner": 300,
+        },
+    ]
+    path = tmp_path / "manifest.jsonl"
+    path.write_text("\n".join(json.dumps(s, ensure_ascii=False) for s in specs) + "\n", encoding="utf-8")
+    return path, specs
+
+
+def test_build_work_converts_nested_specs(tmp_path: Path, font_path: str) -> None:
+    _, specs = _manifest(tmp_path, font_path)
+    fan = build_work(specs[2])
+    assert isinstance(fan, Fan)
+    assert fan.style is not None and fan.style.font_size == 32
+
+
+def test_batch_renders_then_resumes(tmp_path: Path, font_path: str) -> None:
+    manifest, specs = _manifest(tmp_path, font_path)
+
+    first = run_batch(str(manifest), workers=2)
+    assert (first.rendered, first.skipped, first.failed) == (3, 0, 0)
+    assert (tmp_path / "out" / "pair_right.png").exists()
+    assert (tmp_path / "out" / "pair_left.png").exists()
+
+    log = manifest.with_name("manifest.jsonl.status.jsonl")
+    assert completed_hashes(str(log)) == {spec_hash(s) for s in specs}
+
+    # 【繁】改動一件的規格：只重渲染該件
+    # [EN] Change one spec: only that job is re-rendered
+    specs[2]["text"] = "山水人"
+    manifest.write_text("\n".join(json.dumps(s, ensure_ascii=False) for s in specs) + "\n", encoding="utf-8")
+    second = run_batch(str(manifest), workers=1)
+    assert (second.rendered, second.skipped, second.failed) == (1, 2, 0)
+
+
+def test_cli_reports_failures(tmp_path: Path) -> None:
+    manifest = tmp_path / "bad.jsonl"
+    manifest.write_text(
+        json.dumps({"work": "fan", "output": str(tmp_path / "x.png"), "text": "山", "style": {"font": "NoSuchFont"}})
+        + "\n",
+        encoding="utf-8",
+    )
+    assert main(["batch", str(manifest), "--workers", "1"]) == 1
+
+
+def test_inprocess_batch_pipelines_writes_with_encode_options(tmp_path: Path, font_path: str) -> None:
+    manifest, specs = _manifest(tmp_path, font_path)
+    specs[1]["encode"] = {"format": "webp", "lossless": True}
+    specs.append({**specs[0], "id": "broken", "main": {"text": "永", "style": {"font": "NoSuchFont"}}})
+    manifest.write_text("\n".join(json.dumps(s, ensure_ascii=False) for s in specs) + "\n", encoding="utf-8")
+
+    summary = run_batch(str(manifest), workers=1)
+    assert (summary.rendered, summary.skipped, summary.failed) == (3, 0, 1)
+    assert (tmp_path / "out" / "pair_right.webp").exists() and (tmp_path / "out" / "pair_left.webp").exists()
+    log = manifest.with_name("manifest.jsonl.status.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["id"] for line in log] == ["scroll", "pair", "fan", "broken"]
+
+
+def test_changed_font_file_rerenders_on_resume(tmp_path: Path, font_path: str) -> None:
+    # 【繁】規格不變但字體檔內容改動：雜湊不同，續跑時重渲染
+    # [EN] Same spec but the font file's contents changed: the hash differs and the resume re-renders the job
+    font = tmp_path / "font.ttf"
+    font.write_bytes(Path(font_path).read_bytes())
+    manifest, specs = _manifest(tmp_path, str(font))
+    manifest.write_text(json.dumps(specs[2], ensure_ascii=False) + "\n", encoding="utf-8")
+    before = spec_hash(specs[2])
+    assert run_batch(str(manifest), workers=1).rendered == 1
+
+    font.write_bytes(font.read_bytes() + b"\0")
+    assert spec_hash(specs[2]) != before
+    again = run_batch(str(manifest), workers=1)
+    assert (again.rendered, again.skipped) == (1, 0)
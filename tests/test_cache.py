@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import shutil
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from chinese_calligraphy import Brush, Couplet, Fan, Style
+from chinese_calligraphy.cache import RenderCache, work_key
+
+
+def _fan(font_path: str, colophon: str | None = None) -> Fan:
+    style = Style(font_path=font_path, font_size=60, ink_dryness=0.2)
+    return Fan(text="永和九年歲在", colophon=colophon, style=style, brush=Brush(seed=3), width=600, height=400)
+
+
+def test_key_covers_spec_and_font_contents(tmp_path: Path, font_path: str) -> None:
+    # 【繁】鍵隨文字、筆刷與渲染參數改變；字體以內容而非路徑計
+    # [EN] The key changes with the text, brush and render parameters; fonts count by contents, not by path
+    fan = _fan(font_path)
+    key = work_key(fan, scale=0.5)
+    assert key == work_key(_fan(font_path), scale=0.5)
+    assert key != work_key(replace(fan, text="永和九年歲"), scale=0.5)
+    assert key != work_key(replace(fan, brush=Brush(seed=4)), scale=0.5)
+    assert key != work_key(fan, scale=0.25)
+    assert work_key(fan, scale=1) == work_key(fan, scale=1.0)
+    dry = [replace(fan, style=Style(font_path=font_path, font_size=60, ink_dryness=v)) for v in (0, 0.0)]
+    assert work_key(dry[0], scale=0.5) == work_key(dry[1], scale=0.5)
+
+    copy = tmp_path / "copy.ttf"
+    shutil.copyfile(font_path, copy)
+    assert work_key(_fan(str(copy)), scale=0.5) == key
+    copy.write_bytes(copy.read_bytes() + b"\0")
+    assert work_key(_fan(str(copy)), scale=0.5) != key
+
+
+def test_repeat_renders_hit_and_evict_lru(tmp_path: Path, font_path: str) -> None:
+    cache = RenderCache(str(tmp_path / "cache"))
+    first = cache.render(_fan(font_path), scale=0.25)
+    again = cache.render(_fan(font_path), scale=0.25)
+    assert again.tobytes() == first.tobytes()
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+    # 【繁】上限只容一條：寫入新條目即淘汰舊的 / [EN] Room for one entry: writing a new one evicts the old one
+    cache.max_bytes = stats.bytes + 1
+    cache.render(_fan(font_path, "山人"), scale=0.25)
+    stats = cache.stats()
+    assert (stats.evictions, stats.entries) == (1, 1)
+    assert len(list((tmp_path / "cache").rglob("*.png"))) == 1
+
+    # 【繁】另一個實例從目錄重建索引 / [EN] Another instance rebuilds its index from the directory
+    assert RenderCache(str(tmp_path / "cache")).stats().entries == 1
+
+
+def test_couplet_parts_and_save_copy(tmp_path: Path, font_path: str) -> None:
+    style = Style(font_path=font_path, font_size=50)
+    couplet = Couplet(
+        text_right="永和九年", text_left="歲在癸丑", style=style, brush=Brush(seed=1), width=200, height=500
+    )
+    cache = RenderCache(str(tmp_path / "cache"))
+    right, left, header = cache.render(couplet, scale=0.5)
+    assert header is None
+    cached = cache.render(couplet, scale=0.5)
+    assert cached[0].tobytes() == right.tobytes() and cached[1].tobytes() == left.tobytes() and cached[2] is None
+    with pytest.raises(TypeError):
+        cache.save(couplet, str(tmp_path / "c.png"))
+
+    # 【繁】PNG 輸出命中時直接複製快取檔 / [EN] A PNG output on a hit is a straight copy of the cached file
+    fan = _fan(font_path)
+    out = tmp_path / "out" / "fan.png"
+    cache.save(fan, str(out), scale=0.25)
+    cache.save(fan, str(out), scale=0.25)
+    assert cache.stats().hits == 3
+    (entry,) = (tmp_path / "cache").rglob(work_key(fan, quality="standard", scale=0.25, canvas="rgb") + ".png")
+    assert out.read_bytes() == entry.read_bytes()
+
+
+def test_save_survives_eviction_and_keys_the_canvas(
+    tmp_path: Path, font_path: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    fan = _fan(font_path)
+    cache = RenderCache(str(tmp_path / "cache"))
+    cache.save(fan, str(tmp_path / "a.png"), scale=0.25)
+
+    # 【繁】查詢後、複製前被淘汰：計為未命中並重新渲染 / [EN] Evicted between the lookup and the copy: a miss, re-rendered
+    lookup = cache.path
+
+    def evicted_after_lookup(key: str) -> str | None:
+        path = lookup(key)
+        if path is not None:
+            Path(path).unlink()
+        return path
+
+    monkeypatch.setattr(cache, "path", evicted_after_lookup)
+    out = tmp_path / "b.png"
+    cache.save(fan, str(out), scale=0.25)
+    monkeypatch.undo()
+    assert (cache.stats().hits, cache.stats().misses) == (0, 2)
+    assert out.read_bytes() == (tmp_path / "a.png").read_bytes()
+
+    # 【繁】覆蓋平面的輸出另立一鍵，不寫入 rgb 的鍵 / [EN] Coverage-canvas output has its own key, not the rgb one
+    cache.save(fan, str(tmp_path / "c.png"), scale=0.25, canvas="coverage")
+    assert cache.stats().misses == 3
+    assert cache.path(work_key(fan, quality="standard", scale=0.25, canvas="coverage")) is not None
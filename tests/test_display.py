@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import dataclasses
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from chinese_calligraphy import Brush, BrushState, Couplet, Handscroll, MainText, ScrollCanvas, Seal, Style
+from chinese_calligraphy.context import CancelToken, RenderCancelled, RenderContext
+from chinese_calligraphy.display import GlyphMark, StampMark
+from chinese_calligraphy.layout import Margins
+from chinese_calligraphy.utils import chunk, iter_chunks, iter_stripped, strip_newlines
+
+
+def _scroll(font_path: str) -> Handscroll:
+    style = Style(font_path=font_path, font_size=40, char_spacing=4, col_spacing=50, ink_dryness=0.0)
+    return Handscroll(
+        canvas=ScrollCanvas(height=260),
+        margins=Margins(top=20, bottom=20, left=20, right=20),
+        main=MainText(text="永和九年歲在癸丑之一二三山水人天", style=style),
+        lead_space=20,
+        tail_space=20,
+    )
+
+
+def test_layout_records_marks(font_path: str) -> None:
+    dl = _scroll(font_path).layout()
+    glyphs = [m for m in dl.marks if isinstance(m, GlyphMark)]
+    assert "".join(m.ch for m in glyphs) == "永和九年歲在癸丑之一二三山水人天"
+    assert dl.rasterize().tobytes() == _scroll(font_path).render().tobytes()
+
+
+def test_render_multi_scales_match(font_path: str) -> None:
+    full, half = _scroll(font_path).render_multi([1.0, 0.5])
+    assert half.size == (round(full.width * 0.5), round(full.height * 0.5))
+    down = np.asarray(full.convert("L").resize(half.size, Image.Resampling.BOX), dtype=float)
+    assert np.abs(down - np.asarray(half.convert("L"), dtype=float)).mean() < 8.0
+
+
+def test_couplet_render_multi(font_path: str) -> None:
+    style = Style(font_path=font_path, font_size=40)
+    seal = Seal(font_path=font_path, text_grid=[("印", 0, 0)])
+    couplet = Couplet(
+        text_right="山水", text_left="人天", text_header="書法", style=style, brush=Brush(seed=1), seal_header=seal
+    )
+    header = couplet.layout()[2]
+    assert header is not None and any(isinstance(m, StampMark) for m in header.marks)
+    (right, left, head), (r2, _, h2) = couplet.render_multi([1.0, 0.5], quality="draft")
+    assert head is not None and h2 is not None
+    assert r2.size == (round(right.width * 0.5), round(right.height * 0.5))
+    assert h2.size == (round(head.width * 0.5), round(head.height * 0.5))
+
+
+def test_brush_config_is_frozen_and_hashable() -> None:
+    brush = Brush(seed=3, zhi_templates={"stable": [(0, 0, 1, 1, 0, 0, 0, 0)], "flow": [], "vertical": []})
+    assert brush == pickle.loads(pickle.dumps(brush)) and hash(brush) == hash(dataclasses.replace(brush))
+    assert {brush: 1}[Brush(seed=3, zhi_templates=brush.zhi_templates)] == 1
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        brush.seed = 4  # type: ignore[misc]
+    assert isinstance(brush.new_state(), BrushState) and brush.new_state() is not brush.new_state()
+
+
+def test_shared_brush_renders_repeatably(font_path: str) -> None:
+    # '之' variants used to be remembered on the brush, so a second render with the same brush drifted
+    style = Style(font_path=font_path, font_size=40, col_spacing=50, ink_dryness=0.0)
+    brush = Brush(seed=5, zhi_segment_stickiness=0.9)
+    main = MainText(text="之山之水之人之天" * 3, style=style, brush=brush)
+    scroll = Handscroll(canvas=ScrollCanvas(height=260), margins=Margins(20, 20, 20, 20), main=main)
+    first = scroll.render().tobytes()
+    assert scroll.render().tobytes() == first
+    couplet = Couplet(text_right="之山之水", text_left="之人之天", style=style, brush=brush)
+    a, b, _ = couplet.render()
+    a2, b2, _ = couplet.render()
+    assert a.tobytes() == a2.tobytes() and b.tobytes() == b2.tobytes()
+
+
+@pytest.mark.parametrize("quality", ["draft", "standard", "final"])
+def test_threaded_paint_matches_serial(font_path: str, quality: str) -> None:
+    style = Style(font_path=font_path, font_size=40, col_spacing=50, ink_dryness=0.3, blur_sigma=0.8)
+    main = MainText(text="永和九年歲在癸丑之一二三山水人天" * 2, style=style)
+    scroll = Handscroll(canvas=ScrollCanvas(height=260), margins=Margins(20, 20, 20, 20), main=main)
+    dl = scroll.layout()
+    serial = dl.rasterize(quality=quality, scale=0.75).tobytes()
+    assert dl.rasterize(quality=quality, scale=0.75, threads=4).tobytes() == serial
+
+    token = CancelToken()
+    token.cancel()
+    with pytest.raises(RenderCancelled):
+        dl.rasterize(token=token, threads=4)
+
+
+def test_coverage_canvas_matches_rgb(font_path: str) -> None:
+    # 【繁】覆蓋平面著色後與 RGB 畫布只差捨入；並行時按完成先後貼上，結果不變
+    # [EN] Colorized coverage planes match the RGB canvas up to rounding; pasting in completion order when threaded
+    #      gives the same result
+    from chinese_calligraphy.coverage import CoverageCanvas
+    from chinese_calligraphy.paper import Paper
+
+    style = Style(font_path=font_path, font_size=40, col_spacing=50, ink_dryness=0.3, blur_sigma=0.8)
+    seal = Seal(font_path=font_path, size=60, font_size=24, text_grid=[("印", 0, 0), ("章", 1, 1)])
+    scroll = Handscroll(
+        canvas=ScrollCanvas(height=260, paper=Paper(tile=64)),
+        margins=Margins(20, 20, 20, 20),
+        main=MainText(text="永和九年歲在癸丑之一二三山水人天" * 2, style=style),
+    )
+    dl = scroll.layout()
+    seal.place(dl, (30, 150))
+    rgb = np.asarray(dl.rasterize(scale=0.75), dtype=np.int16)
+    cov = dl.rasterize(scale=0.75, canvas="coverage")
+    assert np.abs(np.asarray(cov, dtype=np.int16) - rgb).max() <= 2
+    assert dl.rasterize(scale=0.75, canvas="coverage", threads=3).tobytes() == cov.tobytes()
+
+    canvas = CoverageCanvas(cov.size, dl.bg, dl.paper, 0.75)
+    dl.cover(canvas, RenderContext(scale=0.75))
+    assert [key[0] for key in canvas.planes] == [style.color, seal.color]
+    assert all(plane.mode == "L" for plane in canvas.planes.values())
+    assert canvas.tile((10, 20, 90, 70)).tobytes() == cov.crop((10, 20, 90, 70)).tobytes()
+    with pytest.raises(ValueError):
+        dl.rasterize(canvas="cmyk")
+
+
+@pytest.mark.parametrize("threads", [1, 3])
+def test_iter_frames_composite_incrementally(font_path: str, threads: int) -> None:
+    # 【繁】每幀只改動其矩形內的像素，末幀與一次渲染相同
+    # [EN] Each frame only changes pixels inside its box, and the last frame equals a one-shot render
+    scroll = _scroll(font_path)
+    prev: np.ndarray | None = None
+    frames = 0
+    for frame in scroll.iter_frames(scale=0.5, threads=threads, group=2):
+        cur = np.asarray(frame.image).copy()
+        if prev is not None:
+            x0, y0, x1, y1 = frame.box
+            changed = np.argwhere((cur != prev).any(axis=2))
+            assert all(y0 <= y < y1 and x0 <= x < x1 for y, x in changed)
+        prev, frames = cur, frames + 1
+    assert frames == 1 + 8  # 【繁】空白幀 + 16 字兩兩一幀 / [EN] blank frame + 16 glyphs two per frame
+    assert prev is not None and prev.tobytes() == scroll.render(scale=0.5).tobytes()
+
+
+def test_couplet_frames_end_on_preview(font_path: str) -> None:
+    style = Style(font_path=font_path, font_size=40)
+    couplet = Couplet(text_right="永和九", text_left="歲在癸", text_header="山水", style=style, width=160, height=300)
+    *_, last = couplet.iter_frames(scale=0.5)
+    assert last.index == 8 and last.image.tobytes() == couplet.preview(scale=0.5).tobytes()
+
+
+def test_streaming_text_matches_string(font_path: str, tmp_path: Path) -> None:
+    text = "  永和九年\r\n\n 歲在癸丑　\n之一二三\n\n山水人天  \n" * 5
+    pieces = [text[i : i + 7] for i in range(0, len(text), 7)]
+    assert "".join(iter_stripped(pieces)) == strip_newlines(text)
+    assert list(iter_chunks(iter_stripped(pieces), 6)) == chunk(strip_newlines(text), 6)
+
+    path = tmp_path / "text.txt"
+    path.write_text(text, encoding="utf-8")
+    style = Style(font_path=font_path, font_size=40, col_spacing=50, ink_dryness=0.0)
+    expected = None
+    for source in (text, path, text.splitlines(keepends=True)):
+        main = MainText(text=source, style=style, chars_per_col=6)
+        assert main.char_count() == len(strip_newlines(text)) and main.num_columns(0) == -(-main.char_count() // 6)
+        scroll = Handscroll(canvas=ScrollCanvas(height=400), margins=Margins(20, 20, 20, 20), main=main)
+        got = [(m.ch, m.p) for m in scroll.layout().marks if isinstance(m, GlyphMark)]
+        assert expected is None or got == expected
+        expected = got
+
+    with pytest.raises(TypeError, match="re-iterable"):
+        MainText(text=iter(pieces), style=style).char_count()
+
+
+def test_render_paints_segments_as_they_are_laid_out(font_path: str) -> None:
+    # 【繁】render 逐段排版落筆，與整篇排版再光柵化逐位元相同；排版的記憶體峰值不隨全文長度增長
+    # [EN] render lays out and paints segment by segment, bit-identically to rasterizing the whole layout; the
+    #      layout's peak memory does not grow with the text length
+    import tracemalloc
+
+    scroll = _scroll(font_path)
+    for threads in (1, 2):
+        expected = scroll.layout().rasterize(scale=0.5, threads=threads)
+        assert scroll.render(scale=0.5, threads=threads).tobytes() == expected.tobytes()
+
+    def peak(lines: int) -> int:
+        main = MainText(text=["永和九年歲在癸丑之一二三山水人天月花"] * lines, style=scroll.main.style)  # type: ignore[union-attr]
+        long = dataclasses.replace(scroll, main=main)
+        sheet = long._sheet()
+        tracemalloc.start()
+        try:
+            for _ in long._batches(sheet.width, RenderContext()):
+                pass
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    assert peak(2000) < 1.5 * peak(500)
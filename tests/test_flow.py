@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from chinese_calligraphy import Brush, MainText, Style
+from chinese_calligraphy.display import DisplayList, GlyphMark
+from chinese_calligraphy.layout import FlowSpec, SegmentSpec, Skyline
+from chinese_calligraphy.metrics import font_metrics
+
+pytest.importorskip("fontTools")
+
+TEXT = "永和九年歲在癸丑之一二三山水人天月花書法印章" * 3
+
+
+def _boxes(dl: DisplayList, font_path: str, fs: int) -> np.ndarray:
+    marks = [m for m in dl.marks if isinstance(m, GlyphMark)]
+    ink = font_metrics(font_path).ink_bboxes("".join(m.ch for m in marks), fs)
+    p = np.array([m.p for m in marks], dtype=float)
+    s = np.array([m.scale for m in marks])[:, None]
+    out: np.ndarray = np.column_stack([p[:, 0], p[:, 1], p[:, 0], p[:, 1]]) + ink * s
+    return out
+
+
+def _overlaps(b: np.ndarray) -> int:
+    x = (b[:, None, 0] < b[None, :, 2]) & (b[None, :, 0] < b[:, None, 2])
+    y = (b[:, None, 1] < b[None, :, 3]) & (b[None, :, 1] < b[:, None, 3])
+    return int(np.triu(x & y, k=1).sum())
+
+
+def _place(font_path: str, flow: FlowSpec | None) -> DisplayList:
+    style = Style(font_path=font_path, font_size=60, char_spacing=4, col_spacing=45, ink_dryness=0.0)
+    brush = Brush(seed=2, char_jitter=(1, 1), col_drift_step=(0, 10), col_drift_max=(0, 36), var_scale=0.03)
+    dl = DisplayList()
+    MainText(text=TEXT, style=style, brush=brush, segment=SegmentSpec(8, 100), flow=flow).place(dl, 2000, 80, 560)
+    return dl
+
+
+def test_skyline_queries_ranges() -> None:
+    sky = Skyline(0, 100, bin=4)
+    sky.add(np.array([0, 40]), np.array([20, 60]), np.array([10.0, 5.0]))
+    sky.add(np.array([50]), np.array([54]), np.array([2.0]))
+    lim = sky.limits(np.array([0, 18, 30, 52, 70]), np.array([8, 45, 38, 53, 90]))
+    assert lim.tolist() == [10.0, 5.0, np.inf, 2.0, np.inf]
+
+
+def test_flowing_columns_avoid_collisions(font_path: str) -> None:
+    grid = _place(font_path, None)
+    flow = _place(font_path, FlowSpec())
+    # Columns 45 px apart with ~50 px wide glyphs collide on the grid; the flowing axis steps aside
+    assert _overlaps(_boxes(grid, font_path, 60)) > 0
+    assert _overlaps(_boxes(flow, font_path, 60)) == 0
+    # Same glyphs, same random draws: only the x positions move
+    gm = [m for m in grid.marks if isinstance(m, GlyphMark)]
+    fm = [m for m in flow.marks if isinstance(m, GlyphMark)]
+    assert [(m.ch, m.p[1], m.rot, m.scale) for m in gm] == [(m.ch, m.p[1], m.rot, m.scale) for m in fm]
+
+
+def test_axis_springs_within_shift() -> None:
+    spec = FlowSpec(max_shift=0.2)
+    free = spec.axes(100.0, np.full(6, np.inf), 50)
+    assert free == [100.0] * 6
+    axes = spec.axes(100.0, np.array([120.0, 120.0, 95.0, 120.0, 120.0, 120.0]), 50)
+    assert max(axes) <= 110.0 + 1e-9 and axes[2] <= 95.0
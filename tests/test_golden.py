@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import pytest
+
+from benchmarks import golden
+
+
+@pytest.mark.parametrize("case", sorted(golden.CASES))
+def test_modes_match_reference_and_golden(case: str) -> None:
+    # 【繁】參考渲染符合存檔黃金圖，每種模式與後端都在各自的容差之內
+    # [EN] The reference render matches the stored golden image, and every mode and backend stays within its tolerance
+    rows = golden.run([case])
+    assert [r.mode for r in rows if not r.ok] == [], golden.format_report(rows)
+
+
+def test_drift_metrics() -> None:
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng(0)
+    a = Image.fromarray((rng.random((40, 50, 3)) * 255).astype(np.uint8), "RGB")
+    same = golden.compare(a, a.copy())
+    assert same.max_diff == 0 and same.psnr == float("inf") and same.ssim == pytest.approx(1.0)
+    assert same.within(golden.EXACT)
+    b = Image.fromarray(np.clip(np.asarray(a, dtype=np.int16) + 3, 0, 255).astype(np.uint8), "RGB")
+    off = golden.compare(a, b)
+    assert off.max_diff == 3 and not off.within(golden.EXACT) and off.within(golden.PERCEPTUAL)
@@ -1,5 +1,56 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
 import chinese_calligraphy
 
+# 【繁】冷啟動匯入時間預算（秒）；實測約 0.02s，留足 CI 餘量
+# [EN] Cold import-time budget (seconds); ~0.02s measured, with ample headroom for CI
+IMPORT_BUDGET_S = 0.25
+
+HEAVY = ["numpy", "scipy", "PIL", "asyncio", "chinese_calligraphy.elements", "chinese_calligraphy.works.handscroll"]
+
+
+def _probe(stmt: str) -> dict[str, object]:
+    # 【繁】在全新直譯器中執行 stmt，回報耗時與哪些重模組已被載入
+    # [EN] Run stmt in a fresh interpreter and report its duration and which heavy modules got imported
+    code = (
+        "import json, sys, time\n"
+        "t = time.perf_counter()\n"
+        f"{stmt}\n"
+        "dt = time.perf_counter() - t\n"
+        f"print(json.dumps({{'seconds': dt, 'loaded': [m for m in {HEAVY!r} if m in sys.modules]}}))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    result: dict[str, object] = json.loads(out)
+    return result
+
 
 def test_import() -> None:
     assert chinese_calligraphy is not None
+
+
+def test_package_import_is_cheap() -> None:
+    probe = _probe("import chinese_calligraphy")
+    assert probe["loaded"] == []
+    assert isinstance(probe["seconds"], float) and probe["seconds"] < IMPORT_BUDGET_S
+
+
+def test_title_and_font_lookup_skip_numpy_and_scipy() -> None:
+    probe = _probe("from chinese_calligraphy import Title\nfrom chinese_calligraphy.font import find_font_path")
+    assert probe["loaded"] == ["PIL", "chinese_calligraphy.elements"]
+
+
+def test_works_load_lazily_without_scipy() -> None:
+    probe = _probe("from chinese_calligraphy import Handscroll")
+    assert isinstance(probe["loaded"], list)
+    assert "chinese_calligraphy.works.handscroll" in probe["loaded"]
+    assert "scipy" not in probe["loaded"] and "numpy" not in probe["loaded"]
+
+
+def test_unknown_attribute_raises() -> None:
+    assert "Handscroll" in dir(chinese_calligraphy)
+    with pytest.raises(AttributeError):
+        _ = chinese_calligraphy.NoSuchThing  # type: ignore[attr-defined]
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from chinese_calligraphy import Brush, Style
+from chinese_calligraphy.display import DisplayList, Mark
+from chinese_calligraphy.ink import available_ink_backends, get_ink_backend
+from chinese_calligraphy.utils import NoiseGenerator, value_noise
+
+
+def _strokes() -> np.ndarray:
+    img = Image.new("L", (120, 120), 0)
+    d = ImageDraw.Draw(img)
+    d.line([(10, 20), (110, 30)], fill=255, width=9)
+    d.line([(60, 5), (50, 115)], fill=255, width=13)
+    d.ellipse([20, 60, 50, 100], fill=255)
+    return np.array(img)
+
+
+def test_numpy_backend_matches_scipy() -> None:
+    pytest.importorskip("scipy")
+    ref, npb = get_ink_backend("scipy"), get_ink_backend("numpy")
+    mask = _strokes()
+    assert np.allclose(npb.distance_inside(mask > 25, limit=3.5), ref.distance_inside(mask > 25, limit=3.5))
+    assert np.abs(npb.gaussian(mask, sigma=1.2) - ref.gaussian(mask, sigma=1.2)).max() < 1e-6
+    low = np.random.default_rng(0).random((12, 9))
+    up_ref, up_np = ref.upsample(low, 60, 45), npb.upsample(low, 60, 45)
+    assert up_ref.shape == up_np.shape
+    assert np.abs(up_ref - up_np).mean() < 0.05
+
+
+def test_backends_agree_on_shape_and_range() -> None:
+    mask = _strokes()
+    for name in available_ink_backends():
+        b = get_ink_backend(name)
+        dist = b.distance_inside(mask > 25, limit=3.5)
+        assert dist.shape == mask.shape and dist.max() == pytest.approx(3.5) and dist[mask <= 25].max() == 0
+        assert b.gaussian(mask, sigma=1.0).shape == mask.shape
+
+
+def test_brush_renders_with_each_backend(font_path: str) -> None:
+    style = Style(font_path=font_path, font_size=40, ink_dryness=0.3, blur_sigma=0.8)
+    for name in available_ink_backends():
+        img = Image.new("RGB", (100, 100), (255, 255, 255))
+        Brush(seed=3, ink_backend=name).draw_char(
+            img,
+            ImageDraw.Draw(img),
+            (30, 30),
+            "永",
+            style.font(),
+            style.color,
+            random.Random(0),
+            rot=2.0,
+            shear_x=0.05,
+            scale=1.0,
+            ink_dryness=style.ink_dryness,
+            blur_sigma=style.blur_sigma,
+        )
+        assert np.asarray(img.convert("L")).min() < 128
+
+
+def test_world_noise_is_coordinate_addressable() -> None:
+    xs, ys = np.arange(-40, 160) + 0.5, np.arange(90) + 0.5
+    full = value_noise(xs, ys, seed=7, cell=6.0, octaves=3)
+    assert full.dtype == np.float32 and full.shape == (90, 200)
+    assert 0.0 <= full.min() and full.max() <= 1.0
+    # Any sub-rectangle, computed on its own, is the matching crop of the whole
+    assert np.array_equal(value_noise(xs[55:130], ys[20:70], seed=7, cell=6.0, octaves=3), full[20:70, 55:130])
+    assert not np.array_equal(value_noise(xs, ys, seed=8, cell=6.0, octaves=3), full)
+    gen = NoiseGenerator(seed=3)
+    assert np.array_equal(gen.fiber_at(10.5, 20.5, 64, 32)[:, 16:], gen.fiber_at(26.5, 20.5, 48, 32))
+
+
+def test_dry_ink_repaints_identically(font_path: str) -> None:
+    style = Style(font_path=font_path, font_size=40, ink_dryness=0.6, blur_sigma=0.8)
+    brush = Brush(seed=2)
+    r = random.Random(0)
+    marks: list[Mark] = [
+        brush.place_char((40 + 60 * i, 50), ch, style.font(), style.color, r, 1.0, 0.0, 1.0, 1.0, 0.6, 0.8)
+        for i, ch in enumerate("永和九")
+    ]
+    dl = DisplayList(220, 100, (255, 255, 255), marks)
+    # Fibers come from canvas coordinates, not from a shared RNG: the order of painting does not matter
+    assert dl.rasterize().tobytes() == DisplayList(220, 100, (255, 255, 255), marks[::-1]).rasterize().tobytes()
+
+
+def test_unknown_backend_raises() -> None:
+    with pytest.raises(ValueError):
+        get_ink_backend("cuda")
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from chinese_calligraphy import Brush, Couplet, MainText, Style, metrics
+from chinese_calligraphy.brush import glyph_mask, glyph_patch_size
+from chinese_calligraphy.display import DisplayList, GlyphMark
+from chinese_calligraphy.font import load_font
+from chinese_calligraphy.metrics import build_font_metrics, font_metrics, glyph_ink_bboxes
+
+pytest.importorskip("fontTools")
+
+# Same characters as the conftest test font
+TEST_CHARS = "永和九年歲在癸丑之一二三山水人天月花書法印章"
+
+
+def test_index_covers_cmap_and_matches_raster(font_path: str) -> None:
+    m = build_font_metrics(font_path)
+    assert len(m) == len(TEST_CHARS) and "永" in m and "x" not in m
+    assert m.points.min() == 12  # three boxes of four points
+    fs = 100
+    w = glyph_patch_size(fs)
+    boxes = m.ink_bboxes("永和x", fs)
+    for ch, box in zip("永和", boxes, strict=False):
+        bbox = glyph_mask(load_font(font_path, fs), ch, w, w).getbbox()
+        assert bbox is not None
+        assert np.abs(np.asarray(bbox, dtype=float) - w // 2 - box).max() <= 2.0
+    assert boxes[2].tolist() == [-50.0, -50.0, 50.0, 50.0]  # missing → em box
+
+
+def test_couplet_measures_only_its_last_column(font_path: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    # 【繁】對聯不建整個字體的索引，所量墨跡邊界與索引相同
+    # [EN] A couplet does not build the whole font's index, and its ink edges equal the index's
+    expected = build_font_metrics(font_path).ink_bboxes("永和x", 70)
+    assert np.array_equal(glyph_ink_bboxes(font_path, "永和x", 70), expected)
+
+    def no_index(*args: object, **kwargs: object) -> None:
+        raise AssertionError("the full index was built")
+
+    monkeypatch.setattr(metrics, "build_font_metrics", no_index)
+    font_metrics.cache_clear()
+    style = Style(font_path=font_path, font_size=60)
+    Couplet(
+        text_right="永和九年", text_left="山水人天", colophon_left="書法", style=style, width=200, height=500
+    ).render(scale=0.25)
+
+
+def test_index_is_cached_on_disk(font_path: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("CHINESE_CALLIGRAPHY_CACHE", str(tmp_path))
+    font_metrics.cache_clear()
+    first = font_metrics(font_path)
+    assert len(list((tmp_path / "metrics").glob("CalligraphyTest-*.npz"))) == 1
+    font_metrics.cache_clear()
+    again = font_metrics(font_path)
+    assert np.array_equal(first.bbox, again.bbox) and np.array_equal(first.density, again.density)
+    font_metrics.cache_clear()
+
+
+def test_density_scales_glyphs(font_path: str) -> None:
+    style = Style(font_path=font_path, font_size=40, ink_dryness=0.0)
+    dens = font_metrics(font_path).densities(TEST_CHARS[:8] + "x")
+    assert 0.0 <= dens.min() and dens.max() <= 1.0 and dens[-1] == 0.5
+    dl = DisplayList()
+    MainText(text=TEST_CHARS[:8], style=style, brush=Brush(seed=1, density_scale=0.1)).place(dl, 400, 40, 2000)
+    scales = np.array([m.scale for m in dl.marks if isinstance(m, GlyphMark)])
+    assert np.allclose(scales, 1.0 + 0.1 * (2.0 * dens[:8] - 1.0), atol=1e-6)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import io
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from chinese_calligraphy import output
+from chinese_calligraphy.output import ImageWriter, OutputOptions, encode_image, save_apng, save_image
+
+
+def _image(mode: str) -> Image.Image:
+    rng = np.random.default_rng(1)
+    a = (rng.random((157, 203, 4)) * 60 + 180).astype(np.uint8)
+    return Image.fromarray(a, "RGBA").convert(mode)
+
+
+@pytest.mark.parametrize("mode", ["L", "RGB", "RGBA"])
+@pytest.mark.parametrize("fmt", ["png", "tiff"])
+def test_strip_encoders_round_trip(monkeypatch: pytest.MonkeyPatch, mode: str, fmt: str) -> None:
+    # 【繁】分條並行編碼的檔案由 Pillow 解碼後與原圖逐像素相同
+    # [EN] Files encoded in parallel strips decode (with Pillow) to exactly the original pixels
+    monkeypatch.setattr(output, "_STRIP_MIN_PIXELS", 0)
+    img = _image(mode)
+    data = encode_image(img, OutputOptions(format=fmt, strip_threads=3, compress_level=1))
+    back = Image.open(io.BytesIO(data))
+    assert back.format == fmt.upper() and back.mode == mode
+    assert back.tobytes() == img.tobytes()
+
+
+def test_formats_follow_options_and_extension(tmp_path: Path) -> None:
+    img = _image("RGBA")
+    save_image(img, str(tmp_path / "a.webp"), OutputOptions(lossless=True))
+    save_image(img, str(tmp_path / "b.png"), OutputOptions(format="jpeg", quality=50))
+    save_image(img, str(tmp_path / "c.tif"), OutputOptions(tiff_compression="tiff_lzw"))
+    assert Image.open(tmp_path / "a.webp").format == "WEBP"
+    assert Image.open(tmp_path / "b.png").format == "JPEG"
+    with Image.open(tmp_path / "c.tif") as tif:
+        assert tif.info["compression"] == "tiff_lzw"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.webp", "b.png", "c.tif"]
+    with pytest.raises(ValueError):
+        OutputOptions(format="bmp")
+
+
+def test_image_writer_writes_in_background(tmp_path: Path) -> None:
+    img = _image("RGB")
+    with ImageWriter(OutputOptions(compress_level=1), max_pending=1) as writer:
+        futures = [writer.submit(img, str(tmp_path / f"{i}.png")) for i in range(3)]
+    assert [f.result() for f in futures] == [str(tmp_path / f"{i}.png") for i in range(3)]
+    assert all(Image.open(tmp_path / f"{i}.png").tobytes() == img.tobytes() for i in range(3))
+
+
+def test_apng_writes_dirty_rectangles(tmp_path: Path) -> None:
+    # 【繁】只寫變動矩形的 APNG 由 Pillow 解出的每一幀都與原幀相同
+    # [EN] An APNG holding only the changed rectangles decodes (with Pillow) to every original frame
+    from chinese_calligraphy.display import Frame
+
+    canvas = _image("RGB")
+    expected = [canvas.copy()]
+    frames = [Frame(0, canvas.copy(), (0, 0, *canvas.size))]
+    live = canvas.copy()
+    for i, box in enumerate([(10, 20, 60, 50), (0, 0, 0, 0), (150, 100, 203, 157)], start=1):
+        live.paste((i * 60, 0, 255 - i * 60), box)
+        expected.append(live.copy())
+        frames.append(Frame(i, live.copy(), box))
+    path = str(tmp_path / "anim.png")
+    assert save_apng(frames, path, fps=20) == 4
+    with Image.open(path) as anim:
+        assert getattr(anim, "n_frames", 1) == 4
+        for i, want in enumerate(expected):
+            anim.seek(i)
+            assert anim.convert("RGB").tobytes() == want.tobytes()
+
+
+@pytest.mark.parametrize("frames", [0, 2])
+def test_apng_discarded_when_the_block_raises(tmp_path: Path, frames: int) -> None:
+    # 【繁】區塊出錯時不留下半截動畫或暫存檔，原本的例外照常拋出
+    # [EN] An error in the block leaves neither a truncated animation nor a temp file, and the original error propagates
+    path = tmp_path / "anim.png"
+    with pytest.raises(KeyboardInterrupt):
+        with output.APNGWriter(str(path)) as writer:
+            for _ in range(frames):
+                writer.add(_image("RGB"))
+            raise KeyboardInterrupt
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from chinese_calligraphy import Fan, Handscroll, MainText, Paper, ScrollCanvas, Style
+from chinese_calligraphy.layout import Margins
+from chinese_calligraphy.paper import paper_tile
+
+
+@pytest.fixture(autouse=True)
+def _cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setenv("CHINESE_CALLIGRAPHY_CACHE", str(tmp_path))
+    paper_tile.cache_clear()
+    return tmp_path
+
+
+def _gray(paper: Paper, size: tuple[int, int]) -> np.ndarray:
+    return np.asarray(paper.fill(size, (200, 200, 200)).convert("L"), dtype=float)
+
+
+def test_tiles_are_seamless() -> None:
+    paper = Paper("gold_fleck", tile=64)
+    a = _gray(paper, (160, 96))
+    assert np.array_equal(a[:, :64], a[:, 64:128]) and np.array_equal(a[:32], a[64:96])
+    # The step across a tile edge is no larger than between neighbouring columns inside the tile
+    inner = np.abs(np.diff(a[:, 1:63], axis=1)).mean()
+    assert np.abs(a[:, 64] - a[:, 63]).mean() < 2 * inner
+
+
+def test_tiles_are_cached_on_disk(_cache: Path) -> None:
+    first = paper_tile("xuan", 3, 64)
+    assert list((_cache / "paper").glob("xuan-s3-t64-*.npz"))
+    paper_tile.cache_clear()
+    assert np.array_equal(paper_tile("xuan", 3, 64)["mod"], first["mod"])
+    assert not np.array_equal(paper_tile("xuan", 4, 64)["mod"], first["mod"])
+
+
+def test_works_use_paper(font_path: str) -> None:
+    style = Style(font_path=font_path, font_size=40)
+    scroll = Handscroll(
+        canvas=ScrollCanvas(height=200, paper=Paper(tile=64)),
+        margins=Margins(top=20, bottom=20, left=20, right=20),
+        main=MainText(text="山水", style=style),
+        lead_space=20,
+        tail_space=20,
+    )
+    assert np.asarray(scroll.render(quality="draft").convert("L"))[:10].std() > 0.5
+
+    fan = Fan(
+        text="山水",
+        style=style,
+        width=600,
+        height=350,
+        center_x=300,
+        center_y=650,
+        radius_outer=550,
+        radius_inner=340,
+        paper=Paper("gold_fleck", tile=64),
+    )
+    img = np.asarray(fan.render(quality="draft").convert("L"), dtype=float)
+    assert img[0, 0] == 255 and img[5, 5] == 255  # outside the leaf stays white
+    assert img[140:160, 250:350].std() > 0.5
+
+
+def test_unknown_paper_kind() -> None:
+    with pytest.raises(ValueError):
+        Paper("washi")
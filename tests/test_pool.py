@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import io
+from pathlib import Path
+
+from PIL import Image
+
+from chinese_calligraphy import Brush, Fan, Style
+from chinese_calligraphy.pool import RenderPool
+
+
+def _fan(font_path: str, text: str) -> Fan:
+    style = Style(font_path=font_path, font_size=32, char_spacing=4, col_spacing=40)
+    return Fan(
+        text=text,
+        style=style,
+        brush=Brush(seed=1),
+        width=400,
+        height=260,
+        center_x=200,
+        center_y=500,
+        radius_outer=460,
+        radius_inner=300,
+    )
+
+
+def test_pool_renders_recycles_and_reports(tmp_path: Path, font_path: str) -> None:
+    style = Style(font_path=font_path, font_size=32)
+    with RenderPool(workers=1, fonts=[style], warm_text="山水", max_jobs_per_worker=2) as pool:
+        first = pool.submit(_fan(font_path, "山水")).result(timeout=60)
+        second = pool.submit(_fan(font_path, "人天")).result(timeout=60)
+        out = tmp_path / "fan.png"
+        third = pool.submit(_fan(font_path, "山水"), path=str(out)).result(timeout=60)
+        stats = pool.stats()
+
+    assert isinstance(first, bytes) and isinstance(second, bytes)
+    assert Image.open(io.BytesIO(first)).tobytes() == _fan(font_path, "山水").render().tobytes()
+    assert third == str(out) and out.exists()
+
+    assert stats.queue_depth == 0
+    (worker,) = stats.workers
+    assert worker.jobs_done == 3
+    assert worker.recycles == 1
+    assert 0.0 < worker.utilization <= 1.0
+
+
+def test_pool_propagates_errors(font_path: str) -> None:
+    bad = _fan(font_path, "山")
+    bad.style = Style(font_path="/nonexistent/font.ttf", font_size=32)
+    with RenderPool(workers=1) as pool:
+        fut = pool.submit(bad)
+        assert isinstance(fut.exception(timeout=60), OSError)
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw, ImageFilter
+
+from chinese_calligraphy import Brush, Handscroll, MainText, ScrollCanvas, Style
+from chinese_calligraphy.context import RenderContext
+from chinese_calligraphy.layout import Margins
+
+
+def _scroll(font_path: str) -> Handscroll:
+    style = Style(font_path=font_path, font_size=32, char_spacing=4, col_spacing=40)
+    return Handscroll(
+        canvas=ScrollCanvas(height=200),
+        margins=Margins(top=20, bottom=20, left=20, right=20),
+        main=MainText(text="永和九年歲在癸丑之一二三山水", style=style),
+        lead_space=20,
+        tail_space=20,
+    )
+
+
+def _ink(img: Image.Image, grow: int = 1) -> np.ndarray:
+    gray = img.convert("L")
+    if grow > 1:
+        gray = gray.filter(ImageFilter.MinFilter(grow))
+    return np.asarray(gray) < 128
+
+
+def test_draft_keeps_layout(font_path: str) -> None:
+    standard = _scroll(font_path).render()
+    draft = _scroll(font_path).render(quality="draft")
+    assert draft.size == standard.size
+    # Standard supersamples these small glyphs and draft does not, so compare the footprints, not the edges
+    a, b = _ink(standard, 5), _ink(draft, 5)
+    assert (a & b).sum() / (a | b).sum() > 0.8
+
+
+def test_draft_makes_the_same_random_draws(font_path: str) -> None:
+    font = Style(font_path=font_path, font_size=40).font()
+    after = []
+    for quality in ("standard", "draft"):
+        img = Image.new("RGB", (120, 120), (255, 255, 255))
+        r = random.Random(7)
+        Brush(seed=1, char_jitter=(2, 2)).draw_char(
+            img,
+            ImageDraw.Draw(img),
+            (60, 60),
+            "永",
+            font,
+            (0, 0, 0),
+            r,
+            3.0,
+            0.05,
+            1.02,
+            ink_dryness=0.2,
+            ctx=RenderContext(quality=quality),
+        )
+        after.append(r.random())
+    assert after[0] == after[1]
+
+
+def _glyph(font_path: str, size: int, quality: str, supersample: int) -> np.ndarray:
+    img = Image.new("RGB", (size * 3, size * 3), (255, 255, 255))
+    Brush(seed=1, supersample=supersample).draw_char(
+        img,
+        ImageDraw.Draw(img),
+        (size * 3 // 2, size * 3 // 2),
+        "永",
+        Style(font_path=font_path, font_size=size).font(),
+        (0, 0, 0),
+        random.Random(5),
+        2.0,
+        0.05,
+        1.0,
+        ink_dryness=0.2,
+        blur_sigma=0.6,
+        ctx=RenderContext(quality=quality),
+    )
+    return 255.0 - np.asarray(img.convert("L"), dtype=float)
+
+
+def test_supersampling_is_adaptive(font_path: str) -> None:
+    # Large glyphs at standard quality stay on the 1x path; "final" always supersamples
+    assert np.array_equal(_glyph(font_path, 80, "standard", 2), _glyph(font_path, 80, "standard", 1))
+    assert not np.array_equal(_glyph(font_path, 80, "final", 2), _glyph(font_path, 80, "final", 1))
+
+
+def test_supersampled_glyph_stays_in_place(font_path: str) -> None:
+    one, two = _glyph(font_path, 30, "standard", 1), _glyph(font_path, 30, "standard", 2)
+    assert not np.array_equal(one, two)
+    ys, xs = np.mgrid[: one.shape[0], : one.shape[1]]
+    for a, b in ((one * xs, two * xs), (one * ys, two * ys)):
+        assert abs(a.sum() / one.sum() - b.sum() / two.sum()) < 1.0
+    assert 0.8 < two.sum() / one.sum() < 1.25
+
+
+def test_scaled_render(font_path: str) -> None:
+    full = _scroll(font_path).render(quality="draft")
+    half = _scroll(font_path).render(quality="draft", scale=0.5)
+    assert half.size == (round(full.width * 0.5), round(full.height * 0.5))
+    assert _ink(half).any()
+
+
+def test_invalid_quality() -> None:
+    with pytest.raises(ValueError):
+        RenderContext(quality="fast")
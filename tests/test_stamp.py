@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from chinese_calligraphy import Seal
+from chinese_calligraphy.context import RenderContext
+from chinese_calligraphy.display import DisplayList, ShapeMark, StampMark, TextMark
+
+
+def _seal(font_path: str, **kw: object) -> Seal:
+    return Seal(font_path=font_path, size=60, font_size=24, cell=22, text_grid=[("印", 0, 0), ("章", 1, 1)], **kw)  # type: ignore[arg-type]
+
+
+def test_stamp_matches_drawing_mark_by_mark(font_path: str) -> None:
+    seal = _seal(font_path)
+    for scale in (1.0, 0.5):
+        ctx = RenderContext(scale=scale)
+        drawn = Image.new("RGB", (100, 100), (240, 235, 220))
+        seal.draw(ImageDraw.Draw(drawn), (10, 12), ctx)
+        stamped = Image.new("RGB", (100, 100), (240, 235, 220))
+        seal.stamp(stamped, (10, 12), ctx)
+        assert stamped.tobytes() == drawn.tobytes()
+
+
+def test_stamps_are_cached_per_spec_and_scale(font_path: str) -> None:
+    a, b = _seal(font_path), _seal(font_path)
+    assert a.spec() == b.spec() and a.spec().stamp() is b.spec().stamp()
+    assert a.spec().stamp(0.5) is not a.spec().stamp()
+
+    dl = DisplayList(100, 100)
+    a.place(dl, (10, 10))
+    assert [type(m) for m in dl.marks] == [StampMark]
+    assert [type(m) for m in dl.flat_marks()] == [ShapeMark, TextMark, TextMark]
+
+
+def test_texture_is_seeded_and_wears_the_impression(font_path: str) -> None:
+    flat = np.asarray(_seal(font_path).spec().stamp()[0].getchannel("A"), dtype=float)
+    worn = np.asarray(_seal(font_path, texture=0.8, texture_seed=1).spec().stamp()[0].getchannel("A"), dtype=float)
+    again = np.asarray(_seal(font_path, texture=0.8, texture_seed=1).spec().stamp()[0].getchannel("A"), dtype=float)
+    other = np.asarray(_seal(font_path, texture=0.8, texture_seed=2).spec().stamp()[0].getchannel("A"), dtype=float)
+    assert np.array_equal(worn, again) and not np.array_equal(worn, other)
+    assert (worn <= flat).all() and 0.4 < worn.sum() / flat.sum() < 0.95
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from chinese_calligraphy import Brush, Couplet, Fan, Style
+from chinese_calligraphy.sweep import GlyphSet, sweep
+
+
+def _fan(font_path: str) -> Fan:
+    style = Style(font_path=font_path, font_size=60, ink_dryness=0.2, blur_sigma=0.5)
+    return Fan(text="永和九年歲在", style=style, brush=Brush(seed=3), width=600, height=400)
+
+
+def test_sweep_matches_rerendering_each_point(font_path: str) -> None:
+    # 【繁】每點與改規格後重新渲染逐位元相同，包括乾筆跨過門檻（0.0）與換種子
+    # [EN] Every point is bit-identical to re-rendering the modified spec, including dryness crossing the
+    #      threshold (0.0) and a new seed
+    fan = _fan(font_path)
+    style = fan.style
+    assert style is not None
+    grid: dict[str, list[float]] = {"seed": [3, 4], "ink_dryness": [0.0, 0.4], "blur_sigma": [0.0, 1.0]}
+    result = sweep(fan, grid, scale=0.5, workers=2)
+    assert len(result.images) == 8
+    # 【繁】每個種子一份版式，加上濕筆一側各一份 / [EN] One layout per seed, plus one each for the wet side
+    assert result.layouts == 4
+    for i, (seed, dry, blur) in enumerate(result.points):
+        spec = replace(fan, brush=replace(fan.brush, seed=seed), style=replace(style, ink_dryness=dry, blur_sigma=blur))
+        assert result.images[i].tobytes() == spec.render(scale=0.5).tobytes()
+
+
+def test_couplet_sweep_composes_the_preview(font_path: str) -> None:
+    style = Style(font_path=font_path, font_size=60, ink_dryness=0.3)
+    couplet = Couplet(
+        text_right="永和九年", text_left="山水人天", text_header="書法", style=style, width=200, height=500
+    )
+    result = sweep(couplet, {"blur_sigma": [0.0, 1.0]}, scale=0.25)
+    assert result.layouts == 1
+    assert (
+        result.images[1].tobytes()
+        == replace(couplet, style=replace(style, blur_sigma=1.0)).preview(scale=0.25).tobytes()
+    )
+
+
+def test_glyph_set_contact_sheet_and_save(tmp_path: Path, font_path: str) -> None:
+    glyphs = GlyphSet("墨永", Style(font_path=font_path, font_size=80))
+    result = sweep(glyphs, {"ink_dryness": [0.1, 0.3, 0.5], "blur_sigma": [0.0, 2.0]}, workers=1)
+    assert result.layouts == 1
+    assert result.label(1) == "ink_dryness=0.1  blur_sigma=2.0"
+    sheet = result.contact_sheet()
+    cell = result.images[0]
+    # 【繁】末軸兩點為一行，共三行 / [EN] Two points of the last axis per row, three rows
+    assert sheet.width == 16 + 2 * (cell.width + 16)
+    assert sheet.height > 3 * cell.height
+
+    paths = result.save(str(tmp_path))
+    assert len(paths) == 7
+    assert (tmp_path / "ink_dryness=0.3,blur_sigma=2.0.png").exists()
+    assert (tmp_path / "sheet.png").exists()
+
+    with pytest.raises(ValueError, match="unknown sweep parameter"):
+        sweep(glyphs, {"wetness": [0.1]})
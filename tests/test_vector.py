@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from chinese_calligraphy import Couplet, Fan, Handscroll, MainText, ScrollCanvas, Seal, Style, Title
+from chinese_calligraphy.display import DisplayList, GlyphMark, TextMark
+from chinese_calligraphy.layout import Margins
+from chinese_calligraphy.vector import PathOp, _glyph_matrix, _text_matrix, glyph_outline, to_pdf, to_svg
+
+pytest.importorskip("fontTools")
+
+
+def _scroll(font_path: str, text: str) -> Handscroll:
+    style = Style(font_path=font_path, font_size=80, char_spacing=4, col_spacing=100, ink_dryness=0.0, blur_sigma=0.0)
+    return Handscroll(
+        canvas=ScrollCanvas(height=500),
+        margins=Margins(top=40, bottom=40, left=40, right=40),
+        title=Title("書法", style),
+        main=MainText(text=text, style=style),
+        lead_space=40,
+        tail_space=40,
+    )
+
+
+def _fill_outlines(dl: DisplayList, font_path: str) -> np.ndarray:
+    # Flatten each placed outline and fill its contours (union, as the test glyphs are overlapping boxes)
+    img = Image.new("L", (dl.width, dl.height), 0)
+    draw = ImageDraw.Draw(img)
+    for mark in dl.marks:
+        if isinstance(mark, GlyphMark):
+            outline = glyph_outline(font_path, 0, mark.ch)
+            m = _glyph_matrix(mark, outline.units_per_em)
+        elif isinstance(mark, TextMark):
+            outline = glyph_outline(font_path, 0, mark.text)
+            m = _text_matrix(mark.font, outline.units_per_em, *mark.p)
+        else:
+            continue
+        for poly in _contours(outline.ops):
+            draw.polygon([(m[0] * x + m[1] * y + m[2], m[3] * x + m[4] * y + m[5]) for x, y in poly], fill=255)
+    return np.asarray(img) > 127
+
+
+def _contours(ops: tuple[PathOp, ...]) -> list[list[tuple[float, float]]]:
+    out: list[list[tuple[float, float]]] = []
+    cur: list[tuple[float, float]] = []
+    for op, args in ops:
+        if op in "ML":
+            cur.append((args[0], args[1]))
+        elif op == "C":
+            cur.append((args[4], args[5]))
+        else:
+            out.append(cur)
+            cur = []
+    return out
+
+
+def test_outlines_follow_the_raster_geometry(font_path: str) -> None:
+    full = _scroll(font_path, "永和九年歲在癸丑之一二三").layout()
+    dl = DisplayList(full.width, full.height, full.bg, [m for m in full.marks if isinstance(m, (GlyphMark, TextMark))])
+    ink = np.asarray(dl.rasterize().convert("L")) < 128
+    vec = _fill_outlines(dl, font_path)
+    assert (ink & vec).sum() / (ink | vec).sum() > 0.85
+
+
+def test_svg_defines_each_glyph_once(font_path: str) -> None:
+    text = "永和九年" * 12
+    dl = _scroll(font_path, text).layout()
+    svg = to_svg(dl)
+    ET.fromstring(svg)
+    # 4 main-text characters + 2 title characters
+    assert len(re.findall(r"<path id=", svg)) == 6
+    assert svg.count("<use ") == len(text) + 2
+    assert len(to_svg(_scroll(font_path, text * 2).layout())) < len(svg) * 2
+
+
+def test_ink_texture_is_a_mask(font_path: str) -> None:
+    dl = _scroll(font_path, "永和").layout()
+    svg = to_svg(dl, ink_texture=True)
+    assert 'mask="url(#ink)"' in svg and "data:image/png;base64," in svg
+    assert b"/SMask" in to_pdf([dl], ink_texture=True)
+
+
+def test_pdf_pages_share_glyphs(font_path: str, tmp_path: Path) -> None:
+    style = Style(font_path=font_path, font_size=60)
+    seal = Seal(font_path=font_path, text_grid=[("印", 0, 0)])
+    couplet = Couplet(text_right="山水山水", text_left="水山", text_header="山水", style=style, seal_header=seal)
+    path = tmp_path / "couplet.pdf"
+    couplet.save_pdf(str(path), dpi=144)
+    data = path.read_bytes()
+    assert data.startswith(b"%PDF-") and b"/Count 3" in data
+    assert data.count(b"/Subtype /Form /BBox") == 3  # 山, 水, 印
+    # Every cross-reference entry points at its object
+    xref = int(data[data.rindex(b"startxref") + 10 :].split()[0])
+    offsets = [int(line[:10]) for line in data[xref:].splitlines()[3:] if line.endswith(b" n ")]
+    assert all(data[o:].startswith(f"{i} 0 obj".encode()) for i, o in enumerate(offsets, start=1))
+
+
+def test_fan_svg_has_vector_leaf(font_path: str, tmp_path: Path) -> None:
+    fan = Fan(text="山水人天", style=Style(font_path=font_path, font_size=40))
+    fan.save_svg(str(tmp_path / "fan.svg"))
+    root = ET.parse(tmp_path / "fan.svg").getroot()
+    assert len(root.findall("{http://www.w3.org/2000/svg}path")) == 2  # outer leaf + inner cut-out
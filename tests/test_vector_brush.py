@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from chinese_calligraphy import MainText, Style, VectorBrush
+from chinese_calligraphy.brush import glyph_mask, glyph_patch_size
+from chinese_calligraphy.display import DisplayList, GlyphMark
+from chinese_calligraphy.font import load_font
+from chinese_calligraphy.vector_brush import rasterize_paths
+
+pytest.importorskip("fontTools")
+
+
+def _mark(brush: VectorBrush, font_path: str, ch: str, p: tuple[int, int] = (300, 300)) -> GlyphMark:
+    return GlyphMark(ch, p, load_font(font_path, 100), (0, 0, 0), 0.0, 0.0, 1.0, 1.0, 0.0, 0.0, brush)
+
+
+def test_undeformed_outline_matches_font_raster(font_path: str) -> None:
+    brush = VectorBrush(seed=1, lean=0.0, stroke_jitter=0.0)
+    font, w = load_font(font_path, 100), glyph_patch_size(100)
+    for ch in "永水書":
+        a = np.asarray(brush._glyph_mask(_mark(brush, font_path, ch), font, w, w)) > 127
+        b = np.asarray(glyph_mask(font, ch, w, w)) > 127
+        assert (a & b).sum() / (a | b).sum() > 0.97
+
+
+def test_nonzero_fill_keeps_holes_and_unions_overlaps() -> None:
+    def square(x0: float, y0: float, x1: float, y1: float, cw: bool) -> list[tuple[float, float]]:
+        pts = [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
+        return pts if cw else pts[::-1]
+
+    contours = [square(10, 10, 50, 50, True), square(20, 20, 40, 40, False), square(30, 30, 70, 70, True)]
+    points = np.array([p for c in contours for p in c], dtype=float)
+    kinds = np.array([0, 1, 1, 1] * 3, dtype=np.int8)
+    contour = np.repeat(np.arange(3), 4)
+    m = np.asarray(rasterize_paths(points, kinds, contour, 80, 80, aa=2))
+    assert m[15, 15] == 255 and m[25, 25] == 0  # ring with a hole
+    assert m[35, 35] == 255 and m[45, 45] == 255 and m[65, 65] == 255  # overlapping squares unite
+    assert m[5, 5] == 0 and m[75, 75] == 0
+
+
+def test_column_warp_matches_per_glyph_and_leans(font_path: str) -> None:
+    brush = VectorBrush(seed=4, lean=0.2, lean_var=0.0, stroke_jitter=0.0)
+    marks = [_mark(brush, font_path, ch, (300, 100 + 120 * i)) for i, ch in enumerate("永和九")]
+    column = brush.warp_outlines(marks)
+    for mark, pts in zip(marks, column, strict=True):
+        assert np.array_equal(brush.warp_outlines([mark])[0], pts)
+    font, w = load_font(font_path, 100), glyph_patch_size(100)
+    m = np.asarray(brush._glyph_mask(marks[0], font, w, w)) > 127
+    rows = np.flatnonzero(m.any(axis=1))
+    top, foot = m[rows[0]], m[rows[-1]]
+    assert np.flatnonzero(top).mean() > np.flatnonzero(foot).mean() + 5  # the top leans right
+
+
+def test_vector_brush_renders_through_ink_pipeline(font_path: str) -> None:
+    style = Style(font_path=font_path, font_size=60, ink_dryness=0.4, blur_sigma=0.8)
+    dl = DisplayList(400, 300, (255, 255, 255))
+    MainText(text="永和九年", style=style, brush=VectorBrush(seed=2, char_jitter=(1, 1))).place(dl, 300, 60, 260)
+    a = dl.rasterize()
+    assert np.asarray(a.convert("L")).min() < 64
+    assert a.tobytes() == dl.rasterize().tobytes()
+
+
+def test_shared_mask_memo_is_keyed_by_brush(font_path: str) -> None:
+    # 【繁】多份版式共用一份遮罩備忘：不同筆刷各得其遮罩，相等的筆刷（即使是新物件）共用
+    # [EN] Display lists sharing one mask memo: different brushes get their own masks, and equal brushes (even new
+    #      objects) share them
+    style = Style(font_path=font_path, font_size=60)
+
+    def layout(lean: float) -> DisplayList:
+        dl = DisplayList(400, 300, (255, 255, 255))
+        MainText(text="永和", style=style, brush=VectorBrush(seed=2, lean=lean)).place(dl, 300, 60, 260)
+        return dl
+
+    masks: dict[object, object] = {}
+    for lean in (0.0, 0.3):
+        assert layout(lean).rasterize(masks=masks).tobytes() == layout(lean).rasterize().tobytes()
+    n = len(masks)
+    layout(0.3).rasterize(masks=masks)
+    assert len(masks) == n